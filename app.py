@@ -1,30 +1,40 @@
 import sys, json, os
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTabWidget, QLabel, QSplashScreen, QFrame, QSizePolicy
+    QLabel, QSplashScreen, QFrame, QSizePolicy
 )
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtCore import Qt, QSize
-
-from tabs.ping_tab import PingTab
-from tabs.traceroute_tab import TracerouteTab
-from tabs.portscan_tab import PortScannerTab
-from tabs.dns_tab import DNSTab
-from tabs.whois import WhoisTab
-
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QSize, QTimer
+
+from core.jobs import get_job_manager
+from core.metrics import metrics_port_from_env, start_metrics_server
+from core.paths import data_path, resource_path
+from core.resolver import get_resolver
+from core.results import close_results_store
+from core.whois_cache import close_whois_cache
+from widgets.lazy_tabs import LazyTabWidget, TabSpec
+from widgets.theme import THEMES, get_theme_engine
 
-# Locate resources when running from source or a bundled executable
-def resource_path(relative_path):
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+# Tab modules are imported only when their tab is first opened
+TAB_REGISTRY = [
+    TabSpec("Ping", "tabs.ping_tab", "PingTab"),
+    TabSpec("Traceroute", "tabs.traceroute_tab", "TracerouteTab"),
+    TabSpec("Port Scan", "tabs.portscan_tab", "PortScannerTab"),
+    TabSpec("Throughput", "tabs.throughput_tab", "ThroughputTab"),
+    TabSpec("HTTP Probe", "tabs.http_tab", "HttpProbeTab"),
+    TabSpec("Capture", "tabs.capture_tab", "CaptureTab"),
+    TabSpec("Agents", "tabs.agents_tab", "AgentsTab"),
+    TabSpec("DNS Lookup", "tabs.dns_tab", "DNSTab"),
+    TabSpec("Whois", "tabs.whois", "WhoisTab"),
+    TabSpec("Monitors", "tabs.monitor_tab", "MonitorTab"),
+    TabSpec("Jobs", "tabs.jobs_tab", "JobsTab"),
+    TabSpec("Diagnostics", "tabs.diagnostics_tab", "DiagnosticsTab"),
+]
 
 
 # Build the path where the app stores user-specific configuration
 def get_config_path():
-    config_dir = os.path.join(os.path.expanduser("~"), ".gatchfier")
-    os.makedirs(config_dir, exist_ok=True)
-    return os.path.join(config_dir, "config.json")
+    return data_path("config.json")
 
 CONFIG_WRITE_PATH = get_config_path()
 CONFIG_READ_PATH = resource_path("config.json")
@@ -53,12 +63,7 @@ def save_theme(theme):
         json.dump({"theme": normalize_theme_name(theme)}, f)
 
 def show_splash(app, theme):
-    if normalize_theme_name(theme) == "neon":
-        splash_path = resource_path("icons/splash_dark.png")
-    else:
-        splash_path = resource_path("icons/splash.png")
-
-    splash_pix = QPixmap(splash_path).scaled(300, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    splash_pix = get_theme_engine().splash(normalize_theme_name(theme), app.devicePixelRatio())
     splash = QSplashScreen(splash_pix)
     splash.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
     splash.show()
@@ -86,11 +91,8 @@ class MainWindow(QWidget):
         header_layout.setContentsMargins(24, 20, 24, 20)
         header_layout.setSpacing(24)
 
-        logo_pixmap = QPixmap(resource_path("icons/gatchfier_logo.png")).scaled(
-            120, 90, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
+        # The themed logo is set by apply_theme below
         self.logo_label = QLabel()
-        self.logo_label.setPixmap(logo_pixmap)
         header_layout.addWidget(self.logo_label)
 
         title_block = QVBoxLayout()
@@ -127,15 +129,12 @@ class MainWindow(QWidget):
         content_layout.setContentsMargins(32, 32, 32, 32)
         content_layout.setSpacing(28)
 
-        self.tabs = QTabWidget()
+        self.tabs = LazyTabWidget()
         self.tabs.setObjectName("MainTabs")
         self.tabs.setElideMode(Qt.ElideRight)
         self.tabs.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.tabs.addTab(PingTab(), "Ping")
-        self.tabs.addTab(TracerouteTab(), "Traceroute")
-        self.tabs.addTab(PortScannerTab(), "Port Scan")
-        self.tabs.addTab(DNSTab(), "DNS Lookup")
-        self.tabs.addTab(WhoisTab(), "Whois")
+        for spec in TAB_REGISTRY:
+            self.tabs.add_lazy_tab(spec)
         content_layout.addWidget(self.tabs)
 
         root_layout.addWidget(content_card, 1)
@@ -145,345 +144,32 @@ class MainWindow(QWidget):
         self.status_label.setAlignment(Qt.AlignCenter)
         root_layout.addWidget(self.status_label)
 
+        # Surface the shared resolver cache counters in the status strip
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_status)
+        self.status_timer.start(1000)
+
         self.apply_theme(self.current_theme)
+        # Scale the other theme's logo once the window is up so the first toggle is instant
+        QTimer.singleShot(1000, lambda: get_theme_engine().prepare(self.devicePixelRatioF()))
 
-    def apply_theme(self, theme):
-        if theme == "neon":
-            stylesheet = """
-                QWidget {
-                    background-color: #040910;
-                    color: #E4FFF9;
-                    font-family: 'Segoe UI';
-                    font-size: 14px;
-                }
-                QLabel {
-                    background-color: transparent;
-                }
-                QLabel#TitleLabel {
-                    font-size: 24px;
-                    font-weight: 600;
-                    color: #3CFFDD;
-                }
-                QLabel#SubtitleLabel {
-                    font-size: 13px;
-                    color: #84FFE8;
-                }
-                QLabel#TabHeading {
-                    font-size: 18px;
-                    font-weight: 600;
-                    color: #3CFFDD;
-                }
-                QLabel#TabSubheading {
-                    font-size: 12px;
-                    color: #9AFEF1;
-                }
-                QLabel#FieldLabel {
-                    font-size: 13px;
-                    font-weight: 600;
-                    color: #9AFEF1;
-                }
-                QLabel#MetricLabel {
-                    font-size: 12px;
-                    color: #73F5D6;
-                }
-                QLabel#StatusStrip {
-                    background-color: rgba(12, 24, 40, 0.85);
-                    border: 1px solid rgba(60, 255, 221, 0.35);
-                    border-radius: 16px;
-                    padding: 14px;
-                    color: #88FFF0;
-                }
-                QFrame#HeaderCard {
-                    background-color: rgba(8, 18, 34, 0.9);
-                    border: 1px solid rgba(60, 255, 221, 0.45);
-                    border-radius: 28px;
-                }
-                QFrame#ContentCard {
-                    background-color: rgba(6, 14, 26, 0.95);
-                    border: 1px solid rgba(60, 255, 221, 0.3);
-                    border-radius: 28px;
-                }
-                QTabWidget#MainTabs::pane {
-                    border: 1px solid rgba(60, 255, 221, 0.28);
-                    border-radius: 18px;
-                    padding: 16px;
-                    background-color: rgba(8, 18, 34, 0.88);
-                    margin-top: 10px;
-                }
-                QTabWidget#MainTabs > QWidget {
-                    background-color: transparent;
-                }
-                QScrollArea {
-                    background-color: transparent;
-                    border: none;
-                }
-                QScrollArea > QWidget > QWidget {
-                    background-color: transparent;
-                }
-                QTabBar::tab {
-                    background-color: rgba(9, 22, 38, 0.9);
-                    border: 1px solid rgba(60, 255, 221, 0.35);
-                    padding: 8px 22px;
-                    border-radius: 16px;
-                    margin-right: 8px;
-                    color: #8EFFF0;
-                }
-                QTabBar::tab:selected {
-                    background-color: rgba(14, 32, 52, 0.95);
-                    color: #3CFFDD;
-                    border: 1px solid rgba(60, 255, 221, 0.6);
-                }
-                QTabBar::tab:hover {
-                    color: #3CFFDD;
-                }
-                QPushButton {
-                    background-color: rgba(10, 24, 40, 0.9);
-                    border: 1px solid rgba(60, 255, 221, 0.35);
-                    border-radius: 12px;
-                    padding: 8px 18px;
-                    color: #E4FFF9;
-                }
-                QPushButton:hover {
-                    background-color: rgba(14, 32, 52, 0.95);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(6, 14, 24, 0.9);
-                }
-                QPushButton:disabled {
-                    color: rgba(150, 210, 210, 0.4);
-                    border: 1px solid rgba(60, 100, 100, 0.25);
-                }
-                QPushButton#AccentButton {
-                    background-color: #3CFFDD;
-                    color: #002A24;
-                    font-weight: 600;
-                    border-radius: 18px;
-                    padding: 10px 26px;
-                }
-                QPushButton#AccentButton:hover {
-                    background-color: #67FFE6;
-                }
-                QPushButton#AccentButton:pressed {
-                    background-color: #2CE2C5;
-                }
-                QLineEdit, QTextEdit, QComboBox, QSpinBox {
-                    background-color: rgba(12, 28, 50, 0.92);
-                    border: 1px solid rgba(60, 255, 221, 0.45);
-                    border-radius: 8px;
-                    padding: 8px 10px;
-                    selection-background-color: #3CFFDD;
-                    selection-color: #001824;
-                    color: #E4FFF9;
-                }
-                QLineEdit::placeholder {
-                    color: rgba(150, 255, 240, 0.55);
-                }
-                QTextEdit#TerminalOutput {
-                    font-family: 'Cascadia Code', 'Consolas', monospace;
-                    font-size: 13px;
-                }
-                QComboBox::drop-down {
-                    border-left: 1px solid rgba(60, 255, 221, 0.35);
-                    width: 26px;
-                    background-color: transparent;
-                }
-                QComboBox QAbstractItemView {
-                    background-color: rgba(6, 14, 24, 0.98);
-                    border: 1px solid rgba(60, 255, 221, 0.35);
-                    selection-background-color: #3CFFDD;
-                    selection-color: #002A24;
-                }
-                QScrollBar:vertical, QScrollBar:horizontal {
-                    background-color: rgba(5, 12, 24, 0.95);
-                    border: 1px solid rgba(60, 255, 221, 0.25);
-                    margin: 6px;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                    background-color: rgba(60, 255, 221, 0.35);
-                    border-radius: 6px;
-                    min-height: 32px;
-                }
-                QScrollBar::handle:hover {
-                    background-color: rgba(60, 255, 221, 0.55);
-                }
-                QScrollBar::add-line, QScrollBar::sub-line {
-                    background: transparent;
-                    border: none;
-                    height: 0px;
-                    width: 0px;
-                }
-                QScrollBar::add-page, QScrollBar::sub-page {
-                    background: transparent;
-                }
-            """
-            self.theme_btn.setText("Switch to Light Theme")
-            logo_path = resource_path("icons/gatchfier_logo.png")
-        else:
-            stylesheet = """
-                QWidget {
-                    background-color: #f4f6fb;
-                    color: #1a1d25;
-                    font-family: 'Segoe UI';
-                    font-size: 14px;
-                }
-                QLabel {
-                    background-color: transparent;
-                }
-                QLabel#TitleLabel {
-                    font-size: 24px;
-                    font-weight: 600;
-                    color: #113f73;
-                }
-                QLabel#SubtitleLabel {
-                    font-size: 13px;
-                    color: #3d4d63;
-                }
-                QLabel#TabHeading {
-                    font-size: 18px;
-                    font-weight: 600;
-                    color: #113f73;
-                }
-                QLabel#TabSubheading {
-                    font-size: 12px;
-                    color: #4a5c78;
-                }
-                QLabel#FieldLabel {
-                    font-size: 13px;
-                    font-weight: 600;
-                    color: #3d4d63;
-                }
-                QLabel#MetricLabel {
-                    font-size: 12px;
-                    color: #4a5c78;
-                }
-                QLabel#StatusStrip {
-                    background-color: #ffffff;
-                    border: 1px solid #d0d6e2;
-                    border-radius: 16px;
-                    padding: 14px;
-                    color: #3d4d63;
-                }
-                QFrame#HeaderCard {
-                    background-color: #ffffff;
-                    border: 1px solid #d0d6e2;
-                    border-radius: 28px;
-                }
-                QFrame#ContentCard {
-                    background-color: #ffffff;
-                    border: 1px solid #d0d6e2;
-                    border-radius: 28px;
-                }
-                QTabWidget#MainTabs::pane {
-                    border: 1px solid #d8deea;
-                    border-radius: 18px;
-                    padding: 16px;
-                    background-color: #ffffff;
-                    margin-top: 10px;
-                }
-                QTabWidget#MainTabs > QWidget {
-                    background-color: transparent;
-                }
-                QScrollArea {
-                    background-color: transparent;
-                    border: none;
-                }
-                QScrollArea > QWidget > QWidget {
-                    background-color: transparent;
-                }
-                QTabBar::tab {
-                    background: #eef1f7;
-                    border: 1px solid #ccd4e2;
-                    padding: 8px 22px;
-                    border-radius: 16px;
-                    margin-right: 8px;
-                    color: #46556f;
-                }
-                QTabBar::tab:selected {
-                    background: #ffffff;
-                    color: #0f4c81;
-                    border: 1px solid #0f4c81;
-                }
-                QPushButton {
-                    background-color: #eef1f7;
-                    border: 1px solid #ccd4e2;
-                    border-radius: 12px;
-                    padding: 8px 18px;
-                    color: #1a1d25;
-                }
-                QPushButton:hover {
-                    background-color: #e2e7f1;
-                }
-                QPushButton:pressed {
-                    background-color: #d4dae6;
-                }
-                QPushButton#AccentButton {
-                    background-color: #0f4c81;
-                    color: #ffffff;
-                    font-weight: 600;
-                    border-radius: 18px;
-                    padding: 10px 26px;
-                }
-                QPushButton#AccentButton:hover {
-                    background-color: #145f9b;
-                }
-                QPushButton#AccentButton:pressed {
-                    background-color: #0c3c66;
-                }
-                QLineEdit, QTextEdit, QComboBox, QSpinBox {
-                    background-color: #ffffff;
-                    border: 1px solid #c7cfde;
-                    border-radius: 8px;
-                    padding: 8px 10px;
-                    selection-background-color: #0f4c81;
-                    selection-color: #ffffff;
-                }
-                QTextEdit#TerminalOutput {
-                    font-family: 'Cascadia Code', 'Consolas', monospace;
-                    font-size: 13px;
-                }
-                QComboBox::drop-down {
-                    border-left: 1px solid #c7cfde;
-                    width: 26px;
-                    background-color: transparent;
-                }
-                QComboBox QAbstractItemView {
-                    background-color: #ffffff;
-                    border: 1px solid #c7cfde;
-                    selection-background-color: #0f4c81;
-                    selection-color: #ffffff;
-                }
-                QScrollBar:vertical, QScrollBar:horizontal {
-                    background-color: #f1f4fb;
-                    border: 1px solid #d8deea;
-                    margin: 6px;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                    background-color: #c7cfde;
-                    border-radius: 6px;
-                    min-height: 32px;
-                }
-                QScrollBar::handle:hover {
-                    background-color: #a8b4c9;
-                }
-                QScrollBar::add-line, QScrollBar::sub-line {
-                    background: transparent;
-                    border: none;
-                    height: 0px;
-                    width: 0px;
-                }
-                QScrollBar::add-page, QScrollBar::sub-page {
-                    background: transparent;
-                }
-            """
-            self.theme_btn.setText("Switch to Neon Theme")
-            logo_path = resource_path("icons/gatchfier_logo_dark.png")
+    def update_status(self):
+        stats = get_resolver().stats()
+        if stats["misses"] or stats["entries"]:
+            self.status_label.setText(f"Ready • {get_resolver().summary()}")
 
-        self.setStyleSheet(stylesheet)
-        self.logo_label.setPixmap(
-            QPixmap(logo_path).scaled(120, 90, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        )
+    def apply_theme(self, theme):
+        engine = get_theme_engine()
+        if not engine.apply(self, theme):
+            return
+        self.theme_btn.setText(THEMES[theme].toggle_text)
+        self.logo_label.setPixmap(engine.logo(theme, self.devicePixelRatioF()))
+
+    def closeEvent(self, event):  # pylint: disable=invalid-name
+        get_job_manager().shutdown()
+        close_results_store()
+        close_whois_cache()
+        super().closeEvent(event)
 
     def toggle_theme(self):
         self.current_theme = "light" if self.current_theme == "neon" else "neon"
@@ -498,5 +184,9 @@ if __name__ == "__main__":
     window = MainWindow()
     window.show()
 
+    metrics_port = metrics_port_from_env()
+    if metrics_port:
+        start_metrics_server(metrics_port)
+
     splash.finish(window)
     sys.exit(app.exec())
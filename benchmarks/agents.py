@@ -0,0 +1,111 @@
+"""Does spreading a scan over agents finish sooner, and does the merge stay exact?
+
+Starts agents as separate processes (``cli.py agent --port 0``) and scans a
+loopback listener farm once in this process and then through 1, 2 and 4
+agents. Blackholed ports dominate the farm, so a scan is bound by connect
+timeouts and its in-flight window rather than by CPU, as a sweep of a
+mostly filtered network is; each agent brings its own window, which is what
+lets more boxes finish sooner. Every dispatched run's merged open, closed
+and filtered sets are compared with the local scan (``matches_local``). A
+last run kills one agent mid-sweep and checks that its chunks are finished
+by the others. tests/test_agent.py asserts both.
+
+Run from the repository root:  python -m benchmarks.agents
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.listener_farm import ListenerFarm
+from core.agent import AgentPool, dispatch
+from core.portscan import scan_ports
+from core.portset import HostPorts, PortSet
+
+
+def start_agents(count: int) -> list:
+    agents = []
+    for index in range(count):
+        process = subprocess.Popen(
+            [sys.executable, "cli.py", "agent", "--port", "0", "--name", f"agent{index + 1}"],
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        # "Agent agent1 listening on 127.0.0.1:PORT"
+        port = int(process.stderr.readline().rsplit(":", 1)[1])
+        agents.append((process, f"127.0.0.1:{port}"))
+    return agents
+
+
+def scan_locally(farm: ListenerFarm, window: int, timeout: float) -> dict:
+    host = HostPorts()
+    started = time.perf_counter()
+    found = scan_ports(farm.host, farm.ports, window=window, timeout=timeout, result=host)
+    elapsed = time.perf_counter() - started
+    counts = host.counts()
+    return {"seconds": elapsed, "open": [item.port for item in found], "closed": counts["closed"],
+            "filtered": list(host.filtered)}
+
+
+def scan_dispatched(farm: ListenerFarm, addresses: list, params: dict, chunk: int, on_start=None) -> dict:
+    pool, errors = AgentPool.connect(addresses)
+    if errors:
+        raise RuntimeError("; ".join(errors))
+    summaries = []
+    try:
+        if on_start:
+            on_start()
+        elapsed = dispatch(pool, "scan", [farm.host], {"ports": PortSet.from_ports(farm.ports).ranges(), **params},
+                           lambda record: record["type"] == "summary" and summaries.append(record), chunk=chunk)
+    finally:
+        pool.close()
+    return {"seconds": elapsed, **summaries[0], "units": [agent.completed for agent in pool.agents]}
+
+
+def compare(local: dict, remote: dict) -> bool:
+    return all(local[key] == remote[key] for key in ("open", "closed", "filtered"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--open", type=int, default=20)
+    parser.add_argument("--closed", type=int, default=1000)
+    parser.add_argument("--blackholed", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=100, help="connects in flight per scanner")
+    parser.add_argument("--timeout", type=float, default=0.3)
+    parser.add_argument("--chunk", type=int, default=128, help="ports per work unit")
+    parser.add_argument("--agents", default="1,2,4")
+    args = parser.parse_args()
+
+    counts = [int(value) for value in args.agents.split(",")]
+    agents = start_agents(max(counts))
+    params = {"window": args.window, "timeout": args.timeout}
+    try:
+        with ListenerFarm(args.open, args.closed, args.blackholed) as farm:
+            total = len(farm.ports)
+            local = scan_locally(farm, args.window, args.timeout)
+            print({"scanner": "local", "ports": total, "seconds": round(local["seconds"], 2),
+                   "ports_per_second": round(total / local["seconds"])})
+            for count in counts:
+                remote = scan_dispatched(farm, [address for _, address in agents[:count]], params, args.chunk)
+                print({"scanner": f"{count} agents", "ports": total, "seconds": round(remote["seconds"], 2),
+                       "ports_per_second": round(total / remote["seconds"]), "units": remote["units"],
+                       "matches_local": compare(local, remote)})
+            if len(agents) > 1:
+                victim = agents[0][0]
+                remote = scan_dispatched(farm, [address for _, address in agents], params, args.chunk,
+                                         on_start=threading.Timer(0.3, victim.kill).start)
+                print({"scanner": f"{len(agents)} agents, one killed", "seconds": round(remote["seconds"], 2),
+                       "units": remote["units"], "matches_local": compare(local, remote),
+                       "errors": remote.get("errors", [])})
+    finally:
+        for process, _ in agents:
+            process.kill()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
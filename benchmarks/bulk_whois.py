@@ -0,0 +1,52 @@
+"""Bulk whois against a local stand-in registry, checking per-registry limits.
+
+Run from the repository root:  python -m benchmarks.bulk_whois
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_whois import StubWhoisServer
+from core.whois_bulk import BulkWhoisRunner, RegistryLimiter
+from core.whois_client import ReferralCache
+
+
+def run(domains: int, concurrency: int, rate: float, delay: float) -> dict:
+    with StubWhoisServer(delay=delay) as stub, tempfile.TemporaryDirectory() as workdir:
+        # An empty index forces the IANA referral path through the stand-in
+        referrals = ReferralCache(os.path.join(workdir, "referrals.json"), iana_server=stub.server, index={})
+        runner = BulkWhoisRunner(referrals, RegistryLimiter(concurrency, rate))
+        names = [f"domain{index}.{tld}" for index in range(domains) for tld in ("com", "net")][:domains]
+        results = []
+        started = time.perf_counter()
+        runner.run(names, results.append)
+        elapsed = time.perf_counter() - started
+        iana_queries = stub.queries - len(names)
+
+    return {
+        "domains": len(names),
+        "elapsed_s": round(elapsed, 3),
+        "errors": sum(1 for result in results if result.error),
+        "with_expiry": sum(1 for result in results if result.record and result.record.get("expiration_date")),
+        "iana_queries": iana_queries,
+        "peak_concurrency": stub.peak_active,
+        "limit": concurrency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=200.0, help="Queries per second per registry")
+    parser.add_argument("--delay", type=float, default=0.01)
+    args = parser.parse_args()
+    for key, value in run(args.domains, args.concurrency, args.rate, args.delay).items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Can the capture path keep up with tens of thousands of packets a second?
+
+Feeds synthetic Ethernet/IPv4 frames (a TCP, UDP and ICMP mix) through
+CaptureSession.ingest with and without pcap streaming and reports frames
+per second, then times summarising one screenful of rows as the packet
+table does on each repaint, and the ring's memory once full. When scapy
+is importable and the process may open packet sockets, it also captures
+a UDP flood over loopback through a kernel BPF filter and reports how
+many datagrams were seen and how many the kernel dropped.
+
+Run from the repository root:  python -m benchmarks.capture
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from core.capture import CaptureSession, capture, summarize
+
+VISIBLE_ROWS = 40
+
+
+def frames(count: int) -> list:
+    ether = b"\x00\x11\x22\x33\x44\x55\x66\x77\x88\x99\xaa\xbb\x08\x00"
+    tcp = struct.pack("!HHIIBBHHH", 40000, 443, 1, 0, 0x50, 0x18, 65535, 0, 0) + os.urandom(1200)
+    udp = struct.pack("!HHHH", 5353, 53, 40, 0) + os.urandom(32)
+    icmp = struct.pack("!BBHHH", 8, 0, 0, 7, 1) + os.urandom(56)
+    packets = []
+    for index in range(count):
+        number, payload = ((6, tcp), (17, udp), (1, icmp))[index % 3]
+        source = socket.inet_aton(f"10.0.{index >> 8 & 255}.{index & 255}")
+        header = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(payload), index & 0xFFFF, 0, 64, number, 0, source,
+                             b"\x0a\x00\x00\x01")
+        packets.append(ether + header + payload)
+    return packets
+
+
+def measure_ingest(packets: list, ring: int, pcap: bool) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        session = CaptureSession(ring, os.path.join(directory, "bench.pcap") if pcap else None)
+        session.open(1)
+        now = time.time()
+        started = time.perf_counter()
+        for frame in packets:
+            session.ingest(frame, now)
+        session.close()
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(session.pcap_path) if pcap else 0
+    return {
+        "step": "ingest + pcap" if pcap else "ingest",
+        "frames_per_second": round(len(packets) / elapsed),
+        "pcap_mb": round(size / 2**20, 1),
+    }
+
+
+def measure_view(packets: list) -> dict:
+    window = packets[:VISIBLE_ROWS]
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for frame in window:
+            summarize(frame)
+    per_screen = (time.perf_counter() - started) / rounds
+    return {"step": f"summarise {VISIBLE_ROWS} visible rows", "ms": round(per_screen * 1000, 3),
+            "per_row_us": round(per_screen / VISIBLE_ROWS * 1e6, 2)}
+
+
+def measure_memory(packets: list, ring: int) -> dict:
+    tracemalloc.start()
+    session = CaptureSession(ring)
+    for frame in packets[:ring]:
+        # Fresh bytes objects, as the socket would hand over
+        session.ingest(bytes(bytearray(frame)), 0.0)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"step": f"ring of {ring:,} frames", "retained_mb": round(current / 2**20, 1)}
+
+
+def measure_live(rate: int, seconds: float) -> dict:
+    try:
+        import scapy.all  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return {"step": "live loopback capture", "skipped": "scapy is not installed"}
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    port = receiver.getsockname()[1]
+    session = CaptureSession(1 << 17)
+    stop = threading.Event()
+    errors = []
+    ready = threading.Event()
+
+    def run():
+        try:
+            capture(session, "lo", f"udp and dst port {port}", stop=stop, on_status=lambda _: ready.set())
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(str(exc))
+            ready.set()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait(10)
+    time.sleep(0.5)
+    if errors:
+        return {"step": "live loopback capture", "skipped": errors[0]}
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payload = os.urandom(64)
+    sent = 0
+    started = time.monotonic()
+    while time.monotonic() - started < seconds:
+        if sent < (time.monotonic() - started) * rate:
+            sender.sendto(payload, ("127.0.0.1", port))
+            sent += 1
+    time.sleep(0.5)
+    stop.set()
+    thread.join(5)
+    sender.close()
+    receiver.close()
+    return {"step": "live loopback capture", "sent": sent, "captured": session.packets,
+            "kernel_drops": session.kernel_drops, "target_pps": rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300_000)
+    parser.add_argument("--ring", type=int, default=100_000)
+    parser.add_argument("--rate", type=int, default=50_000, help="datagrams per second for the live capture")
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    packets = frames(args.frames)
+    print(measure_ingest(packets, args.ring, pcap=False))
+    print(measure_ingest(packets, args.ring, pcap=True))
+    print(measure_view(packets))
+    print(measure_memory(packets, args.ring))
+    print(measure_live(args.rate, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
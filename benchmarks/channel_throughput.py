@@ -0,0 +1,79 @@
+"""Worker-to-GUI hand-off rate through ResultChannel.
+
+Producer threads push typed records while a consumer drains on a fixed tick,
+standing in for the GUI timer. ``--consumer-cost-us`` charges a per-record
+cost to the consumer so backpressure can be observed.
+
+Run from the repository root:  python -m benchmarks.channel_throughput
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from core.channel import Progress, ResultChannel
+
+
+def run(records: int, producers: int, tick_ms: float, consumer_cost_us: float, high_watermark: int) -> dict:
+    channel = ResultChannel(high_watermark=high_watermark)
+    per_producer = records // producers
+    done = threading.Event()
+
+    def produce():
+        for index in range(per_producer):
+            if index % 256 == 0:
+                channel.wait_for_room(1.0)
+            channel.put(Progress(index, per_producer))
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    def watch():
+        for thread in threads:
+            thread.join()
+        done.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+    received = 0
+    ticks = 0
+    while not (done.is_set() and not channel.depth()):
+        time.sleep(tick_ms / 1000)
+        batch = channel.drain()
+        ticks += 1
+        received += len(batch)
+        if consumer_cost_us:
+            time.sleep(len(batch) * consumer_cost_us / 1e6)
+    elapsed = time.perf_counter() - started
+
+    stats = channel.stats()
+    return {
+        "records": received,
+        "producers": producers,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(received / elapsed, 1),
+        "gui_ticks": ticks,
+        "records_per_tick": round(received / max(1, ticks), 1),
+        "peak_depth": stats["peak_depth"],
+        "throttled_s": stats["throttled_s"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--tick-ms", type=float, default=16)
+    parser.add_argument("--consumer-cost-us", type=float, default=0)
+    parser.add_argument("--high-watermark", type=int, default=20000)
+    args = parser.parse_args()
+    result = run(args.records, args.producers, args.tick_ms, args.consumer_cost_us, args.high_watermark)
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Cold vs warm HTTP(S) request timings against a local stub server.
+
+Runs the probe against StubHttpServer (in a child process) over plain HTTP
+and TLS with a throwaway self-signed certificate, three ways: keep-alive
+pooling, a new connection per request, and a naive client that opens an
+http.client connection per request as a script calling urllib would, one
+request at a time. Reports per-phase percentiles and the CPU this process
+spent per request, and how many connections the server saw; with
+keep-alive that never exceeds the pool size (tests/test_http_probe.py
+asserts it). Compare the naive client with ``--concurrency 1``.
+
+Run from the repository root:  python -m benchmarks.http_probe
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import ssl
+import time
+
+from benchmarks.stub_http import stub_process
+from core.dns_bench import percentile
+from core.http_probe import probe_many
+
+
+def naive(url: str, tls: bool, port: int, count: int) -> dict:
+    samples = []
+    context = ssl._create_unverified_context() if tls else None  # pylint: disable=protected-access
+    cpu_started = time.process_time()
+    for _ in range(count):
+        started = time.perf_counter()
+        if tls:
+            conn = http.client.HTTPSConnection("127.0.0.1", port, context=context)
+        else:
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/")
+        conn.getresponse().read()
+        conn.close()
+        samples.append((time.perf_counter() - started) * 1000)
+    cpu = time.process_time() - cpu_started
+    return {
+        "client": "naive",
+        "url": url,
+        "total_p50": round(percentile(samples, 50), 2),
+        "total_p99": round(percentile(samples, 99), 2),
+        "cpu_ms_per_request": round(cpu * 1000 / count, 3),
+    }
+
+
+def run(tls: bool, count: int, concurrency: int, body: int, delay: float):
+    with stub_process(tls=tls, delay=delay, body_size=body) as server:
+        if tls and not server.tls:
+            print({"skipped": "https", "reason": "openssl binary not found"})
+            return
+        url = server.url()
+        for keep_alive in (True, False):
+            before = server.connections
+            cpu_started = time.process_time()
+            stats = probe_many(url, count, concurrency, keep_alive=keep_alive, verify=False)
+            cpu = time.process_time() - cpu_started
+            for row in stats.summary():
+                print({
+                    "client": "probe",
+                    "url": url,
+                    "keep_alive": keep_alive,
+                    **{key: value for key, value in row.items() if key.endswith(("p50", "p99")) or key in ("connections", "requests")},
+                })
+            print({
+                "failures": stats.failures,
+                "server_connections": server.connections - before,
+                "cpu_ms_per_request": round(cpu * 1000 / count, 3),
+            })
+        print(naive(url, tls, server.port, count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--body", type=int, default=16384, help="response size in bytes")
+    parser.add_argument("--delay", type=float, default=0.0, help="server think time in seconds")
+    args = parser.parse_args()
+    for tls in (False, True):
+        run(tls, args.count, args.concurrency, args.body, args.delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import select
+import socket
+import threading
+from typing import List
+
+
+class ListenerFarm:
+    """Loopback ports in three known states for scan and tcping benchmarks.
+
+    * open: listening sockets whose connections are accepted and closed at once
+    * closed: sockets bound but not listening, so a connect is refused (RST)
+    * blackholed: listeners with a zero backlog that is already full, so the
+      kernel drops further SYNs and a connect times out like a filtered port
+
+    Blackholing relies on Linux dropping SYNs to a full accept queue; Windows
+    answers those with a reset instead, so there they read as closed.
+    """
+
+    def __init__(self, open_ports: int = 10, closed_ports: int = 200, blackholed_ports: int = 5, host: str = "127.0.0.1"):
+        self.host = host
+        self._sockets: List[socket.socket] = []
+        self._listeners: List[socket.socket] = []
+        self._fillers: List[socket.socket] = []
+        self.open = [self._listen(128, accept=True) for _ in range(open_ports)]
+        self.closed = [self._bind() for _ in range(closed_ports)]
+        self.blackholed = [self._blackhole() for _ in range(blackholed_ports)]
+        self.accepted = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="listener-farm", daemon=True)
+
+    @property
+    def ports(self) -> List[int]:
+        return sorted(self.open + self.closed + self.blackholed)
+
+    def _bind(self) -> int:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((self.host, 0))
+        self._sockets.append(sock)
+        return sock.getsockname()[1]
+
+    def _listen(self, backlog: int, accept: bool) -> int:
+        port = self._bind()
+        sock = self._sockets[-1]
+        sock.listen(backlog)
+        if accept:
+            sock.setblocking(False)
+            self._listeners.append(sock)
+        return port
+
+    def _blackhole(self) -> int:
+        port = self._listen(0, accept=False)
+        # Linux queues backlog + 1 connections; fill them so later SYNs are dropped
+        for _ in range(2):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            filler.connect_ex((self.host, port))
+            self._fillers.append(filler)
+        return port
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        for sock in self._fillers + self._sockets:
+            sock.close()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            readable, _, _ = select.select(self._listeners, [], [], 0.1) if self._listeners else ([], [], [])
+            if not self._listeners:
+                self._stop.wait(0.1)
+            for listener in readable:
+                while True:
+                    try:
+                        conn, _ = listener.accept()
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        return
+                    conn.close()
+                    self.accepted += 1
@@ -0,0 +1,91 @@
+"""Cost of the instrumentation on the port-scan hot path.
+
+Times a bare counter increment and histogram observation, then scans a block
+of loopback ports (one listener, the rest refused) twice: once as shipped and
+once with the scan metrics swapped for no-ops, so the difference is what the
+counters add per probe.
+
+Run from the repository root:  python -m benchmarks.metrics_overhead
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import time
+
+import core.portscan as portscan
+from core.metrics import Counter, Histogram
+
+
+class _Null:
+    def inc(self, amount: int = 1):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+
+def per_call_ns(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e9
+
+
+def scan_seconds(ports: range, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        portscan.scan_ports("127.0.0.1", ports)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(calls: int, ports: int, rounds: int) -> dict:
+    counter, histogram = Counter("bench_total"), Histogram("bench_seconds")
+    inc_ns = per_call_ns(counter.inc, calls)
+    observe_ns = per_call_ns(lambda: histogram.observe(0.003), calls)
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(128)
+    port = listener.getsockname()[1]
+    block = range(max(1, port - ports // 2), max(1, port - ports // 2) + ports)
+    saved = (portscan.PROBES, portscan.OPEN_FOUND, portscan.TIMEOUTS, portscan.CONNECT_SECONDS)
+    instrumented = bare = float("inf")
+    try:
+        scan_seconds(block, 1)  # warm up the I/O pool
+        # Alternate the two so drift in the host affects both equally
+        for _ in range(rounds):
+            instrumented = min(instrumented, scan_seconds(block, 1))
+            portscan.PROBES = portscan.OPEN_FOUND = portscan.TIMEOUTS = portscan.CONNECT_SECONDS = _Null()
+            try:
+                bare = min(bare, scan_seconds(block, 1))
+            finally:
+                portscan.PROBES, portscan.OPEN_FOUND, portscan.TIMEOUTS, portscan.CONNECT_SECONDS = saved
+    finally:
+        listener.close()
+
+    return {
+        "counter_inc_ns": round(inc_ns, 1),
+        "histogram_observe_ns": round(observe_ns, 1),
+        "ports": len(block),
+        "scan_bare_s": round(bare, 3),
+        "scan_instrumented_s": round(instrumented, 3),
+        "overhead_us_per_probe": round((instrumented - bare) / len(block) * 1e6, 2),
+        "overhead_pct": round((instrumented - bare) / bare * 100, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000000)
+    parser.add_argument("--ports", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    for key, value in run(args.calls, args.ports, args.rounds).items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Scheduler cost as the number of recurring monitor checks grows.
+
+First the timer wheel alone: N timers with intervals between 10 s and 5 min
+are advanced through ten simulated minutes, re-arming each one as it fires,
+and the cost per tick and per firing is reported. Flat numbers across N mean
+the bookkeeping does not scale with the number of checks. Then the real
+MonitorScheduler runs N no-op checks on a 1 s interval against the shared
+job manager and reports how late checks were dispatched.
+
+Run from the repository root:  python -m benchmarks.monitor_scheduler
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from core.dns_bench import percentile
+from core.jobs import JobManager
+from core.monitors import Check, CheckResult, MonitorScheduler
+from core.timer_wheel import TimerWheel
+
+
+def wheel_cost(timers: int, minutes: float) -> dict:
+    wheel = TimerWheel(tick=0.1, start=0.0)
+    rng = random.Random(1)
+    intervals = [rng.uniform(10, 300) for _ in range(timers)]
+    for index, interval in enumerate(intervals):
+        wheel.schedule(rng.uniform(0, interval), index)
+    ticks = int(minutes * 60 / wheel.tick)
+    fired = 0
+    started = time.perf_counter()
+    for step in range(1, ticks + 1):
+        for index in wheel.advance(step * wheel.tick + 1e-9):
+            wheel.schedule(intervals[index], index)
+            fired += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "timers": timers,
+        "fired": fired,
+        "us_per_tick": round(elapsed / ticks * 1e6, 2),
+        "us_per_fire": round(elapsed / max(1, fired) * 1e6, 2),
+    }
+
+
+def dispatch_lag(checks: int, seconds: float) -> dict:
+    manager = JobManager()
+    lags = []
+
+    def noop(check: Check) -> CheckResult:
+        lags.append(time.monotonic() - check.due)
+        return CheckResult(check.id, True, 0.0, "ok", time.time())
+
+    scheduler = MonitorScheduler(manager=manager, runner=noop)
+    for index in range(checks):
+        scheduler.add(Check("tcp", f"host{index}.test", interval=1.0, port=80))
+    cpu_started = time.process_time()
+    scheduler.start()
+    time.sleep(seconds)
+    scheduler.stop()
+    cpu = time.process_time() - cpu_started
+    manager.shutdown()
+    return {
+        "checks": checks,
+        "executed": len(lags),
+        "lag_p50_ms": round(percentile(lags, 50) * 1000, 2),
+        "lag_p99_ms": round(percentile(lags, 99) * 1000, 2),
+        "cpu_per_check_us": round(cpu / max(1, len(lags)) * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", default="100,1000,10000,100000")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--live-checks", default="100,1000,5000")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    for count in (int(value) for value in args.counts.split(",")):
+        print(wheel_cost(count, args.minutes))
+    for count in (int(value) for value in args.live_checks.split(",")):
+        print(dispatch_lag(count, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Memory, file size and set-algebra cost of bitmap port-scan results.
+
+Builds a synthetic sweep of N hosts with every port scanned, a handful open
+and a filtered block on some hosts, stores it once as ScanSnapshot bitmaps
+and once as the previous representation (a set of open port numbers per
+host), then times saving, loading, diffing against a second sweep, a union
+across all hosts and counting. Memory is measured with tracemalloc.
+
+Run from the repository root:  python -m benchmarks.portset
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from core.portset import PORT_SPACE, STATE_FILTERED, STATE_OPEN, PortSet, ScanSnapshot
+
+
+def sweep(hosts: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    common = [22, 25, 53, 80, 110, 143, 443, 445, 993, 3306, 3389, 5432, 8080, 8443]
+    result = {}
+    for index in range(hosts):
+        open_ports = set(rng.sample(common, rng.randint(0, 5)))
+        open_ports.update(rng.randrange(1024, PORT_SPACE) for _ in range(rng.randint(0, 3)))
+        filtered = range(0)
+        if rng.random() < 0.2:
+            start = rng.randrange(1, PORT_SPACE - 2000)
+            filtered = range(start, start + rng.randint(1, 2000))
+        result[f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"] = (open_ports, filtered)
+    return result
+
+
+def build_snapshot(data: dict) -> ScanSnapshot:
+    everything = bytes([0xFF]) * (PORT_SPACE // 8)
+    snapshot = ScanSnapshot()
+    for name, (open_ports, filtered) in data.items():
+        host = snapshot.host(name)
+        host.scanned = PortSet(everything)
+        for port in open_ports:
+            host.state(STATE_OPEN).add(port)
+        if filtered:
+            host.state(STATE_FILTERED)._bits[filtered.start >> 3:filtered.stop >> 3] = bytes([0xFF]) * (  # pylint: disable=protected-access
+                (filtered.stop >> 3) - (filtered.start >> 3)
+            )
+        snapshot.share(name)
+    return snapshot
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print({"step": label, "seconds": round(elapsed, 3), "retained_mb": round(current / 2**20, 1), "peak_mb": round(peak / 2**20, 1)})
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hosts", type=int, default=10000)
+    args = parser.parse_args()
+
+    before = sweep(args.hosts, 1)
+    after = sweep(args.hosts, 2)
+    measure("python sets (open + filtered only)", lambda: {name: (set(o), set(f)) for name, (o, f) in before.items()})
+    old = measure("bitmaps", lambda: build_snapshot(before))
+    new = build_snapshot(after)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sweep.gps")
+        measure("save", lambda: old.save(path))
+        print({"file_mb": round(os.path.getsize(path) / 2**20, 1), "bytes_per_host": os.path.getsize(path) // args.hosts})
+        loaded = measure("load", lambda: ScanSnapshot.load(path))
+    assert loaded.hosts.keys() == old.hosts.keys()
+
+    changes = measure("diff", lambda: old.diff(new))
+    print({"hosts_changed": len(changes)})
+    measure("diff of a rescan with no changes", lambda: old.diff(loaded))
+
+    seen = measure("union of open ports", lambda: PortSet.union(host.open for host in old.hosts.values()))
+    print({"distinct_open_ports": len(seen)})
+    total = measure("count states", lambda: sum(host.counts()["closed"] for host in old.hosts.values()))
+    print({"closed_ports": total})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Reverse-sweep a whole /16 against a local stub server and report memory use.
+
+Run from the repository root:  python -m benchmarks.ptr_sweep
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.stub_dns import stub_process
+from core.dns_client import DNSClient
+from core.ptr_sweep import STATUS_FOUND, PtrSweepStore, parse_network, sweep
+
+
+def run(cidr: str, window: int, rate: float | None) -> dict:
+    with stub_process(reverse=True) as server:
+        client = DNSClient(server, timeout=2.0)
+        tracemalloc.start()
+        store = PtrSweepStore(parse_network(cidr))
+        started = time.perf_counter()
+        sweep(store, client, rate=rate, window=window)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    found = sum(1 for status in store.status if status == STATUS_FOUND)
+    started = time.perf_counter()
+    store.sorted_rows(1)
+    sort_ms = (time.perf_counter() - started) * 1000
+    return {
+        "cidr": cidr,
+        "addresses": store.size,
+        "completed": store.completed_count(),
+        "found": found,
+        "elapsed_s": round(elapsed, 3),
+        "qps": round(store.size / elapsed, 1),
+        "peak_mib": round(peak / (1 << 20), 2),
+        "sort_by_name_ms": round(sort_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cidr", default="10.20.0.0/16")
+    parser.add_argument("--window", type=int, default=512)
+    parser.add_argument("--rate", type=float, default=None, help="Queries per second cap")
+    args = parser.parse_args()
+    for key, value in run(args.cidr, args.window, args.rate).items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare resolver latency percentiles using stub servers with injected delays.
+
+Run from the repository root:  python -m benchmarks.resolver_latency
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+
+from benchmarks.stub_dns import stub_process
+from core.dns_bench import benchmark_resolvers
+
+
+def run(delays_ms, names: int, rounds: int, cold_ms: float = 0.0) -> list:
+    with contextlib.ExitStack() as stack:
+        stubs = {
+            stack.enter_context(stub_process(delay=delay / 1000, cold_delay=cold_ms / 1000)): delay
+            for delay in delays_ms
+        }
+        name_set = [f"name{index}.bench.test" for index in range(names)]
+        results = benchmark_resolvers(list(stubs), name_set, rounds=rounds)
+
+    rows = []
+    for stats in sorted(results, key=lambda item: stubs[item.resolver]):
+        row = stats.summary()
+        row["injected_ms"] = stubs[stats.resolver]
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delays", default="0,5,20", help="Injected delay per stub server in ms")
+    parser.add_argument("--names", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--cold", type=float, default=20, help="Extra delay in ms for a name's first query")
+    args = parser.parse_args()
+    delays = [float(value) for value in args.delays.split(",")]
+    for row in run(delays, args.names, args.rounds, args.cold):
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Write throughput of the SQLite results store under concurrent producers.
+
+Producers call ``record`` as fast as they can, like a busy ping or scan; the
+time each call takes is what the GUI would feel. The run ends once the writer
+has committed every row, then an indexed per-target query is timed.
+
+Run from the repository root:  python -m benchmarks.results_store
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from core.dns_bench import percentile
+from core.results import ResultsStore
+
+
+def run(rows: int, producers: int, targets: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        store = ResultsStore(os.path.join(workdir, "results.db"))
+        per_producer = rows // producers
+        call_times = [[] for _ in range(producers)]
+
+        def produce(index: int):
+            timings = call_times[index]
+            for seq in range(per_producer):
+                started = time.perf_counter()
+                store.record("ping", f"host{seq % targets}.test", seq=seq, rtt_ms=12.5)
+                timings.append((time.perf_counter() - started) * 1e6)
+
+        threads = [threading.Thread(target=produce, args=(index,)) for index in range(producers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        enqueued = time.perf_counter() - started
+        store.flush()
+        committed = time.perf_counter() - started
+
+        query_started = time.perf_counter()
+        recent = store.query("ping", target="host7.test", limit=100)
+        query_ms = (time.perf_counter() - query_started) * 1000
+        stats = store.stats()
+        store.close()
+
+    samples = [value for timings in call_times for value in timings]
+    return {
+        "rows": stats["written"],
+        "batches": stats["batches"],
+        "enqueue_s": round(enqueued, 3),
+        "commit_s": round(committed, 3),
+        "rows_per_s": round(stats["written"] / committed, 1),
+        "record_p50_us": round(percentile(samples, 50), 2),
+        "record_p99_us": round(percentile(samples, 99), 2),
+        "query_ms": round(query_ms, 2),
+        "query_rows": len(recent),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--targets", type=int, default=50)
+    args = parser.parse_args()
+    for key, value in run(args.rows, args.producers, args.targets).items():
+        print(f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main()
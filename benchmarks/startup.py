@@ -0,0 +1,115 @@
+"""Cold-start time from process launch to the main window's first paint.
+
+Each run starts a fresh interpreter so nothing is warm in ``sys.modules``.
+The child imports ``app``, builds ``MainWindow``, shows it and exits on the
+first paint event; the parent measures wall time around the whole process.
+The median is compared with ``STARTUP_BUDGET_MS`` and the exit status is
+non-zero when it is exceeded. The offscreen Qt platform is used unless
+``--platform`` says otherwise.
+
+Run from the repository root:  python -m benchmarks.startup
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Budget for launch to first paint, interpreter start-up included
+STARTUP_BUDGET_MS = 1200
+
+
+def child():
+    started = time.perf_counter()
+    from PySide6.QtCore import QEvent, QObject, QTimer  # pylint: disable=import-outside-toplevel
+    from PySide6.QtWidgets import QApplication  # pylint: disable=import-outside-toplevel
+
+    qt_ready = time.perf_counter()
+    app_instance = QApplication(sys.argv[:1])
+    import app  # pylint: disable=import-outside-toplevel
+
+    imported = time.perf_counter()
+    window = app.MainWindow()
+    built = time.perf_counter()
+    marks = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):  # pylint: disable=invalid-name
+            if event.type() == QEvent.Paint and "paint" not in marks:
+                marks["paint"] = time.perf_counter()
+                QTimer.singleShot(0, app_instance.quit)
+            return False
+
+    paint_filter = FirstPaint()
+    window.installEventFilter(paint_filter)
+    window.show()
+    QTimer.singleShot(10000, app_instance.quit)
+    app_instance.exec()
+
+    def ms(value):
+        return round((value - started) * 1000, 1)
+
+    print(json.dumps({
+        "qt_import_ms": ms(qt_ready),
+        "app_import_ms": ms(imported),
+        "window_built_ms": ms(built),
+        "first_paint_ms": ms(marks["paint"]) if "paint" in marks else None,
+        "tabs_built": len(window.tabs.loaded_tabs()),
+        "modules": len(sys.modules),
+        "heavy_modules": sorted(name for name in ("ping3", "whois", "scapy", "dateutil") if name in sys.modules),
+    }))
+
+
+def run(runs: int, platform: str) -> dict:
+    env = dict(os.environ)
+    if platform:
+        env["QT_QPA_PLATFORM"] = platform
+    samples = []
+    detail = {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip() or "startup child failed")
+        detail = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(wall)
+    median = statistics.median(samples)
+    return {
+        "runs": runs,
+        "median_wall_ms": round(median, 1),
+        "best_wall_ms": round(min(samples), 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": median <= STARTUP_BUDGET_MS,
+        **detail,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--platform", default="offscreen")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+    result = run(args.runs, args.platform)
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+    if not result["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
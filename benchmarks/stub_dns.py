@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import contextlib
+import heapq
+import ipaddress
+import multiprocessing
+import select
+import socket
+import struct
+import threading
+import time
+from typing import List, Tuple
+
+from core.dns_wire import FLAG_QR, FLAG_RD, FLAG_TC, RECORD_TYPES, encode_name, read_name
+
+FLAG_RA = 0x0080
+RCODE_NXDOMAIN = 3
+
+
+class StubDNSServer:
+    """Local authoritative-looking DNS server for benchmarks.
+
+    Every name under ``zone`` answers with ``address``; other names return
+    NXDOMAIN. Reverse names under in-addr.arpa answer a PTR for even final
+    octets when ``reverse`` is set. ``delay`` (seconds) is injected before each UDP answer without
+    serialising queries, and names listed in ``truncate`` get a TC reply over
+    UDP so the client falls back to TCP. ``cold_delay`` is added the first
+    time a name is asked, the way a recursive resolver answers a cache miss
+    more slowly than a repeat. ``tcp_delay`` is added before each TCP answer.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        zone: str = "bench.test",
+        address: str = "192.0.2.1",
+        ttl: int = 300,
+        delay: float = 0.0,
+        truncate: Tuple[str, ...] = (),
+        reverse: bool = False,
+        cold_delay: float = 0.0,
+        tcp_delay: float = 0.0,
+    ):
+        self.zone = zone.rstrip(".").lower()
+        self.address = address
+        self.ttl = ttl
+        self.delay = delay
+        self.truncate = {name.rstrip(".").lower() for name in truncate}
+        self.reverse = reverse
+        self.cold_delay = cold_delay
+        self.tcp_delay = tcp_delay
+        self._seen: set = set()
+        self._seen_lock = threading.Lock()
+        self.queries = 0
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._udp.bind((host, 0))
+        self._udp.setblocking(False)
+        self.port = self._udp.getsockname()[1]
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind((host, self.port))
+        self._tcp.listen(64)
+        self._tcp.setblocking(False)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def server(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._udp.close()
+        self._tcp.close()
+
+    def delay_for(self, query: bytes) -> float:
+        if not self.cold_delay:
+            return self.delay
+        try:
+            name = read_name(query, 12)[0].lower()
+        except Exception:  # pylint: disable=broad-except
+            return self.delay
+        with self._seen_lock:
+            if name in self._seen:
+                return self.delay
+            self._seen.add(name)
+        return self.delay + self.cold_delay
+
+    def answer(self, query: bytes, over_tcp: bool = False) -> bytes | None:
+        if len(query) < 12:
+            return None
+        txid, flags = struct.unpack_from("!HH", query)
+        try:
+            qname, offset = read_name(query, 12)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        qtype = struct.unpack_from("!H", query, offset)[0]
+        question = query[12:offset + 4]
+        name = qname.rstrip(".").lower()
+        self.queries += 1
+
+        out_flags = FLAG_QR | FLAG_RA | (flags & FLAG_RD)
+        if name in self.truncate and not over_tcp:
+            return struct.pack("!HHHHHH", txid, out_flags | FLAG_TC, 1, 0, 0, 0) + question
+
+        answers: List[bytes] = []
+        if self.reverse and name.endswith(".in-addr.arpa"):
+            octets = name.split(".")[:4]
+            if qtype == RECORD_TYPES["PTR"] and len(octets) == 4 and int(octets[0]) % 2 == 0:
+                rdata = encode_name("host-" + "-".join(reversed(octets)) + "." + self.zone)
+                answers.append(struct.pack("!HHHIH", 0xC00C, qtype, 1, self.ttl, len(rdata)) + rdata)
+            else:
+                out_flags |= RCODE_NXDOMAIN
+        elif name == self.zone or name.endswith("." + self.zone):
+            if qtype == RECORD_TYPES["A"]:
+                rdata = ipaddress.IPv4Address(self.address).packed
+                answers.append(struct.pack("!HHHIH", 0xC00C, qtype, 1, self.ttl, len(rdata)) + rdata)
+            if name in self.truncate:
+                # Pad the TCP answer with enough TXT data to exceed a UDP datagram
+                chunk = b"x" * 200
+                rdata = (bytes((len(chunk),)) + chunk) * 10
+                answers.append(struct.pack("!HHHIH", 0xC00C, RECORD_TYPES["TXT"], 1, self.ttl, len(rdata)) + rdata)
+        else:
+            out_flags |= RCODE_NXDOMAIN
+        header = struct.pack("!HHHHHH", txid, out_flags, 1, len(answers), 0, 0)
+        return header + question + b"".join(answers)
+
+    def _serve(self):
+        scheduled: List[Tuple[float, int, bytes, tuple]] = []
+        sequence = 0
+        while not self._stop.is_set():
+            timeout = 0.05
+            if scheduled:
+                timeout = max(0.0, min(timeout, scheduled[0][0] - time.monotonic()))
+            readable, _, _ = select.select([self._udp, self._tcp], [], [], timeout)
+            if self._udp in readable:
+                while True:
+                    try:
+                        data, peer = self._udp.recvfrom(4096)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        return
+                    response = self.answer(data)
+                    if response is None:
+                        continue
+                    delay = self.delay_for(data)
+                    if delay > 0:
+                        sequence += 1
+                        heapq.heappush(scheduled, (time.monotonic() + delay, sequence, response, peer))
+                    else:
+                        self._udp.sendto(response, peer)
+            if self._tcp in readable:
+                try:
+                    conn, _ = self._tcp.accept()
+                except (BlockingIOError, InterruptedError):
+                    conn = None
+                if conn is not None:
+                    threading.Thread(target=self._serve_tcp, args=(conn,), daemon=True).start()
+            now = time.monotonic()
+            while scheduled and scheduled[0][0] <= now:
+                _, _, response, peer = heapq.heappop(scheduled)
+                try:
+                    self._udp.sendto(response, peer)
+                except OSError:
+                    pass
+
+    def _serve_tcp(self, conn: socket.socket):
+        with conn:
+            conn.settimeout(2)
+            try:
+                header = conn.recv(2)
+                if len(header) < 2:
+                    return
+                length = struct.unpack("!H", header)[0]
+                query = b""
+                while len(query) < length:
+                    chunk = conn.recv(length - len(query))
+                    if not chunk:
+                        return
+                    query += chunk
+                delay = self.delay_for(query) + self.tcp_delay
+                if delay > 0:
+                    time.sleep(delay)
+                response = self.answer(query, over_tcp=True)
+                if response:
+                    conn.sendall(struct.pack("!H", len(response)) + response)
+            except OSError:
+                pass
+
+
+
+def _serve_until_told(conn, options):
+    stub = StubDNSServer(**options)
+    stub.start()
+    conn.send(stub.server)
+    conn.recv()
+    stub.stop()
+
+
+@contextlib.contextmanager
+def stub_process(**options):
+    """Run a StubDNSServer in a child process so it does not share our GIL."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve_until_told, args=(child, options), daemon=True)
+    process.start()
+    try:
+        yield parent.recv()
+    finally:
+        parent.send("stop")
+        process.join(timeout=2)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def self_signed_context(directory: str) -> ssl.SSLContext | None:
+    """Server context with a throwaway certificate for localhost; None without the openssl binary."""
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+         "-keyout", key, "-out", cert],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+class StubHttpServer:
+    """Local HTTP/1.1 server for the probe benchmarks, optionally behind TLS.
+
+    Every GET is answered after ``delay`` seconds with ``body_size`` bytes;
+    ``/chunked`` sends the same body with chunked transfer encoding and
+    ``/close`` asks the client to drop the connection afterwards. New
+    connections are counted so keep-alive reuse can be checked.
+    """
+
+    def __init__(self, tls: bool = False, delay: float = 0.0, body_size: int = 1024):
+        self.delay = delay
+        self.body = os.urandom(body_size)
+        self.connections = 0
+        self.requests = 0
+        self._directory = tempfile.TemporaryDirectory()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this Nagle holds the body for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                if self.path == "/chunked":
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for start in range(0, len(server.body), 4096):
+                        chunk = server.body[start:start + 4096]
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+                if self.path == "/close":
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.tls = False
+        if tls:
+            context = self_signed_context(self._directory.name)
+            if context is not None:
+                self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+                self.tls = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.1}, daemon=True)
+
+    def url(self, path: str = "/") -> str:
+        return f"{'https' if self.tls else 'http'}://127.0.0.1:{self.port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._directory.cleanup()
+
+
+class RemoteStub:
+    """Parent-side handle on a StubHttpServer running in a child process."""
+
+    def __init__(self, conn, base_url: str, tls: bool, port: int):
+        self._conn = conn
+        self.base_url = base_url
+        self.tls = tls
+        self.port = port
+
+    def url(self, path: str = "/") -> str:
+        return f"{self.base_url}{path}"
+
+    @property
+    def connections(self) -> int:
+        self._conn.send("connections")
+        return self._conn.recv()
+
+
+def _serve_until_told(conn, options):
+    with StubHttpServer(**options) as stub:
+        conn.send((stub.url(""), stub.tls, stub.port))
+        while conn.recv() != "stop":
+            conn.send(stub.connections)
+
+
+@contextlib.contextmanager
+def stub_process(**options):
+    """Run a StubHttpServer in a child process so its handshakes do not share our GIL."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve_until_told, args=(child, options), daemon=True)
+    process.start()
+    try:
+        yield RemoteStub(parent, *parent.recv())
+    finally:
+        parent.send("stop")
+        process.join(timeout=2)
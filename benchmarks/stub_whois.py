@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+
+RESPONSE_TEMPLATE = """   Domain Name: {domain_upper}
+   Registry Domain ID: 0000001_DOMAIN_COM-VRSN
+   Registrar WHOIS Server: whois.example-registrar.test
+   Registrar URL: http://www.example-registrar.test
+   Updated Date: 2024-08-14T07:01:34Z
+   Creation Date: 1995-08-14T04:00:00Z
+   Registry Expiry Date: {expiry}T04:00:00Z
+   Registrar: Example Registrar, Inc.
+   Registrar IANA ID: 9999
+   Registrar Abuse Contact Email: abuse@example-registrar.test
+   Domain Status: clientDeleteProhibited https://icann.org/epp#clientDeleteProhibited
+   Domain Status: clientTransferProhibited https://icann.org/epp#clientTransferProhibited
+   Name Server: NS1.EXAMPLE.TEST
+   Name Server: NS2.EXAMPLE.TEST
+   DNSSEC: unsigned
+>>> Last update of whois database: 2024-09-01T00:00:00Z <<<
+"""
+
+
+class StubWhoisServer:
+    """Local stand-in for both IANA and a registry whois server.
+
+    A bare TLD query gets an IANA-style ``refer:`` line pointing back at this
+    server; any other query gets a registry-style record. ``delay`` seconds are
+    added to each answer and the peak number of concurrent connections is
+    tracked so per-registry limits can be checked. Binding port 43 requires
+    privileges, so an ephemeral port is used unless one is given.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.queries = 0
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(128)
+        self._sock.settimeout(0.2)
+        self.port = self._sock.getsockname()[1]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def server(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._sock.close()
+
+    def response_for(self, query: str) -> str:
+        if "." not in query:
+            return f"% IANA WHOIS server\n\ndomain:       {query.upper()}\nrefer:        {self.server}\n"
+        # Spread expiry dates so sorting by expiration is meaningful
+        expiry_year = 2025 + sum(query.encode()) % 10
+        return RESPONSE_TEMPLATE.format(domain_upper=query.upper(), expiry=f"{expiry_year}-08-13")
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket):
+        with self._lock:
+            self.active += 1
+            self.queries += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            with conn:
+                try:
+                    conn.settimeout(5)
+                    data = b""
+                    while not data.endswith(b"\r\n"):
+                        chunk = conn.recv(1024)
+                        if not chunk:
+                            return
+                        data += chunk
+                    if self.delay > 0:
+                        time.sleep(self.delay)
+                    conn.sendall(self.response_for(data.decode().strip()).encode())
+                finally:
+                    # Before the close, so a client that reconnects at once is not counted twice
+                    with self._lock:
+                        self.active -= 1
+        except OSError:
+            pass
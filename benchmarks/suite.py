@@ -0,0 +1,305 @@
+"""Run every network benchmark against local stand-ins and keep the numbers.
+
+Each scenario starts its own stand-in services (a loopback listener farm with
+open, closed and blackholed ports, the stub DNS server and the stub whois
+server), so runs are repeatable on any machine without touching the network.
+Results are written as JSON under ``benchmarks/results/`` named after the
+current commit; ``--compare`` reports what moved between two result files
+and exits non-zero when something regressed past ``--threshold`` percent.
+
+Run from the repository root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --only scan,dns
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict
+
+from benchmarks import bulk_whois, channel_throughput, dns_throughput
+from benchmarks.listener_farm import ListenerFarm
+from benchmarks.stub_whois import StubWhoisServer
+from core.dns_bench import percentile
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_THRESHOLD_PCT = 10.0
+
+# Keys ending like this get better as they grow; timings get better as they shrink
+HIGHER_IS_BETTER = ("_per_s", "qps")
+LOWER_IS_BETTER = ("_ms", "_s", "_us")
+
+
+def scenario_scan() -> dict:
+    from core import portscan  # pylint: disable=import-outside-toplevel
+
+    with ListenerFarm(open_ports=20, closed_ports=4000, blackholed_ports=10) as farm:
+        timeouts_before = portscan.TIMEOUTS.value
+        started = time.perf_counter()
+        found = portscan.scan_ports(farm.host, farm.ports)
+        elapsed = time.perf_counter() - started
+        timeouts = portscan.TIMEOUTS.value - timeouts_before
+    return {
+        "ports": len(farm.ports),
+        "elapsed_s": round(elapsed, 3),
+        "ports_per_s": round(len(farm.ports) / elapsed, 1),
+        "open_correct": sorted(item.port for item in found) == sorted(farm.open),
+        "filtered_counted": timeouts,
+        "filtered_expected": len(farm.blackholed),
+    }
+
+
+def _connect_ms(host: str, port: int, timeout: float) -> tuple:
+    import socket  # pylint: disable=import-outside-toplevel
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        started = time.perf_counter()
+        result = sock.connect_ex((host, port))
+        return result, (time.perf_counter() - started) * 1000
+
+
+def scenario_tcping(samples: int = 200, timeout: float = 0.25) -> dict:
+    with ListenerFarm(open_ports=1, closed_ports=1, blackholed_ports=1) as farm:
+        opened = [_connect_ms(farm.host, farm.open[0], timeout)[1] for _ in range(samples)]
+        refused = [_connect_ms(farm.host, farm.closed[0], timeout)[1] for _ in range(samples)]
+        filtered = [_connect_ms(farm.host, farm.blackholed[0], timeout)[1] for _ in range(5)]
+    return {
+        "open_p50_ms": round(percentile(opened, 50), 3),
+        "open_p99_ms": round(percentile(opened, 99), 3),
+        "open_jitter_ms": round(statistics.pstdev(opened), 3),
+        "refused_p50_ms": round(percentile(refused, 50), 3),
+        # How far a filtered port's wait overshoots the configured timeout
+        "timeout_overshoot_ms": round(statistics.mean(filtered) - timeout * 1000, 3),
+    }
+
+
+def scenario_ping(count: int = 20) -> dict:
+    try:
+        from core.ping import ping_host  # pylint: disable=import-outside-toplevel
+
+        replies = []
+        ping_host("127.0.0.1", replies.append, count=count, interval=0.05, timeout=1.0)
+    except Exception as exc:  # pylint: disable=broad-except
+        # ICMP needs ping3 and, on most systems, raw-socket privileges
+        return {"skipped": f"{type(exc).__name__}: {exc}"}
+    times = [reply.rtt_ms for reply in replies if reply.rtt_ms is not None]
+    return {
+        "sent": len(replies),
+        "lost": len(replies) - len(times),
+        "rtt_p50_ms": round(percentile(times, 50), 3) if times else None,
+        "rtt_p99_ms": round(percentile(times, 99), 3) if times else None,
+        "rtt_jitter_ms": round(statistics.pstdev(times), 3) if len(times) > 1 else None,
+    }
+
+
+def scenario_discover(prefix: str = "127.10.0.0/18") -> dict:
+    import ipaddress  # pylint: disable=import-outside-toplevel
+
+    from core.discovery import icmp_sweep, sweep_addresses, tcp_sweep  # pylint: disable=import-outside-toplevel
+
+    # Every loopback address answers, so the sweep measures the send/receive loop itself
+    addresses = sweep_addresses(ipaddress.ip_network(prefix))
+    result = {"addresses": len(addresses)}
+    found = []
+    started = time.perf_counter()
+    try:
+        icmp_sweep(addresses, found.append, rate=None, timeout=0.5)
+    except OSError as exc:
+        result["icmp_skipped"] = f"{type(exc).__name__}: {exc}"
+    else:
+        elapsed = time.perf_counter() - started
+        result.update(icmp_found=len(found), icmp_hosts_per_s=round(len(found) / elapsed, 1))
+    tcp_addresses = addresses[:4096]
+    found = []
+    started = time.perf_counter()
+    tcp_sweep(tcp_addresses, found.append, ports=(9,), timeout=0.5)
+    elapsed = time.perf_counter() - started
+    result.update(tcp_found=len(found), tcp_hosts_per_s=round(len(found) / elapsed, 1))
+    return result
+
+
+def scenario_dns() -> dict:
+    fast = dns_throughput.run(count=10000, window=256, delay=0.0)
+    # With 20 ms injected per answer the ceiling is window / delay queries per second
+    slow = dns_throughput.run(count=3000, window=256, delay=0.02)
+    return {
+        "qps": fast["qps"],
+        "failures": fast["failures"],
+        "delayed_qps": slow["qps"],
+        "delayed_failures": slow["failures"],
+    }
+
+
+def scenario_whois(queries: int = 50, delay: float = 0.02) -> dict:
+    from core.whois_client import query_port43  # pylint: disable=import-outside-toplevel
+
+    with StubWhoisServer(delay=delay) as stub:
+        timings = []
+        for index in range(queries):
+            started = time.perf_counter()
+            query_port43(stub.server, f"domain{index}.com")
+            timings.append((time.perf_counter() - started) * 1000)
+    bulk = bulk_whois.run(domains=200, concurrency=4, rate=200.0, delay=0.01)
+    return {
+        "query_p50_ms": round(percentile(timings, 50), 3),
+        "query_p99_ms": round(percentile(timings, 99), 3),
+        "overhead_p50_ms": round(percentile(timings, 50) - delay * 1000, 3),
+        "bulk_elapsed_s": bulk["elapsed_s"],
+        "bulk_errors": bulk["errors"],
+        "bulk_peak_concurrency": bulk["peak_concurrency"],
+    }
+
+
+def scenario_log_ingest(lines: int = 200000) -> dict:
+    from core.log_buffer import LogBuffer  # pylint: disable=import-outside-toplevel
+
+    buffer = LogBuffer()
+    started = time.perf_counter()
+    for index in range(lines):
+        buffer.append(f"Reply from 192.0.2.1: seq={index} time=12.34 ms")
+        if index % 1000 == 0:
+            buffer.take_pending()
+    ring = time.perf_counter() - started
+    result = {"lines": lines, "ring_lines_per_s": round(lines / ring, 1)}
+
+    channel = channel_throughput.run(
+        records=200000, producers=4, tick_ms=16, consumer_cost_us=0, high_watermark=20000
+    )
+    result["channel_records_per_s"] = channel["records_per_s"]
+    result.update(_gui_ingest(lines // 4))
+    return result
+
+
+def _gui_ingest(lines: int) -> dict:
+    """Lines per second through a real TerminalLog, when Qt is available."""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication  # pylint: disable=import-outside-toplevel
+
+        from widgets.terminal import TerminalLog  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        return {"gui_skipped": str(exc)}
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    log = TerminalLog()
+    log.show()
+    started = time.perf_counter()
+    for index in range(lines):
+        log.append(f"Reply from 192.0.2.1: seq={index} time=12.34 ms")
+        if index % 500 == 0:
+            app.processEvents()
+    log.flush()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    log.close()
+    return {"gui_lines_per_s": round(lines / elapsed, 1)}
+
+
+SCENARIOS: Dict[str, Callable[[], dict]] = {
+    "scan": scenario_scan,
+    "tcping": scenario_tcping,
+    "ping": scenario_ping,
+    "discover": scenario_discover,
+    "dns": scenario_dns,
+    "whois": scenario_whois,
+    "log_ingest": scenario_log_ingest,
+}
+
+
+def current_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return commit + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(names) -> dict:
+    report = {
+        "commit": current_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for name in names:
+        started = time.perf_counter()
+        try:
+            result = SCENARIOS[name]()
+        except Exception as exc:  # pylint: disable=broad-except
+            result = {"error": f"{type(exc).__name__}: {exc}"}
+        result["wall_s"] = round(time.perf_counter() - started, 3)
+        report["scenarios"][name] = result
+        print(f"{name}: {json.dumps(result)}", flush=True)
+    return report
+
+
+def direction(key: str) -> int:
+    """+1 when a larger value is better, -1 when smaller is better, 0 when neutral."""
+    if key == "wall_s":
+        return 0
+    if key.endswith(HIGHER_IS_BETTER):
+        return 1
+    if key.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(base: dict, head: dict, threshold: float) -> int:
+    """Print every numeric change; return how many regressed past ``threshold`` percent."""
+    regressions = 0
+    print(f"{base.get('commit', '?')} -> {head.get('commit', '?')}")
+    for name, results in head.get("scenarios", {}).items():
+        before = base.get("scenarios", {}).get(name, {})
+        for key, value in results.items():
+            old = before.get(key)
+            better = direction(key)
+            if not better or isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if not isinstance(old, (int, float)) or isinstance(old, bool) or not old:
+                continue
+            change = (value - old) / abs(old) * 100
+            regressed = change * better < -threshold
+            regressions += regressed
+            marker = "REGRESSION" if regressed else ""
+            print(f"  {name + '.' + key:<36} {old:>12g} -> {value:<12g} {change:+7.1f}%  {marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help=f"comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files and exit")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], "r", encoding="utf-8") as base, open(args.compare[1], "r", encoding="utf-8") as head:
+            regressions = compare(json.load(base), json.load(head), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    report = run_suite(names)
+    path = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
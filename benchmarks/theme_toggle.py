@@ -0,0 +1,83 @@
+"""Theme toggle latency on a fully built main window.
+
+Every tab is constructed first so the window holds the whole widget tree.
+Each sample is one ``apply_theme`` call followed by processing the events it
+posts, which includes the repaint. A toggle restyles only what is on screen,
+so the cost of switching to a tab that was hidden during a toggle is
+reported as well. The first toggle is reported separately because it pays
+for scaling the other theme's logo.
+
+Run from the repository root:  python -m benchmarks.theme_toggle
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from core.dns_bench import percentile
+
+
+def run(toggles: int) -> dict:
+    from PySide6.QtWidgets import QApplication  # pylint: disable=import-outside-toplevel
+
+    app_instance = QApplication.instance() or QApplication(sys.argv[:1])
+    import app  # pylint: disable=import-outside-toplevel
+
+    window = app.MainWindow()
+    for index in range(window.tabs.count()):
+        window.tabs.ensure_loaded(index)
+    window.show()
+    app_instance.processEvents()
+
+    theme = window.current_theme
+
+    def toggle() -> float:
+        nonlocal theme
+        theme = "light" if theme == "neon" else "neon"
+        started = time.perf_counter()
+        window.apply_theme(theme)
+        app_instance.processEvents()
+        return (time.perf_counter() - started) * 1000
+
+    first = toggle()
+    samples = [toggle() for _ in range(toggles)]
+
+    started = time.perf_counter()
+    window.apply_theme(theme)
+    app_instance.processEvents()
+    noop = (time.perf_counter() - started) * 1000
+
+    # Each other tab was hidden during the toggles and is restyled on show
+    switches = []
+    for index in range(1, window.tabs.count()):
+        started = time.perf_counter()
+        window.tabs.setCurrentIndex(index)
+        app_instance.processEvents()
+        switches.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "toggles": toggles,
+        "first_ms": round(first, 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "same_theme_ms": round(noop, 3),
+        "stale_tab_ms": round(statistics.median(switches), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--toggles", type=int, default=40)
+    parser.add_argument("--platform", default="offscreen")
+    args = parser.parse_args()
+    if args.platform:
+        os.environ.setdefault("QT_QPA_PLATFORM", args.platform)
+    for key, value in run(args.toggles).items():
+        print(f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main()
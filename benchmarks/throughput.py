@@ -0,0 +1,112 @@
+"""Is the throughput tool or the network the limit? Measured over loopback.
+
+Runs the bundled server and client over 127.0.0.1 for each stream count and
+direction and reports the rate plus the CPU this process spent per GiB
+moved. The server runs in a separate process (``cli.py throughput-server``)
+so the CPU figure is the client's alone. The same transfer is then repeated
+with a naive client that calls ``sendall`` on a freshly built bytes object
+and ``recv`` (a new allocation per read) in 16 KiB chunks. Loopback is far
+faster than any real link, so a tool rate well above a link's capacity, at
+a lower CPU cost per GiB than the naive loop, means the tool is not what a
+real measurement is limited by.
+
+Run from the repository root:  python -m benchmarks.throughput
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from core.throughput import (
+    DIRECTIONS,
+    HEADER,
+    HEADER_MAGIC,
+    format_bits,
+    run_test,
+)
+
+NAIVE_CHUNK = 16 << 10
+
+
+def measure_tool(port: int, direction: str, streams: int, seconds: float) -> dict:
+    cpu_started = time.process_time()
+    result = run_test("127.0.0.1", port, duration=seconds, streams=streams, direction=direction, interval=seconds)
+    cpu = time.process_time() - cpu_started
+    return {
+        "client": "tool",
+        "direction": direction,
+        "streams": streams,
+        "rate": format_bits(result.bits_per_second),
+        "cpu_s_per_gib": round(cpu / max(1e-9, result.bytes / (1 << 30)), 3),
+    }
+
+
+def measure_naive(port: int, direction: str, streams: int, seconds: float) -> dict:
+    totals = [0] * streams
+
+    def run(index: int):
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(HEADER.pack(HEADER_MAGIC, DIRECTIONS[direction], seconds))
+            deadline = time.monotonic() + seconds
+            if direction == "upload":
+                while time.monotonic() < deadline:
+                    chunk = os.urandom(16) * (NAIVE_CHUNK // 16)
+                    sock.sendall(chunk)
+                    totals[index] += len(chunk)
+                sock.shutdown(socket.SHUT_WR)
+                sock.recv(8)
+            else:
+                while True:
+                    data = sock.recv(NAIVE_CHUNK)
+                    if not data:
+                        break
+                    totals[index] += len(data)
+
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(streams)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    cpu = time.process_time() - cpu_started
+    total = sum(totals)
+    return {
+        "client": "naive",
+        "direction": direction,
+        "streams": streams,
+        "rate": format_bits(total * 8 / elapsed),
+        "cpu_s_per_gib": round(cpu / max(1e-9, total / (1 << 30)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--streams", default="1,4")
+    parser.add_argument("--port", type=int, default=15201)
+    args = parser.parse_args()
+    server = subprocess.Popen(
+        [sys.executable, "cli.py", "throughput-server", "--bind", "127.0.0.1", "--port", str(args.port)],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        print(server.stderr.readline().strip())
+        for streams in (int(value) for value in args.streams.split(",")):
+            for direction in ("upload", "download"):
+                print(measure_tool(args.port, direction, streams, args.seconds))
+                print(measure_naive(args.port, direction, streams, args.seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
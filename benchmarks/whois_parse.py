@@ -0,0 +1,56 @@
+"""Parse throughput of the native whois parser over stored registry responses.
+
+Run from the repository root:  python -m benchmarks.whois_parse
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import time
+
+from core.whois_client import WhoisQueryError, parse_record
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus", "whois")
+
+
+def load_corpus():
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def run(iterations: int) -> dict:
+    corpus = load_corpus()
+    parsed = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for name, text in corpus:
+            try:
+                parse_record(name, text)
+            except WhoisQueryError:
+                pass
+            parsed += 1
+    elapsed = time.perf_counter() - started
+    size = sum(len(text) for _, text in corpus) * iterations
+    return {
+        "responses": parsed,
+        "corpus_files": len(corpus),
+        "elapsed_s": round(elapsed, 3),
+        "responses_per_s": round(parsed / elapsed, 1),
+        "mib_per_s": round(size / elapsed / (1 << 20), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    for key, value in run(args.iterations).items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,689 @@
+"""Headless Gatchfier: run the toolkit's engines from a shell and stream NDJSON.
+
+Every result is written as one JSON object per line as soon as it is known,
+so the output can be piped into jq, a log shipper or another script. Targets
+come from the command line, from a file given with ``--input`` (``-`` reads
+stdin), or both. Nothing here imports Qt.
+
+Examples:
+    python cli.py ping example.com -c 4
+    python cli.py scan 192.0.2.10 --ports 1-1024 --bitmap today.gps
+    python cli.py scandiff yesterday.gps today.gps
+    python cli.py discover 192.168.1.0/24 --scan 1-1024
+    python cli.py throughput 192.0.2.20 -P 4 -t 10
+    python cli.py http https://example.com/ -n 50 -c 4
+    python cli.py capture --iface eth0 -f "icmp or tcp port 443" -w trace.pcap
+    python cli.py agent --bind 0.0.0.0 --token s3cret
+    python cli.py dispatch 192.0.2.0/28 --tool scan -p 1-1024 --agents box1,box2:7451 --token s3cret
+    python cli.py dns example.com example.org --type MX
+    python cli.py whois --input domains.txt
+    python cli.py monitor example.com --kind tcp --port 443 --interval 30
+    python cli.py export scan -o scans.csv.gz
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Iterable, List
+
+_output_lock = threading.Lock()
+
+
+def emit(record: dict):
+    line = json.dumps(record, default=str, separators=(",", ":"))
+    with _output_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+def read_targets(args) -> List[str]:
+    targets = list(args.targets)
+    if args.input:
+        stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+        with stream:
+            for line in stream:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    targets.append(line)
+    return list(dict.fromkeys(targets))
+
+
+def for_each(targets: Iterable[str], parallel: int, fn: Callable[[str], None], stop: threading.Event):
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        for future in [executor.submit(fn, target) for target in targets]:
+            while not stop.is_set():
+                try:
+                    future.result(timeout=0.2)
+                    break
+                except FutureTimeoutError:
+                    continue
+
+
+def resolve(host: str, use_ipv6: bool = False) -> str:
+    import socket  # pylint: disable=import-outside-toplevel
+
+    from core.resolver import get_resolver  # pylint: disable=import-outside-toplevel
+
+    family = socket.AF_INET6 if use_ipv6 else socket.AF_INET
+    return get_resolver().lookup(host, family).addresses[0]
+
+
+def cmd_ping(args, targets, stop):
+    from core.ping import ping_host, summarize  # pylint: disable=import-outside-toplevel
+
+    def run(target: str):
+        replies = []
+
+        def on_reply(reply):
+            replies.append(reply)
+            if args.store:
+                args.store.record("ping", target, seq=reply.seq, rtt_ms=reply.rtt_ms)
+            emit({"type": "reply", "tool": "ping", "target": target, "seq": reply.seq, "rtt_ms": reply.rtt_ms})
+
+        try:
+            address = resolve(target, args.ipv6)
+            ping_host(address, on_reply, count=args.count or None, use_ipv6=args.ipv6, interval=args.interval, stop=stop)
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "tool": "ping", "target": target, "error": str(exc)})
+            return
+        emit({"type": "summary", "tool": "ping", "target": target, "address": address, **summarize(replies)})
+
+    for_each(targets, args.parallel, run, stop)
+
+
+def cmd_scan(args, targets, stop):
+    from core.portscan import ALL_PORTS, parse_ports, scan_ports  # pylint: disable=import-outside-toplevel
+    from core.portset import ScanSnapshot  # pylint: disable=import-outside-toplevel
+
+    ports = parse_ports(args.ports) if args.ports else ALL_PORTS
+    snapshot = ScanSnapshot()
+    snapshot_lock = threading.Lock()
+
+    def run(target: str):
+        try:
+            address = resolve(target)
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "tool": "scan", "target": target, "error": str(exc)})
+            return
+
+        def on_open(found):
+            if args.store:
+                args.store.record("portscan", target, address=address, port=found.port, service=found.service)
+            emit({"type": "open", "tool": "scan", "target": target, "port": found.port, "service": found.service})
+
+        with snapshot_lock:
+            host = snapshot.host(target)
+        open_ports = scan_ports(
+            address, ports, on_open=on_open, stop=stop, window=args.window, timeout=args.timeout, result=host
+        )
+        counts = host.counts()
+        emit({
+            "type": "summary",
+            "tool": "scan",
+            "target": target,
+            "address": address,
+            "scanned": counts["scanned"],
+            "open": [found.port for found in open_ports],
+            "closed": counts["closed"],
+            "filtered": list(host.filtered),
+            "complete": not stop.is_set(),
+        })
+        with snapshot_lock:
+            snapshot.share(target)
+
+    for_each(targets, args.parallel, run, stop)
+    if args.bitmap:
+        snapshot.save(args.bitmap)
+
+
+def cmd_scandiff(args):
+    from core.portset import ScanSnapshot  # pylint: disable=import-outside-toplevel
+
+    changes = ScanSnapshot.load(args.old).diff(ScanSnapshot.load(args.new))
+    for target, change in changes.items():
+        emit({
+            "type": "diff",
+            "tool": "scan",
+            "target": target,
+            "opened": list(change["opened"]),
+            "closed": list(change["closed"]),
+        })
+    return 0
+
+
+def cmd_discover(args, targets, stop):
+    from core.discovery import discover, parse_network, sweep_addresses  # pylint: disable=import-outside-toplevel
+    from core.portscan import parse_ports, scan_ports  # pylint: disable=import-outside-toplevel
+    from core.portset import HostPorts  # pylint: disable=import-outside-toplevel
+
+    ports = parse_ports(args.scan) if args.scan else None
+    # Live hosts are port-scanned while the sweep is still running
+    scanner = ThreadPoolExecutor(max_workers=max(1, args.parallel)) if ports else None
+
+    def scan(address: str):
+        def on_open(found):
+            if args.store:
+                args.store.record("portscan", address, address=address, port=found.port, service=found.service)
+            emit({"type": "open", "tool": "scan", "target": address, "port": found.port, "service": found.service})
+
+        host = HostPorts()
+        open_ports = scan_ports(address, ports, on_open=on_open, stop=stop, timeout=args.timeout, result=host)
+        counts = host.counts()
+        emit({"type": "summary", "tool": "scan", "target": address, "scanned": counts["scanned"],
+              "open": [found.port for found in open_ports], "closed": counts["closed"],
+              "filtered": list(host.filtered), "complete": not stop.is_set()})
+
+    def run(target: str):
+        try:
+            network = parse_network(target)
+        except ValueError as exc:
+            emit({"type": "error", "tool": "discover", "target": target, "error": str(exc)})
+            return
+        target = str(network)
+
+        def on_host(host):
+            if args.store:
+                args.store.record("discovery", target, address=host.address, method=host.method,
+                                  rtt_ms=host.rtt_ms, mac=host.mac)
+            emit({"type": "host", "tool": "discover", "target": target, "address": host.address,
+                  "method": host.method, "rtt_ms": host.rtt_ms, "mac": host.mac or None})
+            if scanner:
+                scanner.submit(scan, host.address)
+
+        def on_status(text: str):
+            print(text, file=sys.stderr)
+
+        found = discover(network, on_host, method=args.method, rate=args.rate, timeout=args.timeout,
+                         stop=stop, on_status=on_status)
+        emit({"type": "summary", "tool": "discover", "target": target, "addresses": len(sweep_addresses(network)),
+              "live": found, "complete": not stop.is_set()})
+
+    try:
+        for_each(targets, 1, run, stop)
+    finally:
+        if scanner:
+            scanner.shutdown(wait=not stop.is_set())
+
+
+def cmd_throughput(args, targets, stop):
+    from core.throughput import run_test  # pylint: disable=import-outside-toplevel
+
+    direction = "download" if args.reverse else "upload"
+
+    def run(target: str):
+        def on_interval(report):
+            emit({"type": "interval", "tool": "throughput", "target": target, "start": round(report.start, 3),
+                  "end": round(report.end, 3), "bytes": report.bytes, "bits_per_second": round(report.bits_per_second)})
+
+        try:
+            result = run_test(resolve(target), args.port, duration=args.time, streams=args.streams,
+                              direction=direction, interval=args.interval, on_interval=on_interval, stop=stop)
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "tool": "throughput", "target": target, "error": str(exc)})
+            return
+        if args.store:
+            args.store.record("throughput", target, direction=direction, streams=result.streams,
+                              seconds=result.seconds, bytes=result.bytes, bits_per_second=result.bits_per_second)
+        emit({"type": "summary", "tool": "throughput", "target": target, "direction": direction,
+              "streams": result.streams, "seconds": round(result.seconds, 3), "bytes": result.bytes,
+              "server_bytes": result.server_bytes, "bits_per_second": round(result.bits_per_second),
+              "errors": result.errors})
+
+    # Tests against several servers would compete for the same uplink, so run them in turn
+    for_each(targets, 1, run, stop)
+
+
+def cmd_throughput_server(args):
+    from core.throughput import ThroughputServer  # pylint: disable=import-outside-toplevel
+
+    server = ThroughputServer(args.bind, args.port).start()
+    print(f"Throughput server listening on {args.bind}:{server.port}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        server.stop()
+    return 0
+
+
+def cmd_http(args, targets, stop):
+    from core.http_probe import PHASES, probe_many  # pylint: disable=import-outside-toplevel
+
+    def run(target: str):
+        def on_result(timing):
+            if args.store:
+                args.store.record("http", target, url=timing.url, status=timing.status, reused=int(timing.reused),
+                                  bytes=timing.bytes, error=timing.error,
+                                  **{phase: round(getattr(timing, phase), 3) for phase in PHASES})
+            record = {"type": "request", "tool": "http", "target": target, "url": timing.url}
+            if timing.error:
+                record["error"] = timing.error
+            else:
+                record.update(status=timing.status, bytes=timing.bytes, reused=timing.reused,
+                              address=timing.address, tls=timing.tls_version, tls_resumed=timing.tls_resumed)
+            record.update({phase: round(getattr(timing, phase), 3) for phase in PHASES})
+            emit(record)
+
+        try:
+            stats = probe_many(target, args.count, args.concurrency, keep_alive=not args.no_keepalive,
+                               method=args.method, timeout=args.timeout, verify=not args.insecure,
+                               on_result=on_result, stop=stop)
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "tool": "http", "target": target, "error": str(exc)})
+            return
+        for row in stats.summary():
+            emit({"type": "summary", "tool": "http", "target": target, "url": stats.url, **row})
+        if stats.failures:
+            emit({"type": "summary", "tool": "http", "target": target, "url": stats.url, "failures": stats.failures})
+
+    for_each(targets, args.parallel, run, stop)
+
+
+def cmd_capture(args):
+    from core.capture import CaptureSession, capture, summarize  # pylint: disable=import-outside-toplevel
+
+    stop = threading.Event()
+    session = CaptureSession(args.ring, args.write)
+    errors: List[str] = []
+
+    def run():
+        try:
+            capture(session, args.iface, args.filter, stop=stop, limit=args.count,
+                    on_status=lambda text: print(text, file=sys.stderr))
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(str(exc) or type(exc).__name__)
+            stop.set()
+
+    def emit_new(next_seq: int) -> int:
+        """Summarise frames captured since ``next_seq``; ones the ring already overwrote are counted, not shown."""
+        ring = session.ring
+        end = ring.written
+        if next_seq < ring.first:
+            emit({"type": "skipped", "tool": "capture", "packets": ring.first - next_seq})
+            next_seq = ring.first
+        for seq in range(next_seq, end):
+            entry = ring.get(seq)
+            if entry is None:
+                continue
+            timestamp, frame, wire_length = entry
+            summary = summarize(frame, session.linktype)
+            emit({"type": "packet", "tool": "capture", "no": seq + 1, "ts": round(timestamp, 6), "length": wire_length,
+                  "source": summary.source, "destination": summary.destination, "protocol": summary.protocol,
+                  "info": summary.info})
+        return end
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    next_seq = 0
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+            if not args.quiet:
+                next_seq = emit_new(next_seq)
+    except KeyboardInterrupt:
+        stop.set()
+        worker.join(5)
+    if not args.quiet:
+        emit_new(next_seq)
+    if errors:
+        emit({"type": "error", "tool": "capture", "error": errors[0]})
+        return 1
+    emit({"type": "summary", "tool": "capture", "packets": session.packets, "bytes": session.bytes,
+          "kernel_drops": session.kernel_drops, "pcap": args.write})
+    return 0
+
+
+def cmd_agent(args):
+    from core.agent import AgentServer  # pylint: disable=import-outside-toplevel
+
+    try:
+        server = AgentServer(args.bind, args.port, args.token, args.name).start()
+    except (OSError, ValueError) as exc:
+        print(f"Cannot start agent: {exc}", file=sys.stderr)
+        return 2
+    print(f"Agent {server.name} listening on {args.bind}:{server.port}", file=sys.stderr, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        server.stop()
+    return 0
+
+
+def cmd_dispatch(args, targets, stop):
+    # pylint: disable=import-outside-toplevel
+    from core.agent import AgentPool, dispatch
+    from core.discovery import parse_network, sweep_addresses
+
+    hosts = []
+    for target in targets:
+        if "/" not in target:
+            hosts.append(target)
+            continue
+        try:
+            hosts.extend(sweep_addresses(parse_network(target)))
+        except ValueError as exc:
+            emit({"type": "error", "tool": "dispatch", "target": target, "error": str(exc)})
+    pool, errors = AgentPool.connect(args.agents.split(","), args.token, args.window)
+    for error in errors:
+        emit({"type": "error", "tool": "dispatch", "error": error})
+    if not pool.agents:
+        return
+    params = {"ports": args.ports, "count": args.count or None, "interval": args.interval, "ipv6": args.ipv6}
+    # Open ports are stored once the target's summary brings its resolved address
+    found: Dict[str, list] = {}
+
+    def on_event(record: dict):
+        if args.store:
+            if record["type"] == "open":
+                found.setdefault(record["target"], []).append(record)
+            elif record["type"] == "summary" and record["tool"] == "scan":
+                for item in found.pop(record["target"], []):
+                    args.store.record("portscan", item["target"], address=record.get("address"), port=item["port"],
+                                      service=item["service"])
+            elif record["type"] == "reply":
+                args.store.record("ping", record["target"], seq=record["seq"], rtt_ms=record["rtt_ms"])
+            elif record["type"] == "hop":
+                args.store.record("traceroute", record["target"], hop=record["hop"], line=record["text"])
+        emit(record)
+
+    try:
+        elapsed = dispatch(pool, args.tool, hosts, params, on_event, stop=stop, chunk=args.chunk)
+    finally:
+        pool.close()
+    emit({
+        "type": "summary",
+        "tool": "dispatch",
+        "targets": len(hosts),
+        "seconds": round(elapsed, 3),
+        "units": {agent.label: agent.completed for agent in pool.agents},
+    })
+
+
+def cmd_trace(args, targets, stop):
+    from core.traceroute import Traceroute  # pylint: disable=import-outside-toplevel
+
+    def run(target: str):
+        try:
+            address = resolve(target, args.ipv6)
+            trace = Traceroute(address, args.ipv6, args.max_hops, args.wait)
+
+            def on_line(line):
+                if args.store:
+                    args.store.record("traceroute", target, hop=line.hop, line=line.text)
+                emit({"type": "hop", "tool": "trace", "target": target, "hop": line.hop, "text": line.text})
+
+            success = trace.run(on_line, stop=stop)
+        except Exception as exc:  # pylint: disable=broad-except
+            emit({"type": "error", "tool": "trace", "target": target, "error": str(exc)})
+            return
+        emit({"type": "summary", "tool": "trace", "target": target, "address": address, "complete": success})
+
+    for_each(targets, args.parallel, run, stop)
+
+
+def cmd_dns(args, targets, stop):
+    from dataclasses import asdict  # pylint: disable=import-outside-toplevel
+
+    from core.dns_lookup import lookup  # pylint: disable=import-outside-toplevel
+    from core.results import save_dns  # pylint: disable=import-outside-toplevel
+
+    def run(target: str):
+        result = lookup(target, args.type, args.server)
+        if args.store:
+            save_dns(args.store, result)
+        emit({"type": "dns", "tool": "dns", **asdict(result)})
+
+    for_each(targets, args.parallel, run, stop)
+
+
+def cmd_whois(args, targets, stop):
+    from core.results import save_whois  # pylint: disable=import-outside-toplevel
+    from core.whois_bulk import BulkWhoisRunner, RegistryLimiter  # pylint: disable=import-outside-toplevel
+    from core.whois_cache import get_whois_cache  # pylint: disable=import-outside-toplevel
+    from core.whois_client import ReferralCache  # pylint: disable=import-outside-toplevel
+
+    def on_result(result):
+        if args.store and not result.cached:
+            save_whois(args.store, result.domain, result.server, result.record, result.error)
+        record = {"type": "whois", "tool": "whois", "domain": result.domain, "server": result.server}
+        if result.error:
+            record["error"] = result.error
+        else:
+            record.update(cached=result.cached, record=result.record)
+        emit(record)
+
+    runner = BulkWhoisRunner(
+        ReferralCache(),
+        RegistryLimiter(args.concurrency, args.rate / 60.0),
+        cache=None if args.no_cache else get_whois_cache(),
+    )
+    runner.run(targets, on_result, stop=stop, refresh=args.refresh)
+
+
+def cmd_monitor(args, targets, stop):
+    from dataclasses import asdict  # pylint: disable=import-outside-toplevel
+
+    from core.monitors import Check, MonitorScheduler  # pylint: disable=import-outside-toplevel
+
+    def on_result(check, result):
+        emit({"type": "check", "tool": "monitor", "check": check.label(), "status": check.status, **asdict(result)})
+
+    def on_alert(alert):
+        emit({"type": "alert", "tool": "monitor", **asdict(alert)})
+
+    scheduler = MonitorScheduler(on_result, on_alert, store=args.store)
+    for target in targets:
+        scheduler.add(Check(
+            args.kind,
+            target,
+            interval=args.interval,
+            port=args.port if args.kind == "tcp" else None,
+            rtype=args.type,
+            max_latency_ms=args.max_latency,
+            min_expiry_days=args.min_expiry_days,
+            fail_after=args.fail_after,
+        ))
+    scheduler.start()
+    stop.wait()
+    scheduler.stop()
+
+
+def cmd_export(args):
+    import time  # pylint: disable=import-outside-toplevel
+
+    from core.export import export_results  # pylint: disable=import-outside-toplevel
+    from core.results import get_results_store  # pylint: disable=import-outside-toplevel
+
+    since = time.time() - args.days * 86400 if args.days else None
+    stop = threading.Event()
+    store = get_results_store()
+    try:
+        rows = export_results(
+            store, EXPORT_TABLES[args.tool], args.output, args.format, args.target, since, stop=stop
+        )
+    except KeyboardInterrupt:
+        stop.set()
+        return 130
+    finally:
+        store.close()
+    print(f"Exported {rows} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+EXPORT_TABLES = {
+    "ping": "ping",
+    "scan": "portscan",
+    "trace": "traceroute",
+    "dns": "dns",
+    "whois": "whois",
+    "monitor": "monitor",
+    "discover": "discovery",
+    "throughput": "throughput",
+    "http": "http",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gatchfier", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus-style /metrics on this localhost port")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, help_text: str, handler) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("targets", nargs="*", help="hosts or names; combine with --input for batches")
+        command.add_argument("-i", "--input", help="file with one target per line, '-' for stdin")
+        command.add_argument("--parallel", type=int, default=8, help="targets processed at once")
+        command.add_argument("--save", action="store_true", help="also record results in the local results store")
+        command.set_defaults(handler=handler)
+        return command
+
+    ping = add_command("ping", "ICMP echo", cmd_ping)
+    ping.add_argument("-c", "--count", type=int, default=4, help="requests per target, 0 for continuous")
+    ping.add_argument("--interval", type=float, default=1.0)
+    ping.add_argument("-6", "--ipv6", action="store_true")
+
+    scan = add_command("scan", "TCP connect port scan", cmd_scan)
+    scan.add_argument("-p", "--ports", help="ports and ranges, e.g. 22,80,8000-8100 (default: all)")
+    scan.add_argument("--window", type=int, default=100, help="connects in flight per target")
+    scan.add_argument("--timeout", type=float, default=0.3, help="connect timeout in seconds")
+    scan.add_argument("--bitmap", help="save every target's port states to this snapshot file")
+
+    scandiff = commands.add_parser("scandiff", help="ports opened or closed between two --bitmap snapshots")
+    scandiff.add_argument("old")
+    scandiff.add_argument("new")
+    scandiff.set_defaults(direct=cmd_scandiff)
+
+    discover_cmd = add_command("discover", "find live hosts in CIDR networks (ARP, ICMP, TCP ping)", cmd_discover)
+    discover_cmd.add_argument("-m", "--method", choices=["auto", "arp", "icmp", "tcp"], default="auto")
+    discover_cmd.add_argument("--rate", type=float, default=2000, help="probes per second")
+    discover_cmd.add_argument("--timeout", type=float, default=1.0, help="seconds to wait for late replies")
+    discover_cmd.add_argument("--scan", metavar="PORTS", help="port-scan each live host as it replies, e.g. 1-1024")
+
+    throughput = add_command("throughput", "TCP throughput test against a throughput-server", cmd_throughput)
+    throughput.add_argument("--port", type=int, default=5201)
+    throughput.add_argument("-P", "--streams", type=int, default=1, help="parallel connections")
+    throughput.add_argument("-t", "--time", type=float, default=10, help="test length in seconds")
+    throughput.add_argument("--interval", type=float, default=1, help="seconds between interval reports")
+    throughput.add_argument("-R", "--reverse", action="store_true", help="server sends, this side receives")
+
+    server = commands.add_parser("throughput-server", help="serve throughput tests until interrupted")
+    server.add_argument("--bind", default="0.0.0.0")
+    server.add_argument("--port", type=int, default=5201)
+    server.set_defaults(direct=cmd_throughput_server)
+
+    http = add_command("http", "HTTP(S) request timing: DNS, connect, TLS, first byte, transfer", cmd_http)
+    http.add_argument("-n", "--count", type=int, default=10, help="requests per URL")
+    http.add_argument("-c", "--concurrency", type=int, default=1, help="requests in flight per URL")
+    http.add_argument("-X", "--method", choices=["GET", "HEAD"], default="GET")
+    http.add_argument("--timeout", type=float, default=10, help="seconds per request phase")
+    http.add_argument("--no-keepalive", action="store_true", help="open a new connection for every request")
+    http.add_argument("-k", "--insecure", action="store_true", help="do not verify TLS certificates")
+
+    capture_cmd = commands.add_parser("capture", help="capture packets with a BPF filter, until interrupted")
+    capture_cmd.add_argument("--iface", help="interface to capture on (default: scapy's default interface)")
+    capture_cmd.add_argument("-f", "--filter", help="BPF filter, e.g. 'icmp or tcp port 443'")
+    capture_cmd.add_argument("-w", "--write", help="stream every captured frame to this pcap file")
+    capture_cmd.add_argument("-c", "--count", type=int, default=0, help="stop after this many packets")
+    capture_cmd.add_argument("--ring", type=int, default=100_000, help="frames kept in memory for summaries")
+    capture_cmd.add_argument("-q", "--quiet", action="store_true", help="only print the final summary")
+    capture_cmd.set_defaults(direct=cmd_capture)
+
+    agent = commands.add_parser("agent", help="run ping, scan and trace jobs for a dispatching controller")
+    agent.add_argument("--bind", default="127.0.0.1", help="address to listen on; non-loopback needs --token")
+    agent.add_argument("--port", type=int, default=7450)
+    agent.add_argument("--token", default="", help="shared secret controllers must present")
+    agent.add_argument("--name", help="label shown in results (default: hostname:port)")
+    agent.set_defaults(direct=cmd_agent)
+
+    dispatch_cmd = add_command("dispatch", "fan ping, scan or trace jobs out to remote agents", cmd_dispatch)
+    dispatch_cmd.add_argument("--agents", required=True, help="comma-separated host[:port] list (default port 7450)")
+    dispatch_cmd.add_argument("--token", default="")
+    dispatch_cmd.add_argument("--tool", choices=["ping", "scan", "trace"], default="scan")
+    dispatch_cmd.add_argument("-p", "--ports", default="1-65535", help="ports for scans")
+    dispatch_cmd.add_argument("--chunk", type=int, default=4096, help="ports per scan work unit")
+    dispatch_cmd.add_argument("--window", type=int, default=2, help="work units in flight per agent")
+    dispatch_cmd.add_argument("-c", "--count", type=int, default=4, help="echo requests per ping target")
+    dispatch_cmd.add_argument("--interval", type=float, default=1.0)
+    dispatch_cmd.add_argument("-6", "--ipv6", action="store_true")
+
+    trace = add_command("trace", "traceroute via the system command", cmd_trace)
+    trace.add_argument("-m", "--max-hops", type=int, default=30)
+    trace.add_argument("-w", "--wait", type=int, default=4, help="seconds to wait per hop")
+    trace.add_argument("-6", "--ipv6", action="store_true")
+
+    dns = add_command("dns", "DNS record lookup", cmd_dns)
+    dns.add_argument("-t", "--type", default="A")
+    dns.add_argument("-s", "--server", help="nameserver as host[:port] (default: system resolver)")
+
+    whois = add_command("whois", "Whois over port 43 with per-registry limits", cmd_whois)
+    whois.add_argument("--concurrency", type=int, default=2, help="queries at once per registry")
+    whois.add_argument("--rate", type=float, default=30, help="queries per minute per registry")
+    whois.add_argument("--refresh", action="store_true", help="ignore cached records")
+    whois.add_argument("--no-cache", action="store_true", help="neither read nor write the whois cache")
+
+    monitor = add_command("monitor", "recurring checks with threshold alerts, until interrupted", cmd_monitor)
+    monitor.add_argument("-k", "--kind", choices=["icmp", "tcp", "dns", "whois"], default="icmp")
+    monitor.add_argument("-p", "--port", type=int, default=443, help="port for tcp checks")
+    monitor.add_argument("-t", "--type", default="A", help="record type for dns checks")
+    monitor.add_argument("--interval", type=float, default=60, help="seconds between checks of one target")
+    monitor.add_argument("--max-latency", type=float, help="alert when latency exceeds this many ms")
+    monitor.add_argument("--min-expiry-days", type=float, help="alert when a whois expiry is closer than this")
+    monitor.add_argument("--fail-after", type=int, default=1, help="consecutive failures before alerting")
+
+    export = commands.add_parser("export", help="stream saved results to CSV or NDJSON (.gz compresses)")
+    export.add_argument("tool", choices=sorted(EXPORT_TABLES))
+    export.add_argument("-o", "--output", required=True, help="file to write, e.g. pings.csv or scans.ndjson.gz")
+    export.add_argument("-f", "--format", choices=["csv", "ndjson"], help="default: from the file name")
+    export.add_argument("--target", help="only rows for this target")
+    export.add_argument("--days", type=float, help="only rows from the last N days")
+    export.set_defaults(direct=cmd_export)
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.metrics_port:
+        from core.metrics import start_metrics_server  # pylint: disable=import-outside-toplevel
+
+        start_metrics_server(args.metrics_port)
+    if getattr(args, "direct", None):
+        return args.direct(args)
+    targets = read_targets(args)
+    if not targets:
+        print("No targets given.", file=sys.stderr)
+        return 2
+    args.store = None
+    if args.save:
+        from core.results import get_results_store  # pylint: disable=import-outside-toplevel
+
+        args.store = get_results_store()
+    stop = threading.Event()
+    worker = threading.Thread(target=args.handler, args=(args, targets, stop), daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+    except KeyboardInterrupt:
+        stop.set()
+        worker.join(5)
+        return 130
+    finally:
+        if args.store:
+            args.store.close()
+        from core.whois_cache import close_whois_cache  # pylint: disable=import-outside-toplevel
+
+        close_whois_cache()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,628 @@
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import itertools
+import json
+import os
+import platform
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from core.metrics import get_metrics
+from core.ping import PING_INTERVAL, ping_host, summarize
+from core.portscan import CONNECT_TIMEOUT, SCAN_WINDOW, parse_ports, scan_ports
+from core.portset import HostPorts, PortSet
+from core.resolver import get_resolver
+from core.traceroute import Traceroute
+
+PROTOCOL_VERSION = 1
+DEFAULT_AGENT_PORT = 7450
+TOOLS = ("ping", "scan", "trace")
+
+# Every frame: payload length, frame type, then a compact JSON object
+FRAME = struct.Struct("!IB")
+MAX_FRAME = 16 << 20
+FRAME_HELLO = 1
+FRAME_WELCOME = 2
+FRAME_JOB = 3
+FRAME_CANCEL = 4
+FRAME_RESULTS = 5
+FRAME_DONE = 6
+
+# Results are sent in batches of up to RESULT_BATCH items, at least every FLUSH_INTERVAL seconds
+RESULT_BATCH = 512
+FLUSH_INTERVAL = 0.05
+HANDSHAKE_TIMEOUT = 5.0
+# Work units each agent is given at once; more keep its engines busy between round trips
+DEFAULT_WINDOW = 2
+SCAN_CHUNK = 4096
+
+_metrics = get_metrics()
+AGENT_FRAMES_SENT = _metrics.counter("gatchfier_agent_frames_sent_total", "Agent protocol frames sent")
+AGENT_FRAMES_RECEIVED = _metrics.counter("gatchfier_agent_frames_received_total", "Agent protocol frames received")
+AGENT_UNITS = _metrics.counter("gatchfier_agent_units_total", "Work units completed by remote agents")
+AGENT_RETRIES = _metrics.counter("gatchfier_agent_retries_total", "Work units requeued after an agent failed")
+
+
+class AgentError(Exception):
+    pass
+
+
+def _encode(kind: int, payload: dict) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return FRAME.pack(len(body), kind) + body
+
+
+def send_frame(sock: socket.socket, kind: int, payload: dict, lock: threading.Lock | None = None):
+    data = _encode(kind, payload)
+    if lock is None:
+        sock.sendall(data)
+    else:
+        with lock:
+            sock.sendall(data)
+    AGENT_FRAMES_SENT.inc()
+
+
+def read_frame(reader) -> Tuple[int, dict] | None:
+    """Next ``(type, payload)`` from a buffered socket reader; None when the peer closed."""
+    header = reader.read(FRAME.size)
+    if not header:
+        return None
+    if len(header) < FRAME.size:
+        raise AgentError("Connection closed mid-frame")
+    length, kind = FRAME.unpack(header)
+    if length > MAX_FRAME:
+        raise AgentError(f"Frame of {length} bytes exceeds the limit")
+    body = reader.read(length)
+    if len(body) < length:
+        raise AgentError("Connection closed mid-frame")
+    AGENT_FRAMES_RECEIVED.inc()
+    return kind, json.loads(body)
+
+
+def parse_agent(spec: str) -> Tuple[str, int]:
+    """``host[:port]`` (``[v6]:port`` for IPv6) into an address tuple."""
+    spec = spec.strip()
+    if spec.startswith("["):
+        host, _, rest = spec[1:].partition("]")
+        port = rest.lstrip(":")
+    elif spec.count(":") == 1:
+        host, port = spec.split(":")
+    else:
+        host, port = spec, ""
+    if not host:
+        raise ValueError(f"No host in agent address: {spec}")
+    return host, int(port) if port else DEFAULT_AGENT_PORT
+
+
+class _Outbox:
+    """Per-connection result batching, flushed by size or by a timer.
+
+    Engines call :meth:`add` from their own threads; a scan that finds a
+    thousand open ports sends a handful of frames instead of a thousand.
+    Batches are sent while the lock is held, so once :meth:`flush` returns
+    for a job every item added before it is on the wire and a DONE frame
+    sent afterwards cannot overtake them.
+    """
+
+    def __init__(self, sock: socket.socket, lock: threading.Lock):
+        self._sock = sock
+        self._send_lock = lock
+        self._pending: Dict[int, List] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: int, item):
+        with self._lock:
+            items = self._pending.setdefault(job, [])
+            items.append(item)
+            if len(items) < RESULT_BATCH:
+                return
+            del self._pending[job]
+            send_frame(self._sock, FRAME_RESULTS, {"job": job, "items": items}, self._send_lock)
+
+    def flush(self, job: int | None = None):
+        with self._lock:
+            if job is None:
+                batches, self._pending = self._pending, {}
+            else:
+                batches = {job: self._pending.pop(job)} if job in self._pending else {}
+            for key, items in batches.items():
+                send_frame(self._sock, FRAME_RESULTS, {"job": key, "items": items}, self._send_lock)
+
+
+def run_job(tool: str, params: dict, emit: Callable, stop: threading.Event) -> dict:
+    """Run one unit of work with the local engines; ``emit`` receives compact result items.
+
+    Items are lists rather than objects to keep frames small: ``[seq, rtt_ms]``
+    for ping, ``[port, service]`` for each open port, ``[hop, text]`` for
+    traceroute lines. The returned dict is the unit's summary.
+    """
+    if tool not in TOOLS:
+        raise AgentError(f"Unknown tool: {tool}")
+    target = params["target"]
+    address = get_resolver().resolve_one(target, socket.AF_INET6 if params.get("ipv6") else socket.AF_INET)
+    if tool == "ping":
+        replies = []
+
+        def on_reply(reply):
+            replies.append(reply)
+            emit([reply.seq, reply.rtt_ms])
+
+        ping_host(address, on_reply, count=params.get("count", 4), use_ipv6=params.get("ipv6", False),
+                  interval=params.get("interval", PING_INTERVAL), stop=stop)
+        return {"address": address, **summarize(replies)}
+    if tool == "scan":
+        host = HostPorts()
+        open_ports = scan_ports(
+            address,
+            parse_ports(params["ports"]),
+            on_open=lambda found: emit([found.port, found.service]),
+            stop=stop,
+            window=params.get("window", SCAN_WINDOW),
+            timeout=params.get("timeout", CONNECT_TIMEOUT),
+            result=host,
+        )
+        counts = host.counts()
+        return {"address": address, "scanned": counts["scanned"], "open": [found.port for found in open_ports],
+                "closed": counts["closed"], "filtered": list(host.filtered), "complete": not stop.is_set()}
+    trace = Traceroute(address, params.get("ipv6", False), params.get("max_hops", 30), params.get("wait", 4))
+    # Cancelling must also end a traceroute that is waiting on a silent hop
+    threading.Thread(target=lambda: stop.wait() and trace.stop(), daemon=True).start()
+    complete = trace.run(lambda line: emit([line.hop, line.text]), stop=stop)
+    stop.set()
+    return {"address": address, "complete": complete}
+
+
+class AgentServer:
+    """Headless worker that runs jobs for controllers connecting over TCP.
+
+    A controller opens a connection, proves it knows the shared token, then
+    sends JOB frames; each job runs on its own thread with the normal
+    engines (and this process's job manager and socket budget), streams
+    RESULTS frames and ends with one DONE frame. CANCEL stops a job, and a
+    dropped connection stops all of that connection's jobs. Without a token
+    the agent only accepts being bound to a loopback address.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT, token: str = "", name: str | None = None):
+        if not token and not ipaddress.ip_address(socket.gethostbyname(host)).is_loopback:
+            raise ValueError("An agent reachable from other machines needs a --token")
+        self.token = token
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(16)
+        self._sock.settimeout(0.2)
+        self.host = host
+        self.port = self._sock.getsockname()[1]
+        self.name = name or f"{platform.node() or 'agent'}:{self.port}"
+        self.jobs_run = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="agent-server", daemon=True)
+
+    def start(self) -> "AgentServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handshake(self, conn: socket.socket, reader) -> bool:
+        conn.settimeout(HANDSHAKE_TIMEOUT)
+        frame = read_frame(reader)
+        if frame is None or frame[0] != FRAME_HELLO:
+            return False
+        hello = frame[1]
+        if hello.get("version") != PROTOCOL_VERSION:
+            send_frame(conn, FRAME_WELCOME, {"error": f"Protocol version {PROTOCOL_VERSION} required"})
+            return False
+        if not hmac.compare_digest(str(hello.get("token", "")).encode(), self.token.encode()):
+            send_frame(conn, FRAME_WELCOME, {"error": "Invalid token"})
+            return False
+        send_frame(conn, FRAME_WELCOME, {"version": PROTOCOL_VERSION, "name": self.name, "tools": list(TOOLS),
+                                         "cpus": os.cpu_count() or 1})
+        conn.settimeout(None)
+        return True
+
+    def _handle(self, conn: socket.socket):
+        send_lock = threading.Lock()
+        jobs: Dict[int, threading.Event] = {}
+        closed = threading.Event()
+        with conn, conn.makefile("rb") as reader:
+            try:
+                if not self._handshake(conn, reader):
+                    return
+            except (OSError, AgentError, ValueError):
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            outbox = _Outbox(conn, send_lock)
+
+            def flusher():
+                while not closed.wait(FLUSH_INTERVAL):
+                    try:
+                        outbox.flush()
+                    except OSError:
+                        return
+
+            def run(job_id: int, tool: str, params: dict, stop: threading.Event):
+                summary, error = None, None
+                try:
+                    summary = run_job(tool, params, lambda item: outbox.add(job_id, item), stop)
+                except Exception as exc:  # pylint: disable=broad-except
+                    error = str(exc) or type(exc).__name__
+                self.jobs_run += 1
+                jobs.pop(job_id, None)
+                try:
+                    outbox.flush(job_id)
+                    send_frame(conn, FRAME_DONE, {"job": job_id, "summary": summary, "error": error}, send_lock)
+                except OSError:
+                    pass
+
+            threading.Thread(target=flusher, daemon=True).start()
+            try:
+                while not self._stop.is_set():
+                    frame = read_frame(reader)
+                    if frame is None:
+                        break
+                    kind, payload = frame
+                    if kind == FRAME_JOB:
+                        stop = jobs[payload["job"]] = threading.Event()
+                        threading.Thread(
+                            target=run, args=(payload["job"], payload["tool"], payload.get("params", {}), stop), daemon=True
+                        ).start()
+                    elif kind == FRAME_CANCEL and payload.get("job") in jobs:
+                        jobs[payload["job"]].set()
+            except (OSError, AgentError, ValueError):
+                pass
+            except (KeyError, TypeError):
+                # A malformed frame ends the session like any other protocol error
+                pass
+            finally:
+                closed.set()
+                for stop in list(jobs.values()):
+                    stop.set()
+
+
+@dataclass
+class WorkUnit:
+    """One job for one agent: a tool, its target and parameters."""
+
+    tool: str
+    target: str
+    params: dict = field(default_factory=dict)
+    attempts: int = 0
+
+
+class AgentConnection:
+    """Controller end of one agent link.
+
+    ``submit`` sends a JOB frame and returns immediately; a reader thread
+    delivers RESULTS and DONE frames to the unit's callbacks. If the link
+    drops, every unfinished unit is completed with an error so the caller
+    can hand it to another agent.
+    """
+
+    def __init__(self, host: str, port: int = DEFAULT_AGENT_PORT, token: str = ""):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.name = f"{host}:{port}"
+        self.label = self.name
+        self.cpus = 1
+        self.alive = False
+        self.error: str | None = None
+        self.completed = 0
+        self._sock: socket.socket | None = None
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Tuple[Callable, Callable]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def connect(self) -> "AgentConnection":
+        sock = socket.create_connection((self.host, self.port), timeout=HANDSHAKE_TIMEOUT)
+        reader = sock.makefile("rb")
+        try:
+            send_frame(sock, FRAME_HELLO, {"version": PROTOCOL_VERSION, "token": self.token})
+            frame = read_frame(reader)
+            if frame is None or frame[0] != FRAME_WELCOME:
+                raise AgentError("Agent closed the connection during the handshake")
+            welcome = frame[1]
+            if welcome.get("error"):
+                raise AgentError(welcome["error"])
+        except BaseException:
+            reader.close()
+            sock.close()
+            raise
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.label = welcome.get("name", self.name)
+        self.cpus = welcome.get("cpus", 1)
+        self._sock = sock
+        self.alive = True
+        self.error = None
+        threading.Thread(target=self._read, args=(reader,), name=f"agent-{self.name}", daemon=True).start()
+        return self
+
+    def submit(self, tool: str, params: dict, on_items: Callable[[list], None],
+               on_done: Callable[[dict | None, str | None], None]) -> int:
+        job_id = next(self._ids)
+        with self._lock:
+            if not self.alive:
+                raise AgentError(self.error or "Agent is not connected")
+            self._pending[job_id] = (on_items, on_done)
+        try:
+            send_frame(self._sock, FRAME_JOB, {"job": job_id, "tool": tool, "params": params}, self._send_lock)
+        except OSError as exc:
+            self._fail(str(exc))
+        return job_id
+
+    def cancel(self, job_id: int):
+        if self.alive:
+            try:
+                send_frame(self._sock, FRAME_CANCEL, {"job": job_id}, self._send_lock)
+            except OSError:
+                pass
+
+    def cancel_all(self):
+        for job_id in list(self._pending):
+            self.cancel(job_id)
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+
+    def _read(self, reader):
+        error = "Agent closed the connection"
+        try:
+            with reader:
+                while True:
+                    frame = read_frame(reader)
+                    if frame is None:
+                        break
+                    kind, payload = frame
+                    callbacks = self._pending.get(payload.get("job"))
+                    if callbacks is None:
+                        continue
+                    if kind == FRAME_RESULTS:
+                        callbacks[0](payload["items"])
+                    elif kind == FRAME_DONE:
+                        with self._lock:
+                            self._pending.pop(payload["job"], None)
+                        self.completed += 1
+                        AGENT_UNITS.inc()
+                        callbacks[1](payload.get("summary"), payload.get("error"))
+        except (OSError, AgentError, ValueError) as exc:
+            error = str(exc) or type(exc).__name__
+        self._fail(error)
+
+    def _fail(self, error: str):
+        with self._lock:
+            if not self.alive:
+                return
+            self.alive = False
+            self.error = error
+            pending, self._pending = self._pending, {}
+        for _, on_done in pending.values():
+            on_done(None, f"Agent lost: {error}")
+
+
+class AgentPool:
+    """Fans work units out over several agents and merges what comes back.
+
+    Scheduling is pull-based: each agent holds at most ``window`` units and
+    gets the next one as soon as one finishes, so faster or less loaded
+    agents take a larger share of a sweep. A unit whose agent drops is put
+    back on the queue once for the remaining agents.
+    """
+
+    def __init__(self, agents: Sequence[AgentConnection], window: int = DEFAULT_WINDOW):
+        self.agents = list(agents)
+        self.window = max(1, window)
+
+    @classmethod
+    def connect(cls, specs: Sequence[str], token: str = "", window: int = DEFAULT_WINDOW) -> Tuple["AgentPool", List[str]]:
+        """Connect to every ``host:port``; returns the pool of those that answered and the errors of the rest."""
+        agents, errors = [], []
+        for spec in specs:
+            try:
+                host, port = parse_agent(spec)
+                agents.append(AgentConnection(host, port, token).connect())
+            except (OSError, AgentError, ValueError) as exc:
+                errors.append(f"{spec}: {exc}")
+        return cls(agents, window), errors
+
+    def close(self):
+        for agent in self.agents:
+            agent.close()
+
+    def run(
+        self,
+        units: Sequence[WorkUnit],
+        on_items: Callable[[WorkUnit, AgentConnection, list], None],
+        on_done: Callable[[WorkUnit, AgentConnection | None, dict | None, str | None], None],
+        stop: threading.Event | None = None,
+    ):
+        """Run every unit somewhere; callbacks arrive on the agents' reader threads."""
+        stop = stop or threading.Event()
+        queue = deque(units)
+        remaining = len(queue)
+        wake = threading.Condition()
+
+        def finish(unit: WorkUnit, agent: AgentConnection, summary, error):
+            nonlocal remaining
+            if error and summary is None and not agent.alive and unit.attempts < 2 and not stop.is_set():
+                AGENT_RETRIES.inc()
+                with wake:
+                    queue.appendleft(unit)
+                    wake.notify()
+                return
+            on_done(unit, agent, summary, error)
+            with wake:
+                remaining -= 1
+                wake.notify()
+
+        def assign(agent: AgentConnection, unit: WorkUnit):
+            unit.attempts += 1
+            params = {"target": unit.target, **unit.params}
+            agent.submit(
+                unit.tool,
+                params,
+                lambda items: on_items(unit, agent, items),
+                lambda summary, error: finish(unit, agent, summary, error),
+            )
+
+        cancelled = False
+        with wake:
+            while remaining > 0:
+                if stop.is_set() and not cancelled:
+                    cancelled = True
+                    for agent in self.agents:
+                        agent.cancel_all()
+                    # Units never sent are reported as not run
+                    while queue:
+                        unit = queue.popleft()
+                        on_done(unit, None, None, "Cancelled")
+                        remaining -= 1
+                live = [agent for agent in self.agents if agent.alive]
+                if not live:
+                    while queue:
+                        on_done(queue.popleft(), None, None, "No agents available")
+                        remaining -= 1
+                    if remaining <= 0:
+                        break
+                for agent in sorted(live, key=lambda item: item.in_flight):
+                    while queue and agent.alive and agent.in_flight < self.window and not stop.is_set():
+                        unit = queue.popleft()
+                        wake.release()
+                        try:
+                            assign(agent, unit)
+                        except AgentError:
+                            queue.appendleft(unit)
+                        finally:
+                            wake.acquire()
+                wake.wait(0.2)
+
+
+def split_units(tool: str, targets: Sequence[str], params: dict, chunk: int = SCAN_CHUNK) -> List[WorkUnit]:
+    """Work units for a sweep: one per target, with scans also split into port chunks.
+
+    Splitting a scan's ports lets a single large host spread over every agent
+    instead of keeping one busy while the rest idle.
+    """
+    if tool != "scan":
+        return [WorkUnit(tool, target, dict(params)) for target in targets]
+    ports = parse_ports(params.get("ports") or "1-65535")
+    step = max(1, chunk)
+    chunks = [PortSet.from_ports(ports[start:start + step]).ranges() for start in range(0, len(ports), step)]
+    return [WorkUnit(tool, target, {**params, "ports": spec}) for target in targets for spec in chunks]
+
+
+class SweepMerger:
+    """Turns per-unit agent results into the same records a local run produces.
+
+    Open ports, replies and hops are passed on as they arrive, tagged with
+    the agent that found them; a target's summary is emitted once all of its
+    units are done, with scan counts and open and filtered ports combined
+    across chunks. A unit retried after its agent dropped may send items
+    again; each port, ping sequence or hop is passed on only once.
+    """
+
+    def __init__(self, units: Sequence[WorkUnit], emit: Callable[[dict], None]):
+        self.emit = emit
+        self._lock = threading.Lock()
+        self._left: Dict[str, int] = {}
+        self._totals: Dict[str, dict] = {}
+        self._seen: Dict[Tuple[str, str], set] = {}
+        for unit in units:
+            self._left[unit.target] = self._left.get(unit.target, 0) + 1
+
+    def on_items(self, unit: WorkUnit, agent: AgentConnection, items: list):
+        base = {"tool": unit.tool, "target": unit.target}
+        with self._lock:
+            seen = self._seen.setdefault((unit.tool, unit.target), set())
+            # Traceroute header lines have no hop number; key those by text
+            keys = [item[0] if item[0] is not None else item[1] for item in items]
+            items = [item for item, key in zip(items, keys) if key not in seen and not seen.add(key)]
+        for item in items:
+            if unit.tool == "scan":
+                record = {"type": "open", **base, "port": item[0], "service": item[1]}
+            elif unit.tool == "ping":
+                record = {"type": "reply", **base, "seq": item[0], "rtt_ms": item[1]}
+            else:
+                record = {"type": "hop", **base, "hop": item[0], "text": item[1]}
+            record["agent"] = agent.label
+            self.emit(record)
+
+    def on_done(self, unit: WorkUnit, agent: AgentConnection | None, summary: dict | None, error: str | None):
+        with self._lock:
+            totals = self._totals.setdefault(unit.target, {"agents": [], "errors": []})
+            if agent is not None and agent.label not in totals["agents"]:
+                totals["agents"].append(agent.label)
+            if error:
+                totals["errors"].append(error)
+            for key, value in (summary or {}).items():
+                if unit.tool == "scan" and key in ("scanned", "closed"):
+                    totals[key] = totals.get(key, 0) + value
+                elif unit.tool == "scan" and key in ("open", "filtered"):
+                    totals[key] = sorted(totals.get(key, []) + value)
+                elif key == "complete":
+                    totals[key] = totals.get(key, True) and value
+                else:
+                    totals[key] = value
+            self._left[unit.target] -= 1
+            done = self._left[unit.target] == 0
+        if done:
+            if not totals["errors"]:
+                del totals["errors"]
+            self.emit({"type": "summary", "tool": unit.tool, "target": unit.target, **totals})
+
+
+def dispatch(
+    pool: AgentPool,
+    tool: str,
+    targets: Sequence[str],
+    params: dict,
+    emit: Callable[[dict], None],
+    stop: threading.Event | None = None,
+    chunk: int = SCAN_CHUNK,
+) -> float:
+    """Run ``tool`` against ``targets`` across the pool's agents; returns elapsed seconds."""
+    if tool not in TOOLS:
+        raise ValueError(f"Unknown tool: {tool}")
+    units = split_units(tool, targets, params, chunk)
+    merger = SweepMerger(units, emit)
+    started = time.monotonic()
+    pool.run(units, merger.on_items, merger.on_done, stop=stop)
+    return time.monotonic() - started
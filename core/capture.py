@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import io
+import socket
+import struct
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+from core.metrics import get_metrics
+
+DEFAULT_RING_SIZE = 100_000
+MAX_RING_SIZE = 1_000_000
+DEFAULT_SNAPLEN = 65535
+# Frames read per wakeup before the stop flag is checked again
+RECV_BATCH = 512
+SOCKET_BUFFER = 8 << 20
+PCAP_BUFFER = 1 << 20
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+
+PCAP_MAGIC = 0xA1B2C3D4
+PCAP_HEADER = struct.Struct("<IHHiIII")
+PCAP_RECORD = struct.Struct("<IIII")
+
+# linux/if_packet.h; reading the statistics also resets them
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+TPACKET_STATS = struct.Struct("II")
+
+_metrics = get_metrics()
+CAPTURED = _metrics.counter("gatchfier_capture_packets_total", "Frames captured")
+CAPTURED_BYTES = _metrics.counter("gatchfier_capture_bytes_total", "Bytes of captured frames as seen on the wire")
+KERNEL_DROPS = _metrics.counter("gatchfier_capture_kernel_drops_total", "Frames the kernel dropped before they were read")
+
+ETHERTYPES = {0x0800: "IPv4", 0x86DD: "IPv6", 0x0806: "ARP", 0x8100: "802.1Q", 0x88CC: "LLDP"}
+IP_PROTOCOLS = {1: "ICMP", 2: "IGMP", 6: "TCP", 17: "UDP", 47: "GRE", 50: "ESP", 58: "ICMPv6", 132: "SCTP"}
+ICMP_TYPES = {0: "echo reply", 3: "unreachable", 5: "redirect", 8: "echo request", 11: "time exceeded"}
+ICMP6_TYPES = {1: "unreachable", 3: "time exceeded", 128: "echo request", 129: "echo reply", 135: "neighbor solicitation",
+               136: "neighbor advertisement"}
+TCP_FLAGS = ((0x02, "SYN"), (0x10, "ACK"), (0x01, "FIN"), (0x04, "RST"), (0x08, "PSH"), (0x20, "URG"))
+WELL_KNOWN_PORTS = {53: "DNS", 67: "DHCP", 68: "DHCP", 123: "NTP", 443: "QUIC", 5353: "mDNS", 1900: "SSDP"}
+
+
+class PacketRing:
+    """The last ``capacity`` raw frames, addressed by a global sequence number.
+
+    Frames are stored as the bytes objects the socket returned, so appending
+    copies nothing; timestamps and wire lengths sit in flat arrays next to
+    them. Only the capture thread writes. Readers ask for a sequence number
+    and get None once it has been overwritten, so the GUI can read rows at
+    any time without a lock: the writer claims a slot before touching it,
+    and the check after reading catches a slot reused underneath it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_RING_SIZE):
+        self.capacity = max(1, min(MAX_RING_SIZE, capacity))
+        self._frames: list = [None] * self.capacity
+        self._times = array("d", bytes(8 * self.capacity))
+        self._lengths = array("I", bytes(4 * self.capacity))
+        self.written = 0
+        self._claimed = 0
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    @property
+    def first(self) -> int:
+        """Sequence number of the oldest frame still held."""
+        return max(0, self.written - self.capacity)
+
+    def append(self, frame: bytes, timestamp: float, wire_length: int):
+        slot = self.written % self.capacity
+        self._claimed = self.written + 1
+        self._frames[slot] = frame
+        self._times[slot] = timestamp
+        self._lengths[slot] = wire_length
+        self.written += 1
+
+    def get(self, seq: int) -> Tuple[float, bytes, int] | None:
+        if not self.first <= seq < self.written:
+            return None
+        slot = seq % self.capacity
+        entry = self._times[slot], self._frames[slot], self._lengths[slot]
+        return entry if seq >= self._claimed - self.capacity else None
+
+    def clear(self):
+        self._frames = [None] * self.capacity
+        self.written = self._claimed = 0
+
+
+class PcapWriter:
+    """Streams frames to a classic libpcap file as they are captured.
+
+    Writes go through a large buffer so the capture thread makes one
+    syscall per megabyte rather than two per frame; :meth:`flush` pushes
+    what is buffered so the file can be opened in Wireshark mid-capture.
+    """
+
+    def __init__(self, path: str, linktype: int = LINKTYPE_ETHERNET, snaplen: int = DEFAULT_SNAPLEN):
+        self.path = path
+        self._file = io.open(path, "wb", buffering=PCAP_BUFFER)
+        self._file.write(PCAP_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, snaplen, linktype))
+        self.bytes_written = PCAP_HEADER.size
+
+    def write(self, frame: bytes, timestamp: float, wire_length: int):
+        seconds = int(timestamp)
+        self._file.write(PCAP_RECORD.pack(seconds, int((timestamp - seconds) * 1_000_000), len(frame), wire_length))
+        self._file.write(frame)
+        self.bytes_written += PCAP_RECORD.size + len(frame)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass(frozen=True)
+class PacketSummary:
+    source: str
+    destination: str
+    protocol: str
+    info: str
+
+
+def _mac(data: bytes) -> str:
+    return ":".join(f"{byte:02x}" for byte in data)
+
+
+def _ports(protocol: str, segment: bytes) -> Tuple[str, str, str, str]:
+    """Source port, destination port, protocol label and info for a TCP or UDP header."""
+    if len(segment) < 4:
+        return "", "", protocol, ""
+    sport, dport = struct.unpack_from("!HH", segment)
+    info = f"{sport} → {dport}"
+    if protocol == "TCP" and len(segment) >= 14:
+        flags = segment[13]
+        names = [name for bit, name in TCP_FLAGS if flags & bit]
+        info += f" [{', '.join(names)}]" if names else ""
+        seq = struct.unpack_from("!I", segment, 4)[0]
+        info += f" seq={seq}"
+    elif protocol == "UDP":
+        service = WELL_KNOWN_PORTS.get(dport) or WELL_KNOWN_PORTS.get(sport)
+        if service:
+            protocol = service
+        if len(segment) >= 6:
+            info += f" len={struct.unpack_from('!H', segment, 4)[0] - 8}"
+    return f":{sport}", f":{dport}", protocol, info
+
+
+def _summarize_ip(packet: bytes) -> PacketSummary:
+    version = packet[0] >> 4 if packet else 0
+    if version == 4 and len(packet) >= 20:
+        header = (packet[0] & 0x0F) * 4
+        number = packet[9]
+        source, destination = socket.inet_ntop(socket.AF_INET, packet[12:16]), socket.inet_ntop(socket.AF_INET, packet[16:20])
+        fragment = struct.unpack_from("!H", packet, 6)[0] & 0x1FFF
+        payload = packet[header:] if not fragment else b""
+        ttl = f" ttl={packet[8]}"
+    elif version == 6 and len(packet) >= 40:
+        number = packet[6]
+        source, destination = socket.inet_ntop(socket.AF_INET6, packet[8:24]), socket.inet_ntop(socket.AF_INET6, packet[24:40])
+        payload = packet[40:]
+        ttl = f" hlim={packet[7]}"
+    else:
+        return PacketSummary("", "", "IP?", f"{len(packet)} bytes")
+
+    protocol = IP_PROTOCOLS.get(number, f"IP proto {number}")
+    if protocol in ("TCP", "UDP"):
+        sport, dport, protocol, info = _ports(protocol, payload)
+        return PacketSummary(source + sport if version == 4 else f"[{source}]{sport}",
+                             destination + dport if version == 4 else f"[{destination}]{dport}", protocol, info)
+    if protocol in ("ICMP", "ICMPv6") and payload:
+        names = ICMP_TYPES if protocol == "ICMP" else ICMP6_TYPES
+        info = names.get(payload[0], f"type {payload[0]}")
+        if payload[0] in (0, 8, 128, 129) and len(payload) >= 8:
+            ident, seq = struct.unpack_from("!HH", payload, 4)
+            info += f" id={ident} seq={seq}"
+        return PacketSummary(source, destination, protocol, info + ttl)
+    return PacketSummary(source, destination, protocol, ttl.strip())
+
+
+def summarize(frame: bytes, linktype: int = LINKTYPE_ETHERNET) -> PacketSummary:
+    """Table columns for one frame, read straight from the headers.
+
+    Only the few fields a packet list shows are unpacked, which costs a few
+    microseconds where a full scapy dissection costs a hundred or more; the
+    full decode is left to :func:`decode` for the one packet being inspected.
+    """
+    try:
+        if linktype == LINKTYPE_RAW:
+            return _summarize_ip(frame)
+        if linktype == LINKTYPE_LINUX_SLL:
+            ethertype, offset = struct.unpack_from("!H", frame, 14)[0], 16
+            source, destination = _mac(frame[6:6 + min(6, frame[5])]), ""
+        else:
+            destination, source = _mac(frame[0:6]), _mac(frame[6:12])
+            ethertype, offset = struct.unpack_from("!H", frame, 12)[0], 14
+            while ethertype in (0x8100, 0x88A8) and len(frame) >= offset + 4:
+                ethertype, offset = struct.unpack_from("!H", frame, offset + 2)[0], offset + 4
+        if ethertype in (0x0800, 0x86DD):
+            return _summarize_ip(frame[offset:])
+        if ethertype == 0x0806 and len(frame) >= offset + 28:
+            operation = struct.unpack_from("!H", frame, offset + 6)[0]
+            sender = socket.inet_ntop(socket.AF_INET, frame[offset + 14:offset + 18])
+            target = socket.inet_ntop(socket.AF_INET, frame[offset + 24:offset + 28])
+            if operation == 1:
+                info = f"Who has {target}? Tell {sender}"
+            else:
+                info = f"{sender} is at {_mac(frame[offset + 8:offset + 14])}"
+            return PacketSummary(source, destination, "ARP", info)
+        return PacketSummary(source, destination, ETHERTYPES.get(ethertype, f"0x{ethertype:04x}"), "")
+    except (struct.error, ValueError, IndexError):
+        return PacketSummary("", "", "?", "Truncated frame")
+
+
+def decode(frame: bytes, linktype: int = LINKTYPE_ETHERNET) -> str:
+    """Full scapy dissection and hex dump of one frame, for the detail view."""
+    from scapy.all import conf, hexdump  # pylint: disable=import-outside-toplevel
+
+    layer = conf.l2types.num2layer.get(linktype, conf.raw_layer)
+    packet = layer(frame)
+    return f"{packet.show(dump=True)}\n{hexdump(packet, dump=True)}"
+
+
+class CaptureSession:
+    """Ring, optional pcap stream and counters for one capture run.
+
+    Every counter is written only by the capture thread and read by the
+    GUI's status timer, like the port scan's progress.
+    """
+
+    def __init__(self, ring_size: int = DEFAULT_RING_SIZE, pcap_path: str | None = None, snaplen: int = DEFAULT_SNAPLEN):
+        self.ring = PacketRing(ring_size)
+        self.pcap_path = pcap_path
+        self.pcap: PcapWriter | None = None
+        self.snaplen = snaplen
+        self.linktype = LINKTYPE_ETHERNET
+        self.packets = 0
+        self.bytes = 0
+        self.kernel_drops = 0
+        self.started = 0.0
+
+    def open(self, linktype: int):
+        self.linktype = linktype
+        self.started = time.time()
+        if self.pcap_path:
+            self.pcap = PcapWriter(self.pcap_path, linktype, self.snaplen)
+
+    def ingest(self, frame: bytes, timestamp: float):
+        wire_length = len(frame)
+        if wire_length > self.snaplen:
+            frame = frame[:self.snaplen]
+        self.ring.append(frame, timestamp, wire_length)
+        if self.pcap is not None:
+            self.pcap.write(frame, timestamp, wire_length)
+        self.packets += 1
+        self.bytes += wire_length
+
+    def close(self):
+        if self.pcap is not None:
+            self.pcap.close()
+
+
+def _kernel_drops(sock: socket.socket) -> int:
+    """Frames dropped since the last call, or 0 where the socket cannot say."""
+    try:
+        _, drops = TPACKET_STATS.unpack(sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, TPACKET_STATS.size))
+    except (OSError, struct.error):
+        return 0
+    return drops
+
+
+def open_listener(iface: str | None, bpf: str | None):
+    """A scapy layer-2 listening socket with ``bpf`` compiled and attached in the kernel.
+
+    Filtering in the kernel means frames the filter rejects never reach
+    this process, which is what lets a narrow capture keep up on a busy
+    link. ``iface`` None means scapy's default interface. Returns the
+    socket and the pcap link type of what it delivers.
+    """
+    from scapy.all import conf  # pylint: disable=import-outside-toplevel
+
+    sock = conf.L2listen(iface=iface, filter=bpf or None)
+    try:
+        sock.ins.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+    except (AttributeError, OSError):
+        pass
+    return sock, conf.l2types.layer2num.get(getattr(sock, "LL", None), LINKTYPE_ETHERNET)
+
+
+def capture(
+    session: CaptureSession,
+    iface: str | None = None,
+    bpf: str | None = None,
+    stop: threading.Event | None = None,
+    limit: int = 0,
+    on_status: Callable[[str], None] | None = None,
+):
+    """Read frames into ``session`` until ``stop`` is set or ``limit`` frames arrive.
+
+    Frames are taken from the socket undecoded (``recv_raw``), in batches
+    of up to :data:`RECV_BATCH` per wakeup, so the per-frame cost is a
+    syscall, a ring slot and a pcap record. Nothing is dissected here.
+    """
+    stop = stop or threading.Event()
+    sock, linktype = open_listener(iface, bpf)
+    session.open(linktype)
+    if on_status:
+        on_status(f"Capturing on {iface or 'the default interface'}" + (f" with filter '{bpf}'" if bpf else ""))
+    raw = getattr(sock, "ins", None)
+    last_flush = time.monotonic()
+    counted_packets = counted_bytes = 0
+
+    def count():
+        nonlocal counted_packets, counted_bytes
+        CAPTURED.inc(session.packets - counted_packets)
+        CAPTURED_BYTES.inc(session.bytes - counted_bytes)
+        counted_packets, counted_bytes = session.packets, session.bytes
+    try:
+        while not stop.is_set():
+            # The socket's own select: on Windows it is an Npcap handle, which
+            # select.select does not accept. There it may report ready with
+            # nothing to read, so an empty read ends the batch too.
+            if sock.select([sock], 0.2):
+                for _ in range(RECV_BATCH):
+                    _, frame, timestamp = sock.recv_raw()
+                    if not frame:
+                        break
+                    session.ingest(frame, timestamp or time.time())
+                    if limit and session.packets >= limit:
+                        stop.set()
+                        break
+                    if not sock.select([sock], 0):
+                        break
+            now = time.monotonic()
+            if now - last_flush >= 1.0:
+                last_flush = now
+                count()
+                if raw is not None:
+                    drops = _kernel_drops(raw)
+                    session.kernel_drops += drops
+                    KERNEL_DROPS.inc(drops)
+                if session.pcap is not None:
+                    session.pcap.flush()
+    finally:
+        count()
+        sock.close()
+        session.close()
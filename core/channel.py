@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, List
+
+DEFAULT_HIGH_WATERMARK = 20000
+DEFAULT_DRAIN_LIMIT = 5000
+
+
+@dataclass(frozen=True)
+class LogLine:
+    """Free-form status text for the output pane."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class Progress:
+    done: int
+    total: int
+
+
+class ResultChannel:
+    """Many-producer, single-consumer hand-off from worker threads to the GUI.
+
+    Producers ``put`` typed records onto a deque (appends and pops are atomic,
+    so the hot path takes no lock) and the GUI drains them in batches on a
+    timer. When more than ``high_watermark`` records are waiting the channel
+    reports pressure; engines call :meth:`wait_for_room` to slow down until
+    the consumer catches up.
+    """
+
+    def __init__(self, high_watermark: int = DEFAULT_HIGH_WATERMARK, drain_limit: int = DEFAULT_DRAIN_LIMIT):
+        self.high_watermark = max(1, high_watermark)
+        self.low_watermark = self.high_watermark // 2
+        self.drain_limit = drain_limit
+        self._items: deque = deque()
+        self._room = threading.Event()
+        self._room.set()
+        self.produced = 0
+        self.consumed = 0
+        self.peak_depth = 0
+        self.drains = 0
+        self.throttled_seconds = 0.0
+        self.closed = False
+
+    def put(self, item: Any):
+        self._items.append(item)
+        # Counters are advisory; a lost increment under contention is harmless
+        self.produced += 1
+        depth = len(self._items)
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+        if depth >= self.high_watermark and not self.closed:
+            self._room.clear()
+
+    def depth(self) -> int:
+        return len(self._items)
+
+    def pressure(self) -> float:
+        """Queue depth as a fraction of the high watermark."""
+        return len(self._items) / self.high_watermark
+
+    def wait_for_room(self, timeout: float | None = None) -> bool:
+        """Block while the consumer is behind; returns False on timeout."""
+        if self._room.is_set():
+            return True
+        started = time.monotonic()
+        ready = self._room.wait(timeout)
+        self.throttled_seconds += time.monotonic() - started
+        return ready
+
+    def drain(self, limit: int | None = None) -> List[Any]:
+        limit = self.drain_limit if limit is None else limit
+        batch = []
+        pop = self._items.popleft
+        try:
+            while len(batch) < limit:
+                batch.append(pop())
+        except IndexError:
+            pass
+        self.consumed += len(batch)
+        self.drains += 1
+        if len(self._items) <= self.low_watermark:
+            self._room.set()
+        return batch
+
+    def close(self):
+        """Release any throttled producers; the consumer may still drain."""
+        self.closed = True
+        self._room.set()
+
+    def stats(self) -> dict:
+        return {
+            "produced": self.produced,
+            "consumed": self.consumed,
+            "depth": len(self._items),
+            "peak_depth": self.peak_depth,
+            "drains": self.drains,
+            "throttled_s": round(self.throttled_seconds, 3),
+        }
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import errno
+import ipaddress
+import os
+import select
+import selectors
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+from core.metrics import get_metrics
+
+MAX_DISCOVERY_ADDRESSES = 1 << 16
+DISCOVERY_METHODS = ("auto", "arp", "icmp", "tcp")
+DEFAULT_RATE = 2000.0
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_TCP_WINDOW = 256
+# A connect that is accepted or refused proves the host is up
+TCP_PING_PORTS = (80, 443, 22, 445, 3389)
+TCP_ALIVE_ERRNOS = {0, errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", errno.ECONNREFUSED)}
+# Non-blocking connect_ex results that mean the connect is still under way, across platforms
+TCP_PENDING_ERRNOS = {
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EALREADY,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+    getattr(errno, "WSAEINPROGRESS", errno.EINPROGRESS),
+    getattr(errno, "WSAEALREADY", errno.EALREADY),
+}
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_RECV_SIZE = 2048
+# Replies are drained between bursts so they never outrun the socket buffer
+ICMP_SEND_BURST = 64
+ICMP_RCVBUF = 4 << 20
+ARP_TARGET_OFFSET = 38  # Ethernet (14) + ARP fields before the target protocol address (24)
+
+_metrics = get_metrics()
+DISCOVERY_PROBES = _metrics.counter("gatchfier_discovery_probes_total", "Host discovery probes sent")
+DISCOVERY_FOUND = _metrics.counter("gatchfier_discovery_hosts_total", "Live hosts found by discovery sweeps")
+DISCOVERY_RTT = _metrics.histogram("gatchfier_discovery_rtt_seconds", "Host discovery reply time")
+
+
+@dataclass(frozen=True)
+class LiveHost:
+    address: str
+    method: str
+    rtt_ms: float | None
+    mac: str = ""
+
+
+def parse_network(text: str) -> ipaddress.IPv4Network:
+    network = ipaddress.ip_network(text.strip(), strict=False)
+    if network.version != 4:
+        raise ValueError("Host discovery sweeps IPv4 networks only.")
+    if network.num_addresses > MAX_DISCOVERY_ADDRESSES:
+        raise ValueError(
+            f"{network} has {network.num_addresses:,} addresses; the limit is {MAX_DISCOVERY_ADDRESSES:,}."
+        )
+    return network
+
+
+def sweep_addresses(network: ipaddress.IPv4Network) -> List[str]:
+    """Every usable host address (network and broadcast addresses skipped)."""
+    return [str(address) for address in network.hosts()]
+
+
+def local_interface(network: ipaddress.IPv4Network) -> str | None:
+    """Interface that reaches ``network`` directly (no gateway), or None.
+
+    ARP only answers on the local segment; anything behind a router needs
+    ICMP or TCP. Asks scapy's routing table, so scapy must be importable.
+    """
+    from scapy.all import conf  # pylint: disable=import-outside-toplevel
+
+    iface, _, gateway = conf.route.route(str(network.network_address + (1 if network.num_addresses > 1 else 0)))
+    return str(iface) if gateway == "0.0.0.0" else None
+
+
+def _paced(started: float, sent: int, rate: float | None) -> bool:
+    """True while ``sent`` is ahead of ``rate`` probes per second."""
+    return bool(rate) and sent >= (time.monotonic() - started) * rate + 1
+
+
+def arp_sweep(
+    addresses: Sequence[str],
+    on_host: Callable[[LiveHost], None],
+    iface: str | None = None,
+    rate: float | None = DEFAULT_RATE,
+    timeout: float = DEFAULT_TIMEOUT,
+    stop: threading.Event | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """ARP-request every address on the local segment; returns the number of live hosts.
+
+    One scapy sniffer collects every reply while requests go out of a single
+    layer-2 socket. Requests are copies of one prebuilt frame with only the
+    target address patched in, so building them costs no scapy dissection.
+    Needs administrator rights.
+    """
+    # scapy takes a second or more to import, so only pay for it when sweeping
+    from scapy.all import ARP, AsyncSniffer, Ether, Raw, conf, get_if_addr, get_if_hwaddr  # pylint: disable=import-outside-toplevel
+
+    stop = stop or threading.Event()
+    iface = iface or conf.iface
+    source_mac = get_if_hwaddr(iface)
+    template = bytearray(bytes(
+        Ether(dst="ff:ff:ff:ff:ff:ff", src=source_mac)
+        / ARP(op=1, hwsrc=source_mac, psrc=get_if_addr(iface), pdst="0.0.0.0")
+    ))
+    sent_at: Dict[str, float] = {}
+    found = 0
+
+    def handle(packet):
+        nonlocal found
+        reply = packet[ARP]
+        started = sent_at.pop(reply.psrc, None) if reply.op == 2 else None
+        if started is None:
+            return
+        rtt = time.monotonic() - started
+        found += 1
+        DISCOVERY_FOUND.inc()
+        DISCOVERY_RTT.observe(rtt)
+        on_host(LiveHost(reply.psrc, "arp", round(rtt * 1000, 2), reply.hwsrc))
+
+    listening = threading.Event()
+    sniffer = AsyncSniffer(iface=iface, filter="arp", prn=handle, store=False, started_callback=listening.set)
+    sniffer.start()
+    try:
+        listening.wait(2.0)
+        sock = conf.L2socket(iface=iface)
+        try:
+            started = time.monotonic()
+            for sent, address in enumerate(addresses):
+                while _paced(started, sent, rate) and not stop.is_set():
+                    stop.wait(max(0.0, started + sent / rate - time.monotonic()))
+                if stop.is_set():
+                    break
+                template[ARP_TARGET_OFFSET:ARP_TARGET_OFFSET + 4] = socket.inet_aton(address)
+                sent_at[address] = time.monotonic()
+                sock.send(Raw(bytes(template)))
+                DISCOVERY_PROBES.inc()
+                if on_progress:
+                    on_progress(sent + 1, len(addresses))
+        finally:
+            sock.close()
+        stop.wait(timeout)
+    finally:
+        sniffer.stop()
+    return found
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(identifier: int, sequence: int) -> bytes:
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    payload = b"gatchfier"
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, _checksum(header + payload), identifier, sequence) + payload
+
+
+def _open_icmp_socket() -> Tuple[socket.socket, bool]:
+    """An ICMP socket and whether it is raw (replies then carry the IP header).
+
+    Raw sockets need administrator rights; Linux and macOS also offer
+    unprivileged datagram ICMP sockets, which are tried second.
+    """
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+    except PermissionError:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+
+
+def icmp_sweep(
+    addresses: Sequence[str],
+    on_host: Callable[[LiveHost], None],
+    rate: float | None = DEFAULT_RATE,
+    timeout: float = DEFAULT_TIMEOUT,
+    stop: threading.Event | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """Echo-request every address from one socket; returns the number of live hosts.
+
+    Sending and receiving share a single non-blocking socket and select loop,
+    like the pipelined DNS client: requests go out at ``rate`` per second while
+    replies are drained as they arrive, and the sweep ends ``timeout`` seconds
+    after the last request. Raises OSError when no ICMP socket can be opened.
+    """
+    stop = stop or threading.Event()
+    sock, raw = _open_icmp_socket()
+    sock.setblocking(False)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, ICMP_RCVBUF)
+    except OSError:
+        pass
+    identifier = os.getpid() & 0xFFFF
+    pending = iter(enumerate(addresses))
+    retry = None
+    sent_at: Dict[str, float] = {}
+    found = 0
+    sent = 0
+    exhausted = False
+    started = last_sent = time.monotonic()
+    try:
+        while not stop.is_set():
+            burst = 0
+            while not exhausted and burst < ICMP_SEND_BURST and not _paced(started, sent, rate):
+                item, retry = retry or next(pending, None), None
+                if item is None:
+                    exhausted = True
+                    break
+                index, address = item
+                try:
+                    sock.sendto(_echo_request(identifier, index & 0xFFFF), (address, 0))
+                except (BlockingIOError, InterruptedError):
+                    # Socket buffer full; let replies drain and retry this address next round
+                    retry = item
+                    break
+                except OSError:
+                    pass
+                last_sent = sent_at[address] = time.monotonic()
+                sent += 1
+                burst += 1
+                DISCOVERY_PROBES.inc()
+            if on_progress:
+                on_progress(sent, len(addresses))
+
+            now = time.monotonic()
+            if exhausted and (not sent_at or now >= last_sent + timeout):
+                break
+            wait = last_sent + timeout - now if exhausted else 0.05
+            if burst >= ICMP_SEND_BURST:
+                wait = 0.0
+            elif rate and not exhausted:
+                wait = min(wait, max(0.0, started + sent / rate - now))
+            readable, _, _ = select.select([sock], [], [], max(0.0, min(wait, 0.25)))
+            if not readable:
+                continue
+            while True:
+                try:
+                    data, (address, _) = sock.recvfrom(ICMP_RECV_SIZE)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+                received = time.monotonic()
+                icmp = data[(data[0] & 0x0F) * 4:] if raw else data
+                if len(icmp) < 8 or icmp[0] != ICMP_ECHO_REPLY:
+                    continue
+                # Datagram sockets rewrite the identifier; the kernel already filters those
+                if raw and struct.unpack_from("!H", icmp, 4)[0] != identifier:
+                    continue
+                sent_time = sent_at.pop(address, None)
+                if sent_time is None:
+                    continue
+                rtt = received - sent_time
+                found += 1
+                DISCOVERY_FOUND.inc()
+                DISCOVERY_RTT.observe(rtt)
+                on_host(LiveHost(address, "icmp", round(rtt * 1000, 2)))
+    finally:
+        sock.close()
+    return found
+
+
+def tcp_sweep(
+    addresses: Sequence[str],
+    on_host: Callable[[LiveHost], None],
+    ports: Sequence[int] = TCP_PING_PORTS,
+    window: int = DEFAULT_TCP_WINDOW,
+    timeout: float = DEFAULT_TIMEOUT,
+    stop: threading.Event | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    manager=None,
+) -> int:
+    """TCP-ping every address on ``ports``; returns the number of live hosts.
+
+    Non-blocking connects are watched by one selector. A host counts as up
+    the moment any port accepts or refuses; its remaining ports are skipped.
+    Each socket takes a slot from the job manager's socket budget. Needs no
+    privileges, so it also works where ICMP is blocked or unavailable.
+    """
+    stop = stop or threading.Event()
+    if manager is None:
+        from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+        manager = get_job_manager()
+    selector = selectors.DefaultSelector()
+    probes = ((address, port) for address in addresses for port in ports)
+    total = len(addresses) * len(ports)
+    alive: Set[str] = set()
+    inflight: Dict[socket.socket, Tuple[str, float]] = {}
+    done = 0
+    exhausted = False
+
+    def finish(sock: socket.socket, code: int | None):
+        nonlocal done
+        address, started = inflight.pop(sock)
+        selector.unregister(sock)
+        sock.close()
+        manager.release_socket()
+        done += 1
+        if code in TCP_ALIVE_ERRNOS and address not in alive:
+            alive.add(address)
+            rtt = time.monotonic() - started
+            DISCOVERY_FOUND.inc()
+            DISCOVERY_RTT.observe(rtt)
+            on_host(LiveHost(address, "tcp", round(rtt * 1000, 2)))
+
+    try:
+        while not stop.is_set():
+            while not exhausted and len(inflight) < window:
+                probe = next(probes, None)
+                if probe is None:
+                    exhausted = True
+                    break
+                address, port = probe
+                if address in alive:
+                    done += 1
+                    continue
+                if not manager.acquire_socket(token=stop):
+                    return len(alive)
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                inflight[sock] = (address, time.monotonic())
+                selector.register(sock, selectors.EVENT_WRITE)
+                DISCOVERY_PROBES.inc()
+                code = sock.connect_ex((address, port))
+                if code not in TCP_PENDING_ERRNOS:
+                    finish(sock, code)
+            if on_progress:
+                on_progress(done, total)
+            if exhausted and not inflight:
+                break
+            for key, _ in selector.select(timeout=0.05) if inflight else ():
+                sock = key.fileobj
+                finish(sock, sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR))
+            now = time.monotonic()
+            for sock in [sock for sock, (_, started) in inflight.items() if now - started >= timeout]:
+                finish(sock, None)
+    finally:
+        for sock in list(inflight):
+            finish(sock, None)
+        selector.close()
+    return len(alive)
+
+
+def discover(
+    network: ipaddress.IPv4Network,
+    on_host: Callable[[LiveHost], None],
+    method: str = "auto",
+    rate: float | None = DEFAULT_RATE,
+    timeout: float = DEFAULT_TIMEOUT,
+    stop: threading.Event | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    on_status: Callable[[str], None] | None = None,
+    tcp_ports: Iterable[int] = TCP_PING_PORTS,
+) -> int:
+    """Find live hosts in ``network`` and report each once; returns how many were found.
+
+    ``auto`` uses ARP when the network is on a local segment and scapy can
+    open a layer-2 socket. Otherwise it sends ICMP echo and then TCP-pings
+    the addresses that did not answer, since many hosts drop ICMP. A method
+    that cannot run (no privileges, no scapy) is reported through
+    ``on_status`` and the next one is tried.
+    """
+    if method not in DISCOVERY_METHODS:
+        raise ValueError(f"Unknown discovery method: {method}")
+    stop = stop or threading.Event()
+    addresses = sweep_addresses(network)
+    seen: Set[str] = set()
+    status = on_status or (lambda message: None)
+
+    def report(host: LiveHost):
+        if host.address not in seen:
+            seen.add(host.address)
+            on_host(host)
+
+    if method in ("auto", "arp"):
+        try:
+            iface = local_interface(network)
+            if iface is None and method == "arp":
+                raise OSError(f"{network} is not on a local segment")
+            if iface is not None:
+                status(f"ARP sweep of {len(addresses):,} addresses on {iface}")
+                arp_sweep(addresses, report, iface=iface, rate=rate, timeout=timeout, stop=stop, on_progress=on_progress)
+                return len(seen)
+        except ImportError:
+            status("scapy is not installed; ARP sweep unavailable")
+        except (OSError, RuntimeError) as exc:
+            status(f"ARP sweep unavailable: {exc}")
+        if method == "arp":
+            return len(seen)
+
+    if method in ("auto", "icmp"):
+        try:
+            status(f"ICMP sweep of {len(addresses):,} addresses")
+            icmp_sweep(addresses, report, rate=rate, timeout=timeout, stop=stop, on_progress=on_progress)
+        except OSError as exc:
+            status(f"ICMP sweep unavailable: {exc}")
+        if method == "icmp" or stop.is_set():
+            return len(seen)
+
+    silent = [address for address in addresses if address not in seen]
+    if silent:
+        ports = tuple(tcp_ports)
+        status(f"TCP ping of {len(silent):,} addresses on ports {', '.join(map(str, ports))}")
+        tcp_sweep(silent, report, ports=ports, timeout=timeout, stop=stop, on_progress=on_progress)
+    return len(seen)
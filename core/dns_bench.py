@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import random
+import string
+import threading
+from concurrent.futures import as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Sequence
+
+from core.dns_client import DNSClient
+from core.jobs import get_job_manager
+
+DEFAULT_NAMES = [
+    "google.com",
+    "youtube.com",
+    "facebook.com",
+    "wikipedia.org",
+    "amazon.com",
+    "microsoft.com",
+    "github.com",
+    "cloudflare.com",
+    "netflix.com",
+    "reddit.com",
+]
+# Answers that mean the resolver is unhealthy rather than that the name is absent
+FAILURE_RCODES = {2, 5}  # SERVFAIL, REFUSED
+
+
+def percentile(values: Sequence[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+@dataclass
+class ResolverStats:
+    resolver: str
+    cached: List[float] = field(default_factory=list)
+    uncached: List[float] = field(default_factory=list)
+    queries: int = 0
+    failures: int = 0
+    error: str | None = None
+
+    @property
+    def failure_rate(self) -> float:
+        return 100.0 * self.failures / self.queries if self.queries else 0.0
+
+    def summary(self) -> dict:
+        row = {"resolver": self.resolver}
+        for label, samples in (("cached", self.cached), ("uncached", self.uncached)):
+            for pct in (50, 95, 99):
+                value = percentile(samples, pct)
+                row[f"{label}_p{pct}"] = None if value is None else round(value, 1)
+        row["queries"] = self.queries
+        row["failure_pct"] = round(self.failure_rate, 1)
+        return row
+
+
+def _cache_buster(name: str) -> str:
+    label = "".join(random.choices(string.ascii_lowercase + string.digits, k=12))
+    return f"gf-{label}.{name}"
+
+
+def benchmark_resolver(
+    resolver: str,
+    names: Iterable[str],
+    rounds: int = 3,
+    window: int = 8,
+    timeout: float = 2.0,
+    stop: threading.Event | None = None,
+) -> ResolverStats:
+    """Measure one resolver's cached and uncached answer latency (ms).
+
+    Uncached samples query a random label under each name, which the resolver
+    cannot have seen and must recurse for. Cached samples repeat the real name
+    after a priming query whose latency is discarded.
+    """
+    stats = ResolverStats(resolver)
+    names = list(names)
+    try:
+        client = DNSClient(resolver, timeout=timeout, retries=0)
+    except (OSError, ValueError) as exc:
+        stats.error = str(exc)
+        return stats
+
+    def record(results, samples):
+        for result in results:
+            stats.queries += 1
+            if not result.ok or result.message.rcode in FAILURE_RCODES:
+                stats.failures += 1
+            else:
+                samples.append(result.elapsed * 1000)
+
+    client.query_many([(name, "A") for name in names], window=window, stop=stop)
+    for _ in range(max(1, rounds)):
+        if stop is not None and stop.is_set():
+            break
+        record(client.query_many([(name, "A") for name in names], window=window, stop=stop), stats.cached)
+        busters = [(_cache_buster(name), "A") for name in names]
+        record(client.query_many(busters, window=window, stop=stop), stats.uncached)
+    return stats
+
+
+def benchmark_resolvers(
+    resolvers: Sequence[str],
+    names: Iterable[str],
+    rounds: int = 3,
+    window: int = 8,
+    timeout: float = 2.0,
+    stop: threading.Event | None = None,
+    on_result: Callable[[ResolverStats], None] | None = None,
+) -> List[ResolverStats]:
+    """Benchmark every resolver concurrently with the same name set.
+
+    Each resolver runs on the job manager's I/O pool and holds one slot of
+    its socket budget. Resolvers not yet started when ``stop`` is set are
+    left out of the results.
+    """
+    names = list(names)
+    manager = get_job_manager()
+    results: List[ResolverStats] = []
+    futures = []
+    for resolver in resolvers:
+        future = manager.submit_io(benchmark_resolver, resolver, names, rounds, window, timeout, stop, token=stop)
+        if future is None:
+            break
+        futures.append(future)
+    for future in as_completed(futures):
+        stats = future.result()
+        results.append(stats)
+        if on_result:
+            on_result(stats)
+    return results
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import platform
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from core.dns_wire import (
+    DNSError,
+    DNSMessage,
+    RECORD_TYPES,
+    decode_header,
+    decode_message,
+    encode_query,
+    type_code,
+    wire_name,
+)
+from core.jobs import get_job_manager
+from core.metrics import get_metrics
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_RETRIES = 1
+DEFAULT_WINDOW = 256
+FALLBACK_NAMESERVER = "1.1.1.1"
+UDP_RECV_SIZE = 65535
+# How often the UDP loop checks on TCP fallbacks running on the I/O pool
+FALLBACK_POLL = 0.01
+
+Question = Tuple[str, str]
+
+_metrics = get_metrics()
+DNS_SENT = _metrics.counter("gatchfier_dns_queries_total", "DNS queries sent over UDP, retries included")
+DNS_TIMEOUTS = _metrics.counter("gatchfier_dns_timeouts_total", "DNS queries that got no answer after all retries")
+DNS_TCP = _metrics.counter("gatchfier_dns_tcp_fallbacks_total", "Truncated answers retried over TCP")
+DNS_RTT = _metrics.histogram("gatchfier_dns_rtt_seconds", "Time from first send to a DNS answer")
+
+
+@dataclass
+class QueryResult:
+    name: str
+    rtype: str
+    message: DNSMessage | None
+    error: str | None
+    elapsed: float
+    server: str = ""
+    via_tcp: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.message is not None and self.error is None
+
+
+class _Outstanding:
+    __slots__ = ("name", "qname", "rtype", "payload", "first_sent", "deadline", "attempts")
+
+    def __init__(self, name: str, rtype: str, payload: bytes, now: float, deadline: float):
+        self.name = name
+        # The question as the server echoes it back, IDN labels included
+        self.qname = wire_name(name)
+        self.rtype = rtype
+        self.payload = payload
+        self.first_sent = now
+        self.deadline = deadline
+        self.attempts = 1
+
+
+def system_nameservers() -> List[str]:
+    """Return the nameservers configured for this machine, best effort."""
+    if platform.system() == "Windows":
+        return _windows_nameservers()
+    servers = []
+    try:
+        with open("/etc/resolv.conf", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    servers.append(parts[1].split("%")[0])
+    except OSError:
+        pass
+    return servers
+
+
+def _windows_nameservers() -> List[str]:
+    try:
+        import winreg  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return []
+
+    servers: List[str] = []
+    base = r"SYSTEM\CurrentControlSet\Services\Tcpip\Parameters"
+
+    def collect(key):
+        for value_name in ("NameServer", "DhcpNameServer"):
+            try:
+                value, _ = winreg.QueryValueEx(key, value_name)
+            except OSError:
+                continue
+            for server in str(value).replace(",", " ").split():
+                if server not in servers:
+                    servers.append(server)
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base) as key:
+            collect(key)
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base + r"\Interfaces") as interfaces:
+            index = 0
+            while True:
+                try:
+                    name = winreg.EnumKey(interfaces, index)
+                except OSError:
+                    break
+                index += 1
+                with winreg.OpenKey(interfaces, name) as key:
+                    collect(key)
+    except OSError:
+        pass
+    return servers
+
+
+def default_nameserver() -> str:
+    servers = system_nameservers()
+    return servers[0] if servers else FALLBACK_NAMESERVER
+
+
+def parse_server(server: str, default_port: int = 53) -> Tuple[str, int]:
+    """Split "host", "host:port", "[v6]:port" or a bare IPv6 address."""
+    server = server.strip()
+    if server.startswith("["):
+        host, _, rest = server[1:].partition("]")
+        port = int(rest[1:]) if rest.startswith(":") else default_port
+        return host, port
+    if server.count(":") == 1:
+        host, port = server.split(":")
+        return host, int(port)
+    return server, default_port
+
+
+class DNSClient:
+    """Minimal stub resolver speaking the DNS wire format over UDP and TCP.
+
+    Many queries are pipelined over a single UDP socket and matched back to
+    their question by transaction ID. Truncated answers are retried over TCP
+    on the job manager's I/O pool, so a slow TCP exchange never holds up the
+    answers still arriving over UDP.
+    """
+
+    def __init__(
+        self,
+        server: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+    ):
+        host, port = parse_server(server or default_nameserver())
+        self.server = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        info = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0]
+        self._family = info[0]
+        self._address = info[4]
+
+    @property
+    def label(self) -> str:
+        return self.server if self.port == 53 else f"{self.server}:{self.port}"
+
+    def query(self, name: str, rtype: str = "A") -> DNSMessage:
+        result = self.query_many([(name, rtype)], window=1)[0]
+        if result.error:
+            raise DNSError(result.error)
+        return result.message
+
+    def query_many(self, questions: Iterable[Question], **kwargs) -> List[QueryResult]:
+        return list(self.iter_queries(questions, **kwargs))
+
+    def iter_queries(
+        self,
+        questions: Iterable[Question],
+        window: int = DEFAULT_WINDOW,
+        rate: float | None = None,
+        stop: threading.Event | None = None,
+        recursion: bool = True,
+    ) -> Iterator[QueryResult]:
+        """Yield a result for every question as answers arrive (not in order).
+
+        ``window`` caps the number of queries in flight and ``rate`` paces new
+        sends to at most that many queries per second.
+        """
+        pending = iter(questions)
+        exhausted = False
+        outstanding: Dict[int, _Outstanding] = {}
+        ready: deque = deque()
+        fallbacks: List[Future] = []
+        id_pool = list(range(1, 65536))
+        random.shuffle(id_pool)
+        free_ids = deque(id_pool)
+        sent = 0
+        started = time.monotonic()
+
+        sock = socket.socket(self._family, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        try:
+            sock.connect(self._address)
+            while True:
+                if stop is not None and stop.is_set():
+                    return
+                now = time.monotonic()
+
+                while not exhausted and len(outstanding) < window and free_ids:
+                    if rate and sent >= (now - started) * rate + 1:
+                        break
+                    try:
+                        name, rtype = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    txid = free_ids.popleft()
+                    try:
+                        payload = encode_query(txid, name, rtype, recursion=recursion)
+                    except DNSError as exc:
+                        free_ids.append(txid)
+                        ready.append(QueryResult(name, rtype, None, str(exc), 0.0, self.label))
+                        continue
+                    if not self._send(sock, payload):
+                        free_ids.append(txid)
+                        ready.append(QueryResult(name, rtype, None, "Send failed", 0.0, self.label))
+                        continue
+                    outstanding[txid] = _Outstanding(name, rtype, payload, now, now + self.timeout)
+                    sent += 1
+                    DNS_SENT.inc()
+
+                for future in [future for future in fallbacks if future.done()]:
+                    fallbacks.remove(future)
+                    ready.append(future.result())
+
+                while ready:
+                    yield ready.popleft()
+
+                if exhausted and not outstanding and not fallbacks:
+                    return
+
+                wait = 0.05
+                if outstanding:
+                    wait = max(0.0, min(entry.deadline for entry in outstanding.values()) - now)
+                if rate and not exhausted:
+                    wait = min(wait, max(0.0, started + sent / rate - now))
+                if fallbacks:
+                    wait = min(wait, FALLBACK_POLL)
+                readable, _, _ = select.select([sock], [], [], min(wait, 0.25))
+
+                if readable:
+                    self._drain(sock, outstanding, free_ids, ready, fallbacks, stop)
+
+                now = time.monotonic()
+                for txid in [txid for txid, entry in outstanding.items() if entry.deadline <= now]:
+                    entry = outstanding[txid]
+                    if entry.attempts <= self.retries:
+                        entry.attempts += 1
+                        entry.deadline = now + self.timeout
+                        self._send(sock, entry.payload)
+                        DNS_SENT.inc()
+                        continue
+                    del outstanding[txid]
+                    free_ids.append(txid)
+                    DNS_TIMEOUTS.inc()
+                    ready.append(QueryResult(entry.name, entry.rtype, None, "Timed out",
+                                             now - entry.first_sent, self.label))
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _send(sock: socket.socket, payload: bytes) -> bool:
+        try:
+            sock.send(payload)
+            return True
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            return False
+
+    def _drain(
+        self,
+        sock: socket.socket,
+        outstanding: Dict[int, _Outstanding],
+        free_ids: deque,
+        ready: deque,
+        fallbacks: List[Future],
+        stop: threading.Event | None,
+    ):
+        while True:
+            try:
+                data = sock.recv(UDP_RECV_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # ICMP port unreachable surfaces here on some platforms
+                return
+            now = time.monotonic()
+            try:
+                txid, _ = decode_header(data)
+            except DNSError:
+                continue
+            entry = outstanding.get(txid)
+            if entry is None:
+                continue
+            try:
+                message = decode_message(data)
+            except DNSError as exc:
+                del outstanding[txid]
+                free_ids.append(txid)
+                ready.append(QueryResult(entry.name, entry.rtype, None, str(exc),
+                                         now - entry.first_sent, self.label))
+                continue
+            if not self._matches(message, entry):
+                continue
+            del outstanding[txid]
+            free_ids.append(txid)
+            if message.truncated:
+                DNS_TCP.inc()
+                future = get_job_manager().submit_io(self._query_tcp, entry, token=stop)
+                if future is not None:
+                    fallbacks.append(future)
+                continue
+            DNS_RTT.observe(now - entry.first_sent)
+            ready.append(QueryResult(entry.name, entry.rtype, message, None,
+                                     now - entry.first_sent, self.label))
+
+    @staticmethod
+    def _matches(message: DNSMessage, entry: _Outstanding) -> bool:
+        if not message.questions:
+            return True
+        qname, qtype, _ = message.questions[0]
+        return qname.lower() == entry.qname and qtype == type_code(entry.rtype)
+
+    def _query_tcp(self, entry: _Outstanding) -> QueryResult:
+        try:
+            with socket.socket(self._family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self._address)
+                sock.sendall(struct.pack("!H", len(entry.payload)) + entry.payload)
+                length = struct.unpack("!H", self._recv_exact(sock, 2))[0]
+                message = decode_message(self._recv_exact(sock, length))
+            return QueryResult(entry.name, entry.rtype, message, None,
+                               time.monotonic() - entry.first_sent, self.label, via_tcp=True)
+        except (OSError, DNSError, struct.error) as exc:
+            return QueryResult(entry.name, entry.rtype, None, f"TCP fallback failed: {exc}",
+                               time.monotonic() - entry.first_sent, self.label, via_tcp=True)
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        chunks = []
+        remaining = size
+        while remaining:
+            chunk = sock.recv(remaining)
+            if not chunk:
+                raise DNSError("Connection closed mid-message")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+def resolve_addresses(client: DNSClient, name: str, family: int = socket.AF_INET) -> Tuple[List[str], int]:
+    """Resolve A/AAAA through ``client`` and return the addresses and their TTL."""
+    rtype = "AAAA" if family == socket.AF_INET6 else "A"
+    message = client.query(name, rtype)
+    if message.rcode != 0:
+        raise DNSError(f"{name}: {message.rcode_name}")
+    records = message.records(RECORD_TYPES[rtype])
+    ttl = min((record.ttl for record in records), default=0)
+    return [record.data for record in records], ttl
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import socket
+from dataclasses import dataclass, field
+from typing import List
+
+from core.dns_client import DNSClient, default_nameserver
+from core.dns_wire import DNSError, reverse_name
+from core.resolver import get_resolver
+
+SYSTEM_RESOLVER = "System resolver"
+
+
+@dataclass
+class LookupResult:
+    domain: str
+    rtype: str
+    name: str
+    server: str
+    records: List[str] = field(default_factory=list)
+    addresses: List[str] = field(default_factory=list)
+    rcode: str | None = None
+    elapsed_ms: float | None = None
+    via_tcp: bool = False
+    from_cache: bool = False
+    error: str | None = None
+
+
+def lookup(domain: str, rtype: str = "A", server: str | None = None) -> LookupResult:
+    """One DNS lookup the way the DNS tab does it.
+
+    A/AAAA through the system resolver use the shared resolver cache; every
+    other combination goes over the wire to ``server`` (or the system's first
+    nameserver).
+    """
+    rtype = rtype.upper()
+    server = server or SYSTEM_RESOLVER
+    if server == SYSTEM_RESOLVER and rtype in ("A", "AAAA"):
+        return resolve_addresses(domain, rtype)
+    return query_records(domain, rtype, None if server == SYSTEM_RESOLVER else server)
+
+
+def resolve_addresses(domain: str, rtype: str) -> LookupResult:
+    family = socket.AF_INET6 if rtype == "AAAA" else socket.AF_INET
+    result = LookupResult(domain, rtype, domain, SYSTEM_RESOLVER)
+    try:
+        resolution = get_resolver().lookup(domain, family)
+    except Exception as exc:  # pylint: disable=broad-except
+        result.error = str(exc)
+        return result
+    result.addresses = sorted(set(resolution.addresses))
+    result.from_cache = resolution.from_cache
+    return result
+
+
+def query_records(domain: str, rtype: str, server: str | None) -> LookupResult:
+    name = domain
+    if rtype == "PTR":
+        try:
+            name = reverse_name(domain)
+        except ValueError:
+            pass
+
+    result = LookupResult(domain, rtype, name, server or "")
+    try:
+        client = DNSClient(server or default_nameserver())
+        answer = client.query_many([(name, rtype)], window=1)[0]
+    except (OSError, ValueError, DNSError) as exc:
+        result.error = str(exc)
+        return result
+
+    result.server = client.label
+    if not answer.ok:
+        result.error = str(answer.error)
+        return result
+
+    message = answer.message
+    result.rcode = message.rcode_name
+    result.elapsed_ms = round(answer.elapsed * 1000, 3)
+    result.via_tcp = answer.via_tcp
+    result.records = [record.to_text() for record in message.answers]
+    return result
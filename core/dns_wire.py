@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import ipaddress
+import struct
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+RECORD_TYPES = {
+    "A": 1,
+    "NS": 2,
+    "CNAME": 5,
+    "SOA": 6,
+    "PTR": 12,
+    "MX": 15,
+    "TXT": 16,
+    "AAAA": 28,
+    "SRV": 33,
+}
+TYPE_NAMES = {value: name for name, value in RECORD_TYPES.items()}
+TYPE_NAMES[41] = "OPT"
+
+RCODE_NAMES = {
+    0: "NOERROR",
+    1: "FORMERR",
+    2: "SERVFAIL",
+    3: "NXDOMAIN",
+    4: "NOTIMP",
+    5: "REFUSED",
+}
+
+CLASS_IN = 1
+FLAG_QR = 0x8000
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+EDNS_PAYLOAD_SIZE = 1232
+MAX_POINTER_HOPS = 64
+
+_HEADER = struct.Struct("!HHHHHH")
+_RR_FIXED = struct.Struct("!HHIH")
+
+
+class DNSError(Exception):
+    """Raised for malformed messages and failed queries."""
+
+
+@dataclass
+class DNSRecord:
+    name: str
+    rtype: int
+    rclass: int
+    ttl: int
+    data: Any
+
+    @property
+    def type_name(self) -> str:
+        return TYPE_NAMES.get(self.rtype, f"TYPE{self.rtype}")
+
+    def data_text(self) -> str:
+        if self.rtype == RECORD_TYPES["MX"]:
+            preference, exchange = self.data
+            return f"{preference} {exchange}"
+        if self.rtype == RECORD_TYPES["TXT"]:
+            return " ".join(f'"{chunk}"' for chunk in self.data)
+        if self.rtype == RECORD_TYPES["SOA"]:
+            return " ".join(str(part) for part in self.data)
+        if self.rtype == RECORD_TYPES["SRV"]:
+            return " ".join(str(part) for part in self.data)
+        if isinstance(self.data, bytes):
+            return self.data.hex()
+        return str(self.data)
+
+    def to_text(self) -> str:
+        return f"{self.name}\t{self.ttl}\tIN\t{self.type_name}\t{self.data_text()}"
+
+
+@dataclass
+class DNSMessage:
+    id: int
+    flags: int
+    questions: List[Tuple[str, int, int]] = field(default_factory=list)
+    answers: List[DNSRecord] = field(default_factory=list)
+    authority: List[DNSRecord] = field(default_factory=list)
+    additional: List[DNSRecord] = field(default_factory=list)
+
+    @property
+    def rcode(self) -> int:
+        return self.flags & 0x000F
+
+    @property
+    def rcode_name(self) -> str:
+        return RCODE_NAMES.get(self.rcode, f"RCODE{self.rcode}")
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.flags & FLAG_TC)
+
+    def records(self, rtype: int) -> List[DNSRecord]:
+        return [record for record in self.answers if record.rtype == rtype]
+
+    def min_ttl(self) -> int | None:
+        ttls = [record.ttl for record in self.answers]
+        return min(ttls) if ttls else None
+
+
+def type_code(rtype: str | int) -> int:
+    if isinstance(rtype, int):
+        return rtype
+    try:
+        return RECORD_TYPES[rtype.upper()]
+    except KeyError as exc:
+        raise DNSError(f"Unsupported record type: {rtype}") from exc
+
+
+def _labels(name: str) -> List[bytes]:
+    """The name's labels as sent on the wire; non-ASCII labels become IDNA (``xn--``)."""
+    labels = []
+    for label in name.split("."):
+        if not label:
+            raise DNSError(f"Empty label in name: {name!r}")
+        try:
+            raw = label.encode("ascii")
+        except UnicodeEncodeError:
+            raw = label.encode("idna")
+        if len(raw) > 63:
+            raise DNSError(f"Label too long in name: {name!r}")
+        labels.append(raw)
+    return labels
+
+
+def encode_name(name: str) -> bytes:
+    name = name.strip().rstrip(".")
+    if not name:
+        return b"\x00"
+    encoded = b"".join(bytes((len(raw),)) + raw for raw in _labels(name)) + b"\x00"
+    if len(encoded) > 255:
+        raise DNSError(f"Name too long: {name!r}")
+    return encoded
+
+
+def wire_name(name: str) -> str:
+    """``name`` the way ``read_name`` returns it once sent: IDNA-encoded, lower case, with the root dot."""
+    name = name.strip().rstrip(".")
+    if not name:
+        return "."
+    return b".".join(_labels(name)).decode("ascii").lower() + "."
+
+
+def encode_query(txid: int, name: str, rtype: str | int = "A", recursion: bool = True, edns: bool = True) -> bytes:
+    flags = FLAG_RD if recursion else 0
+    header = _HEADER.pack(txid, flags, 1, 0, 0, 1 if edns else 0)
+    question = encode_name(name) + struct.pack("!HH", type_code(rtype), CLASS_IN)
+    if not edns:
+        return header + question
+    # OPT pseudo-record advertising a larger UDP payload to avoid truncation
+    opt = b"\x00" + struct.pack("!HHIH", 41, EDNS_PAYLOAD_SIZE, 0, 0)
+    return header + question + opt
+
+
+def read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    labels = []
+    end = None
+    hops = 0
+    while True:
+        if offset >= len(data):
+            raise DNSError("Name runs past end of message")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DNSError("Truncated compression pointer")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            hops += 1
+            if hops > MAX_POINTER_HOPS:
+                raise DNSError("Compression pointer loop")
+            continue
+        if length & 0xC0:
+            raise DNSError("Unsupported label type")
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", errors="replace"))
+        offset += length
+    name = ".".join(labels) + "."
+    return name, end if end is not None else offset
+
+
+def _parse_rdata(data: bytes, offset: int, length: int, rtype: int) -> Any:
+    rdata = data[offset:offset + length]
+    if rtype == 1 and length == 4:
+        return str(ipaddress.IPv4Address(rdata))
+    if rtype == 28 and length == 16:
+        return str(ipaddress.IPv6Address(rdata))
+    if rtype in (2, 5, 12):
+        return read_name(data, offset)[0]
+    if rtype == 15:
+        preference = struct.unpack_from("!H", data, offset)[0]
+        return preference, read_name(data, offset + 2)[0]
+    if rtype == 16:
+        chunks = []
+        position = 0
+        while position < length:
+            size = rdata[position]
+            chunks.append(rdata[position + 1:position + 1 + size].decode("utf-8", errors="replace"))
+            position += 1 + size
+        return chunks
+    if rtype == 6:
+        mname, position = read_name(data, offset)
+        rname, position = read_name(data, position)
+        serial, refresh, retry, expire, minimum = struct.unpack_from("!IIIII", data, position)
+        return mname, rname, serial, refresh, retry, expire, minimum
+    if rtype == 33:
+        priority, weight, port = struct.unpack_from("!HHH", data, offset)
+        return priority, weight, port, read_name(data, offset + 6)[0]
+    return bytes(rdata)
+
+
+def _read_record(data: bytes, offset: int) -> Tuple[DNSRecord, int]:
+    name, offset = read_name(data, offset)
+    if offset + _RR_FIXED.size > len(data):
+        raise DNSError("Truncated resource record")
+    rtype, rclass, ttl, length = _RR_FIXED.unpack_from(data, offset)
+    offset += _RR_FIXED.size
+    if offset + length > len(data):
+        raise DNSError("Resource data runs past end of message")
+    try:
+        payload = _parse_rdata(data, offset, length, rtype)
+    except (struct.error, ValueError, IndexError) as exc:
+        raise DNSError(f"Malformed {TYPE_NAMES.get(rtype, rtype)} record") from exc
+    return DNSRecord(name, rtype, rclass, ttl, payload), offset + length
+
+
+def decode_header(data: bytes) -> Tuple[int, int]:
+    if len(data) < _HEADER.size:
+        raise DNSError("Message shorter than DNS header")
+    txid, flags = struct.unpack_from("!HH", data)
+    return txid, flags
+
+
+def decode_message(data: bytes) -> DNSMessage:
+    if len(data) < _HEADER.size:
+        raise DNSError("Message shorter than DNS header")
+    txid, flags, qdcount, ancount, nscount, arcount = _HEADER.unpack_from(data)
+    message = DNSMessage(txid, flags)
+    offset = _HEADER.size
+    for _ in range(qdcount):
+        name, offset = read_name(data, offset)
+        if offset + 4 > len(data):
+            raise DNSError("Truncated question")
+        qtype, qclass = struct.unpack_from("!HH", data, offset)
+        offset += 4
+        message.questions.append((name, qtype, qclass))
+    if flags & FLAG_TC:
+        # Truncated answers are re-asked over TCP; the sections may be partial.
+        return message
+    for count, section in ((ancount, message.answers), (nscount, message.authority), (arcount, message.additional)):
+        for _ in range(count):
+            record, offset = _read_record(data, offset)
+            section.append(record)
+    return message
+
+
+def reverse_name(address: str) -> str:
+    return ipaddress.ip_address(address).reverse_pointer + "."
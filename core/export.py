@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import threading
+from typing import Callable, Iterable, List
+
+FORMATS = ("csv", "ndjson")
+FILE_FILTERS = "CSV (*.csv);;CSV, gzip (*.csv.gz);;NDJSON (*.ndjson);;NDJSON, gzip (*.ndjson.gz)"
+WRITE_BUFFER = 1 << 20
+PROGRESS_EVERY = 10000
+
+
+def guess_format(path: str) -> str:
+    """``csv`` or ``ndjson`` from the file name, ignoring a trailing ``.gz``."""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return "ndjson" if name.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+class ExportWriter:
+    """Appends rows to a CSV or NDJSON file one at a time.
+
+    Nothing is held in memory beyond the write buffer, so the size of an
+    export is bounded by the disk rather than by RAM. Paths ending in
+    ``.gz`` are gzip-compressed on the fly. CSV columns come from
+    ``fields`` or, failing that, from the first row written.
+    """
+
+    def __init__(self, path: str, fmt: str | None = None, fields: List[str] | None = None):
+        self.path = path
+        self.format = fmt or guess_format(path)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {self.format}")
+        self.fields = list(fields) if fields else None
+        self.rows = 0
+        if path.lower().endswith(".gz"):
+            # Level 6 compresses nearly as well as 9 at a fraction of the CPU
+            raw = gzip.open(path, "wb", compresslevel=6)
+            self._file = io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER), encoding="utf-8", newline="")
+        else:
+            self._file = open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+        self._csv = None
+
+    def write(self, row: dict):
+        if self.format == "ndjson":
+            self._file.write(json.dumps(row, default=str, separators=(",", ":")) + "\n")
+        else:
+            if self._csv is None:
+                self.fields = self.fields or list(row)
+                self._csv = csv.DictWriter(self._file, self.fields, extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        if self.format == "csv" and self._csv is None and self.fields:
+            csv.writer(self._file).writerow(self.fields)
+        self._file.close()
+
+    def __enter__(self) -> "ExportWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export_rows(
+    rows: Iterable[dict],
+    path: str,
+    fmt: str | None = None,
+    fields: List[str] | None = None,
+    on_progress: Callable[[int], None] | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Stream ``rows`` into ``path``; returns how many were written.
+
+    ``rows`` is consumed lazily, so a generator over a database cursor keeps
+    memory flat however long the export is. Stopping leaves a valid, shorter
+    file behind.
+    """
+    with ExportWriter(path, fmt, fields) as writer:
+        for row in rows:
+            if stop is not None and stop.is_set():
+                break
+            writer.write(row)
+            if on_progress and writer.rows % PROGRESS_EVERY == 0:
+                on_progress(writer.rows)
+        if on_progress:
+            on_progress(writer.rows)
+        return writer.rows
+
+
+def export_results(
+    store,
+    tool: str,
+    path: str,
+    fmt: str | None = None,
+    target: str | None = None,
+    since: float | None = None,
+    on_progress: Callable[[int], None] | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Export one tool's rows from a :class:`core.results.ResultsStore`, oldest first."""
+    # Include everything recorded up to now, not just what the writer has committed
+    store.flush()
+    return export_rows(
+        store.iter_rows(tool, target, since),
+        path,
+        fmt,
+        fields=store.columns(tool),
+        on_progress=on_progress,
+        stop=stop,
+    )
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from core.dns_bench import percentile
+from core.metrics import get_metrics
+from core.resolver import get_resolver
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_COUNT = 10
+DEFAULT_CONCURRENCY = 1
+MAX_CONCURRENCY = 64
+# Idle keep-alive connections are dropped after this long; most servers close sooner
+IDLE_TIMEOUT = 30.0
+BODY_BUFFER = 64 << 10
+MAX_HEADER_LINES = 200
+USER_AGENT = "Gatchfier-HTTP-probe/1"
+# Millisecond phases, in the order a cold request goes through them
+PHASES = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "transfer_ms", "total_ms")
+
+_metrics = get_metrics()
+HTTP_REQUESTS = _metrics.counter("gatchfier_http_requests_total", "HTTP probe requests sent")
+HTTP_ERRORS = _metrics.counter("gatchfier_http_errors_total", "HTTP probe requests that failed")
+HTTP_REUSED = _metrics.counter("gatchfier_http_reused_total", "HTTP probe requests sent on a kept-alive connection")
+HTTP_TTFB = _metrics.histogram("gatchfier_http_ttfb_seconds", "HTTP probe time to first byte")
+
+ConnectionKey = Tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    scheme: str
+    host: str
+    port: int
+    path: str
+
+    @property
+    def key(self) -> ConnectionKey:
+        return self.scheme, self.host, self.port
+
+    @property
+    def netloc(self) -> str:
+        """The Host header value: the port is left out when it is the scheme's default."""
+        netloc = f"[{self.host}]" if ":" in self.host else self.host
+        if self.port != (443 if self.scheme == "https" else 80):
+            netloc += f":{self.port}"
+        return netloc
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://{self.netloc}{self.path}"
+
+
+def parse_url(url: str) -> ProbeTarget:
+    """Split a URL into what the probe needs; a bare host means ``http://host/``."""
+    url = url.strip()
+    if "://" not in url:
+        url = f"http://{url}"
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported scheme: {parts.scheme}")
+    if not parts.hostname:
+        raise ValueError(f"No host in URL: {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path += f"?{parts.query}"
+    return ProbeTarget(parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), path)
+
+
+@dataclass
+class HttpTiming:
+    """One request's phase breakdown in milliseconds.
+
+    A request sent on a kept-alive connection skips DNS, connect and TLS, so
+    those phases are 0 and ``reused`` is True. ``ttfb_ms`` runs from the
+    request being written to the first response byte; ``transfer_ms`` from
+    there to the end of the body.
+    """
+
+    url: str
+    address: str | None = None
+    status: int | None = None
+    reason: str = ""
+    http_version: str = ""
+    bytes: int = 0
+    reused: bool = False
+    dns_cached: bool = False
+    tls_version: str | None = None
+    tls_resumed: bool = False
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    transfer_ms: float = 0.0
+    total_ms: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _Connection:
+    __slots__ = ("key", "sock", "reader", "address", "tls_version", "last_used")
+
+    def __init__(self, key: ConnectionKey, sock: socket.socket, address: str):
+        self.key = key
+        self.sock = sock
+        self.reader = sock.makefile("rb", buffering=BODY_BUFFER)
+        self.address = address
+        self.tls_version = sock.version() if isinstance(sock, ssl.SSLSocket) else None
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port), plus TLS sessions.
+
+    Connections are handed out most-recently-used first, so a steady stream
+    of requests keeps reusing the same warm sockets while the rest age out
+    after :data:`IDLE_TIMEOUT`. The last TLS session seen for each host is
+    offered when a new connection has to be opened, so even a cold TCP
+    connection can skip the full handshake if the server resumes it.
+    """
+
+    def __init__(self, max_idle: int = MAX_CONCURRENCY, resume_tls: bool = True):
+        self.max_idle = max_idle
+        self.resume_tls = resume_tls
+        self._idle: Dict[ConnectionKey, List[_Connection]] = {}
+        self._sessions: Dict[ConnectionKey, ssl.SSLSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: ConnectionKey) -> _Connection | None:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn = idle.pop()
+                if now - conn.last_used < IDLE_TIMEOUT:
+                    return conn
+                conn.close()
+        return None
+
+    def put(self, conn: _Connection):
+        conn.last_used = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(conn.key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def session(self, key: ConnectionKey) -> ssl.SSLSession | None:
+        return self._sessions.get(key) if self.resume_tls else None
+
+    def remember_session(self, key: ConnectionKey, session: ssl.SSLSession | None):
+        if self.resume_tls and session is not None:
+            self._sessions[key] = session
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+            self._sessions.clear()
+
+
+def _ms(started: float, ended: float) -> float:
+    return (ended - started) * 1000
+
+
+_contexts: Dict[bool, ssl.SSLContext] = {}
+
+
+def _tls_context(verify: bool) -> ssl.SSLContext:
+    """Shared per verify mode: loading the CA store is slow, and sessions only resume on their own context."""
+    context = _contexts.get(verify)
+    if context is None:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        context.set_alpn_protocols(["http/1.1"])
+        context = _contexts.setdefault(verify, context)
+    return context
+
+
+def _open(target: ProbeTarget, timing: HttpTiming, context: ssl.SSLContext | None, timeout: float, family: int,
+          session: ssl.SSLSession | None = None) -> _Connection:
+    started = time.perf_counter()
+    resolution = get_resolver().lookup(target.host, family)
+    resolved = time.perf_counter()
+    timing.dns_ms = _ms(started, resolved)
+    timing.dns_cached = resolution.from_cache
+    address = resolution.addresses[0]
+    timing.address = address
+
+    sock = socket.socket(socket.AF_INET6 if ":" in address else socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect((address, target.port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connected = time.perf_counter()
+        timing.connect_ms = _ms(resolved, connected)
+        if context is not None:
+            sock = context.wrap_socket(
+                sock,
+                server_hostname=target.host,
+                do_handshake_on_connect=False,
+                session=session,
+            )
+            sock.do_handshake()
+            timing.tls_ms = _ms(connected, time.perf_counter())
+            timing.tls_resumed = sock.session_reused
+    except BaseException:
+        sock.close()
+        raise
+    conn = _Connection(target.key, sock, address)
+    timing.tls_version = conn.tls_version
+    return conn
+
+
+def _read_headers(reader) -> Tuple[str, int, str, Dict[str, str]]:
+    status_line = reader.readline(65537).decode("iso-8859-1").rstrip("\r\n")
+    if not status_line:
+        raise ConnectionError("Connection closed before a response")
+    parts = status_line.split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ConnectionError(f"Malformed status line: {status_line[:80]!r}")
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = reader.readline(65537)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("iso-8859-1").partition(":")
+        name = name.strip().lower()
+        value = value.strip()
+        # Repeated headers are joined, as RFC 9110 allows for list-valued fields
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else "", headers
+
+
+def _drain(reader, view: memoryview, length: int | None) -> int:
+    """Read and discard ``length`` bytes (or up to EOF when None) into ``view``."""
+    received = 0
+    while length is None or received < length:
+        wanted = len(view) if length is None else min(len(view), length - received)
+        count = reader.readinto(view[:wanted])
+        if not count:
+            if length is not None:
+                raise ConnectionError("Connection closed mid-body")
+            break
+        received += count
+    return received
+
+
+def _read_chunked(reader, view: memoryview) -> int:
+    received = 0
+    while True:
+        size_line = reader.readline(1026)
+        if not size_line:
+            raise ConnectionError("Connection closed mid-chunk")
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            # Trailer fields, then the blank line that ends the message
+            while reader.readline(65537) not in (b"\r\n", b"\n", b""):
+                pass
+            return received
+        received += _drain(reader, view, size)
+        reader.readline(3)
+
+
+def probe(
+    target: ProbeTarget,
+    pool: ConnectionPool | None = None,
+    method: str = "GET",
+    timeout: float = DEFAULT_TIMEOUT,
+    verify: bool = True,
+    family: int = socket.AF_INET,
+    buffer: memoryview | None = None,
+) -> HttpTiming:
+    """Send one HTTP/1.1 request and time each phase of it.
+
+    With a ``pool`` the request goes out on an idle kept-alive connection
+    when one exists, and the connection is returned to the pool afterwards
+    if the response allows it; without one every request is cold. A reused
+    connection that turns out to have been closed by the server is retried
+    once on a fresh one, as browsers do, and only the fresh attempt is timed.
+    The body is read into ``buffer`` (or a per-call one) and discarded.
+    """
+    HTTP_REQUESTS.inc()
+    if buffer is None:
+        buffer = memoryview(bytearray(BODY_BUFFER))
+    context = _tls_context(verify) if target.scheme == "https" else None
+    request = (
+        f"{method} {target.path} HTTP/1.1\r\n"
+        f"Host: {target.netloc}\r\n"
+        f"User-Agent: {USER_AGENT}\r\n"
+        "Accept: */*\r\n"
+        "Accept-Encoding: identity\r\n"
+        f"Connection: {'keep-alive' if pool is not None else 'close'}\r\n\r\n"
+    ).encode("ascii")
+
+    for attempt in range(2):
+        timing = HttpTiming(target.url)
+        conn = pool.get(target.key) if pool is not None and attempt == 0 else None
+        timing.reused = conn is not None
+        started = time.perf_counter()
+        try:
+            if conn is None:
+                session = pool.session(target.key) if pool is not None and context is not None else None
+                conn = _open(target, timing, context, timeout, family, session)
+            else:
+                timing.address = conn.address
+                timing.tls_version = conn.tls_version
+            sent = time.perf_counter()
+            conn.sock.settimeout(timeout)
+            conn.sock.sendall(request)
+            if not conn.reader.peek(1):
+                raise ConnectionError("Connection closed before a response")
+            first_byte = time.perf_counter()
+            timing.ttfb_ms = _ms(sent, first_byte)
+            version, timing.status, timing.reason, headers = _read_headers(conn.reader)
+            timing.http_version = version
+            chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+            length = headers.get("content-length")
+            keep_alive = version == "HTTP/1.1" and "close" not in headers.get("connection", "").lower()
+            if method == "HEAD" or timing.status in (204, 304) or 100 <= timing.status < 200:
+                timing.bytes = 0
+            elif chunked:
+                timing.bytes = _read_chunked(conn.reader, buffer)
+            elif length is not None:
+                timing.bytes = _drain(conn.reader, buffer, int(length))
+            else:
+                timing.bytes = _drain(conn.reader, buffer, None)
+                keep_alive = False
+            ended = time.perf_counter()
+            timing.transfer_ms = _ms(first_byte, ended)
+            timing.total_ms = timing.dns_ms + timing.connect_ms + timing.tls_ms + _ms(sent, ended)
+            HTTP_TTFB.observe(timing.ttfb_ms / 1000)
+        except (OSError, ValueError) as exc:
+            if conn is not None:
+                conn.close()
+            if timing.reused and timing.status is None:
+                # The server dropped the idle connection; open a new one
+                continue
+            HTTP_ERRORS.inc()
+            timing.error = str(exc) or type(exc).__name__
+            timing.total_ms = _ms(started, time.perf_counter())
+            return timing
+        if timing.reused:
+            HTTP_REUSED.inc()
+        elif pool is not None and context is not None:
+            # TLS 1.3 tickets arrive after the handshake, so the session is only resumable now
+            pool.remember_session(target.key, conn.sock.session)
+        if pool is not None and keep_alive:
+            pool.put(conn)
+        else:
+            conn.close()
+        return timing
+    return timing
+
+
+@dataclass
+class HttpProbeStats:
+    """Timings of a probe run, summarised separately for cold and reused connections."""
+
+    url: str
+    timings: List[HttpTiming] = field(default_factory=list)
+
+    @property
+    def failures(self) -> int:
+        return sum(1 for timing in self.timings if not timing.ok)
+
+    def group(self, reused: bool) -> List[HttpTiming]:
+        return [timing for timing in self.timings if timing.ok and timing.reused == reused]
+
+    def summary(self) -> List[dict]:
+        rows = []
+        for label, reused in (("cold", False), ("warm", True)):
+            samples = self.group(reused)
+            if not samples:
+                continue
+            row: dict = {"connections": label, "requests": len(samples)}
+            for phase in PHASES:
+                values = [getattr(timing, phase) for timing in samples]
+                for pct in (50, 95, 99):
+                    row[f"{phase[:-3]}_p{pct}"] = round(percentile(values, pct), 2)
+            rows.append(row)
+        return rows
+
+
+def probe_many(
+    url: str,
+    count: int = DEFAULT_COUNT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    keep_alive: bool = True,
+    method: str = "GET",
+    timeout: float = DEFAULT_TIMEOUT,
+    verify: bool = True,
+    on_result: Callable[[HttpTiming], None] | None = None,
+    stop: threading.Event | None = None,
+    manager=None,
+) -> HttpProbeStats:
+    """Send ``count`` requests to ``url`` with up to ``concurrency`` in flight.
+
+    Requests run on the job manager's I/O pool, so each one holds a socket
+    slot while it runs. With ``keep_alive`` they share one connection pool:
+    the first request on each connection shows the cold cost and the rest
+    the warm cost, which :meth:`HttpProbeStats.summary` reports side by side.
+    Without it every request opens and closes its own connection.
+    """
+    target = parse_url(url)
+    stop = stop or threading.Event()
+    concurrency = max(1, min(MAX_CONCURRENCY, concurrency))
+    if manager is None:
+        from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+        manager = get_job_manager()
+    family = socket.AF_INET6 if ":" in target.host else socket.AF_INET
+    pool = ConnectionPool(max_idle=concurrency) if keep_alive else None
+    # One body buffer per in-flight request, handed back when the request finishes
+    buffers = [memoryview(bytearray(BODY_BUFFER)) for _ in range(concurrency)]
+    stats = HttpProbeStats(target.url)
+
+    def run(buffer: memoryview) -> Tuple[HttpTiming, memoryview]:
+        return probe(target, pool, method, timeout, verify, family, buffer), buffer
+
+    pending: set[Future] = set()
+    submitted = 0
+    try:
+        while not stop.is_set():
+            while submitted < count and buffers:
+                future = manager.submit_io(run, buffers.pop(), token=stop)
+                if future is None:
+                    break
+                pending.add(future)
+                submitted += 1
+            if not pending:
+                break
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                timing, buffer = future.result()
+                buffers.append(buffer)
+                stats.timings.append(timing)
+                if on_result:
+                    on_result(timing)
+    finally:
+        wait(pending)
+        if pool is not None:
+            pool.close()
+    return stats
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+PRIORITY_LABELS = {
+    PRIORITY_INTERACTIVE: "Interactive",
+    PRIORITY_NORMAL: "Normal",
+    PRIORITY_BULK: "Bulk",
+}
+
+STATE_QUEUED = "Queued"
+STATE_RUNNING = "Running"
+STATE_DONE = "Done"
+STATE_FAILED = "Failed"
+STATE_CANCELLED = "Cancelled"
+
+DEFAULT_JOB_THREADS = 16
+DEFAULT_IO_THREADS = 128
+DEFAULT_SOCKET_LIMIT = 512
+# Job threads bulk work may never take, so interactive jobs start promptly
+INTERACTIVE_RESERVE = 4
+FINISHED_HISTORY = 50
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken(threading.Event):
+    """Cancellation flag handed to a job.
+
+    It is a ``threading.Event``, so it can be passed anywhere the engines
+    already accept a ``stop`` event.
+    """
+
+    def cancel(self):
+        self.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.is_set()
+
+    def raise_if_cancelled(self):
+        if self.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    def __init__(
+        self,
+        job_id: int,
+        name: str,
+        tool: str,
+        priority: int,
+        fn: Callable[["Job"], Any],
+        token: CancelToken,
+        on_skipped: Callable[["Job"], None] | None = None,
+    ):
+        self.id = job_id
+        self.name = name
+        self.tool = tool
+        self.priority = priority
+        self.fn = fn
+        self.token = token
+        self.on_skipped = on_skipped
+        self.state = STATE_QUEUED
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.submitted = time.monotonic()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.result: Any = None
+        self.error: str | None = None
+
+    def report(self, done: int, total: int = 0, message: str | None = None):
+        self.done = done
+        self.total = total
+        if message is not None:
+            self.message = message
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def fraction(self) -> float | None:
+        return self.done / self.total if self.total else None
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def active(self) -> bool:
+        return self.state in (STATE_QUEUED, STATE_RUNNING)
+
+
+class JobManager:
+    """One scheduler for every tool in the app.
+
+    Jobs wait in a priority queue and run on a bounded set of job threads;
+    bulk jobs are kept off the last ``INTERACTIVE_RESERVE`` threads. Short
+    blocking calls inside a job (socket connects, per-item lookups) go through
+    :meth:`submit_io`, which shares one I/O pool and a global socket budget.
+
+    A job cancelled while still queued is never started. It is marked
+    cancelled when a job thread dequeues it, and its ``on_skipped`` callback,
+    if any, runs on that thread instead so the owner still sees it end.
+    """
+
+    def __init__(
+        self,
+        job_threads: int = DEFAULT_JOB_THREADS,
+        io_threads: int = DEFAULT_IO_THREADS,
+        socket_limit: int = DEFAULT_SOCKET_LIMIT,
+    ):
+        self.job_threads = max(2, job_threads)
+        self.bulk_limit = max(1, self.job_threads - INTERACTIVE_RESERVE)
+        self.socket_limit = socket_limit
+        self._lock = threading.Condition()
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, Job] = {}
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._running_bulk = 0
+        self._sockets = threading.Semaphore(socket_limit)
+        self._sockets_lock = threading.Lock()
+        self.sockets_in_use = 0
+        self._io = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="io")
+        self._shutdown = False
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[[Job], Any],
+        priority: int = PRIORITY_NORMAL,
+        tool: str = "",
+        token: CancelToken | None = None,
+        on_skipped: Callable[[Job], None] | None = None,
+    ) -> Job:
+        with self._lock:
+            job = Job(next(self._ids), name, tool, priority, fn, token or CancelToken(), on_skipped)
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            # Idle threads already woken for earlier jobs still count as idle,
+            # so compare against the whole queue, not just this job
+            if len(self._queue) > self._idle and len(self._threads) < self.job_threads:
+                thread = threading.Thread(target=self._work, name=f"job-{len(self._threads) + 1}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._lock.notify_all()
+            self._trim_history()
+        return job
+
+    def _next_job(self) -> Job | None:
+        """Pop the best runnable job; bulk jobs wait once they fill their share."""
+        deferred = []
+        job = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            if entry[0] >= PRIORITY_BULK and self._running_bulk >= self.bulk_limit:
+                deferred.append(entry)
+                continue
+            job = entry[2]
+            break
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        return job
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    self._lock.wait()
+                    self._idle -= 1
+                    job = self._next_job()
+                skipped = job.token.cancelled
+                if skipped:
+                    job.state = STATE_CANCELLED
+                    job.finished = time.monotonic()
+                else:
+                    job.state = STATE_RUNNING
+                    job.started = time.monotonic()
+                    if job.priority >= PRIORITY_BULK:
+                        self._running_bulk += 1
+            if skipped:
+                self._skip(job)
+                continue
+            try:
+                job.result = job.fn(job)
+                state = STATE_CANCELLED if job.token.cancelled else STATE_DONE
+            except JobCancelled:
+                state = STATE_CANCELLED
+            except Exception as exc:  # pylint: disable=broad-except
+                job.error = str(exc)
+                state = STATE_FAILED
+            with self._lock:
+                job.state = state
+                job.finished = time.monotonic()
+                if job.priority >= PRIORITY_BULK:
+                    self._running_bulk -= 1
+                self._lock.notify_all()
+
+    @staticmethod
+    def _skip(job: Job):
+        if job.on_skipped is None:
+            return
+        try:
+            job.on_skipped(job)
+        except Exception as exc:  # pylint: disable=broad-except
+            job.error = str(exc)
+
+    def _trim_history(self):
+        finished = [job for job in self._jobs.values() if not job.active]
+        for job in finished[: max(0, len(finished) - FINISHED_HISTORY)]:
+            del self._jobs[job.id]
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, job_id: int) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in self.jobs():
+            job.cancel()
+
+    def acquire_socket(self, token: threading.Event | None = None) -> bool:
+        """Take one slot from the global socket budget; False if cancelled first."""
+        while not self._sockets.acquire(timeout=0.1):
+            if token is not None and token.is_set():
+                return False
+        with self._sockets_lock:
+            self.sockets_in_use += 1
+        return True
+
+    def release_socket(self):
+        with self._sockets_lock:
+            self.sockets_in_use -= 1
+        self._sockets.release()
+
+    def submit_io(self, fn: Callable[..., Any], *args, token: threading.Event | None = None) -> Future | None:
+        """Run a short socket-bound call on the shared I/O pool.
+
+        Blocks the caller until a socket slot is free, which is what keeps a
+        large scan from crowding out everything else. Returns None if
+        ``token`` is set while waiting.
+        """
+        if not self.acquire_socket(token):
+            return None
+        future = self._io.submit(fn, *args)
+        future.add_done_callback(lambda _: self.release_socket())
+        return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            return {
+                "running": sum(1 for job in jobs if job.state == STATE_RUNNING),
+                "queued": sum(1 for job in jobs if job.state == STATE_QUEUED),
+                "job_threads": len(self._threads),
+                "sockets_in_use": self.sockets_in_use,
+                "socket_limit": self.socket_limit,
+            }
+
+    def shutdown(self):
+        self.cancel_all()
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+        self._io.shutdown(wait=False, cancel_futures=True)
+
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
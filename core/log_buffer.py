@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, List
+
+DEFAULT_MAX_LINES = 5000
+
+
+class LogBuffer:
+    """Fixed-size ring of output lines plus the batch waiting to be shown.
+
+    Writers call :meth:`append` as often as they like; the view drains
+    :meth:`take_pending` once per frame. Filtering and searching read the
+    ring, so they see every retained line regardless of what the view shows.
+    While a filter is set, ``matched`` is kept up to date as lines enter and
+    leave the ring, so showing the match count never rescans it.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        self.max_lines = max_lines
+        self._lines: deque = deque(maxlen=max_lines)
+        self._pending: List[str] = []
+        self.total = 0
+        self.dropped = 0
+        self._needle = ""
+        # One flag per ring line, in step with _lines, while a filter is set
+        self._flags: deque = deque(maxlen=max_lines)
+        self.matched = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def append(self, text: str):
+        lines = str(text).split("\n")
+        overflow = len(self._lines) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.dropped += overflow
+        self._lines.extend(lines)
+        if self._needle:
+            flags = self._flags
+            for line in lines:
+                hit = self._needle in line.casefold()
+                if len(flags) == self.max_lines:
+                    self.matched -= flags[0]
+                flags.append(hit)
+                self.matched += hit
+        else:
+            self.matched = len(self._lines)
+        self._pending.extend(lines)
+        self.total += len(lines)
+        # A backlog longer than the ring can never be displayed in full
+        if len(self._pending) > self.max_lines:
+            del self._pending[: len(self._pending) - self.max_lines]
+
+    def extend(self, texts: Iterable[str]):
+        for text in texts:
+            self.append(text)
+
+    def take_pending(self) -> List[str]:
+        pending, self._pending = self._pending, []
+        return pending
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def clear(self):
+        self._lines.clear()
+        self._flags.clear()
+        self._pending = []
+        self.dropped = 0
+        self.matched = 0
+
+    def set_filter(self, pattern: str) -> List[str]:
+        """Start counting lines containing ``pattern``; returns the lines that match now."""
+        self._needle = pattern.casefold()
+        self._flags.clear()
+        if not self._needle:
+            self.matched = len(self._lines)
+            return list(self._lines)
+        self._flags.extend(self._needle in line.casefold() for line in self._lines)
+        self.matched = sum(self._flags)
+        return [line for line, hit in zip(self._lines, self._flags) if hit]
+
+    def lines(self) -> List[str]:
+        return list(self._lines)
+
+    def matching(self, pattern: str) -> List[str]:
+        """Lines containing ``pattern``, case-insensitively."""
+        if not pattern:
+            return list(self._lines)
+        needle = pattern.casefold()
+        return [line for line in self._lines if needle in line.casefold()]
+
+    def count(self, pattern: str) -> int:
+        if not pattern:
+            return len(self._lines)
+        needle = pattern.casefold()
+        return sum(1 for line in self._lines if needle in line.casefold())
+
+    def text(self) -> str:
+        return "\n".join(self._lines)
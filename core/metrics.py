@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+METRICS_PORT_ENV = "GATCHFIER_METRICS_PORT"
+
+# Seconds; spans a loopback connect up to a slow whois referral chain
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic count, either incremented here or read from ``source`` when sampled.
+
+    Like the ResultChannel counters, updates take no lock: a lost increment
+    under heavy contention is harmless, and it keeps ``inc`` to a single add
+    on per-probe paths. A ``source`` lets a service that already keeps a
+    running total export it without a second count on its hot path.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = "", source: Callable[[], float] | None = None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.source = source
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def sample(self) -> float:
+        if self.source is not None:
+            try:
+                return float(self.source())
+            except Exception:  # pylint: disable=broad-except
+                return float("nan")
+        return self.value
+
+
+class Gauge:
+    """Current level, either set directly or read from ``source`` when sampled."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str = "", source: Callable[[], float] | None = None):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+        self.source = source
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def sample(self) -> float:
+        if self.source is not None:
+            try:
+                return float(self.source())
+            except Exception:  # pylint: disable=broad-except
+                return float("nan")
+        return self.value
+
+
+class Histogram:
+    """Fixed-bucket distribution; ``observe`` is one bisect and three adds, unlocked like Counter."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def sample(self) -> float:
+        return self.count
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def mean(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+
+class RateMeter:
+    """Exponentially smoothed rate of a growing count, sampled at any cadence.
+
+    Each :meth:`update` folds the rate since the previous sample into the
+    average with a weight that depends on the elapsed time, so a sample taken
+    late counts for more than one taken early and ``half_life`` stays in
+    seconds whatever the polling interval.
+    """
+
+    def __init__(self, half_life: float = 5.0):
+        self.half_life = half_life
+        self.rate: float | None = None
+        self._last: Tuple[float, int] | None = None
+
+    def reset(self):
+        self.rate = None
+        self._last = None
+
+    def update(self, count: int, now: float | None = None) -> float | None:
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            last_time, last_count = self._last
+            elapsed = now - last_time
+            if elapsed <= 0:
+                return self.rate
+            instant = (count - last_count) / elapsed
+            if self.rate is None:
+                self.rate = instant
+            else:
+                weight = 1 - 0.5 ** (elapsed / self.half_life)
+                self.rate += weight * (instant - self.rate)
+        self._last = (now, count)
+        return self.rate
+
+    def eta(self, remaining: int) -> float | None:
+        """Seconds left for ``remaining`` more at the smoothed rate; None until a rate is known."""
+        if not self.rate or self.rate <= 0:
+            return None
+        return remaining / self.rate
+
+
+class MetricsRegistry:
+    """Named metrics shared by every engine; creating one twice returns the first."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Counter | Gauge | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str = "", source: Callable[[], float] | None = None) -> Counter:
+        return self._get(Counter, name, help_text, source)
+
+    def gauge(self, name: str, help_text: str = "", source: Callable[[], float] | None = None) -> Gauge:
+        return self._get(Gauge, name, help_text, source)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets)
+
+    def metrics(self) -> List[Counter | Gauge | Histogram]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                counts, value_sum = list(metric.counts), metric.sum
+                total = sum(counts)
+                cumulative = 0
+                for bound, count in zip(metric.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{metric.name}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric.name}_bucket{{le="+Inf"}} {total}')
+                lines.append(f"{metric.name}_sum {value_sum:g}")
+                lines.append(f"{metric.name}_count {total}")
+            else:
+                lines.append(f"{metric.name} {metric.sample():g}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
+
+
+def _register_service_metrics(registry: MetricsRegistry):
+    # Read from the existing services when sampled, so they cost nothing in between
+    def job_stat(key: str) -> Callable[[], float]:
+        def read() -> float:
+            from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+            return get_job_manager().stats()[key]
+
+        return read
+
+    def resolver_stat(*keys: str) -> Callable[[], float]:
+        def read() -> float:
+            from core.resolver import get_resolver  # pylint: disable=import-outside-toplevel
+
+            stats = get_resolver().stats()
+            return sum(stats[key] for key in keys)
+
+        return read
+
+    registry.gauge("gatchfier_sockets_in_flight", "Sockets held from the shared socket budget", job_stat("sockets_in_use"))
+    registry.gauge("gatchfier_jobs_running", "Jobs running on the job manager", job_stat("running"))
+    registry.gauge("gatchfier_jobs_queued", "Jobs waiting for a job thread", job_stat("queued"))
+    registry.counter(
+        "gatchfier_resolver_cache_hits_total",
+        "Resolver cache hits, including negative hits",
+        resolver_stat("hits", "negative_hits"),
+    )
+    registry.counter(
+        "gatchfier_resolver_cache_misses_total", "Resolver lookups that went to the system", resolver_stat("misses")
+    )
+    registry.gauge("gatchfier_resolver_cache_entries", "Names held in the resolver cache", resolver_stat("entries"))
+
+
+_register_service_metrics(_registry)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve ``/metrics`` on localhost from a daemon thread; returns the server."""
+    # Imported here so engines that only count things never load http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # pylint: disable=import-outside-toplevel
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # pylint: disable=invalid-name
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = _registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def metrics_port_from_env() -> int | None:
+    value = os.environ.get(METRICS_PORT_ENV, "").strip()
+    return int(value) if value.isdigit() else None
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List
+
+from core.metrics import get_metrics
+from core.paths import data_path
+from core.timer_wheel import DEFAULT_TICK, TimerWheel
+
+MONITORS_FILE = "monitors.json"
+CHECK_KINDS = ("icmp", "tcp", "dns", "whois")
+DEFAULT_INTERVAL = 60.0
+DEFAULT_JITTER = 0.1
+CHECK_TIMEOUT = 3.0
+
+STATUS_PENDING = "Pending"
+STATUS_OK = "OK"
+STATUS_FAILING = "Failing"
+STATUS_ALERT = "Alert"
+
+# Fields saved to monitors.json; the rest is runtime state
+CONFIG_FIELDS = ("kind", "target", "interval", "port", "rtype", "expect", "max_latency_ms", "min_expiry_days", "fail_after")
+
+_metrics = get_metrics()
+CHECKS_RUN = _metrics.counter("gatchfier_monitor_checks_total", "Monitor checks executed")
+CHECKS_FAILED = _metrics.counter("gatchfier_monitor_failures_total", "Monitor checks that failed or breached a threshold")
+ALERTS_RAISED = _metrics.counter("gatchfier_monitor_alerts_total", "Monitor alerts raised")
+DISPATCH_LAG = _metrics.histogram("gatchfier_monitor_dispatch_lag_seconds", "How late checks are dispatched after falling due")
+
+
+@dataclass
+class Check:
+    kind: str
+    target: str
+    interval: float = DEFAULT_INTERVAL
+    port: int | None = None
+    rtype: str = "A"
+    expect: str | None = None
+    max_latency_ms: float | None = None
+    min_expiry_days: float | None = None
+    fail_after: int = 1
+    id: int = 0
+    status: str = STATUS_PENDING
+    value: float | None = None
+    detail: str = ""
+    last_run: float | None = None
+    failures: int = 0
+    alerting: bool = False
+    running: bool = field(default=False, repr=False)
+    due: float = field(default=0.0, repr=False)
+
+    def label(self) -> str:
+        target = f"{self.target}:{self.port}" if self.kind == "tcp" else self.target
+        return f"{self.kind.upper()} {target}"
+
+    def to_config(self) -> dict:
+        return {name: value for name, value in asdict(self).items() if name in CONFIG_FIELDS}
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    check_id: int
+    ok: bool
+    value: float | None = None
+    detail: str = ""
+    ts: float = 0.0
+
+
+@dataclass(frozen=True)
+class Alert:
+    check_id: int
+    label: str
+    raised: bool
+    message: str
+    ts: float
+
+
+def _resolve(host: str, family: int = socket.AF_INET) -> str:
+    from core.resolver import get_resolver  # pylint: disable=import-outside-toplevel
+
+    return get_resolver().lookup(host, family).addresses[0]
+
+
+def check_icmp(check: Check) -> CheckResult:
+    from core.ping import ping_host  # pylint: disable=import-outside-toplevel
+
+    replies = []
+    ping_host(_resolve(check.target), replies.append, count=1, timeout=min(CHECK_TIMEOUT, check.interval))
+    rtt = replies[0].rtt_ms if replies else None
+    if rtt is None:
+        return CheckResult(check.id, False, None, "Request timed out")
+    return CheckResult(check.id, True, round(rtt, 2), f"{rtt:.1f} ms")
+
+
+def check_tcp(check: Check) -> CheckResult:
+    address = _resolve(check.target)
+    started = time.perf_counter()
+    try:
+        with socket.create_connection((address, check.port or 80), timeout=CHECK_TIMEOUT):
+            pass
+    except OSError as exc:
+        return CheckResult(check.id, False, None, str(exc) or type(exc).__name__)
+    elapsed = (time.perf_counter() - started) * 1000
+    return CheckResult(check.id, True, round(elapsed, 2), f"connected in {elapsed:.1f} ms")
+
+
+def check_dns(check: Check) -> CheckResult:
+    from core.dns_lookup import lookup  # pylint: disable=import-outside-toplevel
+
+    started = time.perf_counter()
+    result = lookup(check.target, check.rtype)
+    elapsed = result.elapsed_ms if result.elapsed_ms is not None else (time.perf_counter() - started) * 1000
+    if result.error:
+        return CheckResult(check.id, False, None, result.error)
+    answers = result.records or result.addresses
+    if check.expect and not any(check.expect in answer for answer in answers):
+        return CheckResult(check.id, False, round(elapsed, 2), f"{check.expect} not in answer")
+    return CheckResult(check.id, True, round(elapsed, 2), ", ".join(answers[:3]) or "empty answer")
+
+
+def check_whois(check: Check) -> CheckResult:
+    from core.whois_cache import get_whois_cache  # pylint: disable=import-outside-toplevel
+    from core.whois_client import WhoisClient  # pylint: disable=import-outside-toplevel
+
+    # Expiry dates change rarely; the cache keeps frequent checks off the registries
+    cache = get_whois_cache()
+    cached = cache.get(check.target)
+    if cached:
+        record = cached[0]
+    else:
+        record = WhoisClient().lookup(check.target)
+        cache.put(check.target, record)
+    expiration = record.get("expiration_date")
+    if isinstance(expiration, list):
+        expiration = expiration[0] if expiration else None
+    if not isinstance(expiration, datetime.datetime):
+        return CheckResult(check.id, False, None, "No expiration date in record")
+    days = (expiration - datetime.datetime.now(expiration.tzinfo)).total_seconds() / 86400
+    return CheckResult(check.id, True, round(days, 1), f"expires {expiration:%Y-%m-%d}")
+
+
+CHECK_RUNNERS: Dict[str, Callable[[Check], CheckResult]] = {
+    "icmp": check_icmp,
+    "tcp": check_tcp,
+    "dns": check_dns,
+    "whois": check_whois,
+}
+
+
+def run_check(check: Check) -> CheckResult:
+    try:
+        result = CHECK_RUNNERS[check.kind](check)
+    except Exception as exc:  # pylint: disable=broad-except
+        result = CheckResult(check.id, False, None, str(exc) or type(exc).__name__)
+    return CheckResult(result.check_id, result.ok, result.value, result.detail, time.time())
+
+
+def breach(check: Check, result: CheckResult) -> str | None:
+    """Why ``result`` counts against ``check``, or None when it is healthy."""
+    if not result.ok:
+        return result.detail
+    if check.max_latency_ms is not None and result.value is not None and result.value > check.max_latency_ms:
+        return f"{result.value:.1f} ms is above {check.max_latency_ms:g} ms"
+    if check.min_expiry_days is not None and result.value is not None and result.value < check.min_expiry_days:
+        return f"expires in {result.value:.0f} days (threshold {check.min_expiry_days:g})"
+    return None
+
+
+class MonitorScheduler:
+    """Runs recurring checks from one timer wheel on the shared I/O pool.
+
+    A single thread advances the wheel each tick and hands due checks to the
+    job manager's I/O pool, so holding thousands of checks costs one timer
+    entry each rather than one QTimer or thread each. Checks start at a
+    random offset within their interval and every reschedule adds up to
+    ``jitter`` (a fraction of the interval) either way, so checks added
+    together do not keep firing together. A check is rescheduled when it
+    finishes, so a slow target never has two probes in flight.
+    """
+
+    def __init__(
+        self,
+        on_result: Callable[[Check, CheckResult], None] | None = None,
+        on_alert: Callable[[Alert], None] | None = None,
+        manager=None,
+        store=None,
+        tick: float = DEFAULT_TICK,
+        jitter: float = DEFAULT_JITTER,
+        runner: Callable[[Check], CheckResult] = run_check,
+    ):
+        self.on_result = on_result
+        self.on_alert = on_alert
+        self.manager = manager
+        self.store = store
+        self.jitter = jitter
+        self.runner = runner
+        self.wheel = TimerWheel(tick)
+        self._checks: Dict[int, Check] = {}
+        self._handles: Dict[int, int] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def checks(self) -> List[Check]:
+        with self._lock:
+            return list(self._checks.values())
+
+    def add(self, check: Check) -> Check:
+        if check.kind not in CHECK_KINDS:
+            raise ValueError(f"Unknown check kind: {check.kind}")
+        check.interval = max(self.wheel.tick, float(check.interval))
+        with self._lock:
+            check.id = self._next_id
+            self._next_id += 1
+            self._checks[check.id] = check
+            self._schedule(check, random.uniform(0, check.interval))
+        return check
+
+    def remove(self, check_id: int) -> bool:
+        with self._lock:
+            check = self._checks.pop(check_id, None)
+            handle = self._handles.pop(check_id, None)
+            if handle is not None:
+                self.wheel.cancel(handle)
+        return check is not None
+
+    def clear(self):
+        for check in self.checks():
+            self.remove(check.id)
+
+    def _schedule(self, check: Check, delay: float):
+        check.due = time.monotonic() + delay
+        self._handles[check.id] = self.wheel.schedule(delay, check.id)
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="monitor-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+        self._thread = None
+
+    def _loop(self):
+        manager = self.manager
+        if manager is None:
+            from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+            manager = get_job_manager()
+        while not self._stop.wait(self.wheel.time_until_next_tick()):
+            now = time.monotonic()
+            with self._lock:
+                due = [self._checks[check_id] for check_id in self.wheel.advance(now) if check_id in self._checks]
+                for check in due:
+                    self._handles.pop(check.id, None)
+                    check.running = True
+            for check in due:
+                DISPATCH_LAG.observe(max(0.0, now - check.due))
+                # Blocks while the app-wide socket budget is spent; the wheel catches up afterwards
+                if manager.submit_io(self._execute, check, token=self._stop) is None:
+                    check.running = False
+                    return
+
+    def _execute(self, check: Check):
+        result = self.runner(check)
+        CHECKS_RUN.inc()
+        reason = breach(check, result)
+        check.value = result.value
+        check.last_run = result.ts
+        check.detail = reason or result.detail
+        alert = None
+        if reason:
+            CHECKS_FAILED.inc()
+            check.failures += 1
+            if check.failures >= check.fail_after and not check.alerting:
+                check.alerting = True
+                ALERTS_RAISED.inc()
+                alert = Alert(check.id, check.label(), True, reason, result.ts)
+        else:
+            check.failures = 0
+            if check.alerting:
+                check.alerting = False
+                alert = Alert(check.id, check.label(), False, result.detail, result.ts)
+        check.status = STATUS_ALERT if check.alerting else STATUS_FAILING if reason else STATUS_OK
+
+        if self.store is not None:
+            self.store.record(
+                "monitor", check.target, kind=check.kind, port=check.port, ok=int(reason is None),
+                value=result.value, detail=check.detail,
+            )
+        with self._lock:
+            check.running = False
+            if check.id in self._checks and not self._stop.is_set():
+                spread = check.interval * self.jitter
+                self._schedule(check, check.interval + random.uniform(-spread, spread))
+        if self.on_result:
+            self.on_result(check, result)
+        if alert and self.on_alert:
+            self.on_alert(alert)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "checks": len(self._checks),
+                "timers": len(self.wheel),
+                "alerting": sum(1 for check in self._checks.values() if check.alerting),
+                "running": sum(1 for check in self._checks.values() if check.running),
+            }
+
+
+def load_checks(path: str | None = None) -> List[Check]:
+    path = path or data_path(MONITORS_FILE)
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            entries = json.load(handle)
+    except (OSError, ValueError):
+        return []
+    checks = []
+    for entry in entries:
+        try:
+            checks.append(Check(**{name: entry[name] for name in CONFIG_FIELDS if name in entry}))
+        except TypeError:
+            continue
+    return checks
+
+
+def save_checks(checks: List[Check], path: str | None = None):
+    path = path or data_path(MONITORS_FILE)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump([check.to_config() for check in checks], handle, indent=2)
+    os.replace(temp_path, path)
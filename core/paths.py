@@ -0,0 +1,20 @@
+import os
+import sys
+
+
+def app_data_dir() -> str:
+    """Directory holding per-user configuration and caches (~/.gatchfier)."""
+    path = os.path.join(os.path.expanduser("~"), ".gatchfier")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(name: str) -> str:
+    return os.path.join(app_data_dir(), name)
+
+
+def resource_path(relative_path: str) -> str:
+    """Locate bundled resources when running from source or a frozen executable."""
+    if hasattr(sys, "_MEIPASS"):
+        return os.path.join(sys._MEIPASS, relative_path)  # pylint: disable=protected-access
+    return os.path.join(os.path.abspath("."), relative_path)
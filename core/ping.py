@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from core.metrics import get_metrics
+
+PING_INTERVAL = 1.0
+PING_TIMEOUT = 4.0
+
+_metrics = get_metrics()
+PINGS_SENT = _metrics.counter("gatchfier_ping_sent_total", "ICMP echo requests sent")
+PINGS_LOST = _metrics.counter("gatchfier_ping_lost_total", "ICMP echo requests without a reply")
+PING_RTT = _metrics.histogram("gatchfier_ping_rtt_seconds", "ICMP echo round-trip time")
+
+
+@dataclass(frozen=True)
+class PingReply:
+    seq: int
+    target: str
+    rtt_ms: float | None
+
+    @property
+    def ok(self) -> bool:
+        return self.rtt_ms is not None
+
+
+def ping_host(
+    target: str,
+    on_reply: Callable[[PingReply], None],
+    count: int | None = 4,
+    use_ipv6: bool = False,
+    interval: float = PING_INTERVAL,
+    timeout: float = PING_TIMEOUT,
+    stop: threading.Event | None = None,
+) -> int:
+    """Send echo requests every ``interval`` seconds; ``count=None`` runs until stopped.
+
+    Returns the number of requests sent.
+    """
+    # ping3 is only needed once a ping is sent, so keep it off every startup path
+    import ping3  # pylint: disable=import-outside-toplevel
+
+    stop = stop or threading.Event()
+    ping3.IPV6 = use_ipv6
+    sent = 0
+    while not stop.is_set() and (count is None or sent < count):
+        started = time.monotonic()
+        result = ping3.ping(target, unit="ms", timeout=timeout)
+        sent += 1
+        PINGS_SENT.inc()
+        if isinstance(result, float):
+            PING_RTT.observe(result / 1000)
+        else:
+            result = None
+            PINGS_LOST.inc()
+        on_reply(PingReply(sent, target, result))
+        if count is not None and sent >= count:
+            break
+        stop.wait(max(0.0, interval - (time.monotonic() - started)))
+    return sent
+
+
+def summarize(replies: List[PingReply]) -> Dict[str, float | int | None]:
+    times = [reply.rtt_ms for reply in replies if reply.rtt_ms is not None]
+    sent = len(replies)
+    return {
+        "sent": sent,
+        "received": len(times),
+        "loss_pct": round((sent - len(times)) / sent * 100, 1) if sent else 0.0,
+        "min_ms": min(times) if times else None,
+        "avg_ms": sum(times) / len(times) if times else None,
+        "max_ms": max(times) if times else None,
+    }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import errno
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, Tuple
+
+from core.metrics import get_metrics
+from core.portset import STATE_FILTERED, STATE_OPEN, HostPorts
+
+COMMON_SERVICES = {
+    21: "FTP",
+    22: "SSH",
+    23: "Telnet",
+    25: "SMTP",
+    53: "DNS",
+    80: "HTTP",
+    110: "POP3",
+    143: "IMAP",
+    443: "HTTPS",
+    3306: "MySQL",
+    3389: "RDP",
+    5432: "PostgreSQL",
+    5900: "VNC",
+    6379: "Redis",
+    8080: "HTTP Alternate",
+}
+
+ALL_PORTS = range(1, 65536)
+SCAN_WINDOW = 100
+CONNECT_TIMEOUT = 0.3
+
+# connect_ex results that mean nothing answered (filtered), across platforms
+TIMEOUT_ERRNOS = {
+    errno.EAGAIN,
+    errno.EWOULDBLOCK,
+    errno.ETIMEDOUT,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+    getattr(errno, "WSAETIMEDOUT", errno.ETIMEDOUT),
+}
+
+_metrics = get_metrics()
+PROBES = _metrics.counter("gatchfier_scan_probes_total", "TCP connects attempted by port scans")
+OPEN_FOUND = _metrics.counter("gatchfier_scan_open_total", "Connects that found an open port")
+TIMEOUTS = _metrics.counter("gatchfier_scan_timeouts_total", "Connects that got no answer before the timeout")
+CONNECT_SECONDS = _metrics.histogram("gatchfier_scan_connect_seconds", "Time spent per TCP connect")
+
+
+@dataclass(frozen=True)
+class OpenPort:
+    port: int
+    service: str
+
+
+def parse_ports(spec: str) -> List[int]:
+    """Expand ``"22,80,8000-8100"`` into a sorted list of unique ports."""
+    ports = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        start, end = int(low), int(high or low)
+        if not 1 <= start <= end <= 65535:
+            raise ValueError(f"Invalid port range: {part}")
+        ports.update(range(start, end + 1))
+    return sorted(ports)
+
+
+class ScanProgress:
+    """Live counts for one scan, written only by the scan loop and read at any time.
+
+    The scan loop is the single writer, so plain attribute updates are enough;
+    a display polls them at its own cadence instead of receiving a signal per
+    port.
+    """
+
+    __slots__ = ("total", "completed", "open", "closed", "filtered", "in_flight", "window")
+
+    def __init__(self, total: int = 0, window: int = 0):
+        self.total = total
+        self.completed = 0
+        self.open = 0
+        self.closed = 0
+        self.filtered = 0
+        self.in_flight = 0
+        self.window = window
+
+
+def scan_ports(
+    address: str,
+    ports: Sequence[int] = ALL_PORTS,
+    on_open: Callable[[OpenPort], None] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    stop: threading.Event | None = None,
+    submit: Callable[..., Future | None] | None = None,
+    throttle: Callable[[float], bool] | None = None,
+    window: int = SCAN_WINDOW,
+    timeout: float = CONNECT_TIMEOUT,
+    result: HostPorts | None = None,
+    progress: ScanProgress | None = None,
+) -> List[OpenPort]:
+    """TCP connect scan keeping at most ``window`` connects in flight.
+
+    Connects run through ``submit`` (the shared job manager's I/O pool and
+    socket budget by default). ``throttle`` lets a slow consumer hold the scan
+    back; it is called with a timeout and returns False to wait longer.
+    When ``result`` is given, every probed port's state is marked in its
+    bitmaps as the probe completes, and ``progress`` counts are kept current.
+    """
+    stop = stop or threading.Event()
+    if submit is None:
+        from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+        manager = get_job_manager()
+
+        def submit(fn, port):
+            return manager.submit_io(fn, port, token=stop)
+
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+
+    def probe(port: int) -> Tuple[int, int | None] | None:
+        """``(port, state)`` with state None for closed; None when skipped or failed locally."""
+        if stop.is_set():
+            return None
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                started = time.perf_counter()
+                code = sock.connect_ex((address, port))
+                CONNECT_SECONDS.observe(time.perf_counter() - started)
+                PROBES.inc()
+                if code in TIMEOUT_ERRNOS:
+                    TIMEOUTS.inc()
+                    return port, STATE_FILTERED
+                if code == 0:
+                    OPEN_FOUND.inc()
+                    return port, STATE_OPEN
+        except OSError:
+            return None
+        return port, None
+
+    total = len(ports)
+    remaining = iter(ports)
+    pending = set()
+    completed = 0
+    if progress is None:
+        progress = ScanProgress()
+    progress.total = total
+    progress.window = window
+    open_ports: List[OpenPort] = []
+    while not stop.is_set():
+        if throttle is not None and not throttle(0.1):
+            continue
+        while len(pending) < window:
+            port = next(remaining, None)
+            if port is None:
+                break
+            future = submit(probe, port)
+            if future is None:
+                break
+            pending.add(future)
+        progress.in_flight = len(pending)
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        progress.in_flight = len(pending)
+        # Bitmaps are only written from this thread, so they need no lock
+        for future in done:
+            outcome = future.result()
+            if outcome is None:
+                continue
+            port, state = outcome
+            if result is not None:
+                result.mark(port, state)
+            if state is None:
+                progress.closed += 1
+            elif state == STATE_FILTERED:
+                progress.filtered += 1
+            else:
+                progress.open += 1
+            if state == STATE_OPEN:
+                found = OpenPort(port, COMMON_SERVICES.get(port, "Unknown"))
+                open_ports.append(found)
+                if on_open:
+                    on_open(found)
+        completed += len(done)
+        progress.completed = completed
+        if on_progress:
+            on_progress(completed, total)
+    progress.in_flight = 0
+    return sorted(open_ports, key=lambda item: item.port)
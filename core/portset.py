@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from core.paths import data_path
+
+PORT_SPACE = 65536
+BITSET_BYTES = PORT_SPACE // 8
+SNAPSHOT_MAGIC = b"GPS1"
+SCANS_DIR = "scans"
+
+STATE_OPEN = 1
+STATE_FILTERED = 2
+STATE_NAMES = {STATE_OPEN: "open", STATE_FILTERED: "filtered"}
+
+
+class PortSet:
+    """Set of TCP ports packed one bit per port (8 KiB covers 0-65535).
+
+    Membership and updates touch one byte. Set algebra and counting convert
+    the whole bitmap to one big integer, so ``|``, ``&``, ``-``, ``^`` and
+    ``len`` are single C-level operations over 65,536 bits rather than
+    Python loops over ports. Not thread-safe for concurrent writers.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, data: bytes | bytearray | None = None):
+        if data is not None and len(data) != BITSET_BYTES:
+            raise ValueError(f"A port bitmap is {BITSET_BYTES} bytes, got {len(data)}")
+        self._bits = bytearray(data) if data is not None else bytearray(BITSET_BYTES)
+
+    @classmethod
+    def from_ports(cls, ports: Iterable[int]) -> "PortSet":
+        result = cls()
+        for port in ports:
+            result.add(port)
+        return result
+
+    @classmethod
+    def union(cls, sets: Iterable["PortSet"]) -> "PortSet":
+        """Union of many sets in one pass, without a temporary bitmap per step."""
+        value = 0
+        for ports in sets:
+            value |= ports._int()
+        return cls._from_int(value)
+
+    @classmethod
+    def _from_int(cls, value: int) -> "PortSet":
+        return cls(value.to_bytes(BITSET_BYTES, "little"))
+
+    def _int(self) -> int:
+        return int.from_bytes(self._bits, "little")
+
+    def add(self, port: int):
+        self._bits[port >> 3] |= 1 << (port & 7)
+
+    def discard(self, port: int):
+        self._bits[port >> 3] &= ~(1 << (port & 7)) & 0xFF
+
+    def __contains__(self, port: int) -> bool:
+        return 0 <= port < PORT_SPACE and bool(self._bits[port >> 3] & (1 << (port & 7)))
+
+    def __len__(self) -> int:
+        return self._int().bit_count()
+
+    def __bool__(self) -> bool:
+        return any(self._bits)
+
+    def __iter__(self) -> Iterator[int]:
+        value = self._int()
+        while value:
+            lowest = value & -value
+            yield lowest.bit_length() - 1
+            value ^= lowest
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PortSet) and self._bits == other._bits
+
+    def __or__(self, other: "PortSet") -> "PortSet":
+        return PortSet._from_int(self._int() | other._int())
+
+    def __and__(self, other: "PortSet") -> "PortSet":
+        return PortSet._from_int(self._int() & other._int())
+
+    def __sub__(self, other: "PortSet") -> "PortSet":
+        return PortSet._from_int(self._int() & ~other._int())
+
+    def __xor__(self, other: "PortSet") -> "PortSet":
+        return PortSet._from_int(self._int() ^ other._int())
+
+    def __ior__(self, other: "PortSet") -> "PortSet":
+        self._bits[:] = (self._int() | other._int()).to_bytes(BITSET_BYTES, "little")
+        return self
+
+    def __repr__(self) -> str:
+        return f"PortSet({self.ranges() or 'empty'})"
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def ranges(self) -> str:
+        """Compact text such as ``"22,80,8000-8002"`` (the format parse_ports reads)."""
+        parts: List[str] = []
+        start = previous = None
+        for port in self:
+            if previous is not None and port == previous + 1:
+                previous = port
+                continue
+            if start is not None:
+                parts.append(str(start) if start == previous else f"{start}-{previous}")
+            start = previous = port
+        if start is not None:
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+        return ",".join(parts)
+
+
+class HostPorts:
+    """Scan outcome for one host: the ports probed and which were open or filtered.
+
+    Closed ports are implied (scanned minus open minus filtered), so a host
+    costs 8 KiB for what was scanned plus 8 KiB per state that actually
+    occurred.
+    """
+
+    __slots__ = ("scanned", "_states")
+
+    def __init__(self, scanned: PortSet | None = None):
+        self.scanned = scanned if scanned is not None else PortSet()
+        self._states: Dict[int, PortSet] = {}
+
+    def state(self, state: int) -> PortSet:
+        ports = self._states.get(state)
+        if ports is None:
+            ports = self._states[state] = PortSet()
+        return ports
+
+    @property
+    def open(self) -> PortSet:
+        return self._states.get(STATE_OPEN) or PortSet()
+
+    @property
+    def filtered(self) -> PortSet:
+        return self._states.get(STATE_FILTERED) or PortSet()
+
+    def _count(self, state: int) -> int:
+        ports = self._states.get(state)
+        return len(ports) if ports is not None else 0
+
+    @property
+    def closed(self) -> PortSet:
+        return self.scanned - self.open - self.filtered
+
+    def mark(self, port: int, state: int | None):
+        """Record a probed port; ``state`` None means closed."""
+        self.scanned.add(port)
+        if state is not None:
+            self.state(state).add(port)
+
+    def counts(self) -> Dict[str, int]:
+        scanned = len(self.scanned)
+        open_count, filtered_count = self._count(STATE_OPEN), self._count(STATE_FILTERED)
+        return {
+            "scanned": scanned,
+            "open": open_count,
+            "filtered": filtered_count,
+            "closed": scanned - open_count - filtered_count,
+        }
+
+    def states(self) -> Iterator[Tuple[int, PortSet]]:
+        return iter(self._states.items())
+
+
+class _BitmapTable:
+    """Distinct bitmaps in insertion order, found by CRC then compared in full."""
+
+    def __init__(self):
+        self.bitmaps: List[PortSet] = []
+        self._by_crc: Dict[int, List[int]] = {}
+
+    def index(self, bits: PortSet) -> int:
+        # pylint: disable=protected-access
+        candidates = self._by_crc.setdefault(zlib.crc32(bits._bits), [])
+        for index in candidates:
+            if self.bitmaps[index]._bits == bits._bits:
+                return index
+        candidates.append(len(self.bitmaps))
+        self.bitmaps.append(bits)
+        return len(self.bitmaps) - 1
+
+
+class ScanSnapshot:
+    """Port states for many hosts, stored as raw bitmaps on disk.
+
+    The file is ``GPS1``, a table of distinct 8 KiB bitmaps, then per host a
+    length-prefixed name and ``(state, bitmap index)`` pairs, with the
+    scanned set as state 0. A sweep probes the same ports on every host, so
+    the scanned bitmap (and every empty or identical state) is written once
+    rather than once per host. Loading slices bitmaps straight out of the
+    file without parsing ports; hosts that shared a bitmap on disk share the
+    same PortSet, so loaded snapshots are for reading.
+    """
+
+    def __init__(self):
+        self.hosts: Dict[str, HostPorts] = {}
+        self._unique = _BitmapTable()
+
+    def host(self, name: str) -> HostPorts:
+        ports = self.hosts.get(name)
+        if ports is None:
+            ports = self.hosts[name] = HostPorts()
+        return ports
+
+    def share(self, name: str):
+        """Swap ``name``'s bitmaps for identical ones already held by other hosts.
+
+        Call once a host's scan is finished; after this its bitmaps may be
+        shared and must not be marked further.
+        """
+        ports = self.hosts[name]
+        ports.scanned = self._intern(ports.scanned)
+        states = ports._states  # pylint: disable=protected-access
+        for state, bits in states.items():
+            states[state] = self._intern(bits)
+
+    def _intern(self, bits: PortSet) -> PortSet:
+        return self._unique.bitmaps[self._unique.index(bits)]
+
+    def save(self, path: str):
+        table = _BitmapTable()
+        hosts: List[Tuple[bytes, List[Tuple[int, int]]]] = []
+        for name, ports in self.hosts.items():
+            states = [(0, ports.scanned)] + [(state, bits) for state, bits in ports.states() if bits]
+            hosts.append((name.encode("utf-8"), [(state, table.index(bits)) for state, bits in states]))
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(SNAPSHOT_MAGIC)
+            handle.write(struct.pack("<I", len(table.bitmaps)))
+            for bits in table.bitmaps:
+                handle.write(bits._bits)  # pylint: disable=protected-access
+            handle.write(struct.pack("<I", len(hosts)))
+            for encoded, states in hosts:
+                handle.write(struct.pack("<HB", len(encoded), len(states)))
+                handle.write(encoded)
+                for state, index in states:
+                    handle.write(struct.pack("<BI", state, index))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ScanSnapshot":
+        with open(path, "rb") as handle:
+            data = memoryview(handle.read())
+        if bytes(data[:4]) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a port scan snapshot")
+        snapshot = cls()
+        (bitmap_count,) = struct.unpack_from("<I", data, 4)
+        offset = 8
+        bitmaps = []
+        for _ in range(bitmap_count):
+            bitmaps.append(PortSet(data[offset:offset + BITSET_BYTES]))
+            offset += BITSET_BYTES
+        (host_count,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(host_count):
+            name_length, state_count = struct.unpack_from("<HB", data, offset)
+            offset += 3
+            name = bytes(data[offset:offset + name_length]).decode("utf-8")
+            offset += name_length
+            ports = snapshot.host(name)
+            for _ in range(state_count):
+                state, index = struct.unpack_from("<BI", data, offset)
+                offset += 5
+                if state == 0:
+                    ports.scanned = bitmaps[index]
+                else:
+                    ports._states[state] = bitmaps[index]  # pylint: disable=protected-access
+        return snapshot
+
+    def diff(self, newer: "ScanSnapshot") -> Dict[str, Dict[str, PortSet]]:
+        """Per host, ports that opened or stopped being open between ``self`` and ``newer``.
+
+        Only ports scanned both times are compared; hosts without changes are
+        omitted. Unchanged hosts cost one 8 KiB memcmp.
+        """
+        changes: Dict[str, Dict[str, PortSet]] = {}
+        empty = bytearray(BITSET_BYTES)
+        for name, after in newer.hosts.items():
+            before = self.hosts.get(name)
+            if before is None:
+                continue
+            # pylint: disable=protected-access
+            before_open = before._states.get(STATE_OPEN)
+            after_open = after._states.get(STATE_OPEN)
+            before_bits = before_open._bits if before_open is not None else empty
+            after_bits = after_open._bits if after_open is not None else empty
+            if before_bits == after_bits:
+                continue
+            both = before.scanned._int() & after.scanned._int()
+            old, new = int.from_bytes(before_bits, "little"), int.from_bytes(after_bits, "little")
+            opened, closed = new & ~old & both, old & ~new & both
+            if opened or closed:
+                changes[name] = {"opened": PortSet._from_int(opened), "closed": PortSet._from_int(closed)}
+        return changes
+
+
+def last_scan_path(host: str) -> str:
+    """Where the port scan tab keeps the most recent scan of ``host``."""
+    directory = data_path(SCANS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9._-]", "_", host) + ".gps")
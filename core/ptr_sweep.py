@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import ipaddress
+import threading
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from core.dns_client import DNSClient
+from core.dns_wire import RECORD_TYPES
+
+MAX_SWEEP_ADDRESSES = 1 << 18
+
+STATUS_PENDING = 0
+STATUS_FOUND = 1
+STATUS_NO_NAME = 2
+STATUS_FAILED = 3
+STATUS_LABELS = {
+    STATUS_PENDING: "Pending",
+    STATUS_FOUND: "Found",
+    STATUS_NO_NAME: "No PTR",
+    STATUS_FAILED: "Failed",
+}
+
+SORT_ADDRESS = 0
+SORT_NAME = 1
+SORT_STATUS = 2
+SORT_LATENCY = 3
+
+
+def parse_network(text: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    network = ipaddress.ip_network(text.strip(), strict=False)
+    if network.num_addresses > MAX_SWEEP_ADDRESSES:
+        raise ValueError(
+            f"{network} has {network.num_addresses:,} addresses; the limit is {MAX_SWEEP_ADDRESSES:,}."
+        )
+    return network
+
+
+class PtrSweepStore:
+    """Array-backed results for a reverse sweep.
+
+    Addresses are never stored: row ``i`` is ``network[i]``. Per address we
+    keep one status byte, a float latency and an index into a shared list of
+    names, so a /16 costs well under 1 MiB before the names themselves.
+    """
+
+    def __init__(self, network: ipaddress.IPv4Network | ipaddress.IPv6Network):
+        self.network = network
+        self.size = network.num_addresses
+        self.status = bytearray(self.size)
+        self.latency = array("f", bytes(4 * self.size))
+        self.name_index = array("i", [-1]) * self.size
+        self.names: List[str] = []
+        self.completed = array("I")
+        self.found = 0
+        self._lock = threading.Lock()
+
+    def address(self, index: int) -> str:
+        return str(self.network.network_address + index)
+
+    def name(self, index: int) -> str:
+        position = self.name_index[index]
+        return self.names[position] if position >= 0 else ""
+
+    def record(self, index: int, status: int, name: str | None, latency_ms: float):
+        with self._lock:
+            self.status[index] = status
+            self.latency[index] = latency_ms
+            if name:
+                self.name_index[index] = len(self.names)
+                self.names.append(name)
+                self.found += 1
+            self.completed.append(index)
+
+    def completed_count(self) -> int:
+        return len(self.completed)
+
+    def sorted_rows(self, column: int, descending: bool = False) -> array:
+        with self._lock:
+            rows = list(self.completed)
+        if column == SORT_NAME:
+            # Rows without a name sort after named rows in either direction
+            named = sorted((row for row in rows if self.name_index[row] >= 0), key=self.name, reverse=descending)
+            unnamed = sorted(row for row in rows if self.name_index[row] < 0)
+            return array("I", named + unnamed)
+        if column == SORT_STATUS:
+            key = self.status.__getitem__
+        elif column == SORT_LATENCY:
+            key = self.latency.__getitem__
+        else:
+            return array("I", sorted(rows, reverse=descending))
+        return array("I", sorted(rows, key=key, reverse=descending))
+
+
+def sweep(
+    store: PtrSweepStore,
+    client: DNSClient,
+    rate: float | None = None,
+    window: int = 256,
+    stop: threading.Event | None = None,
+):
+    """Issue a PTR query for every address in ``store`` and record the answers."""
+    inflight: Dict[str, int] = {}
+
+    def questions() -> Iterator[Tuple[str, str]]:
+        for index in range(store.size):
+            name = (store.network.network_address + index).reverse_pointer + "."
+            inflight[name] = index
+            yield name, "PTR"
+
+    ptr_type = RECORD_TYPES["PTR"]
+    for result in client.iter_queries(questions(), window=window, rate=rate, stop=stop):
+        index = inflight.pop(result.name, None)
+        if index is None:
+            continue
+        latency = result.elapsed * 1000
+        if not result.ok or result.message.rcode not in (0, 3):
+            store.record(index, STATUS_FAILED, None, latency)
+        else:
+            records = result.message.records(ptr_type)
+            if records:
+                store.record(index, STATUS_FOUND, records[0].data.rstrip("."), latency)
+            else:
+                store.record(index, STATUS_NO_NAME, None, latency)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# getaddrinfo does not expose record TTLs, so answers obtained through the
+# system resolver are kept for DEFAULT_TTL seconds. Callers that know the real
+# TTL (e.g. a wire-level DNS client) can store answers with ``put``.
+DEFAULT_TTL = 300.0
+NEGATIVE_TTL = 30.0
+MAX_ENTRIES = 1024
+# Resolver failures that say nothing about the name itself; caching them
+# would block a valid name for the whole negative TTL after one hiccup.
+TRANSIENT_ERRNOS = {
+    code for code in (getattr(socket, name, None) for name in ("EAI_AGAIN", "EAI_SYSTEM", "EAI_MEMORY")) if code
+}
+
+CacheKey = Tuple[str, int]
+
+
+@dataclass
+class Resolution:
+    host: str
+    family: int
+    addresses: List[str]
+    from_cache: bool
+    expires_at: float
+
+
+@dataclass
+class _Entry:
+    addresses: List[str]
+    expires_at: float
+    error: Optional[str] = None
+    errno: int = 0
+
+
+class _Pending:
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry: _Entry | None = None
+
+
+def _system_lookup(host: str, family: int) -> List[str]:
+    results = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+    addresses: List[str] = []
+    for res in results:
+        address = res[4][0]
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+class ResolverCache:
+    """Process-wide name cache with TTLs, negative caching and LRU eviction.
+
+    Concurrent lookups for the same (host, family) pair are coalesced: the
+    first caller performs the query while the others wait for its answer.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        default_ttl: float = DEFAULT_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        lookup: Callable[[str, int], List[str]] = _system_lookup,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._lookup = lookup
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, _Pending] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(host: str, family: int) -> CacheKey:
+        return host.strip().rstrip(".").lower(), family
+
+    def lookup(self, host: str, family: int = socket.AF_INET) -> Resolution:
+        """Resolve ``host`` and report whether the answer came from the cache.
+
+        Raises ``socket.gaierror`` for failed (or negatively cached) lookups.
+        """
+        literal = self._literal(host, family)
+        if literal is not None:
+            return Resolution(host, family, [literal], False, float("inf"))
+
+        key = self._key(host, family)
+        owner = False
+        with self._lock:
+            entry = self._get_fresh(key)
+            if entry is not None:
+                if entry.error is not None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+            else:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = _Pending()
+                    self._inflight[key] = pending
+                    self.misses += 1
+                    owner = True
+                else:
+                    self.coalesced += 1
+
+        if entry is not None:
+            return self._to_resolution(host, family, entry, from_cache=True)
+
+        if owner:
+            entry = self._query(key, pending)
+        else:
+            pending.event.wait()
+            entry = pending.entry
+        return self._to_resolution(host, family, entry, from_cache=not owner)
+
+    def resolve(self, host: str, family: int = socket.AF_INET) -> List[str]:
+        return self.lookup(host, family).addresses
+
+    def resolve_one(self, host: str, family: int = socket.AF_INET) -> str:
+        return self.lookup(host, family).addresses[0]
+
+    def put(self, host: str, family: int, addresses: List[str], ttl: float | None = None):
+        """Store an answer obtained elsewhere, honouring its record TTL."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._store(self._key(host, family), _Entry(list(addresses), time.monotonic() + ttl))
+
+    def put_negative(self, host: str, family: int, message: str, ttl: float | None = None):
+        ttl = self.negative_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        entry = _Entry([], time.monotonic() + ttl, error=message, errno=socket.EAI_NONAME)
+        with self._lock:
+            self._store(self._key(host, family), entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        hits = stats["hits"] + stats["negative_hits"] + stats["coalesced"]
+        return f"DNS cache: {hits} hits • {stats['misses']} misses • {stats['entries']} entries"
+
+    def _query(self, key: CacheKey, pending: _Pending) -> _Entry:
+        host, family = key
+        try:
+            addresses = self._lookup(host, family)
+            if addresses:
+                entry = _Entry(addresses, time.monotonic() + self.default_ttl)
+            else:
+                entry = _Entry([], time.monotonic() + self.negative_ttl,
+                               error="No address associated with hostname", errno=socket.EAI_NONAME)
+        except socket.gaierror as exc:
+            transient = exc.errno in TRANSIENT_ERRNOS
+            entry = _Entry([], 0.0 if transient else time.monotonic() + self.negative_ttl,
+                           error=exc.strerror or str(exc), errno=exc.errno or socket.EAI_NONAME)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Transient failures (timeouts, interrupted calls) are not cached.
+            entry = _Entry([], 0.0, error=str(exc), errno=socket.EAI_AGAIN)
+
+        with self._lock:
+            if entry.expires_at > time.monotonic():
+                self._store(key, entry)
+            self._inflight.pop(key, None)
+        pending.entry = entry
+        pending.event.set()
+        return entry
+
+    def _get_fresh(self, key: CacheKey) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: CacheKey, entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _literal(host: str, family: int) -> str | None:
+        try:
+            address = ipaddress.ip_address(host.strip().strip("[]"))
+        except ValueError:
+            return None
+        if family == socket.AF_INET6 and address.version == 4:
+            return None
+        if family == socket.AF_INET and address.version == 6:
+            return None
+        return str(address)
+
+    @staticmethod
+    def _to_resolution(host: str, family: int, entry: _Entry, from_cache: bool) -> Resolution:
+        if entry.error is not None:
+            raise socket.gaierror(entry.errno, entry.error)
+        return Resolution(host, family, list(entry.addresses), from_cache, entry.expires_at)
+
+
+_shared: ResolverCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_resolver() -> ResolverCache:
+    """Return the resolver cache shared by every tool in the process."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ResolverCache()
+    return _shared
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from core.metrics import get_metrics
+from core.paths import data_path
+
+RESULTS_FILE = "results.db"
+DEFAULT_RETENTION_DAYS = 30
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.5
+COMPACT_INTERVAL = 3600
+# A batch is tried this many times, RETRY_DELAY seconds apart, before its rows are dropped
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.2
+
+log = logging.getLogger(__name__)
+_metrics = get_metrics()
+WRITE_ERRORS = _metrics.counter("gatchfier_results_write_errors_total", "Failed attempts to commit a batch of results")
+ROWS_DROPPED = _metrics.counter("gatchfier_results_dropped_rows_total", "Result rows dropped after every write attempt failed")
+
+# Column names after the implicit ``ts`` and ``target`` columns of each table
+TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "ping": (("seq", "INTEGER"), ("rtt_ms", "REAL")),
+    "portscan": (("address", "TEXT"), ("port", "INTEGER"), ("service", "TEXT")),
+    "traceroute": (("hop", "INTEGER"), ("line", "TEXT")),
+    "dns": (
+        ("rtype", "TEXT"),
+        ("server", "TEXT"),
+        ("rcode", "TEXT"),
+        ("answers", "TEXT"),
+        ("elapsed_ms", "REAL"),
+        ("error", "TEXT"),
+    ),
+    "whois": (("server", "TEXT"), ("registrar", "TEXT"), ("expiration", "TEXT"), ("record", "TEXT"), ("error", "TEXT")),
+    "monitor": (("kind", "TEXT"), ("port", "INTEGER"), ("ok", "INTEGER"), ("value", "REAL"), ("detail", "TEXT")),
+    "discovery": (("address", "TEXT"), ("method", "TEXT"), ("rtt_ms", "REAL"), ("mac", "TEXT")),
+    "throughput": (
+        ("direction", "TEXT"),
+        ("streams", "INTEGER"),
+        ("seconds", "REAL"),
+        ("bytes", "INTEGER"),
+        ("bits_per_second", "REAL"),
+    ),
+    "http": (
+        ("url", "TEXT"),
+        ("status", "INTEGER"),
+        ("reused", "INTEGER"),
+        ("dns_ms", "REAL"),
+        ("connect_ms", "REAL"),
+        ("tls_ms", "REAL"),
+        ("ttfb_ms", "REAL"),
+        ("transfer_ms", "REAL"),
+        ("total_ms", "REAL"),
+        ("bytes", "INTEGER"),
+        ("error", "TEXT"),
+    ),
+}
+
+
+def _where(target: str | None, since: float | None) -> Tuple[str, list]:
+    clauses, params = [], []
+    if target is not None:
+        clauses.append("target = ?")
+        params.append(target)
+    if since is not None:
+        clauses.append("ts >= ?")
+        params.append(since)
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class ResultsStore:
+    """SQLite history of every measurement, one table per tool.
+
+    ``record`` only enqueues a row, so it is safe to call from the GUI thread
+    or a hot engine loop. A single writer thread commits queued rows in
+    batches of up to ``BATCH_SIZE`` per transaction, and periodically deletes
+    rows older than the retention period. A batch that fails to commit is
+    retried; if every attempt fails its rows are dropped, counted in
+    ``dropped`` and the metrics, and logged with the error.
+    """
+
+    def __init__(self, path: str | None = None, retention_days: float = DEFAULT_RETENTION_DAYS):
+        self.path = path or data_path(RESULTS_FILE)
+        self.retention_days = retention_days
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.last_error: str | None = None
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._writer, name="results-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _create_schema(self, connection: sqlite3.Connection):
+        for table, columns in TABLES.items():
+            definitions = ", ".join(f"{name} {kind}" for name, kind in columns)
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (ts REAL NOT NULL, target TEXT NOT NULL, {definitions})")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_target_ts ON {table} (target, ts)")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_ts ON {table} (ts)")
+        connection.commit()
+
+    def record(self, tool: str, target: str, ts: float | None = None, **fields):
+        columns = TABLES[tool]
+        row = (ts or time.time(), target) + tuple(_encode(fields.get(name)) for name, _ in columns)
+        self._queue.put((tool, row))
+
+    def _writer(self):
+        connection = self._connect()
+        self._create_schema(connection)
+        self._ready.set()
+        self.compact(connection)
+        last_compact = time.monotonic()
+        statements = {
+            table: f"INSERT INTO {table} VALUES ({', '.join('?' * (len(columns) + 2))})"
+            for table, columns in TABLES.items()
+        }
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+            if item is None and self._closed:
+                break
+            batch: Dict[str, List[tuple]] = {}
+            count = 0
+            # Gather whatever else is already queued, up to one batch
+            while item is not None:
+                if item == "stop":
+                    self._closed = True
+                    self._queue.task_done()
+                    break
+                batch.setdefault(item[0], []).append(item[1])
+                count += 1
+                if count >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if batch:
+                self._commit(connection, statements, batch, count)
+                for _ in range(count):
+                    self._queue.task_done()
+            if time.monotonic() - last_compact > COMPACT_INTERVAL:
+                self.compact(connection)
+                last_compact = time.monotonic()
+            if self._closed and self._queue.empty():
+                break
+        connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, statements: Dict[str, str], batch: Dict[str, List[tuple]],
+                count: int):
+        error: sqlite3.Error | None = None
+        for attempt in range(WRITE_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_DELAY)
+            try:
+                with connection:
+                    for table, rows in batch.items():
+                        connection.executemany(statements[table], rows)
+            except sqlite3.Error as exc:
+                error = exc
+                WRITE_ERRORS.inc()
+                continue
+            self.written += count
+            self.batches += 1
+            return
+        self.dropped += count
+        self.last_error = str(error)
+        ROWS_DROPPED.inc(count)
+        log.error("Dropped %d result rows after %d failed writes to %s: %s", count, WRITE_ATTEMPTS, self.path, error)
+
+    def compact(self, connection: sqlite3.Connection | None = None) -> int:
+        """Delete rows past the retention period; returns how many were removed."""
+        if self.retention_days <= 0:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        own = connection is None
+        connection = connection or self._connect()
+        removed = 0
+        try:
+            with connection:
+                for table in TABLES:
+                    removed += connection.execute(f"DELETE FROM {table} WHERE ts < ?", (cutoff,)).rowcount
+            if removed:
+                connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error:
+            pass
+        finally:
+            if own:
+                connection.close()
+        return removed
+
+    def query(self, tool: str, target: str | None = None, since: float | None = None, limit: int = 1000) -> List[dict]:
+        """Newest rows first, optionally for one target and/or after ``since``."""
+        where, params = _where(target, since)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        try:
+            rows = connection.execute(
+                f"SELECT * FROM {tool}{where} ORDER BY ts DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        finally:
+            connection.close()
+        return [dict(row) for row in rows]
+
+    def iter_rows(self, tool: str, target: str | None = None, since: float | None = None, chunk: int = 5000):
+        """Yield rows oldest first without loading the whole result set."""
+        where, params = _where(target, since)
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            cursor = connection.execute(f"SELECT * FROM {tool}{where} ORDER BY ts", params)
+            names = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(names, row))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def columns(tool: str) -> List[str]:
+        return ["ts", "target"] + [name for name, _ in TABLES[tool]]
+
+    def flush(self):
+        """Block until every row queued so far is committed."""
+        self._queue.join()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        if not self._closed:
+            self._queue.put("stop")
+            self._thread.join(10)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "last_error": self.last_error,
+        }
+
+
+def _first(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+def save_dns(store: ResultsStore, result) -> None:
+    """Record a ``core.dns_lookup.LookupResult``."""
+    store.record(
+        "dns",
+        result.domain,
+        rtype=result.rtype,
+        server=result.server,
+        rcode=result.rcode,
+        answers=result.records or result.addresses,
+        elapsed_ms=result.elapsed_ms,
+        error=result.error,
+    )
+
+
+def save_whois(store: ResultsStore, domain: str, server: str, record: Dict[str, Any] | None, error: str | None = None):
+    record = record or {}
+    expiration = _first(record.get("expiration_date"))
+    store.record(
+        "whois",
+        domain,
+        server=server,
+        registrar=_first(record.get("registrar")),
+        expiration=expiration.isoformat() if hasattr(expiration, "isoformat") else expiration,
+        record=record or None,
+        error=error,
+    )
+
+
+_store: ResultsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultsStore()
+        return _store
+
+
+def close_results_store():
+    """Commit anything still queued; used at shutdown."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
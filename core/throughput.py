@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, List
+
+from core.metrics import get_metrics
+
+DEFAULT_PORT = 5201
+DEFAULT_DURATION = 10.0
+DEFAULT_INTERVAL = 1.0
+MAX_STREAMS = 64
+DIRECTION_UPLOAD = 0
+DIRECTION_DOWNLOAD = 1
+DIRECTIONS = {"upload": DIRECTION_UPLOAD, "download": DIRECTION_DOWNLOAD}
+
+# Sent by the client on every stream: magic, direction, test seconds
+HEADER = struct.Struct("!4sBd")
+HEADER_MAGIC = b"GTP1"
+# Sent back by the server after an upload: bytes it actually received
+TOTAL = struct.Struct("!Q")
+
+PAYLOAD_SIZE = 4 << 20
+SEND_CHUNK = 1 << 20
+RECV_BUFFER = 256 << 10
+SOCKET_BUFFER = 4 << 20
+CONNECT_TIMEOUT = 5.0
+
+_metrics = get_metrics()
+THROUGHPUT_BYTES = _metrics.counter("gatchfier_throughput_bytes_total", "Bytes moved by throughput tests")
+THROUGHPUT_TESTS = _metrics.counter("gatchfier_throughput_tests_total", "Throughput tests run")
+
+
+@dataclass(frozen=True)
+class IntervalReport:
+    start: float
+    end: float
+    bytes: int
+    stream_bytes: tuple
+
+    @property
+    def bits_per_second(self) -> float:
+        span = self.end - self.start
+        return self.bytes * 8 / span if span > 0 else 0.0
+
+
+@dataclass
+class ThroughputResult:
+    direction: str
+    streams: int
+    seconds: float = 0.0
+    bytes: int = 0
+    # Upload only: what the server says it received, which excludes data still in flight
+    server_bytes: int | None = None
+    intervals: List[IntervalReport] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def bits_per_second(self) -> float:
+        return self.bytes * 8 / self.seconds if self.seconds > 0 else 0.0
+
+
+def format_bits(bits_per_second: float) -> str:
+    for unit, scale in (("Gbit/s", 1e9), ("Mbit/s", 1e6), ("kbit/s", 1e3)):
+        if bits_per_second >= scale:
+            return f"{bits_per_second / scale:.2f} {unit}"
+    return f"{bits_per_second:.0f} bit/s"
+
+
+def format_bytes(count: float) -> str:
+    for unit, scale in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if count >= scale:
+            return f"{count / scale:.2f} {unit}"
+    return f"{count:.0f} B"
+
+
+def payload_file() -> BinaryIO:
+    """An unnamed temporary file of random bytes to ``sendfile`` from.
+
+    Random content keeps compressing links honest. Each stream gets its own
+    file because socket.sendfile falls back to seek-and-read where the OS
+    has no sendfile, and a shared file position would race.
+    """
+    handle = tempfile.TemporaryFile()
+    handle.write(os.urandom(PAYLOAD_SIZE))
+    handle.flush()
+    return handle
+
+
+def _tune(sock: socket.socket):
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER)
+        except OSError:
+            pass
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-header")
+        data += chunk
+    return bytes(data)
+
+
+class _Stream:
+    """Byte counter for one connection; only its own thread writes it."""
+
+    __slots__ = ("bytes", "error", "ended")
+
+    def __init__(self):
+        self.bytes = 0
+        self.error: str | None = None
+        self.ended: float | None = None
+
+
+def _send_until(sock: socket.socket, payload: BinaryIO, deadline: float, stream: _Stream, stop: threading.Event):
+    """Stream ``payload`` repeatedly with sendfile until ``deadline``; no bytes pass through Python."""
+    offset = 0
+    while not stop.is_set() and time.monotonic() < deadline:
+        sent = sock.sendfile(payload, offset, SEND_CHUNK)
+        stream.bytes += sent
+        offset = (offset + sent) % PAYLOAD_SIZE
+
+
+def _recv_all(sock: socket.socket, stream: _Stream, stop: threading.Event):
+    """Read into one preallocated buffer until the peer closes; nothing is allocated per read."""
+    view = memoryview(bytearray(RECV_BUFFER))
+    while not stop.is_set():
+        received = sock.recv_into(view)
+        if not received:
+            return
+        stream.bytes += received
+
+
+class ThroughputServer:
+    """Bundled test server: each connection says which way to push data and for how long.
+
+    Uploads are read with ``recv_into`` into a per-connection buffer and the
+    byte count is returned to the client; downloads are sent with
+    ``sendfile`` until the requested duration has passed. One thread per
+    connection, since every connection is a long bulk transfer.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(MAX_STREAMS)
+        self._sock.settimeout(0.2)
+        self.host = host
+        self.port = self._sock.getsockname()[1]
+        self.connections = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="throughput-server", daemon=True)
+
+    def start(self) -> "ThroughputServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket):
+        stream = _Stream()
+        try:
+            with conn:
+                conn.settimeout(CONNECT_TIMEOUT)
+                magic, direction, duration = HEADER.unpack(_recv_exact(conn, HEADER.size))
+                if magic != HEADER_MAGIC:
+                    return
+                conn.settimeout(None)
+                _tune(conn)
+                if direction == DIRECTION_UPLOAD:
+                    _recv_all(conn, stream, self._stop)
+                    conn.sendall(TOTAL.pack(stream.bytes))
+                else:
+                    with payload_file() as payload:
+                        _send_until(conn, payload, time.monotonic() + min(duration, 3600), stream, self._stop)
+        except OSError:
+            pass
+
+
+def run_test(
+    host: str,
+    port: int = DEFAULT_PORT,
+    duration: float = DEFAULT_DURATION,
+    streams: int = 1,
+    direction: str = "upload",
+    interval: float = DEFAULT_INTERVAL,
+    on_interval: Callable[[IntervalReport], None] | None = None,
+    stop: threading.Event | None = None,
+    manager=None,
+) -> ThroughputResult:
+    """Push data over ``streams`` parallel connections for ``duration`` seconds.
+
+    Uploads go out with ``socket.sendfile`` from a temporary payload file
+    and downloads land in a preallocated buffer via ``recv_into``, so the
+    measurement is not limited by Python allocating or copying bytes. Every
+    ``interval`` seconds the per-stream counters are sampled and reported;
+    the counters are plain integers written by one thread each, so sampling
+    needs no lock. Each connection holds a slot of the job manager's socket
+    budget for the length of the test.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown direction: {direction}")
+    streams = max(1, min(MAX_STREAMS, streams))
+    stop = stop or threading.Event()
+    if manager is None:
+        from core.jobs import get_job_manager  # pylint: disable=import-outside-toplevel
+
+        manager = get_job_manager()
+    THROUGHPUT_TESTS.inc()
+
+    result = ThroughputResult(direction, streams)
+    counters = [_Stream() for _ in range(streams)]
+    server_totals: List[int] = []
+    sockets: List[socket.socket] = []
+    halt = threading.Event()
+
+    def run_stream(sock: socket.socket, stream: _Stream, deadline: float):
+        try:
+            if direction == "upload":
+                with payload_file() as payload:
+                    _send_until(sock, payload, deadline, stream, halt)
+                stream.ended = time.monotonic()
+                sock.shutdown(socket.SHUT_WR)
+                sock.settimeout(CONNECT_TIMEOUT)
+                server_totals.append(TOTAL.unpack(_recv_exact(sock, TOTAL.size))[0])
+            else:
+                _recv_all(sock, stream, halt)
+                stream.ended = time.monotonic()
+        except OSError as exc:
+            if not halt.is_set():
+                stream.error = str(exc) or type(exc).__name__
+        finally:
+            sock.close()
+            manager.release_socket()
+
+    def close_all():
+        for sock in sockets:
+            sock.close()
+            manager.release_socket()
+
+    try:
+        for _ in range(streams):
+            if not manager.acquire_socket(token=stop):
+                break
+            try:
+                sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+            except OSError:
+                manager.release_socket()
+                raise
+            # Owned by the list from here, so any failure below closes and releases it
+            sockets.append(sock)
+            _tune(sock)
+            sock.sendall(HEADER.pack(HEADER_MAGIC, DIRECTIONS[direction], duration))
+            sock.settimeout(None)
+    except Exception:
+        close_all()
+        raise
+    if len(sockets) < streams:
+        # Cancelled while waiting for a socket slot
+        close_all()
+        return result
+
+    started = time.monotonic()
+    deadline = started + duration
+    threads = [
+        threading.Thread(target=run_stream, args=(sock, stream, deadline), name=f"throughput-{index}", daemon=True)
+        for index, (sock, stream) in enumerate(zip(sockets, counters))
+    ]
+    for thread in threads:
+        thread.start()
+
+    def halt_streams():
+        halt.set()
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def sample(now: float):
+        nonlocal last_time, last_counts
+        counts = [stream.bytes for stream in counters]
+        deltas = tuple(count - last for count, last in zip(counts, last_counts))
+        report = IntervalReport(last_time - started, now - started, sum(deltas), deltas)
+        result.intervals.append(report)
+        if on_interval:
+            on_interval(report)
+        last_time, last_counts = now, counts
+
+    last_time, last_counts = started, [0] * streams
+    while any(thread.is_alive() for thread in threads):
+        if stop.is_set() and not halt.is_set():
+            halt_streams()
+        now = time.monotonic()
+        if halt.is_set() or now >= deadline:
+            # Only waiting for streams to wind down now
+            time.sleep(0.05)
+        else:
+            stop.wait(max(0.0, min(last_time + interval, deadline) - now))
+        now = time.monotonic()
+        if last_time < deadline and (now >= last_time + interval or now >= deadline):
+            sample(min(now, deadline))
+        if now >= deadline + CONNECT_TIMEOUT and not halt.is_set():
+            # A stalled peer must not hold the test open
+            halt_streams()
+    if sum(stream.bytes for stream in counters) > sum(last_counts):
+        sample(max([stream.ended or last_time for stream in counters] + [last_time]))
+
+    ended = [stream.ended for stream in counters if stream.ended is not None]
+    result.seconds = (max(ended) if ended else time.monotonic()) - started
+    result.bytes = sum(stream.bytes for stream in counters)
+    THROUGHPUT_BYTES.inc(result.bytes)
+    if direction == "upload" and len(server_totals) == streams:
+        result.server_bytes = sum(server_totals)
+    result.errors = [stream.error for stream in counters if stream.error]
+    return result
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+
+from core.metrics import get_metrics
+
+HOP_PATTERN = re.compile(r"\s*(\d+)\s")
+
+_metrics = get_metrics()
+TRACES = _metrics.counter("gatchfier_trace_runs_total", "Traceroute runs started")
+TRACE_HOPS = _metrics.counter("gatchfier_trace_hops_total", "Hop lines read from traceroute")
+TRACE_TIMEOUTS = _metrics.counter("gatchfier_trace_hop_timeouts_total", "Hops where every probe timed out")
+TRACE_SECONDS = _metrics.histogram(
+    "gatchfier_trace_seconds", "Wall time of a traceroute run", buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300)
+)
+
+
+class TracerouteError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class TraceLine:
+    """One line of traceroute output; ``hop`` is set for numbered hop lines."""
+
+    text: str
+    hop: int | None = None
+
+
+def build_command(target: str, use_ipv6: bool = False, max_hops: int = 30, per_hop_timeout: int = 4) -> List[str]:
+    system = platform.system()
+    if system == "Windows":
+        base_cmd = "tracert"
+        if not shutil.which(base_cmd):
+            raise TracerouteError("The 'tracert' command is not available on this system.")
+        args = [base_cmd, "-h", str(max_hops), "-d", "-6" if use_ipv6 else "-4"]
+    else:
+        base_cmd = "traceroute"
+        if not shutil.which(base_cmd):
+            raise TracerouteError("The 'traceroute' command is not available on this system.")
+        args = [
+            base_cmd,
+            "-m",
+            str(max_hops),
+            "-n",
+            "-6" if use_ipv6 else "-4",
+            "-w",
+            str(per_hop_timeout),
+        ]
+    args.append(target)
+    return args
+
+
+class Traceroute:
+    """Runs the system traceroute for one target and streams its lines.
+
+    ``stop`` may be called from any thread; it terminates the subprocess so
+    ``run`` returns promptly.
+    """
+
+    def __init__(self, target: str, use_ipv6: bool = False, max_hops: int = 30, per_hop_timeout: int = 4):
+        self.target = target
+        self.use_ipv6 = use_ipv6
+        self.max_hops = max_hops
+        self.per_hop_timeout = per_hop_timeout
+        self._process: subprocess.Popen | None = None
+        self._stop_requested = False
+
+    def run(self, on_line: Callable[[TraceLine], None], stop: threading.Event | None = None) -> bool:
+        """Return True when traceroute ran to completion without being stopped."""
+        if self._stop_requested:
+            return False
+        command = build_command(self.target, self.use_ipv6, self.max_hops, self.per_hop_timeout)
+        try:
+            creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if platform.system() == "Windows" else 0  # type: ignore[attr-defined]
+            self._process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                encoding="utf-8",
+                errors="replace",
+                universal_newlines=True,
+                creationflags=creationflags,
+            )
+        except FileNotFoundError as exc:
+            raise TracerouteError(f"Traceroute command not found: {command[0]}") from exc
+        except Exception as exc:  # pragma: no cover
+            raise TracerouteError(f"Failed to start traceroute: {exc}") from exc
+
+        if not self._process.stdout:
+            raise TracerouteError("Unable to capture traceroute output.")
+
+        TRACES.inc()
+        started = time.monotonic()
+        try:
+            for raw_line in self._process.stdout:
+                if self._stop_requested or (stop is not None and stop.is_set()):
+                    self._stop_requested = True
+                    break
+                line = raw_line.rstrip()
+                if line:
+                    match = HOP_PATTERN.match(line)
+                    if match:
+                        TRACE_HOPS.inc()
+                        if line.count("*") >= 3:
+                            TRACE_TIMEOUTS.inc()
+                    on_line(TraceLine(line, int(match.group(1)) if match else None))
+        finally:
+            TRACE_SECONDS.observe(time.monotonic() - started)
+            process = self._process
+            if self._stop_requested:
+                self._terminate_process()
+            # Always reap the child here, even when stop() terminated it from another thread
+            process.wait()
+            success = not self._stop_requested and process.returncode == 0
+            self._process = None
+        return success
+
+    def stop(self):
+        self._stop_requested = True
+        self._terminate_process()
+
+    def _terminate_process(self):
+        # The handle stays set so run() can still wait on the child
+        process = self._process
+        if process and process.poll() is None:
+            try:
+                process.terminate()
+            except Exception:  # pragma: no cover
+                process.kill()
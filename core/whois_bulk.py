@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List
+
+from core.jobs import get_job_manager
+from core.whois_cache import WhoisCache
+from core.whois_client import QUERY_TIMEOUT, ReferralCache, domain_tld, parse_record, query_port43
+
+DEFAULT_REGISTRY_CONCURRENCY = 2
+DEFAULT_REGISTRY_RATE = 1.0  # queries per second per registry
+
+
+class RegistryLimiter:
+    """Separate concurrency cap and minimum query spacing for each registry."""
+
+    def __init__(self, concurrency: int = DEFAULT_REGISTRY_CONCURRENCY, rate: float = DEFAULT_REGISTRY_RATE):
+        self.concurrency = max(1, concurrency)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def slot(self, server: str, stop: threading.Event | None = None):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(server, threading.Semaphore(self.concurrency))
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start[server])
+                self._next_start[server] = start + self.interval
+            delay = start - now
+            if delay > 0:
+                if stop is not None:
+                    stop.wait(delay)
+                else:
+                    time.sleep(delay)
+            yield
+        finally:
+            semaphore.release()
+
+
+@dataclass
+class BulkResult:
+    domain: str
+    server: str
+    record: Dict[str, Any] | None
+    error: str | None = None
+    cached: bool = False
+
+
+class BulkWhoisRunner:
+    """Look up many domains, grouped and throttled per registry server."""
+
+    def __init__(
+        self,
+        referrals: ReferralCache,
+        limiter: RegistryLimiter,
+        cache: WhoisCache | None = None,
+        parse: Callable[[str, str], Dict[str, Any]] = parse_record,
+        timeout: float = QUERY_TIMEOUT,
+        max_workers: int = 32,
+    ):
+        self.referrals = referrals
+        self.limiter = limiter
+        self.cache = cache
+        self.parse = parse
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def run(
+        self,
+        domains: Iterable[str],
+        on_result: Callable[[BulkResult], None],
+        stop: threading.Event | None = None,
+        refresh: bool = False,
+    ):
+        stop = stop or threading.Event()
+        unique = list(dict.fromkeys(domain.strip().rstrip(".").lower() for domain in domains if domain.strip()))
+
+        by_tld: Dict[str, List[str]] = defaultdict(list)
+        for domain in unique:
+            cached = None if refresh or self.cache is None else self.cache.get(domain)
+            if cached:
+                on_result(BulkResult(domain, "cache", cached[0], cached=True))
+            else:
+                by_tld[domain_tld(domain)].append(domain)
+
+        # Resolve each TLD's registry once, then group the domains per server
+        manager = get_job_manager()
+        by_server: Dict[str, deque] = defaultdict(deque)
+        futures = {manager.submit_io(self.referrals.server_for, tld + "."): tld for tld in by_tld}
+        for future in futures:
+            tld = futures[future]
+            try:
+                by_server[future.result()].extend(by_tld[tld])
+            except Exception as exc:  # pylint: disable=broad-except
+                for domain in by_tld[tld]:
+                    on_result(BulkResult(domain, "", None, str(exc)))
+
+        # Each registry gets its own small set of drain loops so a slow or
+        # strict registry never ties up threads meant for the others. They
+        # run on the job manager's I/O pool, one socket slot per loop.
+        pending = set()
+        for server, queue in by_server.items():
+            for _ in range(min(self.limiter.concurrency, len(queue))):
+                if len(pending) >= self.max_workers:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                future = manager.submit_io(self._drain, server, queue, on_result, stop, token=stop)
+                if future is not None:
+                    pending.add(future)
+        wait(pending)
+        if self.cache is not None:
+            self.cache.flush()
+
+    def _drain(self, server: str, queue: deque, on_result: Callable[[BulkResult], None], stop: threading.Event):
+        while not stop.is_set():
+            try:
+                domain = queue.popleft()
+            except IndexError:
+                return
+            on_result(self._lookup(server, domain, stop))
+
+    def _lookup(self, server: str, domain: str, stop: threading.Event) -> BulkResult:
+        try:
+            with self.limiter.slot(server, stop):
+                if stop.is_set():
+                    return BulkResult(domain, server, None, "Cancelled")
+                text = query_port43(server, domain, self.timeout)
+            record = self.parse(domain, text)
+        except Exception as exc:  # pylint: disable=broad-except
+            return BulkResult(domain, server, None, str(exc))
+        if self.cache is not None:
+            self.cache.put(domain, record)
+        return BulkResult(domain, server, record)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from core.metrics import get_metrics
+from core.paths import data_path
+
+DEFAULT_MAX_AGE_HOURS = 24
+CACHE_FILE = "whois_cache.json"
+MAX_CACHED_DOMAINS = 5000
+# Writes are coalesced: the file is saved this many seconds after the first unsaved put
+SAVE_DELAY = 2.0
+
+_metrics = get_metrics()
+CACHE_HITS = _metrics.counter("gatchfier_whois_cache_hits_total", "Whois lookups answered from the local cache")
+CACHE_MISSES = _metrics.counter("gatchfier_whois_cache_misses_total", "Whois lookups missing or stale in the cache")
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__datetime__": datetime.datetime(value.year, value.month, value.day).isoformat()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"__datetime__"}:
+            return datetime.datetime.fromisoformat(value["__datetime__"])
+        return {key: _from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    return value
+
+
+def format_age(seconds: float) -> str:
+    seconds = int(max(0, seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 48:
+        return f"{hours}h {minutes}m"
+    return f"{hours // 24}d {hours % 24}h"
+
+
+class WhoisCache:
+    """Parsed whois records persisted as JSON with a per-cache expiry.
+
+    ``put`` only updates memory; the file is rewritten once per
+    ``save_delay`` however many records arrive, and ``flush`` saves at once
+    (bulk runs call it when they finish, the app and CLI at shutdown).
+    """
+
+    def __init__(self, path: str | None = None, max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+                 save_delay: float = SAVE_DELAY):
+        self.path = path or data_path(CACHE_FILE)
+        self.max_age_hours = max_age_hours
+        self.save_delay = save_delay
+        self.saves = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, dict] | None = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+
+    @staticmethod
+    def _key(domain: str) -> str:
+        return domain.strip().rstrip(".").lower()
+
+    def get(self, domain: str) -> Tuple[Dict[str, Any], float] | None:
+        """Return ``(record, age_seconds)`` for a fresh entry, otherwise None."""
+        with self._lock:
+            entry = self._load().get(self._key(domain))
+        if not entry:
+            CACHE_MISSES.inc()
+            return None
+        age = time.time() - entry["fetched"]
+        if age > self.max_age_hours * 3600:
+            CACHE_MISSES.inc()
+            return None
+        CACHE_HITS.inc()
+        return _from_json(entry["record"]), age
+
+    def put(self, domain: str, record: Dict[str, Any]):
+        with self._lock:
+            entries = self._load()
+            entries[self._key(domain)] = {"fetched": time.time(), "record": _to_json(record)}
+            if len(entries) > MAX_CACHED_DOMAINS:
+                oldest = sorted(entries, key=lambda key: entries[key]["fetched"])
+                for key in oldest[: len(entries) - MAX_CACHED_DOMAINS]:
+                    del entries[key]
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending changes now; the JSON is encoded outside the entries lock."""
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                snapshot = dict(self._entries)
+            self._save(snapshot)
+            self.saves += 1
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: Dict[str, dict]):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+_shared: WhoisCache | None = None
+
+
+def get_whois_cache() -> WhoisCache:
+    global _shared
+    if _shared is None:
+        _shared = WhoisCache()
+    return _shared
+
+
+def close_whois_cache():
+    """Save records still waiting for the debounced write; used at shutdown."""
+    if _shared is not None:
+        _shared.flush()
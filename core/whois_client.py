@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from core.metrics import get_metrics
+from core.paths import data_path
+
+IANA_SERVER = "whois.iana.org"
+WHOIS_PORT = 43
+QUERY_TIMEOUT = 10.0
+REFERRAL_FILE = "whois_referrals.json"
+REFERRAL_MAX_AGE = 30 * 24 * 3600
+MAX_RESPONSE_BYTES = 1 << 20
+MAX_REFERRALS = 2
+
+# Registry servers for the most common TLDs, so a lookup normally needs no
+# IANA round trip. Anything missing here is learnt through ReferralCache.
+TLD_SERVERS = {
+    "com": "whois.verisign-grs.com",
+    "net": "whois.verisign-grs.com",
+    "org": "whois.pir.org",
+    "info": "whois.nic.info",
+    "biz": "whois.nic.biz",
+    "io": "whois.nic.io",
+    "co": "whois.nic.co",
+    "me": "whois.nic.me",
+    "tv": "whois.nic.tv",
+    "cc": "ccwhois.verisign-grs.com",
+    "us": "whois.nic.us",
+    "app": "whois.nic.google",
+    "dev": "whois.nic.google",
+    "page": "whois.nic.google",
+    "xyz": "whois.nic.xyz",
+    "online": "whois.nic.online",
+    "site": "whois.nic.site",
+    "tech": "whois.nic.tech",
+    "store": "whois.nic.store",
+    "cloud": "whois.nic.cloud",
+    "ai": "whois.nic.ai",
+    "edu": "whois.educause.edu",
+    "gov": "whois.dotgov.gov",
+    "uk": "whois.nic.uk",
+    "de": "whois.denic.de",
+    "fr": "whois.nic.fr",
+    "nl": "whois.domain-registry.nl",
+    "be": "whois.dns.be",
+    "eu": "whois.eu",
+    "ch": "whois.nic.ch",
+    "at": "whois.nic.at",
+    "it": "whois.nic.it",
+    "es": "whois.nic.es",
+    "pt": "whois.dns.pt",
+    "pl": "whois.dns.pl",
+    "cz": "whois.nic.cz",
+    "se": "whois.iis.se",
+    "no": "whois.norid.no",
+    "fi": "whois.fi",
+    "ie": "whois.weare.ie",
+    "ru": "whois.tcinet.ru",
+    "br": "whois.registro.br",
+    "mx": "whois.mx",
+    "ca": "whois.cira.ca",
+    "au": "whois.auda.org.au",
+    "nz": "whois.irs.net.nz",
+    "jp": "whois.jprs.jp",
+    "kr": "whois.kr",
+    "cn": "whois.cnnic.cn",
+    "in": "whois.registry.in",
+}
+
+FIELD_ALIASES = {
+    "domain_name": ("domain name", "domain", "domain_name", "[domain name]"),
+    "registrar": ("registrar", "registrar name", "sponsoring registrar", "registrar organization"),
+    "creation_date": (
+        "creation date",
+        "created",
+        "created on",
+        "created date",
+        "registered",
+        "registered on",
+        "registration date",
+        "registration time",
+        "domain registration date",
+        "[created on]",
+        "[registered date]",
+    ),
+    "expiration_date": (
+        "registry expiry date",
+        "registrar registration expiration date",
+        "registry expiration date",
+        "expiration date",
+        "expiry date",
+        "expire date",
+        "expires",
+        "expires on",
+        "expiration time",
+        "paid-till",
+        "[expires on]",
+    ),
+    "updated_date": (
+        "updated date",
+        "updated",
+        "last updated",
+        "last-update",
+        "last modified",
+        "modified",
+        "changed",
+        "[last updated]",
+        "[last update]",
+    ),
+    "status": ("domain status", "status", "registration status", "state", "[status]", "[state]"),
+    "name_servers": ("name server", "name servers", "nameservers", "nserver", "[name server]"),
+}
+_ALIAS_TO_FIELD = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+DATE_FIELDS = {"creation_date", "expiration_date", "updated_date"}
+
+REFERRAL_KEYS = ("registrar whois server", "whois server", "referralserver")
+NOT_FOUND_MARKERS = (
+    "no match for",
+    "not found",
+    "no data found",
+    "no entries found",
+    "status: free",
+    "status: available",
+    "this query returned 0 objects",
+)
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_BRACKETED = re.compile(r"^(?:[a-z]\.\s*)?(\[[^\]]+\])\s*(.*)$")
+_DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y.%m.%d %H:%M:%S",
+    "%Y.%m.%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%d-%b-%Y",
+    "%d-%B-%Y",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y",
+    "%d/%m/%Y",
+    "%Y%m%d",
+    "%a %b %d %H:%M:%S %Z %Y",
+    "%b %d %Y",
+)
+
+
+class WhoisQueryError(Exception):
+    """Raised when a port-43 query fails or times out."""
+
+
+_metrics = get_metrics()
+WHOIS_QUERIES = _metrics.counter("gatchfier_whois_queries_total", "Port-43 queries sent, referrals included")
+WHOIS_ERRORS = _metrics.counter("gatchfier_whois_errors_total", "Port-43 queries that failed or timed out")
+WHOIS_SECONDS = _metrics.histogram("gatchfier_whois_query_seconds", "Time per port-43 query")
+
+
+def split_server(server: str) -> Tuple[str, int]:
+    host, _, port = server.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return server, WHOIS_PORT
+
+
+def query_port43(server: str, query: str, timeout: float = QUERY_TIMEOUT) -> str:
+    """Send ``query`` to a whois server and read until it closes the connection."""
+    host, port = split_server(server)
+    deadline = time.monotonic() + timeout
+    chunks: List[bytes] = []
+    received = 0
+    WHOIS_QUERIES.inc()
+    started = time.monotonic()
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(query.encode("idna") + b"\r\n")
+            while received < MAX_RESPONSE_BYTES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WhoisQueryError(f"{server} timed out after {timeout:.0f}s")
+                sock.settimeout(remaining)
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                received += len(chunk)
+    except socket.timeout as exc:
+        WHOIS_ERRORS.inc()
+        raise WhoisQueryError(f"{server} timed out after {timeout:.0f}s") from exc
+    except (OSError, UnicodeError) as exc:
+        WHOIS_ERRORS.inc()
+        raise WhoisQueryError(f"{server}: {exc}") from exc
+    except WhoisQueryError:
+        WHOIS_ERRORS.inc()
+        raise
+    finally:
+        WHOIS_SECONDS.observe(time.monotonic() - started)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def domain_tld(domain: str) -> str:
+    return domain.strip().rstrip(".").rsplit(".", 1)[-1].lower()
+
+
+class ReferralCache:
+    """TLD to registry whois server map.
+
+    Known TLDs are answered from the precomputed ``index``; others are asked
+    of IANA once and the referral is kept on disk.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        iana_server: str = IANA_SERVER,
+        timeout: float = QUERY_TIMEOUT,
+        index: Dict[str, str] | None = None,
+    ):
+        self.index = TLD_SERVERS if index is None else index
+        self.path = path or data_path(REFERRAL_FILE)
+        self.iana_server = iana_server
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._tld_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._entries: Dict[str, dict] | None = None
+
+    def server_for(self, domain: str) -> str:
+        tld = domain_tld(domain)
+        if tld in self.index:
+            return self.index[tld]
+        with self._lock:
+            tld_lock = self._tld_locks[tld]
+        # One IANA query per TLD even when many domains ask at once
+        with tld_lock:
+            with self._lock:
+                entry = self._load().get(tld)
+            if entry and time.time() - entry["fetched"] < REFERRAL_MAX_AGE:
+                return entry["server"]
+            server = self._ask_iana(tld)
+            with self._lock:
+                self._load()[tld] = {"server": server, "fetched": time.time()}
+                self._save()
+            return server
+
+    def _ask_iana(self, tld: str) -> str:
+        response = query_port43(self.iana_server, tld, self.timeout)
+        for key in ("refer:", "whois:"):
+            for line in response.splitlines():
+                if line.lower().startswith(key):
+                    server = line.split(":", 1)[1].strip()
+                    if server:
+                        return server
+        raise WhoisQueryError(f"No whois server is registered for .{tld}")
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+def parse_date(value: str) -> datetime.datetime | str:
+    """Parse the date formats registries commonly use; unknown text is kept."""
+    text = value.strip()
+    # Drop trailing zone names and notes such as "(JST)" or "UTC"
+    candidate = re.sub(r"\s*\((?:[A-Z]{2,5})\)$|\s+(?:UTC|GMT)$", "", text)
+    candidate = re.sub(r"(\.\d{6})\d+", r"\1", candidate)
+    for fmt in _DATE_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(candidate, fmt)
+        except ValueError:
+            continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return parsed
+    try:
+        from dateutil import parser as date_parser  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return text
+    try:
+        parsed = date_parser.parse(candidate)
+    except (ValueError, OverflowError):
+        return text
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _clean(field: str, value: str) -> Any:
+    value = value.strip()
+    if field in DATE_FIELDS:
+        return parse_date(value)
+    if field == "status":
+        # "clientTransferProhibited https://icann.org/epp#..." -> the code only
+        return value.split(" ", 1)[0] if "http" in value else value
+    if field == "name_servers":
+        return value.split()[0].rstrip(".").lower()
+    return value
+
+
+def parse_whois(text: str) -> Dict[str, Any]:
+    """Extract the fields WhoisTab shows from a raw whois response.
+
+    Handles the "Key: value" style used by gTLD registries as well as the
+    indented blocks used by Nominet-style ccTLDs, where the key sits on its
+    own line and values follow on indented lines.
+    """
+    collected: Dict[str, List[Any]] = {}
+    pending_field: str | None = None
+
+    for raw_line in text.splitlines():
+        if not raw_line.strip() or raw_line.lstrip().startswith(("%", "#", ">>>")):
+            pending_field = None
+            continue
+        if pending_field and raw_line[:1].isspace() and ":" not in raw_line.strip()[:-1]:
+            collected.setdefault(pending_field, []).append(_clean(pending_field, raw_line))
+            continue
+
+        bracketed = _BRACKETED.match(raw_line.strip())
+        if bracketed:
+            # JPRS style: "a. [Domain Name]      EXAMPLE.JP"
+            key, value = bracketed.groups()
+        else:
+            key, separator, value = raw_line.strip().partition(":")
+            if not separator:
+                pending_field = None
+                continue
+        field = _ALIAS_TO_FIELD.get(key.strip().lower())
+        if field is None:
+            pending_field = None
+            continue
+        value = value.strip()
+        if value:
+            collected.setdefault(field, []).append(_clean(field, value))
+            pending_field = None
+        else:
+            pending_field = field
+
+    record: Dict[str, Any] = {}
+    for field in FIELD_ALIASES:
+        values = []
+        for value in collected.get(field, []):
+            if value and value not in values:
+                values.append(value)
+        if values:
+            record[field] = values[0] if len(values) == 1 else values
+
+    emails = list(dict.fromkeys(match.lower() for match in _EMAIL.findall(text)))
+    if emails:
+        record["emails"] = emails[0] if len(emails) == 1 else emails
+    return record
+
+
+def find_referral(text: str) -> str | None:
+    for line in text.splitlines():
+        key, separator, value = line.strip().partition(":")
+        if separator and key.strip().lower() in REFERRAL_KEYS:
+            server = value.strip()
+            server = re.sub(r"^[a-z]+://", "", server, flags=re.IGNORECASE).rstrip("/")
+            if server:
+                return server
+    return None
+
+
+def is_not_found(text: str) -> bool:
+    lowered = text.lower()
+    return any(marker in lowered for marker in NOT_FOUND_MARKERS)
+
+
+class WhoisClient:
+    """In-process port-43 whois client.
+
+    The registry server comes from ``TLD_SERVERS`` (falling back to an IANA
+    referral), thin-registry answers are followed to the registrar's server,
+    and the whole lookup, referrals included, shares one ``timeout`` budget.
+    """
+
+    def __init__(self, timeout: float = QUERY_TIMEOUT, referrals: ReferralCache | None = None):
+        self.timeout = timeout
+        self.referrals = referrals or ReferralCache()
+
+    def server_for(self, domain: str) -> str:
+        return self.referrals.server_for(domain)
+
+    def lookup(self, domain: str) -> Dict[str, Any]:
+        domain = domain.strip().rstrip(".").lower()
+        deadline = time.monotonic() + self.timeout
+        server = self.server_for(domain)
+        text = query_port43(server, domain, self._remaining(deadline, server))
+        record = parse_record(domain, text)
+
+        visited = {server.lower()}
+        for _ in range(MAX_REFERRALS):
+            referral = find_referral(text)
+            if not referral or referral.lower() in visited:
+                break
+            visited.add(referral.lower())
+            try:
+                text = query_port43(referral, domain, self._remaining(deadline, referral))
+            except WhoisQueryError:
+                # The registry answer is already usable; a dead registrar is not fatal
+                break
+            # Registrar data is more detailed, but keep registry dates when absent
+            for field, value in parse_whois(text).items():
+                if field == "domain_name" and field in record:
+                    continue
+                record[field] = value
+        return record
+
+    @staticmethod
+    def _remaining(deadline: float, server: str) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise WhoisQueryError(f"Whois lookup timed out before querying {server}")
+        return remaining
+
+
+def parse_record(domain: str, text: str) -> Dict[str, Any]:
+    """Parse a registry answer, raising when the domain is not registered."""
+    record = parse_whois(text)
+    if not record.get("domain_name") and is_not_found(text):
+        raise WhoisQueryError(f"No whois record found for {domain}")
+    return record
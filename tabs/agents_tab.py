@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QScrollArea,
+    QFrame,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+)
+
+from core.agent import DEFAULT_AGENT_PORT, SCAN_CHUNK, TOOLS, AgentPool, dispatch
+from core.channel import ResultChannel
+from core.discovery import parse_network, sweep_addresses
+from core.results import get_results_store
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.pump import ChannelPump
+from widgets.terminal import TerminalLog
+
+TOOL_TABLES = {"ping": "ping", "scan": "portscan", "trace": "traceroute"}
+AGENT_COLUMNS = ["Agent", "Status", "Units done", "In flight"]
+
+
+def expand_targets(text: str) -> list:
+    """Comma or space separated hosts; CIDR networks become their host addresses."""
+    hosts = []
+    for part in text.replace(",", " ").split():
+        hosts.extend(sweep_addresses(parse_network(part)) if "/" in part else [part])
+    return list(dict.fromkeys(hosts))
+
+
+def format_record(record: dict) -> str:
+    target, agent = record["target"], record.get("agent", "")
+    if record["type"] == "open":
+        return f"[{agent}] {target}: port {record['port']} open ({record['service']})"
+    if record["type"] == "reply":
+        rtt = "timeout" if record["rtt_ms"] is None else f"{record['rtt_ms']:.2f} ms"
+        return f"[{agent}] {target}: seq {record['seq']} {rtt}"
+    if record["type"] == "hop":
+        return f"[{agent}] {target}: {record['text']}"
+    agents = ", ".join(record.get("agents", [])) or "no agent"
+    errors = "; ".join(record.get("errors", []))
+    if record["tool"] == "scan":
+        line = (f"{target}: {record.get('scanned', 0):,} ports scanned, open {record.get('open', [])}, "
+                f"{record.get('closed', 0):,} closed")
+    elif record["tool"] == "ping":
+        line = f"{target}: {record.get('received', 0)}/{record.get('sent', 0)} replies, {record.get('loss_pct', 0)}% loss"
+    else:
+        line = f"{target}: traceroute {'complete' if record.get('complete') else 'incomplete'}"
+    return f"{line} via {agents}" + (f" — {errors}" if errors else "")
+
+
+class DispatchWorker(JobWorker):
+    connected = Signal(list)
+    finished = Signal(float)
+    error = Signal(str)
+
+    tool = "Agents"
+
+    def __init__(self, agents: list, token: str, tool: str, targets: list, params: dict, chunk: int):
+        super().__init__()
+        self.agents = agents
+        self.agent_token = token
+        self.job_tool = tool
+        self.targets = targets
+        self.params = params
+        self.chunk = chunk
+        self.pool: AgentPool | None = None
+        self.channel = ResultChannel()
+        self.summaries = 0
+
+    def describe(self) -> str:
+        return f"Dispatch {self.job_tool} of {len(self.targets)} targets to {len(self.agents)} agents"
+
+    def run(self):
+        store = get_results_store()
+        table = TOOL_TABLES[self.job_tool]
+        # Open ports are stored once the target's summary brings its resolved address
+        found = {}
+
+        def on_event(record: dict):
+            if record["type"] == "open":
+                found.setdefault(record["target"], []).append(record)
+            elif record["type"] == "reply":
+                store.record(table, record["target"], seq=record["seq"], rtt_ms=record["rtt_ms"])
+            elif record["type"] == "hop":
+                store.record(table, record["target"], hop=record["hop"], line=record["text"])
+            else:
+                for item in found.pop(record["target"], []):
+                    store.record(table, item["target"], address=record.get("address"), port=item["port"],
+                                 service=item["service"])
+                self.summaries += 1
+                self.report(self.summaries, len(self.targets))
+            self.channel.put(record)
+
+        try:
+            self.pool, errors = AgentPool.connect(self.agents, self.agent_token)
+            self.connected.emit(errors)
+            if not self.pool.agents:
+                self.error.emit("No agent could be reached.")
+                return
+            elapsed = dispatch(self.pool, self.job_tool, self.targets, self.params, on_event, stop=self.token,
+                               chunk=self.chunk)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error.emit(str(exc) or type(exc).__name__)
+            return
+        finally:
+            if self.pool:
+                self.pool.close()
+        self.finished.emit(elapsed)
+
+    def skipped(self):
+        self.error.emit("Cancelled before it started.")
+
+
+class AgentsTab(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        self.worker: DispatchWorker | None = None
+        self.pump: ChannelPump | None = None
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Agents")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel(
+            "Spread ping, port scan and traceroute sweeps over headless agents started with "
+            "'python cli.py agent' on this or other machines."
+        )
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        agents_row = QHBoxLayout()
+        agents_row.setSpacing(8)
+
+        self.agents_input = QLineEdit()
+        self.agents_input.setPlaceholderText(f"Agents (e.g., 127.0.0.1:{DEFAULT_AGENT_PORT}, box2:{DEFAULT_AGENT_PORT + 1})")
+        agents_row.addWidget(self.agents_input, 1)
+
+        self.token_input = QLineEdit()
+        self.token_input.setPlaceholderText("Token")
+        self.token_input.setEchoMode(QLineEdit.Password)
+        agents_row.addWidget(self.token_input)
+        layout.addLayout(agents_row)
+
+        self.targets_input = QLineEdit()
+        self.targets_input.setPlaceholderText("Targets (hosts or CIDR networks, e.g., 192.168.1.0/24 example.com)")
+        layout.addWidget(self.targets_input)
+
+        options_row = QHBoxLayout()
+        options_row.setSpacing(8)
+
+        self.tool_select = QComboBox()
+        self.tool_select.addItems(list(TOOLS))
+        self.tool_select.setCurrentText("scan")
+        options_row.addWidget(self.tool_select)
+
+        self.ports_input = QLineEdit("1-1024")
+        self.ports_input.setPlaceholderText("Ports (e.g., 1-1024,8080)")
+        options_row.addWidget(self.ports_input)
+
+        self.chunk_input = QSpinBox()
+        self.chunk_input.setRange(16, 65535)
+        self.chunk_input.setValue(SCAN_CHUNK)
+        self.chunk_input.setPrefix("Ports per unit: ")
+        options_row.addWidget(self.chunk_input)
+
+        self.count_input = QSpinBox()
+        self.count_input.setRange(1, 1000)
+        self.count_input.setValue(4)
+        self.count_input.setPrefix("Pings: ")
+        options_row.addWidget(self.count_input)
+
+        options_row.addStretch(1)
+        layout.addLayout(options_row)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.start_btn = QPushButton("Dispatch")
+        buttons_row.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        buttons_row.addWidget(self.stop_btn)
+
+        self.export_btn = ExportButton(TOOL_TABLES["scan"])
+        buttons_row.addWidget(self.export_btn)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.agents_table = QTableWidget(0, len(AGENT_COLUMNS))
+        self.agents_table.setHorizontalHeaderLabels(AGENT_COLUMNS)
+        self.agents_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.agents_table.verticalHeader().setVisible(False)
+        self.agents_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.agents_table.setMaximumHeight(160)
+        layout.addWidget(self.agents_table)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(240)
+        layout.addWidget(self.output, 1)
+
+        # Agent counters are polled rather than signalled per unit
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(250)
+        self.status_timer.timeout.connect(self.refresh_agents)
+
+        self.start_btn.clicked.connect(self.start_dispatch)
+        self.stop_btn.clicked.connect(self.stop_dispatch)
+        self.tool_select.currentTextChanged.connect(self.update_options)
+        self.export_btn.message.connect(self.output.append)
+        self.update_options(self.tool_select.currentText())
+
+    def update_options(self, tool: str):
+        self.ports_input.setEnabled(tool == "scan")
+        self.chunk_input.setEnabled(tool == "scan")
+        self.count_input.setEnabled(tool == "ping")
+        self.export_btn.table = TOOL_TABLES[tool]
+
+    def start_dispatch(self):
+        if self.worker:
+            return
+        agents = [part.strip() for part in self.agents_input.text().split(",") if part.strip()]
+        if not agents:
+            self.output.append("Please enter at least one agent address.")
+            return
+        try:
+            targets = expand_targets(self.targets_input.text())
+        except ValueError as exc:
+            self.output.append(str(exc))
+            return
+        if not targets:
+            self.output.append("Please enter targets to dispatch.")
+            return
+
+        tool = self.tool_select.currentText()
+        params = {"ports": self.ports_input.text().strip() or "1-65535", "count": self.count_input.value()}
+        self.output.clear()
+        self.agents_table.setRowCount(0)
+        self.output.append(f"Dispatching {tool} of {len(targets):,} targets to {len(agents)} agents...")
+        self.status_label.setText("Connecting to agents...")
+
+        self.worker = DispatchWorker(agents, self.token_input.text(), tool, targets, params, self.chunk_input.value())
+        self.worker.connected.connect(self.show_connected)
+        self.worker.finished.connect(self.show_finished)
+        self.worker.error.connect(self.show_error)
+        self.pump = ChannelPump(self.worker.channel, parent=self)
+        self.pump.batch.connect(self.handle_results)
+        self.pump.start()
+        self.worker.start()
+
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+    def stop_dispatch(self):
+        if self.worker:
+            self.worker.stop()
+        self.status_label.setText("Cancelling jobs on agents...")
+        self.stop_btn.setEnabled(False)
+
+    def show_connected(self, errors: list):
+        for error in errors:
+            self.output.append(f"Agent unavailable: {error}")
+        self.refresh_agents()
+        self.status_timer.start()
+
+    def refresh_agents(self):
+        if not self.worker or not self.worker.pool:
+            return
+        agents = self.worker.pool.agents
+        self.agents_table.setRowCount(len(agents))
+        for row, agent in enumerate(agents):
+            status = "Connected" if agent.alive else f"Lost: {agent.error}"
+            for column, value in enumerate((agent.label, status, agent.completed, agent.in_flight)):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                self.agents_table.setItem(row, column, item)
+        self.status_label.setText(
+            f"Dispatching • {self.worker.summaries:,}/{len(self.worker.targets):,} targets done"
+        )
+
+    def handle_results(self, records):
+        for record in records:
+            self.output.append(format_record(record))
+
+    def show_finished(self, elapsed: float):
+        done = self.worker.summaries if self.worker else 0
+        self._reset_worker()
+        self.output.append(f"\nDispatch complete: {done:,} targets in {elapsed:.1f} s.")
+        self.status_label.setText(f"Last dispatch: {done:,} targets in {elapsed:.1f} s")
+
+    def show_error(self, message: str):
+        self._reset_worker()
+        self.output.append(f"Dispatch failed: {message}")
+        self.status_label.setText("Idle")
+
+    def _reset_worker(self):
+        # Deliver records still queued in the channel before the closing line
+        if self.pump:
+            self.pump.stop()
+            self.pump = None
+        self.refresh_agents()
+        self.status_timer.stop()
+        self.worker = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import socket
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QCheckBox,
+    QFileDialog,
+    QPlainTextEdit,
+    QSplitter,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+)
+
+from core.capture import DEFAULT_RING_SIZE, MAX_RING_SIZE, CaptureSession, PacketRing, capture, decode, summarize
+from core.metrics import RateMeter
+from widgets.job_worker import JobWorker
+from widgets.terminal import TerminalLog
+
+REFRESH_INTERVAL_MS = 250
+DEFAULT_INTERFACE = "Default interface"
+PACKET_COLUMNS = ["No.", "Time", "Source", "Destination", "Protocol", "Length", "Info"]
+# Summaries of rows that were on screen; a screenful is a few dozen rows
+SUMMARY_CACHE_LIMIT = 4096
+
+
+class CaptureWorker(JobWorker):
+    status = Signal(str)
+    error = Signal(str)
+    finished = Signal()
+
+    tool = "Capture"
+
+    def __init__(self, session: CaptureSession, iface: str | None, bpf: str):
+        super().__init__()
+        self.session = session
+        self.iface = iface
+        self.bpf = bpf
+
+    def describe(self) -> str:
+        return f"Capture on {self.iface or 'the default interface'}" + (f" ({self.bpf})" if self.bpf else "")
+
+    def run(self):
+        try:
+            capture(self.session, self.iface, self.bpf, stop=self.token, on_status=self.status.emit)
+        except ImportError:
+            self.error.emit("Packet capture needs scapy (pip install -r requirements.txt).")
+        except PermissionError:
+            self.error.emit("Packet capture needs administrator/root privileges.")
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error.emit(f"Capture failed: {exc}")
+        self.finished.emit()
+
+
+class PacketTableModel(QAbstractTableModel):
+    """Virtual table over a :class:`PacketRing`.
+
+    The model holds no rows of its own: row ``r`` is ring sequence
+    ``first + r`` and cells are summarised only when the view asks for
+    them, which it does for visible rows alone. ``refresh`` moves the
+    window once per timer tick with one remove and one insert
+    notification, however many packets arrived in between.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ring: PacketRing | None = None
+        self.linktype = 1
+        self.started = 0.0
+        self.first = 0
+        self.count = 0
+        self._summaries: dict = {}
+
+    def attach(self, session: CaptureSession):
+        self.beginResetModel()
+        self.ring = session.ring
+        self.linktype = session.linktype
+        self.started = session.started
+        self.first = self.count = 0
+        self._summaries.clear()
+        self.endResetModel()
+
+    def refresh(self, session: CaptureSession):
+        if self.ring is None:
+            return
+        self.linktype = session.linktype
+        self.started = session.started
+        first, end = self.ring.first, self.ring.written
+        evicted = min(self.count, max(0, first - self.first))
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self.first += evicted
+            self.count -= evicted
+            self.endRemoveRows()
+        if self.first < first:
+            # Everything shown was overwritten between ticks
+            self.first = first
+        added = end - (self.first + self.count)
+        if added > 0:
+            self.beginInsertRows(QModelIndex(), self.count, self.count + added - 1)
+            self.count += added
+            self.endInsertRows()
+
+    def seq(self, row: int) -> int:
+        return self.first + row
+
+    def rowCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else self.count
+
+    def columnCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(PACKET_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # pylint: disable=invalid-name
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PACKET_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or self.ring is None:
+            return None
+        seq = self.seq(index.row())
+        entry = self.ring.get(seq)
+        if entry is None:
+            return ""
+        timestamp, frame, wire_length = entry
+        column = index.column()
+        if column == 0:
+            return seq + 1
+        if column == 1:
+            return f"{timestamp - self.started:.6f}"
+        if column == 5:
+            return wire_length
+        summary = self._summaries.get(seq)
+        if summary is None:
+            if len(self._summaries) >= SUMMARY_CACHE_LIMIT:
+                self._summaries.clear()
+            summary = self._summaries[seq] = summarize(frame, self.linktype)
+        return (summary.source, summary.destination, summary.protocol, summary.info)[column - 2]
+
+
+class CaptureTab(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        self.worker: CaptureWorker | None = None
+        self.session: CaptureSession | None = None
+        self.rate = RateMeter()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Packet Capture")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel(
+            "Capture frames with a kernel-side BPF filter into a fixed-size ring, optionally streaming to a pcap file. "
+            "Select a packet to decode it."
+        )
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        filter_row = QHBoxLayout()
+        filter_row.setSpacing(8)
+
+        self.iface_select = QComboBox()
+        self.iface_select.setEditable(True)
+        self.iface_select.addItem(DEFAULT_INTERFACE)
+        try:
+            self.iface_select.addItems([name for _, name in socket.if_nameindex()])
+        except OSError:
+            pass
+        filter_row.addWidget(self.iface_select)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("BPF filter (e.g., icmp or tcp port 443)")
+        filter_row.addWidget(self.filter_input, 1)
+
+        layout.addLayout(filter_row)
+
+        options_row = QHBoxLayout()
+        options_row.setSpacing(8)
+
+        self.ring_input = QSpinBox()
+        self.ring_input.setRange(1000, MAX_RING_SIZE)
+        self.ring_input.setSingleStep(10000)
+        self.ring_input.setValue(DEFAULT_RING_SIZE)
+        self.ring_input.setPrefix("Keep last ")
+        self.ring_input.setSuffix(" packets")
+        options_row.addWidget(self.ring_input)
+
+        self.pcap_input = QLineEdit()
+        self.pcap_input.setPlaceholderText("Save to pcap file (optional)")
+        options_row.addWidget(self.pcap_input, 1)
+
+        self.browse_btn = QPushButton("Browse…")
+        options_row.addWidget(self.browse_btn)
+
+        layout.addLayout(options_row)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.start_btn = QPushButton("Start Capture")
+        buttons_row.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        buttons_row.addWidget(self.stop_btn)
+
+        self.follow_check = QCheckBox("Follow new packets")
+        self.follow_check.setChecked(True)
+        buttons_row.addWidget(self.follow_check)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.model = PacketTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view place rows without measuring them
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate((80, 110, 190, 190, 80, 70)):
+            self.table.setColumnWidth(column, width)
+
+        self.details = QPlainTextEdit()
+        self.details.setReadOnly(True)
+        self.details.setPlaceholderText("Select a packet to decode it.")
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.details)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, 1)
+
+        self.output = TerminalLog()
+        self.output.setMaximumHeight(140)
+        layout.addWidget(self.output)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.browse_btn.clicked.connect(self.choose_pcap)
+        self.start_btn.clicked.connect(self.start_capture)
+        self.filter_input.returnPressed.connect(self.start_capture)
+        self.stop_btn.clicked.connect(self.stop_capture)
+        self.table.selectionModel().currentRowChanged.connect(self.show_packet)
+
+    def choose_pcap(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save capture", "capture.pcap", "pcap files (*.pcap);;All files (*)")
+        if path:
+            self.pcap_input.setText(path)
+
+    def start_capture(self):
+        if self.worker:
+            return
+        iface = self.iface_select.currentText().strip()
+        iface = None if not iface or iface == DEFAULT_INTERFACE else iface
+        bpf = self.filter_input.text().strip()
+
+        self.session = CaptureSession(self.ring_input.value(), self.pcap_input.text().strip() or None)
+        self.model.attach(self.session)
+        self.details.clear()
+        self.rate = RateMeter()
+
+        self.worker = CaptureWorker(self.session, iface, bpf)
+        self.worker.status.connect(self.output.append)
+        self.worker.error.connect(self.output.append)
+        self.worker.finished.connect(self.capture_finished)
+        self.worker.start()
+        self.refresh_timer.start()
+
+        self.status_label.setText("Starting capture...")
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+    def stop_capture(self):
+        if self.worker:
+            self.worker.stop()
+        self.status_label.setText("Stopping capture...")
+        self.stop_btn.setEnabled(False)
+
+    def refresh(self):
+        session = self.session
+        if session is None:
+            return
+        self.model.refresh(session)
+        self.rate.update(session.packets)
+        if self.follow_check.isChecked() and self.model.count:
+            self.table.scrollToBottom()
+        status = (
+            f"{session.packets:,} packets • {self.rate.rate or 0:,.0f} pkt/s • {len(session.ring):,} in view"
+            f" • {session.bytes / 1e6:,.1f} MB"
+        )
+        if session.kernel_drops:
+            status += f" • {session.kernel_drops:,} dropped by kernel"
+        if session.pcap is not None:
+            status += f" • pcap {session.pcap.bytes_written / 1e6:,.1f} MB"
+        self.status_label.setText(status)
+
+    def show_packet(self, current, _previous=None):
+        if not current.isValid() or self.model.ring is None:
+            return
+        seq = self.model.seq(current.row())
+        entry = self.model.ring.get(seq)
+        if entry is None:
+            self.details.setPlainText(f"Packet {seq + 1} has been overwritten in the ring.")
+            return
+        _, frame, wire_length = entry
+        try:
+            text = decode(frame, self.model.linktype)
+        except ImportError:
+            text = "Decoding needs scapy (pip install -r requirements.txt)."
+        except Exception as exc:  # pylint: disable=broad-except
+            text = f"Could not decode packet: {exc}"
+        self.details.setPlainText(f"Packet {seq + 1} • {wire_length} bytes on the wire\n\n{text}")
+
+    def capture_finished(self):
+        self.refresh_timer.stop()
+        self.refresh()
+        if self.session is not None:
+            self.output.append(f"Capture stopped after {self.session.packets:,} packets.")
+            if self.session.pcap_path:
+                self.output.append(f"Saved to {self.session.pcap_path}")
+        self.worker = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
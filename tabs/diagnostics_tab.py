@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QScrollArea,
+    QFrame,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+)
+
+from core.metrics import METRICS_PORT_ENV, Histogram, get_metrics, metrics_port_from_env
+
+METRIC_COLUMNS = ["Metric", "Type", "Value", "Rate / s", "p50", "p95", "p99", "Mean"]
+REFRESH_INTERVAL_MS = 1000
+METRIC_PREFIX = "gatchfier_"
+
+
+def format_seconds(value: float | None) -> str:
+    if value is None:
+        return ""
+    if value == float("inf"):
+        return "> max"
+    return f"{value * 1000:.1f} ms" if value < 1 else f"{value:.2f} s"
+
+
+def format_value(value: float) -> str:
+    if value != value:  # NaN from a metric whose source failed
+        return ""
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.3f}"
+
+
+class DiagnosticsTab(QWidget):
+    """Live view of the engine counters, gauges and latency histograms."""
+
+    def __init__(self):
+        super().__init__()
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Diagnostics")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Probe rates, timeouts, cache hits, queue depth and latency counted by every engine.")
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        port = metrics_port_from_env()
+        endpoint = (
+            f"Prometheus endpoint: http://127.0.0.1:{port}/metrics"
+            if port
+            else f"Prometheus endpoint off • set {METRICS_PORT_ENV} to serve /metrics"
+        )
+        self.endpoint_label = QLabel(endpoint)
+        self.endpoint_label.setObjectName("MetricLabel")
+        self.endpoint_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.endpoint_label)
+
+        self.table = QTableWidget(0, len(METRIC_COLUMNS))
+        self.table.setHorizontalHeaderLabels(METRIC_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setMinimumHeight(320)
+        layout.addWidget(self.table, 1)
+
+        # Previous samples for the per-second rates
+        self.last_values: dict = {}
+        self.last_sampled = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):  # pylint: disable=invalid-name
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        now = time.monotonic()
+        elapsed = now - self.last_sampled if self.last_sampled else 0.0
+        metrics = get_metrics().metrics()
+        self.table.setRowCount(len(metrics))
+        values = {}
+        for row, metric in enumerate(metrics):
+            value = metric.sample()
+            values[metric.name] = value
+            previous = self.last_values.get(metric.name)
+            rate = ""
+            if metric.kind != "gauge" and previous is not None and elapsed:
+                rate = f"{(value - previous) / elapsed:,.1f}"
+            name = metric.name[len(METRIC_PREFIX):] if metric.name.startswith(METRIC_PREFIX) else metric.name
+            cells = [name, metric.kind, format_value(value), rate]
+            if isinstance(metric, Histogram):
+                cells += [format_seconds(metric.quantile(q)) for q in (0.5, 0.95, 0.99)]
+                cells.append(format_seconds(metric.mean()))
+            else:
+                cells += ["", "", "", ""]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                if item.text() != text:
+                    item.setText(text)
+            self.table.item(row, 0).setToolTip(metric.help)
+        self.last_values = values
+        self.last_sampled = now
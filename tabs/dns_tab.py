@@ -1,19 +1,236 @@
-import socket
+from __future__ import annotations
 
-from PySide6.QtCore import Qt
+from typing import List
+
+from PySide6.QtCore import Qt, Signal, QTimer, QAbstractTableModel, QModelIndex
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLineEdit,
-    QTextEdit,
     QPushButton,
     QLabel,
     QComboBox,
     QHBoxLayout,
     QScrollArea,
     QFrame,
+    QSpinBox,
+    QStackedWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QTableView,
+    QHeaderView,
 )
 
+from core.dns_bench import DEFAULT_NAMES, ResolverStats, benchmark_resolvers
+from core.dns_client import DNSClient, default_nameserver
+from core.dns_lookup import SYSTEM_RESOLVER, LookupResult, lookup
+from core.dns_wire import RECORD_TYPES
+from core.jobs import PRIORITY_BULK, PRIORITY_INTERACTIVE
+from core.ptr_sweep import STATUS_LABELS, PtrSweepStore, parse_network, sweep
+from core.results import get_results_store, save_dns
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.terminal import TerminalLog
+
+PUBLIC_RESOLVERS = ["1.1.1.1", "8.8.8.8", "9.9.9.9"]
+BENCHMARK_COLUMNS = [
+    ("Resolver", "resolver"),
+    ("Cached p50", "cached_p50"),
+    ("Cached p95", "cached_p95"),
+    ("Cached p99", "cached_p99"),
+    ("Uncached p50", "uncached_p50"),
+    ("Uncached p95", "uncached_p95"),
+    ("Uncached p99", "uncached_p99"),
+    ("Failures %", "failure_pct"),
+]
+
+
+class DNSLookupWorker(JobWorker):
+    finished = Signal(list)
+
+    tool = "DNS"
+    priority = PRIORITY_INTERACTIVE
+
+    def __init__(self, domain: str, rtype: str, server: str | None):
+        super().__init__()
+        self.domain = domain
+        self.rtype = rtype
+        self.server = server
+
+    def describe(self) -> str:
+        return f"{self.rtype} lookup for {self.domain}"
+
+    def run(self):
+        result = lookup(self.domain, self.rtype, self.server)
+        save_dns(get_results_store(), result)
+        self.finished.emit(format_lookup(result))
+
+    def skipped(self):
+        self.finished.emit([])
+
+
+def format_lookup(result: LookupResult) -> List[str]:
+    domain, rtype = result.domain, result.rtype
+    if result.error:
+        return [f"Lookup error: {result.error}"]
+    if result.server == SYSTEM_RESOLVER:
+        if not result.addresses:
+            return [f"No {rtype} records found for {domain}."]
+        source = " (cached)" if result.from_cache else ""
+        return [f"{domain} resolves to{source}:"] + [f"  - {ip}" for ip in result.addresses]
+
+    transport = "TCP" if result.via_tcp else "UDP"
+    lines = [
+        f"{rtype} query for {result.name} via {result.server} ({transport}, {result.elapsed_ms:.1f} ms): "
+        f"{result.rcode}"
+    ]
+    if not result.records:
+        lines.append(f"No {rtype} records found for {domain}.")
+    lines.extend(f"  {record}" for record in result.records)
+    return lines
+
+
+class ResolverBenchmarkWorker(JobWorker):
+    result = Signal(object)
+    finished = Signal(bool)
+
+    tool = "DNS"
+    priority = PRIORITY_BULK
+
+    def __init__(self, resolvers, names, rounds: int):
+        super().__init__()
+        self.resolvers = resolvers
+        self.names = names
+        self.rounds = rounds
+        self.completed = 0
+
+    def describe(self) -> str:
+        return f"Resolver benchmark ({len(self.resolvers)} resolvers)"
+
+    def on_result(self, stats: ResolverStats):
+        self.completed += 1
+        self.report(self.completed, len(self.resolvers))
+        self.result.emit(stats)
+
+    def run(self):
+        benchmark_resolvers(
+            self.resolvers,
+            self.names,
+            rounds=self.rounds,
+            stop=self.token,
+            on_result=self.on_result,
+        )
+        self.finished.emit(not self.token.is_set())
+
+    def skipped(self):
+        self.finished.emit(False)
+
+
+class ReverseSweepWorker(JobWorker):
+    finished = Signal(bool)
+    error = Signal(str)
+
+    tool = "DNS"
+    priority = PRIORITY_BULK
+
+    def __init__(self, store: PtrSweepStore, server: str, rate: float, window: int):
+        super().__init__()
+        self.store = store
+        self.server = server
+        self.rate = rate
+        self.window = window
+
+    def describe(self) -> str:
+        return f"Reverse sweep of {self.store.network}"
+
+    def run(self):
+        try:
+            client = DNSClient(self.server)
+        except (OSError, ValueError) as exc:
+            self.error.emit(str(exc))
+            self.finished.emit(False)
+            return
+        sweep(self.store, client, rate=self.rate, window=self.window, stop=self.token)
+        self.finished.emit(not self.token.is_set())
+
+    def skipped(self):
+        self.finished.emit(False)
+
+
+class PtrSweepModel(QAbstractTableModel):
+    """Virtual table over a PtrSweepStore; cells are only formatted on paint."""
+
+    HEADERS = ["Address", "PTR Name", "Status", "Latency (ms)"]
+
+    def __init__(self):
+        super().__init__()
+        self.store: PtrSweepStore | None = None
+        self.rows = None
+        self.visible = 0
+        self.sort_column: int | None = None
+        self.descending = False
+
+    def set_store(self, store: PtrSweepStore | None):
+        self.beginResetModel()
+        self.store = store
+        self.rows = None
+        self.visible = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None:
+            return 0
+        return len(self.rows) if self.rows is not None else self.visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or self.store is None:
+            return None
+        row = self.rows[index.row()] if self.rows is not None else self.store.completed[index.row()]
+        column = index.column()
+        if column == 0:
+            return self.store.address(row)
+        if column == 1:
+            return self.store.name(row)
+        if column == 2:
+            return STATUS_LABELS[self.store.status[row]]
+        return f"{self.store.latency[row]:.1f}"
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.descending = order == Qt.DescendingOrder
+        self.refresh(resort=True)
+
+    def refresh(self, resort: bool = False):
+        """Pick up rows completed since the last call.
+
+        While a column is sorted, new rows are appended below the sorted ones
+        so a running sweep keeps the scroll position and selection; the full
+        sort happens only on ``resort`` (a header click or the sweep's end).
+        """
+        if self.store is None:
+            return
+        if self.sort_column is not None and (resort or self.rows is None):
+            self.beginResetModel()
+            self.rows = self.store.sorted_rows(self.sort_column, self.descending)
+            self.endResetModel()
+        count = self.store.completed_count()
+        shown = self.rowCount()
+        if count > shown:
+            self.beginInsertRows(QModelIndex(), shown, count - 1)
+            if self.rows is not None:
+                self.rows.extend(self.store.completed[shown:count])
+            else:
+                self.visible = count
+            self.endInsertRows()
+
 
 class DNSTab(QWidget):
     def __init__(self):
@@ -40,11 +257,54 @@ class DNSTab(QWidget):
         title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         layout.addWidget(title)
 
-        subtitle = QLabel("Resolve hostnames to IPv4 or IPv6 addresses using system DNS.")
+        subtitle = QLabel(
+            "Query A, AAAA, MX, TXT and other records through the system resolver or a chosen DNS server."
+        )
         subtitle.setObjectName("TabSubheading")
         subtitle.setWordWrap(True)
         layout.addWidget(subtitle)
 
+        mode_row = QHBoxLayout()
+        mode_row.setSpacing(8)
+
+        mode_label = QLabel("Mode:")
+        mode_label.setObjectName("FieldLabel")
+        mode_row.addWidget(mode_label)
+
+        self.mode_select = QComboBox()
+        self.mode_select.addItems(["Lookup", "Resolver Benchmark", "Reverse Sweep"])
+        mode_row.addWidget(self.mode_select)
+        mode_row.addStretch(1)
+        layout.addLayout(mode_row)
+
+        self.pages = QStackedWidget()
+        self.pages.addWidget(self._build_lookup_page())
+        self.pages.addWidget(self._build_benchmark_page())
+        self.pages.addWidget(self._build_sweep_page())
+        layout.addWidget(self.pages)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(200)
+        layout.addWidget(self.output, 1)
+
+        self.lookup_worker: DNSLookupWorker | None = None
+        self.benchmark_worker: ResolverBenchmarkWorker | None = None
+        self.mode_select.currentIndexChanged.connect(self.switch_mode)
+        self.lookup_btn.clicked.connect(self.resolve_dns)
+        self.export_btn.message.connect(self.output.append)
+        self.bench_btn.clicked.connect(self.toggle_benchmark)
+
+        self.sweep_worker: ReverseSweepWorker | None = None
+        self.sweep_timer = QTimer(self)
+        self.sweep_timer.timeout.connect(self.refresh_sweep)
+        self.sweep_btn.clicked.connect(self.toggle_sweep)
+
+    def _build_lookup_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
         self.domain_input = QLineEdit()
         self.domain_input.setPlaceholderText("Domain or host (e.g., example.com)")
         layout.addWidget(self.domain_input)
@@ -52,27 +312,128 @@ class DNSTab(QWidget):
         options_row = QHBoxLayout()
         options_row.setSpacing(8)
 
-        protocol_label = QLabel("Protocol:")
-        protocol_label.setObjectName("FieldLabel")
-        options_row.addWidget(protocol_label)
+        record_label = QLabel("Record:")
+        record_label.setObjectName("FieldLabel")
+        options_row.addWidget(record_label)
+
+        self.record_select = QComboBox()
+        self.record_select.addItems(list(RECORD_TYPES))
+        options_row.addWidget(self.record_select, 1)
 
-        self.protocol_select = QComboBox()
-        self.protocol_select.addItems(["IPv4", "IPv6"])
-        options_row.addWidget(self.protocol_select, 1)
+        resolver_label = QLabel("Resolver:")
+        resolver_label.setObjectName("FieldLabel")
+        options_row.addWidget(resolver_label)
+
+        self.resolver_select = QComboBox()
+        self.resolver_select.setEditable(True)
+        self.resolver_select.addItems([SYSTEM_RESOLVER, *PUBLIC_RESOLVERS])
+        self.resolver_select.setToolTip("Pick a resolver or type an address such as 192.0.2.53:5353")
+        options_row.addWidget(self.resolver_select, 1)
 
         self.lookup_btn = QPushButton("Resolve")
         options_row.addWidget(self.lookup_btn)
 
+        self.export_btn = ExportButton("dns", self.domain_input.text)
+        options_row.addWidget(self.export_btn)
+
         options_row.addStretch(1)
         layout.addLayout(options_row)
+        return page
 
-        self.output = QTextEdit()
-        self.output.setObjectName("TerminalOutput")
-        self.output.setReadOnly(True)
-        self.output.setMinimumHeight(200)
-        layout.addWidget(self.output, 1)
+    def _build_benchmark_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
 
-        self.lookup_btn.clicked.connect(self.resolve_dns)
+        self.resolvers_input = QLineEdit(", ".join([SYSTEM_RESOLVER, *PUBLIC_RESOLVERS]))
+        self.resolvers_input.setPlaceholderText("Resolvers, comma separated (e.g., 1.1.1.1, 8.8.8.8)")
+        layout.addWidget(self.resolvers_input)
+
+        self.names_input = QLineEdit(", ".join(DEFAULT_NAMES))
+        self.names_input.setPlaceholderText("Names to query, comma separated")
+        layout.addWidget(self.names_input)
+
+        controls_row = QHBoxLayout()
+        controls_row.setSpacing(8)
+
+        self.rounds_input = QSpinBox()
+        self.rounds_input.setRange(1, 50)
+        self.rounds_input.setValue(3)
+        self.rounds_input.setPrefix("Rounds: ")
+        controls_row.addWidget(self.rounds_input)
+
+        self.bench_btn = QPushButton("Run Benchmark")
+        controls_row.addWidget(self.bench_btn)
+
+        controls_row.addStretch(1)
+        layout.addLayout(controls_row)
+
+        self.bench_table = QTableWidget(0, len(BENCHMARK_COLUMNS))
+        self.bench_table.setHorizontalHeaderLabels([label for label, _ in BENCHMARK_COLUMNS])
+        self.bench_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.bench_table.verticalHeader().setVisible(False)
+        self.bench_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.bench_table.setSortingEnabled(True)
+        self.bench_table.setMinimumHeight(180)
+        layout.addWidget(self.bench_table)
+        return page
+
+    def _build_sweep_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
+        self.cidr_input = QLineEdit()
+        self.cidr_input.setPlaceholderText("Network in CIDR notation (e.g., 192.0.2.0/24)")
+        layout.addWidget(self.cidr_input)
+
+        controls_row = QHBoxLayout()
+        controls_row.setSpacing(8)
+
+        self.sweep_resolver = QComboBox()
+        self.sweep_resolver.setEditable(True)
+        self.sweep_resolver.addItems([SYSTEM_RESOLVER, *PUBLIC_RESOLVERS])
+        controls_row.addWidget(self.sweep_resolver, 1)
+
+        self.rate_input = QSpinBox()
+        self.rate_input.setRange(1, 20000)
+        self.rate_input.setValue(500)
+        self.rate_input.setPrefix("Rate: ")
+        self.rate_input.setSuffix(" q/s")
+        controls_row.addWidget(self.rate_input)
+
+        self.window_input = QSpinBox()
+        self.window_input.setRange(1, 4096)
+        self.window_input.setValue(256)
+        self.window_input.setPrefix("In flight: ")
+        controls_row.addWidget(self.window_input)
+
+        self.sweep_btn = QPushButton("Start Sweep")
+        controls_row.addWidget(self.sweep_btn)
+
+        controls_row.addStretch(1)
+        layout.addLayout(controls_row)
+
+        self.sweep_status = QLabel("Idle")
+        self.sweep_status.setObjectName("MetricLabel")
+        layout.addWidget(self.sweep_status)
+
+        self.sweep_model = PtrSweepModel()
+        self.sweep_table = QTableView()
+        self.sweep_table.setModel(self.sweep_model)
+        self.sweep_table.setSortingEnabled(True)
+        self.sweep_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.sweep_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.sweep_table.verticalHeader().setVisible(False)
+        self.sweep_table.verticalHeader().setDefaultSectionSize(24)
+        self.sweep_table.setMinimumHeight(240)
+        layout.addWidget(self.sweep_table)
+        return page
+
+    def switch_mode(self, index: int):
+        self.pages.setCurrentIndex(index)
 
     def resolve_dns(self):
         self.output.clear()
@@ -81,16 +442,120 @@ class DNSTab(QWidget):
             self.output.append("Please enter a domain before resolving.")
             return
 
-        family = socket.AF_INET6 if self.protocol_select.currentText() == "IPv6" else socket.AF_INET
+        rtype = self.record_select.currentText()
+        resolver = self.resolver_select.currentText().strip() or SYSTEM_RESOLVER
+        self.lookup_btn.setEnabled(False)
+        self.lookup_worker = DNSLookupWorker(domain, rtype, resolver)
+        self.lookup_worker.finished.connect(self.lookup_finished)
+        self.lookup_worker.start()
+
+    def lookup_finished(self, lines):
+        for line in lines:
+            self.output.append(line)
+        self.lookup_btn.setEnabled(True)
+        self.lookup_worker = None
+
+    def toggle_benchmark(self):
+        if self.benchmark_worker:
+            self.benchmark_worker.stop()
+            self.bench_btn.setEnabled(False)
+            self.bench_btn.setText("Stopping...")
+            return
+
+        resolvers = [item.strip() for item in self.resolvers_input.text().split(",") if item.strip()]
+        names = [item.strip() for item in self.names_input.text().split(",") if item.strip()]
+        if not resolvers or not names:
+            self.output.append("Please enter at least one resolver and one name to benchmark.")
+            return
+
+        system = default_nameserver()
+        resolvers = [system if item == SYSTEM_RESOLVER else item for item in resolvers]
+
+        self.output.clear()
+        self.bench_table.setSortingEnabled(False)
+        self.bench_table.setRowCount(0)
+        self.bench_table.setSortingEnabled(True)
+        self.output.append(
+            f"Benchmarking {len(resolvers)} resolvers with {len(names)} names x {self.rounds_input.value()} rounds..."
+        )
+
+        self.benchmark_worker = ResolverBenchmarkWorker(resolvers, names, self.rounds_input.value())
+        self.benchmark_worker.result.connect(self.add_benchmark_row)
+        self.benchmark_worker.finished.connect(self.benchmark_finished)
+        self.benchmark_worker.start()
+        self.bench_btn.setText("Stop Benchmark")
+
+    def add_benchmark_row(self, stats: ResolverStats):
+        if stats.error:
+            self.output.append(f"{stats.resolver}: {stats.error}")
+            return
+
+        summary = stats.summary()
+        self.bench_table.setSortingEnabled(False)
+        row = self.bench_table.rowCount()
+        self.bench_table.insertRow(row)
+        for column, (_, key) in enumerate(BENCHMARK_COLUMNS):
+            item = QTableWidgetItem()
+            value = summary[key]
+            # Numbers go in the display role so the column sorts numerically
+            item.setData(Qt.DisplayRole, value if value is not None else "n/a")
+            self.bench_table.setItem(row, column, item)
+        self.bench_table.setSortingEnabled(True)
+        self.output.append(
+            f"{stats.resolver}: {stats.queries} queries, {stats.failures} failures "
+            f"({summary['failure_pct']}%)"
+        )
+
+    def benchmark_finished(self, completed: bool):
+        self.output.append("Benchmark complete. Latencies are in ms." if completed else "Benchmark stopped.")
+        self.bench_btn.setEnabled(True)
+        self.bench_btn.setText("Run Benchmark")
+        self.benchmark_worker = None
+
+    def toggle_sweep(self):
+        if self.sweep_worker:
+            self.sweep_worker.stop()
+            self.sweep_btn.setEnabled(False)
+            self.sweep_btn.setText("Stopping...")
+            return
 
         try:
-            results = socket.getaddrinfo(domain, None, family)
-            unique_ips = sorted({res[4][0] for res in results})
-            if unique_ips:
-                self.output.append(f"{domain} resolves to:")
-                for ip in unique_ips:
-                    self.output.append(f"  - {ip}")
-            else:
-                self.output.append(f"No {self.protocol_select.currentText()} records found for {domain}.")
-        except Exception as exc:  # pylint: disable=broad-except
-            self.output.append(f"Lookup error: {exc}")
+            network = parse_network(self.cidr_input.text())
+        except ValueError as exc:
+            self.output.append(f"Invalid network: {exc}")
+            return
+
+        resolver = self.sweep_resolver.currentText().strip() or SYSTEM_RESOLVER
+        server = default_nameserver() if resolver == SYSTEM_RESOLVER else resolver
+
+        store = PtrSweepStore(network)
+        self.sweep_model.set_store(store)
+        self.output.clear()
+        self.output.append(f"Reverse sweep of {network} ({store.size:,} addresses) via {server}...")
+
+        self.sweep_worker = ReverseSweepWorker(store, server, self.rate_input.value(), self.window_input.value())
+        self.sweep_worker.error.connect(lambda message: self.output.append(f"Sweep error: {message}"))
+        self.sweep_worker.finished.connect(self.sweep_finished)
+        self.sweep_worker.start()
+        self.sweep_timer.start(250)
+        self.sweep_btn.setText("Stop Sweep")
+
+    def refresh_sweep(self):
+        store = self.sweep_model.store
+        if store is None:
+            return
+        self.sweep_model.refresh()
+        if self.sweep_worker:
+            self.sweep_worker.report(store.completed_count(), store.size)
+        self.sweep_status.setText(
+            f"Completed {store.completed_count():,} / {store.size:,} • Names found: {store.found:,}"
+        )
+
+    def sweep_finished(self, completed: bool):
+        self.sweep_timer.stop()
+        self.refresh_sweep()
+        self.sweep_model.refresh(resort=True)
+        self.output.append("Sweep complete." if completed else "Sweep stopped.")
+        self.sweep_btn.setEnabled(True)
+        self.sweep_btn.setText("Start Sweep")
+        self.sweep_worker = None
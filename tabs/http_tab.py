@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QCheckBox,
+    QScrollArea,
+    QFrame,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+)
+
+from core.channel import ResultChannel
+from core.http_probe import MAX_CONCURRENCY, PHASES, HttpProbeStats, HttpTiming, parse_url, probe_many
+from core.results import get_results_store
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.pump import ChannelPump
+from widgets.terminal import TerminalLog
+
+SUMMARY_COLUMNS = [
+    ("Connections", "connections"),
+    ("Requests", "requests"),
+    ("DNS p50", "dns_p50"),
+    ("Connect p50", "connect_p50"),
+    ("TLS p50", "tls_p50"),
+    ("TTFB p50", "ttfb_p50"),
+    ("Transfer p50", "transfer_p50"),
+    ("Total p50", "total_p50"),
+    ("Total p95", "total_p95"),
+    ("Total p99", "total_p99"),
+]
+
+
+def format_timing(index: int, timing: HttpTiming) -> str:
+    if timing.error:
+        return f"#{index:<4} error after {timing.total_ms:.1f} ms: {timing.error}"
+    connection = "reused" if timing.reused else "new" + (", TLS resumed" if timing.tls_resumed else "")
+    return (
+        f"#{index:<4} {timing.status} {timing.bytes:>9,} B  dns {timing.dns_ms:6.2f}  connect {timing.connect_ms:6.2f}  "
+        f"tls {timing.tls_ms:6.2f}  ttfb {timing.ttfb_ms:7.2f}  transfer {timing.transfer_ms:6.2f}  "
+        f"total {timing.total_ms:7.2f} ms  ({connection})"
+    )
+
+
+class HttpProbeWorker(JobWorker):
+    finished = Signal(object)
+    error = Signal(str)
+
+    tool = "HTTP"
+
+    def __init__(self, url: str, count: int, concurrency: int, keep_alive: bool, method: str, verify: bool):
+        super().__init__()
+        self.url = url
+        self.count = count
+        self.concurrency = concurrency
+        self.keep_alive = keep_alive
+        self.method = method
+        self.verify = verify
+        self.channel = ResultChannel()
+        self.completed = 0
+
+    def describe(self) -> str:
+        return f"HTTP probe of {self.url} ({self.count} requests)"
+
+    def run(self):
+        store = get_results_store()
+
+        def on_result(timing: HttpTiming):
+            self.completed += 1
+            self.report(self.completed, self.count)
+            store.record("http", self.url, url=timing.url, status=timing.status, reused=int(timing.reused),
+                         bytes=timing.bytes, error=timing.error,
+                         **{phase: round(getattr(timing, phase), 3) for phase in PHASES})
+            self.channel.put(timing)
+
+        try:
+            stats = probe_many(
+                self.url,
+                self.count,
+                self.concurrency,
+                keep_alive=self.keep_alive,
+                method=self.method,
+                verify=self.verify,
+                on_result=on_result,
+                stop=self.token,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error.emit(str(exc) or type(exc).__name__)
+            return
+        self.finished.emit(stats)
+
+    def skipped(self):
+        self.error.emit("Cancelled before it started.")
+
+
+class HttpProbeTab(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        self.worker: HttpProbeWorker | None = None
+        self.pump: ChannelPump | None = None
+        self.received = 0
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("HTTP Probe")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel(
+            "Time each phase of HTTP(S) requests — DNS, connect, TLS, first byte and transfer — "
+            "on new and kept-alive connections."
+        )
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        self.url_input = QLineEdit()
+        self.url_input.setPlaceholderText("URL (e.g., https://example.com/)")
+        layout.addWidget(self.url_input)
+
+        options_row = QHBoxLayout()
+        options_row.setSpacing(8)
+
+        self.method_select = QComboBox()
+        self.method_select.addItems(["GET", "HEAD"])
+        options_row.addWidget(self.method_select)
+
+        self.count_input = QSpinBox()
+        self.count_input.setRange(1, 100000)
+        self.count_input.setValue(20)
+        self.count_input.setPrefix("Requests: ")
+        options_row.addWidget(self.count_input)
+
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, MAX_CONCURRENCY)
+        self.concurrency_input.setValue(1)
+        self.concurrency_input.setPrefix("Concurrency: ")
+        options_row.addWidget(self.concurrency_input)
+
+        self.keepalive_check = QCheckBox("Keep-alive")
+        self.keepalive_check.setChecked(True)
+        self.keepalive_check.setToolTip("Reuse connections between requests; off opens a new one every time")
+        options_row.addWidget(self.keepalive_check)
+
+        self.verify_check = QCheckBox("Verify TLS")
+        self.verify_check.setChecked(True)
+        options_row.addWidget(self.verify_check)
+
+        options_row.addStretch(1)
+        layout.addLayout(options_row)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.start_btn = QPushButton("Start Probe")
+        buttons_row.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        buttons_row.addWidget(self.stop_btn)
+
+        self.export_btn = ExportButton("http", self.url_input.text)
+        buttons_row.addWidget(self.export_btn)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.summary_table = QTableWidget(0, len(SUMMARY_COLUMNS))
+        self.summary_table.setHorizontalHeaderLabels([label for label, _ in SUMMARY_COLUMNS])
+        self.summary_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.summary_table.verticalHeader().setVisible(False)
+        self.summary_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.summary_table.setMaximumHeight(110)
+        layout.addWidget(self.summary_table)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(240)
+        layout.addWidget(self.output, 1)
+
+        self.start_btn.clicked.connect(self.start_probe)
+        self.url_input.returnPressed.connect(self.start_probe)
+        self.stop_btn.clicked.connect(self.stop_probe)
+        self.export_btn.message.connect(self.output.append)
+
+    def start_probe(self):
+        url = self.url_input.text().strip()
+        if not url:
+            self.output.append("Please enter a URL to probe.")
+            return
+        if self.worker:
+            return
+        try:
+            target = parse_url(url)
+        except ValueError as exc:
+            self.output.append(str(exc))
+            return
+
+        count = self.count_input.value()
+        self.received = 0
+        self.output.clear()
+        self.summary_table.setRowCount(0)
+        self.output.append(
+            f"Probing {target.url} with {count} {self.method_select.currentText()} requests, "
+            f"{self.concurrency_input.value()} at a time"
+            + ("" if self.keepalive_check.isChecked() else ", new connection each") + ". Times are in ms."
+        )
+        self.status_label.setText(f"Probing {target.host}...")
+
+        self.worker = HttpProbeWorker(
+            url,
+            count,
+            self.concurrency_input.value(),
+            self.keepalive_check.isChecked(),
+            self.method_select.currentText(),
+            self.verify_check.isChecked(),
+        )
+        self.worker.finished.connect(self.show_summary)
+        self.worker.error.connect(self.show_error)
+        self.pump = ChannelPump(self.worker.channel, parent=self)
+        self.pump.batch.connect(self.handle_results)
+        self.pump.start()
+        self.worker.start()
+
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+    def stop_probe(self):
+        if self.worker:
+            self.worker.stop()
+        self.status_label.setText("Stopping probe...")
+        self.stop_btn.setEnabled(False)
+
+    def handle_results(self, items):
+        for timing in items:
+            self.received += 1
+            self.output.append(format_timing(self.received, timing))
+        if self.worker:
+            self.status_label.setText(f"Probing • {self.received:,}/{self.worker.count:,} requests")
+
+    def show_summary(self, stats: HttpProbeStats):
+        # Deliver timings still queued in the channel before the summary
+        self._reset_worker()
+        for row_values in stats.summary():
+            row = self.summary_table.rowCount()
+            self.summary_table.insertRow(row)
+            for column, (_, key) in enumerate(SUMMARY_COLUMNS):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, row_values[key])
+                self.summary_table.setItem(row, column, item)
+        failures = f", {stats.failures} failed" if stats.failures else ""
+        self.output.append(f"\nProbe complete: {len(stats.timings)} requests{failures}.")
+        self.status_label.setText(f"Last probe: {stats.url} • {len(stats.timings)} requests{failures}")
+
+    def show_error(self, message: str):
+        self._reset_worker()
+        self.output.append(f"Probe failed: {message}")
+        self.status_label.setText("Idle")
+
+    def _reset_worker(self):
+        if self.pump:
+            self.pump.stop()
+            self.pump = None
+        self.worker = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
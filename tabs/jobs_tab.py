@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLabel,
+    QScrollArea,
+    QFrame,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+)
+
+from core.jobs import PRIORITY_LABELS, get_job_manager
+
+JOB_COLUMNS = ["ID", "Job", "Tool", "Priority", "State", "Progress", "Elapsed"]
+REFRESH_INTERVAL_MS = 500
+
+
+def format_progress(job) -> str:
+    if job.total:
+        return f"{job.done:,} / {job.total:,} ({job.done / job.total:.0%})"
+    return f"{job.done:,}" if job.done else ""
+
+
+class JobsTab(QWidget):
+    """Lists every job on the shared JobManager and lets the user cancel them."""
+
+    def __init__(self):
+        super().__init__()
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Jobs")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Everything the tools are running, queued by priority on one shared scheduler.")
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.cancel_btn = QPushButton("Cancel Selected")
+        buttons_row.addWidget(self.cancel_btn)
+
+        self.cancel_all_btn = QPushButton("Cancel All")
+        buttons_row.addWidget(self.cancel_all_btn)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(JOB_COLUMNS))
+        self.table.setHorizontalHeaderLabels(JOB_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setMinimumHeight(260)
+        layout.addWidget(self.table, 1)
+
+        self.cancel_btn.clicked.connect(self.cancel_selected)
+        self.cancel_all_btn.clicked.connect(get_job_manager().cancel_all)
+
+        # Only poll the manager while the panel is on screen
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):  # pylint: disable=invalid-name
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        manager = get_job_manager()
+        # Active jobs first, then the most recent finished ones
+        jobs = sorted(manager.jobs(), key=lambda job: (not job.active, job.priority if job.active else 0, -job.id))
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [
+                str(job.id),
+                job.name,
+                job.tool,
+                PRIORITY_LABELS.get(job.priority, str(job.priority)),
+                job.state if not job.error else f"{job.state}: {job.error}",
+                format_progress(job),
+                f"{job.elapsed():.1f} s" if job.started else "",
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                if item.text() != value:
+                    item.setText(value)
+            self.table.item(row, 0).setData(Qt.UserRole, job.id)
+
+        stats = manager.stats()
+        self.status_label.setText(
+            f"Running: {stats['running']} • Queued: {stats['queued']} • "
+            f"Job threads: {stats['job_threads']} • Sockets: {stats['sockets_in_use']} / {stats['socket_limit']}"
+        )
+
+    def cancel_selected(self):
+        manager = get_job_manager()
+        for index in self.table.selectionModel().selectedRows():
+            job_id = self.table.item(index.row(), 0).data(Qt.UserRole)
+            if job_id is not None:
+                manager.cancel(job_id)
+        self.refresh()
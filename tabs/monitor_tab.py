@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QScrollArea,
+    QFrame,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+)
+
+from core.channel import LogLine, ResultChannel
+from core.monitors import Check, MonitorScheduler, load_checks, save_checks
+from core.results import get_results_store
+from widgets.pump import ChannelPump
+from widgets.terminal import TerminalLog
+
+REFRESH_INTERVAL_MS = 1000
+
+# Kind label -> (check kind, threshold prefix, threshold suffix)
+KIND_OPTIONS = {
+    "ICMP": ("icmp", "Alert above: ", " ms"),
+    "TCP Port": ("tcp", "Alert above: ", " ms"),
+    "DNS": ("dns", "Alert above: ", " ms"),
+    "Whois Expiry": ("whois", "Alert under: ", " days"),
+}
+
+
+def format_age(ts: float | None) -> str:
+    if ts is None:
+        return ""
+    seconds = max(0, int(time.time() - ts))
+    return f"{seconds} s ago" if seconds < 120 else f"{seconds // 60} min ago"
+
+
+class MonitorModel(QAbstractTableModel):
+    """Virtual table over the scheduler's checks; cells are read on paint."""
+
+    HEADERS = ["Check", "Every", "Status", "Last Value", "Detail", "Last Run", "Failures"]
+
+    def __init__(self):
+        super().__init__()
+        self.checks = []
+
+    def set_checks(self, checks):
+        self.beginResetModel()
+        self.checks = checks
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.checks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        check = self.checks[index.row()]
+        column = index.column()
+        if column == 0:
+            return check.label()
+        if column == 1:
+            return f"{check.interval:g} s"
+        if column == 2:
+            return check.status
+        if column == 3:
+            if check.value is None:
+                return ""
+            return f"{check.value:g} days" if check.kind == "whois" else f"{check.value:.1f} ms"
+        if column == 4:
+            return check.detail
+        if column == 5:
+            return format_age(check.last_run)
+        return str(check.failures)
+
+    def refresh(self):
+        """Repaint values that the scheduler updated in place."""
+        if self.checks:
+            self.dataChanged.emit(self.index(0, 2), self.index(len(self.checks) - 1, len(self.HEADERS) - 1))
+
+
+class MonitorTab(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Monitors")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel("Recurring ICMP, TCP port, DNS and whois expiry checks with threshold alerts.")
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        form_row = QHBoxLayout()
+        form_row.setSpacing(8)
+
+        self.kind_select = QComboBox()
+        self.kind_select.addItems(list(KIND_OPTIONS))
+        form_row.addWidget(self.kind_select)
+
+        self.target_input = QLineEdit()
+        self.target_input.setPlaceholderText("Host, IP address or domain")
+        form_row.addWidget(self.target_input, 1)
+
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1, 65535)
+        self.port_input.setValue(443)
+        self.port_input.setPrefix("Port: ")
+        form_row.addWidget(self.port_input)
+
+        self.interval_input = QSpinBox()
+        self.interval_input.setRange(1, 7 * 24 * 3600)
+        self.interval_input.setValue(60)
+        self.interval_input.setPrefix("Every ")
+        self.interval_input.setSuffix(" s")
+        form_row.addWidget(self.interval_input)
+
+        self.threshold_input = QSpinBox()
+        self.threshold_input.setRange(0, 100000)
+        self.threshold_input.setSpecialValueText("No threshold")
+        form_row.addWidget(self.threshold_input)
+
+        self.add_btn = QPushButton("Add Check")
+        form_row.addWidget(self.add_btn)
+        layout.addLayout(form_row)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.start_btn = QPushButton("Start Monitoring")
+        buttons_row.addWidget(self.start_btn)
+
+        self.remove_btn = QPushButton("Remove Selected")
+        buttons_row.addWidget(self.remove_btn)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.model = MonitorModel()
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setMinimumHeight(260)
+        layout.addWidget(self.table, 1)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(140)
+        layout.addWidget(self.output)
+
+        # Alerts arrive on I/O threads; hand them to the GUI in batches
+        self.channel = ResultChannel()
+        self.pump = ChannelPump(self.channel, parent=self)
+        self.pump.batch.connect(self.show_alerts)
+        self.pump.start()
+
+        self.scheduler = MonitorScheduler(on_alert=self.queue_alert, store=get_results_store())
+        for check in load_checks():
+            self.scheduler.add(check)
+        self.model.set_checks(self.scheduler.checks())
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+
+        self.kind_select.currentTextChanged.connect(self.update_form)
+        self.add_btn.clicked.connect(self.add_check)
+        self.target_input.returnPressed.connect(self.add_check)
+        self.start_btn.clicked.connect(self.toggle_monitoring)
+        self.remove_btn.clicked.connect(self.remove_selected)
+        self.update_form(self.kind_select.currentText())
+        self.refresh()
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):  # pylint: disable=invalid-name
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def update_form(self, label: str):
+        kind, prefix, suffix = KIND_OPTIONS[label]
+        self.port_input.setVisible(kind == "tcp")
+        self.threshold_input.setPrefix(prefix)
+        self.threshold_input.setSuffix(suffix)
+        self.threshold_input.setValue(30 if kind == "whois" else 0)
+
+    def add_check(self):
+        target = self.target_input.text().strip()
+        if not target:
+            self.output.append("Enter a host or domain to monitor.")
+            return
+        kind = KIND_OPTIONS[self.kind_select.currentText()][0]
+        threshold = self.threshold_input.value() or None
+        check = Check(
+            kind,
+            target,
+            interval=self.interval_input.value(),
+            port=self.port_input.value() if kind == "tcp" else None,
+            max_latency_ms=threshold if kind != "whois" else None,
+            min_expiry_days=threshold if kind == "whois" else None,
+        )
+        self.scheduler.add(check)
+        self.checks_changed()
+        self.output.append(f"Added {check.label()} every {check.interval:g} s.")
+        self.target_input.clear()
+
+    def remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        for row in rows:
+            self.scheduler.remove(self.model.checks[row].id)
+        if rows:
+            self.checks_changed()
+
+    def checks_changed(self):
+        checks = self.scheduler.checks()
+        self.model.set_checks(checks)
+        try:
+            save_checks(checks)
+        except OSError as exc:
+            self.output.append(f"Could not save monitors: {exc}")
+        self.refresh()
+
+    def toggle_monitoring(self):
+        if self.scheduler.running:
+            self.scheduler.stop()
+            self.start_btn.setText("Start Monitoring")
+            self.output.append("Monitoring stopped.")
+        else:
+            self.scheduler.start()
+            self.start_btn.setText("Stop Monitoring")
+            self.output.append(f"Monitoring {len(self.model.checks)} checks.")
+        self.refresh()
+
+    def queue_alert(self, alert):
+        state = "ALERT" if alert.raised else "Recovered"
+        stamp = time.strftime("%H:%M:%S", time.localtime(alert.ts))
+        self.channel.put(LogLine(f"[{stamp}] {state}: {alert.label} – {alert.message}"))
+
+    def show_alerts(self, items):
+        for item in items:
+            self.output.append(item.text)
+        self.refresh()
+
+    def refresh(self):
+        self.model.refresh()
+        stats = self.scheduler.stats()
+        state = "Running" if self.scheduler.running else "Stopped"
+        self.status_label.setText(
+            f"{state} • Checks: {stats['checks']} • In flight: {stats['running']} • Alerting: {stats['alerting']}"
+        )
@@ -1,20 +1,58 @@
+from __future__ import annotations
+
 import socket
 
-import ping3
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
     QLineEdit,
-    QTextEdit,
     QLabel,
     QComboBox,
     QScrollArea,
     QFrame,
 )
 
+from core.jobs import PRIORITY_INTERACTIVE
+from core.ping import PingReply, ping_host
+from core.resolver import get_resolver
+from core.results import get_results_store
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.terminal import TerminalLog
+
+
+class PingWorker(JobWorker):
+    """Sends one echo request per second until ``count`` is reached or stopped."""
+
+    reply = Signal(object)
+    finished = Signal()
+
+    tool = "Ping"
+    priority = PRIORITY_INTERACTIVE
+
+    def __init__(self, target: str, use_ipv6: bool, count: int | None):
+        super().__init__()
+        self.target = target
+        self.use_ipv6 = use_ipv6
+        self.count = count
+
+    def describe(self) -> str:
+        return f"Ping {self.target}"
+
+    def run(self):
+        store = get_results_store()
+
+        def on_reply(reply: PingReply):
+            store.record("ping", self.target, seq=reply.seq, rtt_ms=reply.rtt_ms)
+            self.report(reply.seq, self.count or 0)
+            self.reply.emit(reply.rtt_ms)
+
+        ping_host(self.target, on_reply, count=self.count, use_ipv6=self.use_ipv6, stop=self.token)
+        self.finished.emit()
+
 
 class PingTab(QWidget):
     def __init__(self):
@@ -76,80 +114,82 @@ class PingTab(QWidget):
         self.stop_btn.setEnabled(False)
         buttons_row.addWidget(self.stop_btn)
 
+        self.export_btn = ExportButton("ping", lambda: self.resolved_ip or self.host_input.text())
+        buttons_row.addWidget(self.export_btn)
+
         layout.addLayout(buttons_row)
 
         self.stats_label = QLabel("Packets - Sent: 0 | Received: 0 | Loss: 0% | Target: idle")
         self.stats_label.setObjectName("MetricLabel")
         layout.addWidget(self.stats_label)
 
-        self.output = QTextEdit()
-        self.output.setObjectName("TerminalOutput")
-        self.output.setReadOnly(True)
+        self.output = TerminalLog()
         self.output.setMinimumHeight(200)
         layout.addWidget(self.output, 1)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.ping_once)
-
-        self.continuous = False
-        self.ping_count = 0
+        self.worker: PingWorker | None = None
         self.reset_counters()
 
         self.ping_btn.clicked.connect(self.ping_summary)
         self.continuous_btn.clicked.connect(self.start_continuous)
         self.stop_btn.clicked.connect(self.stop_ping)
+        self.export_btn.message.connect(self.output.append)
 
     def resolve_ip(self):
         host = self.host_input.text()
         family = socket.AF_INET6 if self.protocol_select.currentText() == "IPv6" else socket.AF_INET
         try:
-            info = socket.getaddrinfo(host, None, family)
-            self.resolved_ip = info[0][4][0]
-            self.output.append(f"Resolved IP: {self.resolved_ip}")
+            resolution = get_resolver().lookup(host, family)
+            self.resolved_ip = resolution.addresses[0]
+            source = " (cached)" if resolution.from_cache else ""
+            self.output.append(f"Resolved IP: {self.resolved_ip}{source}")
         except Exception as exc:  # pylint: disable=broad-except
             self.output.append(f"Could not resolve IP: {exc}")
             self.resolved_ip = None
         finally:
             self.update_stats_label()
 
-    def ping_once(self):
-        ping3.IPV6 = self.protocol_select.currentText() == "IPv6"
+    def handle_reply(self, result):
+        if self.sender() is not self.worker:
+            return
         self.sent += 1
-        result = ping3.ping(self.resolved_ip or self.host_input.text(), unit="ms")
-        if isinstance(result, float):
+        if result is not None:
             target = self.resolved_ip or self.host_input.text()
             self.output.append(f"Reply from {target}: time={result:.2f} ms")
             self.received += 1
             self.times.append(result)
         else:
             self.output.append("Request timed out")
-
         self.update_stats_label()
 
-        if not self.continuous:
-            self.ping_count -= 1
-            if self.ping_count <= 0:
-                self.stop_ping()
-
     def ping_summary(self):
-        self.output.clear()
-        self.reset_counters()
-        self.continuous = False
-        self.ping_count = 4
-        self.stop_btn.setEnabled(True)
-        self.resolve_ip()
-        self.timer.start(1000)
+        self.start_ping(4)
 
     def start_continuous(self):
+        self.start_ping(None)
+
+    def start_ping(self, count: int | None):
+        if self.worker:
+            self.worker.stop()
         self.output.clear()
         self.reset_counters()
-        self.continuous = True
         self.stop_btn.setEnabled(True)
         self.resolve_ip()
-        self.timer.start(1000)
+        use_ipv6 = self.protocol_select.currentText() == "IPv6"
+        self.worker = PingWorker(self.resolved_ip or self.host_input.text(), use_ipv6, count)
+        self.worker.reply.connect(self.handle_reply)
+        self.worker.finished.connect(self.ping_finished)
+        self.worker.start()
 
     def stop_ping(self):
-        self.timer.stop()
+        if self.worker:
+            self.worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    def ping_finished(self):
+        if self.sender() is not self.worker:
+            return
+        self.worker = None
         self.stop_btn.setEnabled(False)
         self.show_summary()
 
@@ -1,83 +1,170 @@
 from __future__ import annotations
 
+import os
 import socket
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLineEdit,
-    QTextEdit,
     QPushButton,
     QLabel,
     QHBoxLayout,
     QScrollArea,
     QFrame,
+    QProgressBar,
+    QComboBox,
+    QSpinBox,
+    QCheckBox,
+    QStackedWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
 
-COMMON_SERVICES = {
-    21: "FTP",
-    22: "SSH",
-    23: "Telnet",
-    25: "SMTP",
-    53: "DNS",
-    80: "HTTP",
-    110: "POP3",
-    143: "IMAP",
-    443: "HTTPS",
-    3306: "MySQL",
-    3389: "RDP",
-    5432: "PostgreSQL",
-    5900: "VNC",
-    6379: "Redis",
-    8080: "HTTP Alternate",
+from core.channel import LogLine, ResultChannel
+from core.discovery import DEFAULT_RATE, LiveHost, discover, parse_network
+from core.jobs import PRIORITY_BULK
+from core.metrics import RateMeter
+from core.portscan import COMMON_SERVICES, OpenPort, ScanProgress, scan_ports
+from core.portset import HostPorts, ScanSnapshot, last_scan_path
+from core.resolver import get_resolver
+from core.results import get_results_store
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.pump import ChannelPump
+from widgets.terminal import TerminalLog
+
+STATUS_INTERVAL_MS = 250
+DISCOVERY_COLUMNS = ["Address", "Method", "RTT (ms)", "MAC"]
+DISCOVERY_METHODS = {
+    "Auto": "auto",
+    "ARP (local segment)": "arp",
+    "ICMP Echo": "icmp",
+    "TCP Ping": "tcp",
 }
 
 
-class PortScannerWorker(QThread):
-    update = Signal(str)
-    finished = Signal(list)
+def format_eta(seconds: float | None) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class PortScannerWorker(JobWorker):
+    # HostPorts, then {"opened": PortSet, "closed": PortSet} against the previous scan (or None)
+    finished = Signal(object, object)
+
+    tool = "Port Scan"
+    priority = PRIORITY_BULK
 
     def __init__(self, host: str):
         super().__init__()
         self.host = host
-        self.running = True
+        self.channel = ResultChannel()
+        self.ports = HostPorts()
+        self.progress = ScanProgress()
+
+    def describe(self) -> str:
+        return f"Full scan of {self.host}"
+
+    def run(self):
+        try:
+            resolution = get_resolver().lookup(self.host, socket.AF_INET)
+        except socket.gaierror as exc:
+            self.channel.put(LogLine(f"Could not resolve {self.host}: {exc}"))
+            self.finished.emit(self.ports, None)
+            return
+
+        # Resolve once up front so the per-port connects never hit the resolver.
+        address = resolution.addresses[0]
+        source = ", cached" if resolution.from_cache else ""
+        self.channel.put(LogLine(f"Starting full scan on {self.host} ({address}{source})..."))
+
+        store = get_results_store()
+
+        def on_open(found: OpenPort):
+            store.record("portscan", self.host, address=address, port=found.port, service=found.service)
+            self.channel.put(found)
+
+        scan_ports(
+            address,
+            on_open=on_open,
+            on_progress=self.report,
+            stop=self.token,
+            # Hold off while the GUI is behind instead of piling up results
+            throttle=self.channel.wait_for_room,
+            result=self.ports,
+            progress=self.progress,
+        )
+        # A stopped scan covers only part of the ports; comparing or saving it
+        # would report unscanned ports as closed and replace a full baseline
+        changes = None if self.token.is_set() else self.compare_with_last_scan()
+        self.finished.emit(self.ports, changes)
+
+    def skipped(self):
+        self.finished.emit(self.ports, None)
+
+    def compare_with_last_scan(self):
+        path = last_scan_path(self.host)
+        current = ScanSnapshot()
+        current.hosts[self.host] = self.ports
+        changes = None
+        try:
+            if os.path.exists(path):
+                changes = ScanSnapshot.load(path).diff(current).get(self.host, {})
+            current.save(path)
+        except (OSError, ValueError) as exc:
+            self.channel.put(LogLine(f"Could not compare with the previous scan: {exc}"))
+        return changes
+
+
+class DiscoveryWorker(JobWorker):
+    finished = Signal(int)
+
+    tool = "Discovery"
+    priority = PRIORITY_BULK
+
+    def __init__(self, network, method: str, rate: float):
+        super().__init__()
+        self.network = network
+        self.method = method
+        self.rate = rate
+        self.channel = ResultChannel()
+
+    def describe(self) -> str:
+        return f"Host discovery of {self.network}"
 
     def run(self):
-        open_ports = []
-        self.update.emit(f"Starting full scan on {self.host}...")
-
-        def scan_port(port: int):
-            if not self.running:
-                return None
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(0.3)
-                    if sock.connect_ex((self.host, port)) == 0:
-                        service = COMMON_SERVICES.get(port, "Unknown")
-                        message = f"Port {port}: Open ({service})"
-                        self.update.emit(message)
-                        return (port, service)
-            except Exception:
-                return None
-            return None
-
-        with ThreadPoolExecutor(max_workers=100) as executor:
-            futures = {executor.submit(scan_port, port): port for port in range(1, 65536)}
-            for index, future in enumerate(as_completed(futures)):
-                if not self.running:
-                    break
-                result = future.result()
-                if result:
-                    open_ports.append(result)
-                if index and index % 5000 == 0:
-                    self.update.emit(f"Progress: {index}/65535 ports scanned...")
-
-        self.finished.emit(open_ports)
-
-    def stop(self):
-        self.running = False
+        store = get_results_store()
+        target = str(self.network)
+
+        def on_host(host: LiveHost):
+            store.record("discovery", target, address=host.address, method=host.method, rtt_ms=host.rtt_ms, mac=host.mac)
+            self.channel.put(host)
+
+        try:
+            found = discover(
+                self.network,
+                on_host,
+                method=self.method,
+                rate=self.rate,
+                stop=self.token,
+                on_progress=self.report,
+                on_status=lambda text: self.channel.put(LogLine(text)),
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.channel.put(LogLine(f"Discovery failed: {exc}"))
+            found = 0
+        self.finished.emit(found)
+
+    def skipped(self):
+        self.finished.emit(0)
 
 
 class PortScannerTab(QWidget):
@@ -85,7 +172,13 @@ class PortScannerTab(QWidget):
         super().__init__()
 
         self.worker: PortScannerWorker | None = None
+        self.pump: ChannelPump | None = None
         self.scanning = False
+        self.rate = RateMeter()
+        self.scan_queue: List[str] = []
+        self.discovery_worker: DiscoveryWorker | None = None
+        self.discovery_pump: ChannelPump | None = None
+        self.live_hosts: List[str] = []
 
         outer_layout = QVBoxLayout(self)
         outer_layout.setContentsMargins(0, 0, 0, 0)
@@ -108,11 +201,63 @@ class PortScannerTab(QWidget):
         title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         layout.addWidget(title)
 
-        subtitle = QLabel("Inspect TCP ports on a remote host to identify exposed services.")
+        subtitle = QLabel("Find live hosts on a network and inspect their TCP ports to identify exposed services.")
         subtitle.setObjectName("TabSubheading")
         subtitle.setWordWrap(True)
         layout.addWidget(subtitle)
 
+        mode_row = QHBoxLayout()
+        mode_row.setSpacing(8)
+
+        mode_label = QLabel("Mode:")
+        mode_label.setObjectName("FieldLabel")
+        mode_row.addWidget(mode_label)
+
+        self.mode_select = QComboBox()
+        self.mode_select.addItems(["Port Scan", "Host Discovery"])
+        mode_row.addWidget(self.mode_select)
+
+        mode_row.addStretch(1)
+        layout.addLayout(mode_row)
+
+        self.pages = QStackedWidget()
+        self.pages.addWidget(self._build_scan_page())
+        self.pages.addWidget(self._build_discovery_page())
+        layout.addWidget(self.pages)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(240)
+        layout.addWidget(self.output, 1)
+
+        # The status line polls the scan's counters instead of getting a signal per port
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(STATUS_INTERVAL_MS)
+        self.status_timer.timeout.connect(self.update_status)
+
+        self.mode_select.currentIndexChanged.connect(self.pages.setCurrentIndex)
+        self.scan_btn.clicked.connect(self.toggle_scan)
+        self.stop_btn.clicked.connect(self.request_stop)
+        self.export_btn.message.connect(self.output.append)
+        self.discover_btn.clicked.connect(self.toggle_discovery)
+        self.network_input.returnPressed.connect(self.toggle_discovery)
+        self.scan_live_btn.clicked.connect(lambda: self.scan_hosts(self.live_hosts))
+        self.discovery_export_btn.message.connect(self.output.append)
+
+    def _build_scan_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
         self.host_input = QLineEdit()
         self.host_input.setPlaceholderText("Host or IP address (e.g., example.com)")
         layout.addWidget(self.host_input)
@@ -127,21 +272,157 @@ class PortScannerTab(QWidget):
         self.stop_btn.setEnabled(False)
         buttons_row.addWidget(self.stop_btn)
 
+        self.export_btn = ExportButton("portscan", self.host_input.text)
+        buttons_row.addWidget(self.export_btn)
+
         buttons_row.addStretch(1)
         layout.addLayout(buttons_row)
+        return page
 
-        self.status_label = QLabel("Idle")
-        self.status_label.setObjectName("MetricLabel")
-        layout.addWidget(self.status_label)
+    def _build_discovery_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
 
-        self.output = QTextEdit()
-        self.output.setObjectName("TerminalOutput")
-        self.output.setReadOnly(True)
-        self.output.setMinimumHeight(240)
-        layout.addWidget(self.output, 1)
+        self.network_input = QLineEdit()
+        self.network_input.setPlaceholderText("Network in CIDR form (e.g., 192.168.1.0/24, up to a /16)")
+        layout.addWidget(self.network_input)
+
+        controls_row = QHBoxLayout()
+        controls_row.setSpacing(8)
+
+        self.method_select = QComboBox()
+        self.method_select.addItems(list(DISCOVERY_METHODS))
+        self.method_select.setToolTip(
+            "Auto uses ARP on the local segment, otherwise ICMP echo followed by TCP ping for hosts that stay silent"
+        )
+        controls_row.addWidget(self.method_select)
+
+        self.discovery_rate = QSpinBox()
+        self.discovery_rate.setRange(10, 50000)
+        self.discovery_rate.setSingleStep(500)
+        self.discovery_rate.setValue(int(DEFAULT_RATE))
+        self.discovery_rate.setPrefix("Rate: ")
+        self.discovery_rate.setSuffix(" / s")
+        controls_row.addWidget(self.discovery_rate)
+
+        self.discover_btn = QPushButton("Start Discovery")
+        controls_row.addWidget(self.discover_btn)
+
+        self.scan_live_btn = QPushButton("Scan Live Hosts")
+        self.scan_live_btn.setEnabled(False)
+        self.scan_live_btn.setToolTip("Run a full port scan on every host found so far")
+        controls_row.addWidget(self.scan_live_btn)
+
+        self.discovery_export_btn = ExportButton("discovery", self.discovery_target)
+        controls_row.addWidget(self.discovery_export_btn)
+
+        controls_row.addStretch(1)
+        layout.addLayout(controls_row)
+
+        self.auto_scan_check = QCheckBox("Port-scan hosts as soon as they reply")
+        layout.addWidget(self.auto_scan_check)
+
+        self.discovery_table = QTableWidget(0, len(DISCOVERY_COLUMNS))
+        self.discovery_table.setHorizontalHeaderLabels(DISCOVERY_COLUMNS)
+        self.discovery_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.discovery_table.verticalHeader().setVisible(False)
+        self.discovery_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.discovery_table.setMinimumHeight(220)
+        layout.addWidget(self.discovery_table)
+        return page
+
+    def discovery_target(self) -> str:
+        # History is keyed by the normalised network, e.g. 192.168.1.0/24 for 192.168.1.7/24
+        text = self.network_input.text().strip()
+        try:
+            return str(parse_network(text))
+        except ValueError:
+            return text
+
+    def toggle_discovery(self):
+        if self.discovery_worker:
+            self.discovery_worker.stop()
+            self.discover_btn.setEnabled(False)
+            self.status_label.setText("Stopping discovery...")
+            return
+        try:
+            network = parse_network(self.network_input.text())
+        except ValueError as exc:
+            self.output.append(f"Invalid network: {exc}")
+            return
 
-        self.scan_btn.clicked.connect(self.toggle_scan)
-        self.stop_btn.clicked.connect(self.request_stop)
+        self.live_hosts = []
+        self.discovery_table.setRowCount(0)
+        self.scan_live_btn.setEnabled(False)
+        self.output.append(f"Discovering live hosts in {network}...")
+        self.status_label.setText(f"Discovering hosts in {network}...")
+        self.discover_btn.setText("Stop Discovery")
+
+        self.discovery_worker = DiscoveryWorker(
+            network, DISCOVERY_METHODS[self.method_select.currentText()], self.discovery_rate.value()
+        )
+        self.discovery_pump = ChannelPump(self.discovery_worker.channel, parent=self)
+        self.discovery_pump.batch.connect(self.handle_discovery)
+        self.discovery_worker.finished.connect(self.discovery_finished)
+        self.discovery_pump.start()
+        self.discovery_worker.start()
+
+    def handle_discovery(self, items):
+        hosts = [item for item in items if isinstance(item, LiveHost)]
+        for item in items:
+            if isinstance(item, LogLine):
+                self.output.append(item.text)
+        if not hosts:
+            return
+        table = self.discovery_table
+        table.setUpdatesEnabled(False)
+        for host in hosts:
+            row = table.rowCount()
+            table.insertRow(row)
+            rtt = f"{host.rtt_ms:.2f}" if host.rtt_ms is not None else ""
+            for column, value in enumerate((host.address, host.method.upper(), rtt, host.mac)):
+                table.setItem(row, column, QTableWidgetItem(value))
+        table.setUpdatesEnabled(True)
+        self.live_hosts.extend(host.address for host in hosts)
+        self.scan_live_btn.setEnabled(True)
+        self.status_label.setText(f"Discovering hosts in {self.discovery_worker.network} • {len(self.live_hosts):,} live")
+        if self.auto_scan_check.isChecked():
+            self.queue_scans([host.address for host in hosts])
+
+    def discovery_finished(self, found: int):
+        # Deliver hosts still queued in the channel before the summary
+        if self.discovery_pump:
+            self.discovery_pump.stop()
+            self.discovery_pump.deleteLater()
+            self.discovery_pump = None
+        network = self.discovery_worker.network if self.discovery_worker else ""
+        self.discovery_worker = None
+        self.discover_btn.setText("Start Discovery")
+        self.discover_btn.setEnabled(True)
+        self.output.append(f"Discovery of {network} finished: {found:,} live hosts.")
+        if not self.scanning:
+            self.status_label.setText("Idle")
+
+    def scan_hosts(self, hosts):
+        """Port-scan ``hosts`` one after another, starting now."""
+        if not hosts:
+            return
+        self.mode_select.setCurrentIndex(0)
+        self.queue_scans(hosts)
+
+    def queue_scans(self, hosts):
+        queued = set(self.scan_queue)
+        self.scan_queue.extend(host for host in hosts if host not in queued)
+        if not self.scanning:
+            self.start_next_scan()
+
+    def start_next_scan(self):
+        if self.scan_queue:
+            host = self.scan_queue.pop(0)
+            self.host_input.setText(host)
+            self.start_scan(host)
 
     def toggle_scan(self):
         if self.scanning:
@@ -149,40 +430,98 @@ class PortScannerTab(QWidget):
         else:
             self.start_scan()
 
-    def start_scan(self):
-        host = self.host_input.text().strip()
-        if not host:
-            self.output.append("Please enter a host before starting the scan.")
-            return
+    def start_scan(self, host: str | None = None):
+        if host is None:
+            host = self.host_input.text().strip()
+            if not host:
+                self.output.append("Please enter a host before starting the scan.")
+                return
+            self.scan_queue.clear()
+            self.output.clear()
+        else:
+            self.output.append("")
 
-        self.output.clear()
         self.status_label.setText(f"Scanning {host}...")
         self.worker = PortScannerWorker(host)
-        self.worker.update.connect(self.output.append)
+        self.pump = ChannelPump(self.worker.channel, parent=self)
+        self.pump.batch.connect(self.handle_results)
         self.worker.finished.connect(self.show_summary)
+        self.pump.start()
         self.worker.start()
+        self.rate.reset()
+        self.progress_bar.setValue(0)
+        self.status_timer.start()
 
         self.scanning = True
         self.scan_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
     def request_stop(self):
+        self.scan_queue.clear()
         if self.worker:
             self.worker.stop()
+        self.status_timer.stop()
         self.status_label.setText("Stopping scan...")
         self.stop_btn.setEnabled(False)
 
-    def show_summary(self, open_ports):
+    def update_status(self):
+        if not self.worker:
+            return
+        progress = self.worker.progress
+        if not progress.total:
+            return
+        rate = self.rate.update(progress.completed)
+        eta = self.rate.eta(progress.total - progress.completed)
+        self.progress_bar.setRange(0, progress.total)
+        self.progress_bar.setValue(progress.completed)
+        self.status_label.setText(
+            f"Scanning {self.worker.host} • {progress.completed:,}/{progress.total:,} • "
+            f"{rate or 0:,.0f} probes/s • ETA {format_eta(eta)} • "
+            f"Open {progress.open:,} • Closed {progress.closed:,} • Filtered {progress.filtered:,} • "
+            f"In flight {progress.in_flight}/{progress.window}"
+            + (f" • Queued {len(self.scan_queue):,}" if self.scan_queue else "")
+        )
+
+    def handle_results(self, items):
+        for item in items:
+            if isinstance(item, OpenPort):
+                self.output.append(f"Port {item.port}: Open ({item.service})")
+            elif isinstance(item, LogLine):
+                self.output.append(item.text)
+
+    def show_summary(self, ports: HostPorts, changes):
+        self.status_timer.stop()
+        if self.worker and self.worker.progress.total:
+            self.progress_bar.setValue(self.worker.progress.completed)
+        # Deliver results still queued in the channel before the summary
+        if self.pump:
+            self.pump.stop()
+            self.pump.deleteLater()
+            self.pump = None
         self.scanning = False
         self.scan_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
 
-        if open_ports:
+        counts = ports.counts()
+        if counts["open"]:
             summary = "\nScan complete. Open ports:"
-            details = "\n".join(f"  - {port} ({service})" for port, service in sorted(open_ports))
+            details = "\n".join(f"  - {port} ({COMMON_SERVICES.get(port, 'Unknown')})" for port in ports.open)
             self.output.append(f"{summary}\n{details}")
         else:
             self.output.append("\nScan complete. No open ports found.")
+        self.output.append(
+            f"Scanned {counts['scanned']:,} • Open {counts['open']:,} • "
+            f"Closed {counts['closed']:,} • Filtered {counts['filtered']:,}"
+        )
+        if changes is not None:
+            if changes:
+                if changes["opened"]:
+                    self.output.append(f"Newly open since the last scan: {changes['opened'].ranges()}")
+                if changes["closed"]:
+                    self.output.append(f"No longer open since the last scan: {changes['closed'].ranges()}")
+            else:
+                self.output.append("Open ports unchanged since the last scan.")
 
         self.status_label.setText("Idle")
         self.worker = None
+        self.start_next_scan()
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import socket
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QSpinBox,
+    QScrollArea,
+    QFrame,
+)
+
+from core.resolver import get_resolver
+from core.results import get_results_store
+from core.throughput import (
+    DEFAULT_PORT,
+    MAX_STREAMS,
+    IntervalReport,
+    ThroughputResult,
+    ThroughputServer,
+    format_bits,
+    format_bytes,
+    run_test,
+)
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.terminal import TerminalLog
+
+DIRECTION_OPTIONS = {
+    "Upload (this machine sends)": "upload",
+    "Download (server sends)": "download",
+}
+
+
+class ThroughputWorker(JobWorker):
+    interval = Signal(object)
+    finished = Signal(object)
+    error = Signal(str)
+
+    tool = "Throughput"
+
+    def __init__(self, host: str, port: int, duration: int, streams: int, direction: str):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.duration = duration
+        self.streams = streams
+        self.direction = direction
+
+    def describe(self) -> str:
+        return f"Throughput to {self.host}:{self.port} ({self.streams} streams)"
+
+    def on_interval(self, report: IntervalReport):
+        self.report(int(report.end), self.duration)
+        self.interval.emit(report)
+
+    def run(self):
+        try:
+            address = get_resolver().resolve_one(self.host, socket.AF_INET)
+            result = run_test(
+                address,
+                self.port,
+                duration=self.duration,
+                streams=self.streams,
+                direction=self.direction,
+                on_interval=self.on_interval,
+                stop=self.token,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error.emit(str(exc) or type(exc).__name__)
+            return
+        get_results_store().record(
+            "throughput",
+            self.host,
+            direction=self.direction,
+            streams=result.streams,
+            seconds=result.seconds,
+            bytes=result.bytes,
+            bits_per_second=result.bits_per_second,
+        )
+        self.finished.emit(result)
+
+    def skipped(self):
+        self.error.emit("Cancelled before it started.")
+
+
+class ThroughputTab(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        self.worker: ThroughputWorker | None = None
+        self.server: ThroughputServer | None = None
+
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.setSpacing(0)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        outer_layout.addWidget(scroll)
+
+        content = QWidget()
+        scroll.setWidget(content)
+
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Throughput")
+        title.setObjectName("TabHeading")
+        title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        layout.addWidget(title)
+
+        subtitle = QLabel(
+            "Measure TCP bandwidth against another machine running the bundled server "
+            "(this tab, or cli.py throughput-server)."
+        )
+        subtitle.setObjectName("TabSubheading")
+        subtitle.setWordWrap(True)
+        layout.addWidget(subtitle)
+
+        server_row = QHBoxLayout()
+        server_row.setSpacing(8)
+
+        server_label = QLabel("Server:")
+        server_label.setObjectName("FieldLabel")
+        server_row.addWidget(server_label)
+
+        self.server_port = QSpinBox()
+        self.server_port.setRange(1, 65535)
+        self.server_port.setValue(DEFAULT_PORT)
+        self.server_port.setPrefix("Port: ")
+        server_row.addWidget(self.server_port)
+
+        self.server_btn = QPushButton("Start Server")
+        server_row.addWidget(self.server_btn)
+
+        server_row.addStretch(1)
+        layout.addLayout(server_row)
+
+        self.host_input = QLineEdit()
+        self.host_input.setPlaceholderText("Server host or IP address (e.g., 192.168.1.20)")
+        layout.addWidget(self.host_input)
+
+        options_row = QHBoxLayout()
+        options_row.setSpacing(8)
+
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1, 65535)
+        self.port_input.setValue(DEFAULT_PORT)
+        self.port_input.setPrefix("Port: ")
+        options_row.addWidget(self.port_input)
+
+        self.direction_select = QComboBox()
+        self.direction_select.addItems(list(DIRECTION_OPTIONS))
+        options_row.addWidget(self.direction_select)
+
+        self.streams_input = QSpinBox()
+        self.streams_input.setRange(1, MAX_STREAMS)
+        self.streams_input.setValue(1)
+        self.streams_input.setPrefix("Streams: ")
+        options_row.addWidget(self.streams_input)
+
+        self.duration_input = QSpinBox()
+        self.duration_input.setRange(1, 3600)
+        self.duration_input.setValue(10)
+        self.duration_input.setPrefix("Duration: ")
+        self.duration_input.setSuffix(" s")
+        options_row.addWidget(self.duration_input)
+
+        options_row.addStretch(1)
+        layout.addLayout(options_row)
+
+        buttons_row = QHBoxLayout()
+        buttons_row.setSpacing(8)
+
+        self.start_btn = QPushButton("Start Test")
+        buttons_row.addWidget(self.start_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        buttons_row.addWidget(self.stop_btn)
+
+        self.export_btn = ExportButton("throughput", self.host_input.text)
+        buttons_row.addWidget(self.export_btn)
+
+        buttons_row.addStretch(1)
+        layout.addLayout(buttons_row)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(240)
+        layout.addWidget(self.output, 1)
+
+        self.server_btn.clicked.connect(self.toggle_server)
+        self.start_btn.clicked.connect(self.start_test)
+        self.host_input.returnPressed.connect(self.start_test)
+        self.stop_btn.clicked.connect(self.stop_test)
+        self.export_btn.message.connect(self.output.append)
+
+    def toggle_server(self):
+        if self.server:
+            self.server.stop()
+            self.server = None
+            self.server_btn.setText("Start Server")
+            self.server_port.setEnabled(True)
+            self.output.append("Server stopped.")
+            return
+        try:
+            self.server = ThroughputServer(port=self.server_port.value()).start()
+        except OSError as exc:
+            self.output.append(f"Could not start the server: {exc}")
+            return
+        self.server_btn.setText("Stop Server")
+        self.server_port.setEnabled(False)
+        self.output.append(f"Server listening on port {self.server.port}.")
+
+    def start_test(self):
+        host = self.host_input.text().strip()
+        if not host:
+            self.output.append("Please enter the server to test against.")
+            return
+        if self.worker:
+            return
+
+        direction = DIRECTION_OPTIONS[self.direction_select.currentText()]
+        streams = self.streams_input.value()
+        self.output.clear()
+        self.output.append(
+            f"Testing {direction} to {host}:{self.port_input.value()} with {streams} "
+            f"stream{'s' if streams != 1 else ''} for {self.duration_input.value()} s..."
+        )
+        self.status_label.setText(f"Testing {host}...")
+
+        self.worker = ThroughputWorker(host, self.port_input.value(), self.duration_input.value(), streams, direction)
+        self.worker.interval.connect(self.show_interval)
+        self.worker.finished.connect(self.show_result)
+        self.worker.error.connect(self.show_error)
+        self.worker.start()
+
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+
+    def stop_test(self):
+        if self.worker:
+            self.worker.stop()
+        self.status_label.setText("Stopping test...")
+        self.stop_btn.setEnabled(False)
+
+    def show_interval(self, report: IntervalReport):
+        line = f"{report.start:6.1f}-{report.end:<6.1f} s  {format_bytes(report.bytes):>11}  {format_bits(report.bits_per_second):>13}"
+        if len(report.stream_bytes) > 1:
+            span = max(report.end - report.start, 1e-9)
+            per_stream = " ".join(format_bits(count * 8 / span) for count in report.stream_bytes)
+            line += f"  [{per_stream}]"
+        self.output.append(line)
+        self.status_label.setText(f"Testing • {format_bits(report.bits_per_second)} • {report.end:.0f} s elapsed")
+
+    def show_result(self, result: ThroughputResult):
+        self._reset_worker()
+        self.output.append(
+            f"\nTotal: {format_bytes(result.bytes)} in {result.seconds:.2f} s • {format_bits(result.bits_per_second)}"
+        )
+        if result.server_bytes is not None:
+            self.output.append(f"Server received {format_bytes(result.server_bytes)}.")
+        for error in result.errors:
+            self.output.append(f"Stream error: {error}")
+        self.status_label.setText(f"Last test: {format_bits(result.bits_per_second)} {result.direction}")
+
+    def show_error(self, message: str):
+        self._reset_worker()
+        self.output.append(f"Test failed: {message}")
+        self.status_label.setText("Idle")
+
+    def _reset_worker(self):
+        self.worker = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
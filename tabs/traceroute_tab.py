@@ -1,17 +1,13 @@
 from __future__ import annotations
 
-import platform
-import shutil
-import subprocess
-from typing import List
+import socket
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLineEdit,
-    QTextEdit,
     QPushButton,
     QLabel,
     QComboBox,
@@ -20,108 +16,74 @@ from PySide6.QtWidgets import (
     QFrame,
 )
 
+from core.channel import LogLine, ResultChannel
+from core.jobs import PRIORITY_INTERACTIVE
+from core.resolver import get_resolver
+from core.results import get_results_store
+from core.traceroute import TraceLine, Traceroute, TracerouteError
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.pump import ChannelPump
+from widgets.terminal import TerminalLog
 
-class TracerouteWorker(QThread):
-    update = Signal(str)
+
+class TracerouteWorker(JobWorker):
     finished = Signal(bool)
     error = Signal(str)
 
+    tool = "Traceroute"
+    priority = PRIORITY_INTERACTIVE
+
     def __init__(self, host: str, use_ipv6: bool = False, max_hops: int = 30, per_hop_timeout: int = 4):
         super().__init__()
         self.host = host
         self.use_ipv6 = use_ipv6
         self.max_hops = max_hops
         self.per_hop_timeout = per_hop_timeout
-        self._process: subprocess.Popen | None = None
-        self._stop_requested = False
+        self.target = host
+        self.trace: Traceroute | None = None
+        self.channel = ResultChannel()
+
+    def describe(self) -> str:
+        return f"Traceroute to {self.host}"
 
     def run(self):
-        try:
-            command = self._build_command()
-        except ValueError as exc:
-            self.error.emit(str(exc))
+        if self.token.is_set():
             self.finished.emit(False)
             return
-
+        family = socket.AF_INET6 if self.use_ipv6 else socket.AF_INET
         try:
-            creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if platform.system() == "Windows" else 0  # type: ignore[attr-defined]
-            self._process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                encoding="utf-8",
-                errors="replace",
-                universal_newlines=True,
-                creationflags=creationflags,
-            )
-        except FileNotFoundError:
-            self.error.emit(f"Traceroute command not found: {command[0]}")
-            self.finished.emit(False)
-            return
-        except Exception as exc:  # pragma: no cover
-            self.error.emit(f"Failed to start traceroute: {exc}")
+            resolution = get_resolver().lookup(self.host, family)
+        except socket.gaierror as exc:
+            self.error.emit(f"Could not resolve {self.host}: {exc}")
             self.finished.emit(False)
             return
 
-        if not self._process.stdout:
-            self.error.emit("Unable to capture traceroute output.")
-            self.finished.emit(False)
-            return
+        # Hand the subprocess a literal address so it skips its own lookup.
+        self.target = resolution.addresses[0]
+        if self.target != self.host:
+            source = " (cached)" if resolution.from_cache else ""
+            self.channel.put(LogLine(f"Resolved {self.host} to {self.target}{source}"))
 
+        self.trace = Traceroute(self.target, self.use_ipv6, self.max_hops, self.per_hop_timeout)
         try:
-            for raw_line in self._process.stdout:
-                if self._stop_requested:
-                    break
-                line = raw_line.rstrip()
-                if line:
-                    self.update.emit(line)
-        finally:
-            if self._stop_requested and self._process:
-                self._terminate_process()
-            if self._process:
-                self._process.wait()
-                success = not self._stop_requested and self._process.returncode == 0
-                self._process = None
-            else:
-                success = False
-            self.finished.emit(success)
+            success = self.trace.run(self.on_line, stop=self.token)
+        except TracerouteError as exc:
+            self.error.emit(str(exc))
+            success = False
+        self.finished.emit(success)
+
+    def skipped(self):
+        self.finished.emit(False)
+
+    def on_line(self, line: TraceLine):
+        get_results_store().record("traceroute", self.host, hop=line.hop, line=line.text)
+        self.channel.put(line)
 
     def stop(self):
-        self._stop_requested = True
-        self._terminate_process()
-
-    def _terminate_process(self):
-        if self._process and self._process.poll() is None:
-            try:
-                self._process.terminate()
-            except Exception:  # pragma: no cover
-                self._process.kill()
-        self._process = None
-
-    def _build_command(self) -> List[str]:
-        system = platform.system()
-        if system == "Windows":
-            base_cmd = "tracert"
-            if not shutil.which(base_cmd):
-                raise ValueError("The 'tracert' command is not available on this system.")
-            args = [base_cmd, "-h", str(self.max_hops), "-d", "-6" if self.use_ipv6 else "-4"]
-        else:
-            base_cmd = "traceroute"
-            if not shutil.which(base_cmd):
-                raise ValueError("The 'traceroute' command is not available on this system.")
-            args = [
-                base_cmd,
-                "-m",
-                str(self.max_hops),
-                "-n",
-                "-6" if self.use_ipv6 else "-4",
-                "-w",
-                str(self.per_hop_timeout),
-            ]
-        args.append(self.host)
-        return args
+        super().stop()
+        if self.trace:
+            self.trace.stop()
 
 
 class TracerouteTab(QWidget):
@@ -129,6 +91,7 @@ class TracerouteTab(QWidget):
         super().__init__()
 
         self.worker: TracerouteWorker | None = None
+        self.pump: ChannelPump | None = None
         self.tracing = False
         self.cancelled_by_user = False
 
@@ -191,6 +154,9 @@ class TracerouteTab(QWidget):
         self.clear_btn = QPushButton("Clear Log")
         buttons_row.addWidget(self.clear_btn)
 
+        self.export_btn = ExportButton("traceroute", self.host_input.text)
+        buttons_row.addWidget(self.export_btn)
+
         buttons_row.addStretch(1)
         layout.addLayout(buttons_row)
 
@@ -198,14 +164,13 @@ class TracerouteTab(QWidget):
         self.status_label.setObjectName("MetricLabel")
         layout.addWidget(self.status_label)
 
-        self.output = QTextEdit()
-        self.output.setObjectName("TerminalOutput")
-        self.output.setReadOnly(True)
+        self.output = TerminalLog()
         self.output.setMinimumHeight(200)
         layout.addWidget(self.output, 1)
 
         self.trace_btn.clicked.connect(self.toggle_trace)
         self.clear_btn.clicked.connect(self.output.clear)
+        self.export_btn.message.connect(self.output.append)
 
     def toggle_trace(self):
         if self.tracing:
@@ -224,9 +189,11 @@ class TracerouteTab(QWidget):
         max_hops = self.hops_input.value()
 
         self.worker = TracerouteWorker(host, use_ipv6=use_ipv6, max_hops=max_hops)
-        self.worker.update.connect(self.output.append)
+        self.pump = ChannelPump(self.worker.channel, parent=self)
+        self.pump.batch.connect(self.handle_lines)
         self.worker.error.connect(self.handle_error)
         self.worker.finished.connect(self.trace_finished)
+        self.pump.start()
 
         self.trace_btn.setText("Stop Traceroute")
         self.tracing = True
@@ -242,7 +209,14 @@ class TracerouteTab(QWidget):
         self.trace_btn.setText("Stopping...")
         self.status_label.setText("Stopping traceroute...")
 
+    def handle_lines(self, items):
+        for item in items:
+            self.output.append(item.text)
+
     def trace_finished(self, success: bool):
+        if self.pump:
+            self.pump.stop()
+            self.pump = None
         self.tracing = False
         self.trace_btn.setEnabled(True)
         self.trace_btn.setText("Start Traceroute")
@@ -1,25 +1,137 @@
+from __future__ import annotations
+
 import datetime
-from typing import Any
+from typing import Any, Dict
 
-import whois
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLineEdit,
-    QTextEdit,
     QPushButton,
     QLabel,
     QHBoxLayout,
     QScrollArea,
     QFrame,
+    QSpinBox,
+    QComboBox,
+    QStackedWidget,
+    QPlainTextEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
 
+from core.jobs import PRIORITY_BULK, PRIORITY_INTERACTIVE
+from core.results import get_results_store, save_whois
+from core.whois_bulk import BulkResult, BulkWhoisRunner, RegistryLimiter
+from core.whois_cache import DEFAULT_MAX_AGE_HOURS, format_age, get_whois_cache
+from core.whois_client import ReferralCache, WhoisClient
+from widgets.export import ExportButton
+from widgets.job_worker import JobWorker
+from widgets.terminal import TerminalLog
+
+DISPLAY_FIELDS = [
+    "domain_name",
+    "registrar",
+    "creation_date",
+    "expiration_date",
+    "updated_date",
+    "status",
+    "name_servers",
+    "emails",
+]
+
+
+class WhoisWorker(JobWorker):
+    finished = Signal(str, object)
+    error = Signal(str, str)
+
+    tool = "Whois"
+    priority = PRIORITY_INTERACTIVE
+
+    def __init__(self, domain: str):
+        super().__init__()
+        self.domain = domain
+
+    def describe(self) -> str:
+        return f"Whois {self.domain}"
+
+    def run(self):
+        client = WhoisClient()
+        try:
+            record = client.lookup(self.domain)
+        except Exception as exc:  # pylint: disable=broad-except
+            save_whois(get_results_store(), self.domain, "", None, str(exc))
+            self.error.emit(self.domain, str(exc))
+            return
+        get_whois_cache().put(self.domain, record)
+        save_whois(get_results_store(), self.domain, "", record)
+        self.finished.emit(self.domain, record)
+
+    def skipped(self):
+        self.error.emit(self.domain, "Cancelled before it started.")
+
+
+BULK_COLUMNS = ["Domain", "Registry", "Registrar", "Expiration Date", "Status"]
+EXPIRATION_COLUMN = 3
+
+
+class BulkWhoisWorker(JobWorker):
+    result = Signal(object)
+    finished = Signal(bool)
+
+    tool = "Whois"
+    priority = PRIORITY_BULK
+
+    def __init__(self, domains, concurrency: int, rate_per_minute: int, refresh: bool):
+        super().__init__()
+        self.domains = domains
+        self.concurrency = concurrency
+        self.rate = rate_per_minute / 60.0
+        self.refresh = refresh
+        self.completed = 0
+
+    def describe(self) -> str:
+        return f"Bulk Whois ({len(self.domains)} domains)"
+
+    def on_result(self, result: BulkResult):
+        if not result.cached:
+            save_whois(get_results_store(), result.domain, result.server, result.record, result.error)
+        self.completed += 1
+        self.report(self.completed, len(self.domains))
+        self.result.emit(result)
+
+    def run(self):
+        runner = BulkWhoisRunner(
+            ReferralCache(),
+            RegistryLimiter(self.concurrency, self.rate),
+            cache=get_whois_cache(),
+        )
+        runner.run(self.domains, self.on_result, stop=self.token, refresh=self.refresh)
+        self.finished.emit(not self.token.is_set())
+
+    def skipped(self):
+        self.finished.emit(False)
+
+
+class SortKeyItem(QTableWidgetItem):
+    """Table item that sorts by the value stored in Qt.UserRole."""
+
+    def __lt__(self, other):
+        mine = self.data(Qt.UserRole)
+        theirs = other.data(Qt.UserRole)
+        if mine is None or theirs is None:
+            return super().__lt__(other)
+        return mine < theirs
+
 
 class WhoisTab(QWidget):
     def __init__(self):
         super().__init__()
 
+        self.worker: WhoisWorker | None = None
+
         outer_layout = QVBoxLayout(self)
         outer_layout.setContentsMargins(0, 0, 0, 0)
         outer_layout.setSpacing(0)
@@ -46,6 +158,57 @@ class WhoisTab(QWidget):
         subtitle.setWordWrap(True)
         layout.addWidget(subtitle)
 
+        mode_row = QHBoxLayout()
+        mode_row.setSpacing(8)
+
+        mode_label = QLabel("Mode:")
+        mode_label.setObjectName("FieldLabel")
+        mode_row.addWidget(mode_label)
+
+        self.mode_select = QComboBox()
+        self.mode_select.addItems(["Single Domain", "Bulk"])
+        mode_row.addWidget(self.mode_select)
+
+        self.expiry_input = QSpinBox()
+        self.expiry_input.setRange(0, 24 * 30)
+        self.expiry_input.setValue(DEFAULT_MAX_AGE_HOURS)
+        self.expiry_input.setPrefix("Cache: ")
+        self.expiry_input.setSuffix(" h")
+        self.expiry_input.setToolTip("How long cached records stay valid (0 disables the cache)")
+        mode_row.addWidget(self.expiry_input)
+
+        mode_row.addStretch(1)
+        layout.addLayout(mode_row)
+
+        self.pages = QStackedWidget()
+        self.pages.addWidget(self._build_single_page())
+        self.pages.addWidget(self._build_bulk_page())
+        layout.addWidget(self.pages)
+
+        self.status_label = QLabel("Idle")
+        self.status_label.setObjectName("MetricLabel")
+        layout.addWidget(self.status_label)
+
+        self.output = TerminalLog()
+        self.output.setMinimumHeight(240)
+        layout.addWidget(self.output, 1)
+
+        self.lookup_btn.clicked.connect(self.run_lookup)
+        self.refresh_btn.clicked.connect(lambda: self.run_lookup(refresh=True))
+        self.domain_input.returnPressed.connect(self.run_lookup)
+        self.export_btn.message.connect(self.output.append)
+        self.bulk_export_btn.message.connect(self.output.append)
+
+        self.bulk_worker: BulkWhoisWorker | None = None
+        self.mode_select.currentIndexChanged.connect(self.pages.setCurrentIndex)
+        self.bulk_btn.clicked.connect(self.toggle_bulk)
+
+    def _build_single_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
         form_row = QHBoxLayout()
         form_row.setSpacing(8)
 
@@ -56,48 +219,203 @@ class WhoisTab(QWidget):
         self.lookup_btn = QPushButton("Lookup")
         form_row.addWidget(self.lookup_btn)
 
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.setToolTip("Query the registry again, bypassing the local cache")
+        form_row.addWidget(self.refresh_btn)
+
+        self.export_btn = ExportButton("whois", self.domain_input.text)
+        form_row.addWidget(self.export_btn)
+
         form_row.addStretch(1)
         layout.addLayout(form_row)
+        layout.addStretch(1)
+        return page
 
-        self.output = QTextEdit()
-        self.output.setObjectName("TerminalOutput")
-        self.output.setReadOnly(True)
-        self.output.setMinimumHeight(240)
-        layout.addWidget(self.output, 1)
 
-        self.lookup_btn.clicked.connect(self.run_lookup)
+    def _build_bulk_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
 
-    def run_lookup(self):
-        self.output.clear()
+        self.bulk_input = QPlainTextEdit()
+        self.bulk_input.setPlaceholderText("One domain per line (commas and spaces also work)")
+        self.bulk_input.setMinimumHeight(110)
+        layout.addWidget(self.bulk_input)
+
+        controls_row = QHBoxLayout()
+        controls_row.setSpacing(8)
+
+        self.registry_concurrency = QSpinBox()
+        self.registry_concurrency.setRange(1, 16)
+        self.registry_concurrency.setValue(2)
+        self.registry_concurrency.setPrefix("Per registry: ")
+        self.registry_concurrency.setSuffix(" at once")
+        controls_row.addWidget(self.registry_concurrency)
+
+        self.registry_rate = QSpinBox()
+        self.registry_rate.setRange(1, 600)
+        self.registry_rate.setValue(30)
+        self.registry_rate.setPrefix("Rate: ")
+        self.registry_rate.setSuffix(" / min / registry")
+        controls_row.addWidget(self.registry_rate)
+
+        self.bulk_btn = QPushButton("Start Bulk Lookup")
+        controls_row.addWidget(self.bulk_btn)
+
+        # Bulk audits span many domains, so this one exports the whole history
+        self.bulk_export_btn = ExportButton("whois")
+        controls_row.addWidget(self.bulk_export_btn)
+
+        controls_row.addStretch(1)
+        layout.addLayout(controls_row)
+
+        self.bulk_table = QTableWidget(0, len(BULK_COLUMNS))
+        self.bulk_table.setHorizontalHeaderLabels(BULK_COLUMNS)
+        self.bulk_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.bulk_table.verticalHeader().setVisible(False)
+        self.bulk_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.bulk_table.setSortingEnabled(True)
+        self.bulk_table.setMinimumHeight(220)
+        layout.addWidget(self.bulk_table)
+        return page
+
+    def run_lookup(self, refresh: bool = False):
         domain = self.domain_input.text().strip()
         if not domain:
+            self.output.clear()
             self.output.append("Please enter a domain before requesting a Whois record.")
             return
+        if self.worker:
+            return
 
-        try:
-            record = whois.whois(domain)
-        except Exception as exc:  # pylint: disable=broad-except
-            self.output.append(f"Lookup error: {exc}")
+        cache = get_whois_cache()
+        cache.max_age_hours = self.expiry_input.value()
+        cached = None if refresh else cache.get(domain)
+        if cached:
+            record, age = cached
+            self.show_record(domain, record)
+            self.status_label.setText(f"Cached result • fetched {format_age(age)} ago • Refresh to re-query")
             return
 
+        self.output.clear()
+        self.output.append(f"Querying registry for {domain}...")
+        self.status_label.setText(f"Looking up {domain}...")
+        self.lookup_btn.setEnabled(False)
+        self.refresh_btn.setEnabled(False)
+
+        self.worker = WhoisWorker(domain)
+        self.worker.finished.connect(self.lookup_finished)
+        self.worker.error.connect(self.lookup_failed)
+        self.worker.start()
+
+    def lookup_finished(self, domain: str, record: Dict[str, Any]):
+        self._reset_worker()
+        self.show_record(domain, record)
+        self.status_label.setText("Fresh result from registry")
+
+    def lookup_failed(self, domain: str, message: str):
+        self._reset_worker()
+        self.output.clear()
+        self.output.append(f"Lookup error: {message}")
+        self.status_label.setText(f"Lookup for {domain} failed")
+
+    def _reset_worker(self):
+        self.worker = None
+        self.lookup_btn.setEnabled(True)
+        self.refresh_btn.setEnabled(True)
+
+    def show_record(self, domain: str, record: Dict[str, Any]):
+        self.output.clear()
         self.output.append(f"Whois information for {domain}:\n")
-        fields = [
-            "domain_name",
-            "registrar",
-            "creation_date",
-            "expiration_date",
-            "updated_date",
-            "status",
-            "name_servers",
-            "emails",
-        ]
-        for field in fields:
+        for field in DISPLAY_FIELDS:
             value = record.get(field)
             formatted = self._format_value(value)
             if formatted:
                 label = field.replace("_", " ").title()
                 self.output.append(f"{label}: {formatted}")
 
+    def toggle_bulk(self):
+        if self.bulk_worker:
+            self.bulk_worker.stop()
+            self.bulk_btn.setEnabled(False)
+            self.bulk_btn.setText("Stopping...")
+            return
+
+        raw = self.bulk_input.toPlainText().replace(",", " ").split()
+        domains = list(dict.fromkeys(item.strip().lower() for item in raw if "." in item))
+        if not domains:
+            self.output.clear()
+            self.output.append("Please enter at least one domain for the bulk lookup.")
+            return
+
+        get_whois_cache().max_age_hours = self.expiry_input.value()
+        self.bulk_total = len(domains)
+        self.bulk_done = 0
+        self.bulk_table.setSortingEnabled(False)
+        self.bulk_table.setRowCount(0)
+        self.bulk_table.setSortingEnabled(True)
+        self.output.clear()
+        self.output.append(f"Bulk lookup of {len(domains)} domains...")
+        self.status_label.setText(f"Bulk: 0 / {self.bulk_total}")
+
+        self.bulk_worker = BulkWhoisWorker(
+            domains,
+            self.registry_concurrency.value(),
+            self.registry_rate.value(),
+            refresh=False,
+        )
+        self.bulk_worker.result.connect(self.add_bulk_row)
+        self.bulk_worker.finished.connect(self.bulk_finished)
+        self.bulk_worker.start()
+        self.bulk_btn.setText("Stop Bulk Lookup")
+
+    def add_bulk_row(self, result: BulkResult):
+        self.bulk_done += 1
+        record = result.record or {}
+        expiration = record.get("expiration_date")
+        if result.error:
+            status = f"Error: {result.error}"
+        else:
+            status = "Cached" if result.cached else "OK"
+
+        values = [
+            result.domain,
+            result.server,
+            self._format_value(record.get("registrar")),
+            self._format_value(expiration),
+            status,
+        ]
+        self.bulk_table.setSortingEnabled(False)
+        row = self.bulk_table.rowCount()
+        self.bulk_table.insertRow(row)
+        for column, value in enumerate(values):
+            item = SortKeyItem(value)
+            if column == EXPIRATION_COLUMN:
+                item.setData(Qt.UserRole, self._expiration_key(expiration))
+            self.bulk_table.setItem(row, column, item)
+        self.bulk_table.setSortingEnabled(True)
+        self.status_label.setText(f"Bulk: {self.bulk_done} / {self.bulk_total}")
+
+    def bulk_finished(self, completed: bool):
+        self.output.append("Bulk lookup complete." if completed else "Bulk lookup stopped.")
+        self.bulk_btn.setEnabled(True)
+        self.bulk_btn.setText("Start Bulk Lookup")
+        self.bulk_worker = None
+
+    @staticmethod
+    def _expiration_key(value: Any) -> float:
+        """Earliest expiry as a timestamp; records without one sort last."""
+        if isinstance(value, (list, tuple, set)):
+            dates = [item for item in value if isinstance(item, datetime.datetime)]
+            value = min(dates) if dates else None
+        if isinstance(value, datetime.datetime):
+            try:
+                return value.timestamp()
+            except (OverflowError, OSError, ValueError):
+                return float("inf")
+        return float("inf")
+
     @staticmethod
     def _format_value(value: Any) -> str:
         if not value:
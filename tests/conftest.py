@@ -0,0 +1,67 @@
+"""Shared fixtures: the benchmark stand-in servers, run in-process on loopback.
+
+Every test gets its own HOME so caches, referrals and the results database
+land in a temporary ``.gatchfier`` directory instead of the user's.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.listener_farm import ListenerFarm
+from benchmarks.stub_dns import StubDNSServer
+from benchmarks.stub_http import StubHttpServer
+from benchmarks.stub_whois import StubWhoisServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def farm():
+    with ListenerFarm(open_ports=5, closed_ports=40, blackholed_ports=3) as listeners:
+        yield listeners
+
+
+@pytest.fixture
+def dns_stub():
+    with StubDNSServer(truncate=("big.bench.test",), reverse=True) as stub:
+        yield stub
+
+
+@pytest.fixture
+def whois_stub():
+    with StubWhoisServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def http_stub():
+    with StubHttpServer(body_size=16384) as stub:
+        yield stub
+
+
+@pytest.fixture
+def run_cli(home):
+    """Run ``cli.py`` in a child process and return its NDJSON records."""
+
+    def run(*args: str, timeout: float = 60) -> list:
+        env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+        completed = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "cli.py"), *args],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout, check=False,
+        )
+        assert completed.returncode == 0, completed.stderr
+        return [json.loads(line) for line in completed.stdout.splitlines() if line.strip()]
+
+    return run
@@ -0,0 +1,196 @@
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import core.agent as agent_module
+from core.agent import (
+    FRAME_DONE,
+    FRAME_JOB,
+    FRAME_RESULTS,
+    AgentConnection,
+    AgentPool,
+    AgentServer,
+    SweepMerger,
+    WorkUnit,
+    _Outbox,
+    dispatch,
+    send_frame,
+    split_units,
+)
+from core.portscan import scan_ports
+from core.portset import HostPorts, PortSet
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARAMS = {"window": 20, "timeout": 0.3}
+
+
+def scan_locally(farm):
+    host = HostPorts()
+    found = scan_ports(farm.host, farm.ports, window=PARAMS["window"], timeout=PARAMS["timeout"], result=host)
+    counts = host.counts()
+    return {"open": [item.port for item in found], "closed": counts["closed"], "filtered": list(host.filtered)}
+
+
+def assert_matches(local, summary):
+    assert summary["complete"]
+    assert "errors" not in summary
+    for key in ("open", "closed", "filtered"):
+        assert summary[key] == local[key], key
+
+
+@contextlib.contextmanager
+def agent_processes(count):
+    processes, addresses = [], []
+    try:
+        for index in range(count):
+            process = subprocess.Popen(
+                [sys.executable, "cli.py", "agent", "--port", "0", "--name", f"agent{index + 1}"],
+                cwd=ROOT, stderr=subprocess.PIPE, text=True,
+            )
+            processes.append(process)
+            # "Agent agent1 listening on 127.0.0.1:PORT"
+            addresses.append(f"127.0.0.1:{int(process.stderr.readline().rsplit(':', 1)[1])}")
+        yield processes, addresses
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+
+
+@pytest.mark.parametrize("agents", [1, 3])
+def test_dispatched_scan_matches_local(farm, agents):
+    local = scan_locally(farm)
+    servers = [AgentServer(port=0, name=f"agent{index}").start() for index in range(agents)]
+    try:
+        pool, errors = AgentPool.connect([f"127.0.0.1:{server.port}" for server in servers])
+        assert not errors
+        records = []
+        try:
+            dispatch(pool, "scan", [farm.host], {"ports": PortSet.from_ports(farm.ports).ranges(), **PARAMS},
+                     records.append, chunk=8)
+        finally:
+            pool.close()
+    finally:
+        for server in servers:
+            server.stop()
+
+    summaries = [record for record in records if record["type"] == "summary"]
+    assert len(summaries) == 1
+    assert_matches(local, summaries[0])
+    assert sorted(record["port"] for record in records if record["type"] == "open") == local["open"]
+    assert sum(server.jobs_run for server in servers) == len(farm.ports) // 8 + bool(len(farm.ports) % 8)
+
+
+def test_killed_agent_units_finish_elsewhere(farm):
+    local = scan_locally(farm)
+    params = {"ports": PortSet.from_ports(farm.ports).ranges(), **PARAMS}
+    units = split_units("scan", [farm.host], params, chunk=6)
+    with agent_processes(3) as (processes, addresses):
+        pool, errors = AgentPool.connect(addresses)
+        assert not errors
+        victim, killed = pool.agents[0], threading.Event()
+        records = []
+        merger = SweepMerger(units, records.append)
+
+        def on_done(unit, agent, summary, error):
+            # Kill the first agent as soon as it has delivered one unit
+            if agent is victim and not killed.is_set():
+                killed.set()
+                processes[0].kill()
+            merger.on_done(unit, agent, summary, error)
+
+        try:
+            pool.run(units, merger.on_items, on_done)
+        finally:
+            pool.close()
+
+    assert killed.is_set()
+    assert not victim.alive
+    # Units the victim still held were requeued and run by the others
+    assert victim.completed + sum(agent.completed for agent in pool.agents[1:]) == len(units)
+    summary = [record for record in records if record["type"] == "summary"][0]
+    assert_matches(local, summary)
+
+
+def test_results_flushed_by_the_timer_still_precede_done(monkeypatch):
+    sent, sending = [], threading.Event()
+    release = threading.Event()
+
+    def send_frame(sock, kind, payload, lock=None):
+        if kind == FRAME_RESULTS and not sending.is_set():
+            sending.set()
+            release.wait(5)
+        sent.append(kind)
+
+    monkeypatch.setattr(agent_module, "send_frame", send_frame)
+    outbox = _Outbox(None, threading.Lock())
+    outbox.add(1, [80, "http"])
+    # The flusher takes the job's last batch and is still sending it ...
+    flusher = threading.Thread(target=outbox.flush)
+    flusher.start()
+    assert sending.wait(5)
+
+    def finish():
+        outbox.flush(1)
+        send_frame(None, FRAME_DONE, {"job": 1})
+
+    # ... when the job itself flushes and sends DONE
+    done = threading.Thread(target=finish)
+    done.start()
+    time.sleep(0.1)
+    release.set()
+    flusher.join()
+    done.join()
+    assert sent == [FRAME_RESULTS, FRAME_DONE]
+
+
+def test_items_resent_by_a_retried_unit_are_passed_on_once():
+    agent = type("Agent", (), {"label": "agent1"})()
+    records = []
+    merger = SweepMerger([], records.append)
+    scan, ping = WorkUnit("scan", "host"), WorkUnit("ping", "host")
+    trace = WorkUnit("trace", "host")
+    merger.on_items(scan, agent, [[22, "ssh"], [80, "http"]])
+    merger.on_items(scan, agent, [[80, "http"], [443, "https"]])
+    merger.on_items(ping, agent, [[1, 1.5], [2, 1.4]])
+    merger.on_items(ping, agent, [[1, 1.6], [2, 1.3], [3, 1.2]])
+    merger.on_items(trace, agent, [[None, "traceroute to host"], [1, "gateway"]])
+    merger.on_items(trace, agent, [[None, "traceroute to host"], [1, "gateway"], [2, "host"]])
+
+    assert [record["port"] for record in records if record["type"] == "open"] == [22, 80, 443]
+    assert [record["seq"] for record in records if record["type"] == "reply"] == [1, 2, 3]
+    assert [record["text"] for record in records if record["type"] == "hop"] == ["traceroute to host", "gateway", "host"]
+
+
+def test_dispatch_saves_open_ports_with_their_address(run_cli, farm, home):
+    with AgentServer(port=0) as server:
+        run_cli("dispatch", farm.host, "--agents", f"127.0.0.1:{server.port}", "-p",
+                ",".join(map(str, farm.open)), "--chunk", "2", "--save")
+    output = home / "scans.ndjson"
+    run_cli("export", "scan", "-o", str(output))
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(row["port"] for row in rows) == sorted(farm.open)
+    assert {row["address"] for row in rows} == {farm.host}
+
+
+def test_malformed_job_frame_ends_the_session_quietly():
+    errors = []
+    hook, threading.excepthook = threading.excepthook, errors.append
+    try:
+        with AgentServer(port=0) as server:
+            agent = AgentConnection("127.0.0.1", server.port).connect()
+            send_frame(agent._sock, FRAME_JOB, {"tool": "scan"})
+            deadline = time.monotonic() + 5
+            while agent.alive and time.monotonic() < deadline:
+                time.sleep(0.01)
+            agent.close()
+    finally:
+        threading.excepthook = hook
+    assert not agent.alive
+    assert errors == []
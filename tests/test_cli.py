@@ -0,0 +1,87 @@
+"""End-to-end runs of ``cli.py`` in a child process, parsing its NDJSON output."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_imports_no_qt():
+    code = "import sys, cli; cli.build_parser(); assert not [m for m in sys.modules if m.startswith('PySide6')]"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, timeout=30)
+
+
+def test_scan_streams_open_ports_and_summary(run_cli, farm):
+    ports = ",".join(map(str, farm.ports))
+    records = run_cli("scan", farm.host, "-p", ports, "--timeout", "0.3")
+
+    opened = [record["port"] for record in records if record["type"] == "open"]
+    assert sorted(opened) == sorted(farm.open)
+    summary = records[-1]
+    assert summary["type"] == "summary" and summary["tool"] == "scan" and summary["complete"]
+    assert summary["open"] == sorted(farm.open)
+    assert summary["scanned"] == len(farm.ports)
+    assert summary["closed"] == len(farm.closed)
+    assert summary["filtered"] == sorted(farm.blackholed)
+
+
+def test_scan_save_then_export(run_cli, farm, home):
+    run_cli("scan", farm.host, "-p", ",".join(map(str, farm.open)), "--save")
+    output = home / "scans.ndjson"
+    run_cli("export", "scan", "-o", str(output))
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(row["port"] for row in rows) == sorted(farm.open)
+
+
+def test_dns_against_stub(run_cli, dns_stub):
+    records = run_cli("dns", "a.bench.test", "b.bench.test", "nope.example", "--server", dns_stub.server)
+    by_domain = {record["domain"]: record for record in records}
+    assert set(by_domain) == {"a.bench.test", "b.bench.test", "nope.example"}
+    assert by_domain["a.bench.test"]["rcode"] == "NOERROR"
+    assert "192.0.2.1" in by_domain["b.bench.test"]["records"][0]
+    assert by_domain["nope.example"]["rcode"] == "NXDOMAIN"
+
+
+def test_dns_reads_targets_from_input_file(run_cli, dns_stub, tmp_path):
+    names = tmp_path / "names.txt"
+    names.write_text("one.bench.test\n# comment\n\ntwo.bench.test\none.bench.test\n")
+    records = run_cli("dns", "--input", str(names), "--server", dns_stub.server)
+    assert sorted(record["domain"] for record in records) == ["one.bench.test", "two.bench.test"]
+
+
+def test_whois_through_stand_in_registry(run_cli, whois_stub, home):
+    referrals = home / ".gatchfier" / "whois_referrals.json"
+    referrals.parent.mkdir(exist_ok=True)
+    referrals.write_text(json.dumps({"test": {"server": whois_stub.server, "fetched": time.time()}}))
+
+    records = run_cli("whois", "alpha.test", "beta.test")
+    assert sorted(record["domain"] for record in records) == ["alpha.test", "beta.test"]
+    for record in records:
+        assert "error" not in record
+        assert record["server"] == whois_stub.server
+        assert record["record"]["domain_name"] == record["domain"].upper()
+    # A second run is answered from the cache without asking the registry
+    queries = whois_stub.queries
+    assert all(record["cached"] for record in run_cli("whois", "alpha.test", "beta.test"))
+    assert whois_stub.queries == queries
+
+
+def test_ping_loopback(run_cli):
+    pytest.importorskip("ping3")
+    records = run_cli("ping", "127.0.0.1", "-c", "2", "--interval", "0.05")
+    assert [record["seq"] for record in records if record["type"] == "reply"] == [1, 2]
+    summary = records[-1]
+    assert summary["type"] == "summary" and summary["sent"] == 2
+
+
+def test_no_targets_is_an_error(home):
+    completed = subprocess.run([sys.executable, os.path.join(ROOT, "cli.py"), "dns"], cwd=ROOT,
+                               env=dict(os.environ, HOME=str(home)), capture_output=True, text=True, timeout=30)
+    assert completed.returncode == 2
+    assert "No targets" in completed.stderr
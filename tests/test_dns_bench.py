@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import contextlib
+import socket
+
+from benchmarks.stub_dns import StubDNSServer
+from core.dns_bench import ResolverStats, benchmark_resolvers, percentile
+
+NAMES = [f"name{index}.bench.test" for index in range(8)]
+
+
+def unused_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_cached_and_uncached_latency_are_split():
+    # Only a name's first query pays the cold delay, as on a recursive resolver
+    with StubDNSServer(cold_delay=0.1) as stub:
+        [stats] = benchmark_resolvers([stub.server], NAMES, rounds=2)
+
+    assert stats.failures == 0
+    assert len(stats.cached) == len(stats.uncached) == 2 * len(NAMES)
+    assert percentile(stats.cached, 95) < 50
+    assert percentile(stats.uncached, 50) >= 100
+
+
+def test_resolvers_run_concurrently_and_keep_their_own_stats():
+    with contextlib.ExitStack() as stack:
+        fast = stack.enter_context(StubDNSServer())
+        slow = stack.enter_context(StubDNSServer(delay=0.15))
+        dead = f"127.0.0.1:{unused_udp_port()}"
+        seen = []
+        results = benchmark_resolvers([fast.server, slow.server, dead], NAMES, rounds=1, timeout=0.5,
+                                      on_result=seen.append)
+
+    by_server = {stats.resolver: stats for stats in results}
+    assert set(by_server) == {fast.server, slow.server, dead} and len(seen) == 3
+    fast_row, slow_row = by_server[fast.server].summary(), by_server[slow.server].summary()
+    assert fast_row["failure_pct"] == slow_row["failure_pct"] == 0.0
+    assert slow_row["cached_p50"] >= 150 > fast_row["cached_p50"]
+    assert by_server[dead].summary()["failure_pct"] == 100.0
+
+
+def test_empty_stats_summary():
+    row = ResolverStats("192.0.2.53").summary()
+    assert row["queries"] == 0 and row["failure_pct"] == 0.0 and row["cached_p50"] is None
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+
+from benchmarks.stub_dns import StubDNSServer
+from core.dns_client import DNSClient
+from core.dns_wire import decode_message, encode_name, encode_query, read_name, wire_name
+
+
+def test_pipelines_queries_over_one_socket():
+    delay, count = 0.2, 50
+    with StubDNSServer(delay=delay) as stub:
+        client = DNSClient(stub.server, timeout=2)
+        started = time.monotonic()
+        results = client.query_many([(f"host{index}.bench.test", "A") for index in range(count)], window=count)
+        elapsed = time.monotonic() - started
+
+    assert len(results) == count
+    assert all(result.ok and result.message.answers[0].data == "192.0.2.1" for result in results)
+    assert sorted(result.name for result in results) == sorted(f"host{index}.bench.test" for index in range(count))
+    # Sequential queries would take count * delay; pipelined ones overlap their waits
+    assert elapsed < delay * 5
+    assert stub.queries == count
+
+
+def test_window_limits_queries_in_flight():
+    with StubDNSServer(delay=0.1) as stub:
+        client = DNSClient(stub.server, timeout=2)
+        started = time.monotonic()
+        results = client.query_many([(f"w{index}.bench.test", "A") for index in range(6)], window=2)
+        elapsed = time.monotonic() - started
+    assert all(result.ok for result in results)
+    assert elapsed >= 0.3
+
+
+def test_truncated_reply_falls_back_to_tcp(dns_stub):
+    client = DNSClient(dns_stub.server, timeout=2)
+    results = {result.name: result for result in client.query_many([("big.bench.test", "A"), ("small.bench.test", "A")])}
+
+    big, small = results["big.bench.test"], results["small.bench.test"]
+    assert big.ok and big.via_tcp
+    assert not big.message.truncated
+    assert [record.type_name for record in big.message.answers] == ["A", "TXT"]
+    assert small.ok and not small.via_tcp
+
+
+def test_slow_tcp_fallback_does_not_hold_up_udp_answers():
+    tcp_delay = 0.5
+    with StubDNSServer(truncate=("big.bench.test",), tcp_delay=tcp_delay) as stub:
+        client = DNSClient(stub.server, timeout=2, retries=0)
+        questions = [("big.bench.test", "A")] + [(f"small{index}.bench.test", "A") for index in range(20)]
+        results = list(client.iter_queries(questions, window=len(questions)))
+
+    assert all(result.ok for result in results)
+    # The truncated name is asked first but answered last, and only it waited on TCP
+    assert results[-1].name == "big.bench.test" and results[-1].via_tcp
+    assert results[-1].elapsed >= tcp_delay
+    assert max(result.elapsed for result in results[:-1]) < tcp_delay / 2
+
+
+def test_idn_name_is_sent_and_matched_in_idna_form(dns_stub):
+    client = DNSClient(dns_stub.server, timeout=0.5, retries=0)
+    result = client.query_many([("bücher.bench.test", "A")])[0]
+
+    assert result.error is None
+    assert result.name == "bücher.bench.test"
+    assert result.message.answers[0].name == "xn--bcher-kva.bench.test."
+    assert result.message.answers[0].data == "192.0.2.1"
+
+
+def test_unanswered_query_times_out():
+    with StubDNSServer(delay=5) as stub:
+        client = DNSClient(stub.server, timeout=0.2, retries=1)
+        result = client.query_many([("slow.bench.test", "A")])[0]
+    assert result.error == "Timed out"
+
+
+def test_wire_name_round_trip():
+    assert wire_name("Bücher.Example.") == "xn--bcher-kva.example."
+    assert read_name(encode_name("bücher.example"), 0) == ("xn--bcher-kva.example.", 23)
+    message = decode_message(encode_query(0x1234, "mx.example", "MX"))
+    assert message.id == 0x1234
+    assert message.questions[0][:2] == ("mx.example.", 15)
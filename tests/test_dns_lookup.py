@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from core.dns_lookup import SYSTEM_RESOLVER, lookup
+
+
+def test_a_record_from_stub(dns_stub):
+    result = lookup("www.bench.test", "A", dns_stub.server)
+    assert result.error is None
+    assert result.rcode == "NOERROR"
+    assert result.server == dns_stub.server
+    assert len(result.records) == 1 and "192.0.2.1" in result.records[0]
+    assert result.elapsed_ms is not None and not result.via_tcp
+
+
+def test_unknown_name_is_nxdomain(dns_stub):
+    result = lookup("missing.example", "A", dns_stub.server)
+    assert result.error is None
+    assert result.rcode == "NXDOMAIN"
+    assert result.records == []
+
+
+def test_truncated_answer_retried_over_tcp(dns_stub):
+    result = lookup("big.bench.test", "A", dns_stub.server)
+    assert result.error is None
+    assert result.via_tcp
+    assert len(result.records) == 2
+
+
+def test_ptr_lookup_reverses_the_address(dns_stub):
+    result = lookup("192.0.2.10", "PTR", dns_stub.server)
+    assert result.name == "10.2.0.192.in-addr.arpa."
+    assert result.records and "host-192-0-2-10.bench.test" in result.records[0]
+
+
+def test_system_resolver_answers_literals_from_the_shared_cache():
+    result = lookup("127.0.0.1", "A")
+    assert result.server == SYSTEM_RESOLVER
+    assert result.addresses == ["127.0.0.1"]
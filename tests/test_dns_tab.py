@@ -0,0 +1,39 @@
+import ipaddress
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from core.ptr_sweep import SORT_LATENCY, STATUS_FOUND, PtrSweepStore  # noqa: E402  pylint: disable=wrong-import-position
+from tabs.dns_tab import PtrSweepModel  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def latencies(model):
+    return [model.data(model.index(row, SORT_LATENCY)) for row in range(model.rowCount())]
+
+
+def test_sorted_sweep_appends_new_rows_until_it_is_resorted():
+    store = PtrSweepStore(ipaddress.ip_network("192.0.2.0/28"))
+    model = PtrSweepModel()
+    model.set_store(store)
+    for index, latency in ((0, 30.0), (1, 10.0), (2, 20.0)):
+        store.record(index, STATUS_FOUND, f"host{index}.test", latency)
+    model.sort(SORT_LATENCY)
+    assert latencies(model) == ["10.0", "20.0", "30.0"]
+
+    resets, inserted = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    store.record(3, STATUS_FOUND, "host3.test", 5.0)
+    store.record(4, STATUS_FOUND, "host4.test", 25.0)
+    model.refresh()
+    # A tick only appends; the existing rows keep their places
+    assert not resets
+    assert inserted == [(3, 4)]
+    assert latencies(model) == ["10.0", "20.0", "30.0", "5.0", "25.0"]
+
+    model.refresh(resort=True)
+    assert resets
+    assert latencies(model) == ["5.0", "10.0", "20.0", "25.0", "30.0"]
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from benchmarks.stub_http import StubHttpServer
+from core.http_probe import probe_many
+
+
+def test_keep_alive_stays_within_the_pool(http_stub):
+    stats = probe_many(http_stub.url(), 80, 4, keep_alive=True)
+
+    assert len(stats.timings) == 80
+    assert stats.failures == 0
+    assert http_stub.requests == 80
+    assert 1 <= http_stub.connections <= 4
+    assert all(timing.status == 200 and timing.bytes == 16384 for timing in stats.timings)
+    # Every connection the server saw is one cold request; the rest reused it
+    assert len(stats.group(False)) == http_stub.connections
+    assert len(stats.group(True)) == 80 - http_stub.connections
+
+
+def test_without_keep_alive_every_request_connects(http_stub):
+    stats = probe_many(http_stub.url(), 20, 4, keep_alive=False)
+
+    assert stats.failures == 0
+    assert http_stub.connections == 20
+    assert not stats.group(True)
+
+
+def test_chunked_and_connection_close(http_stub):
+    chunked = probe_many(http_stub.url("/chunked"), 10, 2)
+    assert chunked.failures == 0
+    assert all(timing.bytes == 16384 for timing in chunked.timings)
+    before = http_stub.connections
+    assert before <= 2
+
+    # The server drops each connection, so none can be reused
+    closing = probe_many(http_stub.url("/close"), 10, 2)
+    assert closing.failures == 0
+    assert http_stub.connections - before == 10
+
+
+def test_tls_keep_alive():
+    with StubHttpServer(tls=True, body_size=4096) as stub:
+        if not stub.tls:
+            pytest.skip("openssl binary not found")
+        stats = probe_many(stub.url(), 30, 3, verify=False)
+        assert stats.failures == 0
+        assert 1 <= stub.connections <= 3
+        assert all(timing.tls_version for timing in stats.group(False))
+
+
+def test_stop_ends_the_run_early():
+    with StubHttpServer(delay=0.05) as stub:
+        stop = threading.Event()
+        timer = threading.Timer(0.3, stop.set)
+        timer.start()
+        stats = probe_many(stub.url(), 1000, 2, stop=stop)
+        timer.cancel()
+        assert len(stats.timings) < 100
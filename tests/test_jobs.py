@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+import core.jobs as jobs
+from core.jobs import STATE_CANCELLED, STATE_DONE, JobManager
+
+
+@pytest.fixture
+def manager():
+    instance = JobManager(job_threads=2, io_threads=8, socket_limit=4)
+    yield instance
+    instance.shutdown()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_job_cancelled_while_queued_never_runs(manager):
+    release = threading.Event()
+    blockers = [manager.submit(f"block {index}", lambda job: release.wait(5)) for index in range(2)]
+    wait_for(lambda: all(job.started for job in blockers))
+
+    ran, skipped = [], []
+    queued = manager.submit("queued", lambda job: ran.append(job.id), on_skipped=skipped.append)
+    queued.cancel()
+    release.set()
+
+    wait_for(lambda: not queued.active)
+    assert queued.state == STATE_CANCELLED
+    assert queued.started is None
+    assert not ran
+    assert skipped == [queued]
+    wait_for(lambda: all(job.state == STATE_DONE for job in blockers))
+
+
+def test_socket_count_is_exact_under_contention(manager):
+    def churn():
+        for _ in range(2000):
+            manager.acquire_socket()
+            manager.release_socket()
+
+    threads = [threading.Thread(target=churn) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.sockets_in_use == 0
+    assert manager.stats()["sockets_in_use"] == 0
+
+
+def test_get_job_manager_builds_one_instance(monkeypatch):
+    built = []
+
+    class SlowManager(JobManager):
+        def __init__(self):
+            time.sleep(0.05)
+            super().__init__(job_threads=2, io_threads=2)
+            built.append(self)
+
+    monkeypatch.setattr(jobs, "_manager", None)
+    monkeypatch.setattr(jobs, "JobManager", SlowManager)
+    start = threading.Barrier(8)
+    seen = []
+
+    def fetch():
+        start.wait()
+        seen.append(jobs.get_job_manager())
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert all(manager is built[0] for manager in seen)
+    built[0].shutdown()
+
+
+def test_second_job_gets_its_own_thread_while_one_is_idle(manager):
+    warm = manager.submit("warm", lambda job: None)
+    wait_for(lambda: warm.state == STATE_DONE and manager._idle == 1)
+
+    release = threading.Event()
+    long_job = manager.submit("long", lambda job: release.wait(5))
+    short_job = manager.submit("short", lambda job: None)
+    try:
+        wait_for(lambda: short_job.state == STATE_DONE, timeout=1.0)
+        assert long_job.state == jobs.STATE_RUNNING
+        assert manager.stats()["job_threads"] == 2
+    finally:
+        release.set()
@@ -0,0 +1,31 @@
+from core.log_buffer import LogBuffer
+
+
+def test_match_count_follows_appends_and_evictions():
+    buffer = LogBuffer(max_lines=50)
+    for index in range(20):
+        buffer.append(f"line {index} {'ERROR' if index % 3 == 0 else 'ok'}")
+    shown = buffer.set_filter("error")
+    assert shown == buffer.matching("error")
+    assert buffer.matched == buffer.count("error") == 7
+
+    # Push the filtered lines through the ring, including multi-line appends
+    for index in range(20, 200):
+        buffer.append(f"a {index} error\nb {index} ok" if index % 5 == 0 else f"line {index}")
+        assert buffer.matched == buffer.count("error")
+    assert len(buffer) == 50
+
+
+def test_clearing_and_removing_the_filter():
+    buffer = LogBuffer(max_lines=10)
+    buffer.extend(["Alpha", "beta", "ALPHA beta"])
+    buffer.set_filter("alpha")
+    assert buffer.matched == 2
+    buffer.clear()
+    assert buffer.matched == 0
+    buffer.append("alpha again")
+    assert buffer.matched == 1
+    assert buffer.set_filter("") == ["alpha again"]
+    assert buffer.matched == len(buffer)
+    buffer.append("more")
+    assert buffer.matched == 2
@@ -0,0 +1,34 @@
+import socket
+
+from core.metrics import MetricsRegistry, get_metrics
+from core.resolver import get_resolver
+
+
+def sample(name):
+    return {metric.name: metric for metric in get_metrics().metrics()}[name].sample()
+
+
+def test_resolver_cache_totals_export_as_counters():
+    text = get_metrics().render()
+    assert "# TYPE gatchfier_resolver_cache_hits_total counter" in text
+    assert "# TYPE gatchfier_resolver_cache_misses_total counter" in text
+    assert "gatchfier_resolver_cache_hits " not in text
+
+    resolver = get_resolver()
+    resolver.clear()
+    hits, misses = sample("gatchfier_resolver_cache_hits_total"), sample("gatchfier_resolver_cache_misses_total")
+    resolver.lookup("localhost", socket.AF_INET)
+    resolver.lookup("localhost", socket.AF_INET)
+    assert sample("gatchfier_resolver_cache_misses_total") == misses + 1
+    assert sample("gatchfier_resolver_cache_hits_total") == hits + 1
+
+
+def test_counter_source():
+    registry = MetricsRegistry()
+    total = [3]
+    counter = registry.counter("things_total", "Things", lambda: total[0])
+    total[0] = 5
+    assert registry.render().splitlines()[-2:] == ["# TYPE things_total counter", "things_total 5"]
+
+    counter.source = lambda: 1 / 0
+    assert counter.sample() != counter.sample()  # NaN
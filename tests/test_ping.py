@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from core.ping import PingReply, ping_host, summarize
+
+pytest.importorskip("ping3")
+
+
+def test_ping_loopback_replies():
+    replies = []
+    sent = ping_host("127.0.0.1", replies.append, count=3, interval=0.05, timeout=1)
+
+    assert sent == 3
+    assert [reply.seq for reply in replies] == [1, 2, 3]
+    if all(reply.rtt_ms is None for reply in replies):
+        pytest.skip("ICMP echo is not permitted for this user")
+    summary = summarize(replies)
+    assert summary["sent"] == 3 and summary["received"] == 3 and summary["loss_pct"] == 0.0
+    assert 0 <= summary["min_ms"] <= summary["avg_ms"] <= summary["max_ms"] < 1000
+
+
+def test_ping_stops_before_count():
+    stop = threading.Event()
+    replies = []
+
+    def on_reply(reply):
+        replies.append(reply)
+        stop.set()
+
+    assert ping_host("127.0.0.1", on_reply, count=None, interval=5, timeout=1, stop=stop) == 1
+
+
+def test_summarize_counts_losses():
+    summary = summarize([PingReply(1, "x", 2.0), PingReply(2, "x", None), PingReply(3, "x", 4.0), PingReply(4, "x", None)])
+    assert summary == {"sent": 4, "received": 2, "loss_pct": 50.0, "min_ms": 2.0, "avg_ms": 3.0, "max_ms": 4.0}
+    assert summarize([])["loss_pct"] == 0.0
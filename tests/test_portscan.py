@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from core.portscan import parse_ports, scan_ports
+from core.portset import HostPorts
+
+
+def test_parse_ports_merges_ranges_and_duplicates():
+    assert parse_ports("80, 22,20-23,80") == [20, 21, 22, 23, 80]
+    with pytest.raises(ValueError):
+        parse_ports("0-10")
+    with pytest.raises(ValueError):
+        parse_ports("100-90")
+
+
+def test_scan_classifies_open_closed_and_filtered(farm):
+    host = HostPorts()
+    found = []
+    opened = scan_ports(farm.host, farm.ports, on_open=found.append, timeout=0.3, result=host)
+
+    assert [item.port for item in opened] == sorted(farm.open)
+    assert sorted(item.port for item in found) == sorted(farm.open)
+    assert host.counts() == {
+        "scanned": len(farm.ports),
+        "open": len(farm.open),
+        "filtered": len(farm.blackholed),
+        "closed": len(farm.closed),
+    }
+    assert sorted(host.filtered) == sorted(farm.blackholed)
+
+
+def test_scan_stops_when_asked(farm):
+    stop = threading.Event()
+    stop.set()
+    host = HostPorts()
+    assert scan_ports(farm.host, farm.ports, stop=stop, result=host) == []
+    assert host.counts()["scanned"] < len(farm.ports)
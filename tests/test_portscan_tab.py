@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PySide6.QtCore")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+import tabs.portscan_tab as portscan_tab  # noqa: E402  pylint: disable=wrong-import-position
+from core.channel import ResultChannel  # noqa: E402  pylint: disable=wrong-import-position
+from core.portset import STATE_OPEN, HostPorts, ScanSnapshot, last_scan_path  # noqa: E402  pylint: disable=wrong-import-position
+from widgets.pump import ChannelPump  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def run_worker(monkeypatch, host, scan):
+    """Run a scan worker inline with ``scan`` standing in for the port scan; returns its changes."""
+    worker = portscan_tab.PortScannerWorker(host)
+    emitted = []
+    worker.finished.connect(lambda ports, changes: emitted.append(changes))
+    monkeypatch.setattr(portscan_tab, "scan_ports", lambda address, **kwargs: scan(worker, kwargs["result"]))
+    worker.run()
+    return emitted[0]
+
+
+def test_stopped_scan_keeps_the_full_baseline(monkeypatch):
+    def full(worker, result):
+        result.mark(22, STATE_OPEN)
+        result.mark(80, STATE_OPEN)
+        result.mark(443, None)
+
+    def partial(worker, result):
+        result.mark(22, None)
+        worker.stop()
+
+    assert run_worker(monkeypatch, "127.0.0.1", full) is None
+    path = last_scan_path("127.0.0.1")
+    baseline = ScanSnapshot.load(path).hosts["127.0.0.1"]
+
+    assert run_worker(monkeypatch, "127.0.0.1", partial) is None
+    kept = ScanSnapshot.load(path).hosts["127.0.0.1"]
+    assert list(kept.open) == list(baseline.open) == [22, 80]
+
+
+def test_completed_scan_is_compared_with_the_last_one(monkeypatch):
+    def first(worker, result):
+        result.mark(22, STATE_OPEN)
+        result.mark(80, None)
+
+    def second(worker, result):
+        result.mark(22, None)
+        result.mark(80, STATE_OPEN)
+
+    run_worker(monkeypatch, "127.0.0.1", first)
+    changes = run_worker(monkeypatch, "127.0.0.1", second)
+    assert list(changes["opened"]) == [80]
+    assert list(changes["closed"]) == [22]
+
+
+def test_finished_runs_do_not_leave_pumps_on_the_tab():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    tab = portscan_tab.PortScannerTab()
+    for _ in range(3):
+        tab.pump = ChannelPump(ResultChannel(), parent=tab)
+        tab.show_summary(HostPorts(), None)
+        tab.discovery_pump = ChannelPump(ResultChannel(), parent=tab)
+        tab.discovery_finished(0)
+    app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    assert tab.findChildren(ChannelPump) == []
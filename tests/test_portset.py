@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import pytest
+
+from core.portscan import parse_ports
+from core.portset import BITSET_BYTES, STATE_FILTERED, STATE_OPEN, HostPorts, PortSet, ScanSnapshot
+
+
+def test_portset_add_discard_and_membership():
+    ports = PortSet()
+    assert not ports and len(ports) == 0
+    for port in (0, 7, 8, 443, 65535):
+        ports.add(port)
+    ports.add(443)
+    ports.discard(7)
+    ports.discard(9)
+
+    assert list(ports) == [0, 8, 443, 65535]
+    assert len(ports) == 4
+    assert 443 in ports and 7 not in ports
+    assert -1 not in ports and 65536 not in ports
+
+
+def test_portset_algebra():
+    low, web = PortSet.from_ports(range(1, 1025)), PortSet.from_ports([80, 443, 8080])
+    assert list(low & web) == [80, 443]
+    assert list(web - low) == [8080]
+    assert len(low | web) == 1025
+    assert list(low ^ web) == [port for port in range(1, 1025) if port not in (80, 443)] + [8080]
+    assert PortSet.union([web, PortSet.from_ports([22])]) == PortSet.from_ports([22, 80, 443, 8080])
+
+    merged = PortSet.from_ports([22])
+    merged |= web
+    assert list(merged) == [22, 80, 443, 8080]
+
+
+def test_portset_ranges_round_trip_through_parse_ports():
+    ports = PortSet.from_ports([22, 80, 8000, 8001, 8002, 65535])
+    assert ports.ranges() == "22,80,8000-8002,65535"
+    assert PortSet.from_ports(parse_ports(ports.ranges())) == ports
+    assert PortSet().ranges() == ""
+    assert PortSet.from_ports(range(1, 65536)).ranges() == "1-65535"
+
+
+def test_portset_bytes_round_trip():
+    ports = PortSet.from_ports([1, 2, 3, 1000])
+    assert PortSet(ports.to_bytes()) == ports
+    with pytest.raises(ValueError):
+        PortSet(b"\x00" * (BITSET_BYTES - 1))
+
+
+def test_host_ports_counts_and_implied_closed():
+    host = HostPorts()
+    for port in (22, 80):
+        host.mark(port, STATE_OPEN)
+    host.mark(25, STATE_FILTERED)
+    for port in (21, 23, 443):
+        host.mark(port, None)
+
+    assert host.counts() == {"scanned": 6, "open": 2, "filtered": 1, "closed": 3}
+    assert list(host.open) == [22, 80]
+    assert list(host.filtered) == [25]
+    assert list(host.closed) == [21, 23, 443]
+    assert HostPorts().counts() == {"scanned": 0, "open": 0, "filtered": 0, "closed": 0}
+
+
+def scanned(ports, open_ports=(), filtered=()) -> HostPorts:
+    host = HostPorts()
+    for port in ports:
+        host.mark(port, STATE_OPEN if port in open_ports else STATE_FILTERED if port in filtered else None)
+    return host
+
+
+def test_snapshot_save_load_round_trip(tmp_path):
+    snapshot = ScanSnapshot()
+    snapshot.hosts["a.test"] = scanned(range(1, 1025), open_ports={22, 80}, filtered={25})
+    snapshot.hosts["b.test"] = scanned(range(1, 1025), open_ports={443})
+    snapshot.hosts["c.test"] = scanned(range(1, 1025))
+    path = str(tmp_path / "sweep.gps")
+    snapshot.save(path)
+
+    with open(path, "rb") as handle:
+        assert handle.read(4) == b"GPS1"
+    loaded = ScanSnapshot.load(path)
+    assert list(loaded.hosts) == ["a.test", "b.test", "c.test"]
+    for name, host in snapshot.hosts.items():
+        again = loaded.hosts[name]
+        assert again.scanned == host.scanned
+        assert again.open == host.open
+        assert again.filtered == host.filtered
+        assert again.counts() == host.counts()
+    # Every host scanned the same ports, so that bitmap is stored once
+    assert loaded.hosts["a.test"].scanned is loaded.hosts["c.test"].scanned
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.gps"
+    path.write_bytes(b"NOPE" + bytes(8))
+    with pytest.raises(ValueError):
+        ScanSnapshot.load(str(path))
+
+
+def test_diff_reports_opened_and_closed_ports(tmp_path):
+    before, after = ScanSnapshot(), ScanSnapshot()
+    before.hosts["a.test"] = scanned(range(1, 101), open_ports={22, 80})
+    after.hosts["a.test"] = scanned(range(1, 101), open_ports={22, 53})
+    before.hosts["same.test"] = scanned(range(1, 101), open_ports={22})
+    after.hosts["same.test"] = scanned(range(1, 101), open_ports={22})
+    after.hosts["new.test"] = scanned(range(1, 101), open_ports={22})
+    path = str(tmp_path / "before.gps")
+    before.save(path)
+
+    changes = ScanSnapshot.load(path).diff(after)
+    assert set(changes) == {"a.test"}
+    assert list(changes["a.test"]["opened"]) == [53]
+    assert list(changes["a.test"]["closed"]) == [80]
+
+
+def test_diff_only_compares_ports_scanned_both_times():
+    before, after = ScanSnapshot(), ScanSnapshot()
+    # 80 was open in a full scan; the new scan skipped it and found 8080 outside the old range
+    before.hosts["a.test"] = scanned(range(1, 1025), open_ports={22, 80})
+    after.hosts["a.test"] = scanned(list(range(1, 50)) + [8080], open_ports={22, 8080})
+    assert before.diff(after) == {}
+
+    # 22 was scanned both times and closed in between
+    after.hosts["a.test"] = scanned(list(range(1, 50)) + [8080], open_ports={8080})
+    changes = before.diff(after)
+    assert list(changes["a.test"]["opened"]) == []
+    assert list(changes["a.test"]["closed"]) == [22]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+
+import pytest
+
+import core.resolver as resolver_module
+from core.resolver import ResolverCache
+
+
+class Clock:
+    """Stands in for the ``time`` module so TTLs can be stepped through."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class ScriptedLookup:
+    """System lookup double: answers, or raises, what each name is given."""
+
+    def __init__(self, answers=None):
+        self.answers = dict(answers or {})
+        self.calls = []
+
+    def __call__(self, host, family):
+        self.calls.append(host)
+        answer = self.answers.get(host, [])
+        if isinstance(answer, Exception):
+            raise answer
+        return list(answer)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(resolver_module, "time", fake)
+    return fake
+
+
+def test_answers_are_cached_until_their_ttl_expires(clock):
+    lookup = ScriptedLookup({"example.test": ["192.0.2.1"]})
+    cache = ResolverCache(default_ttl=60, lookup=lookup)
+
+    first = cache.lookup("example.test")
+    assert first.addresses == ["192.0.2.1"] and not first.from_cache
+    clock.now += 59
+    again = cache.lookup("Example.Test.")
+    assert again.from_cache and lookup.calls == ["example.test"]
+
+    clock.now += 1
+    assert not cache.lookup("example.test").from_cache
+    assert lookup.calls == ["example.test", "example.test"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_put_honours_the_record_ttl(clock):
+    lookup = ScriptedLookup()
+    cache = ResolverCache(lookup=lookup)
+    cache.put("wire.test", socket.AF_INET, ["198.51.100.7"], ttl=5)
+    cache.put("zero.test", socket.AF_INET, ["198.51.100.8"], ttl=0)
+
+    assert cache.lookup("wire.test").from_cache
+    clock.now += 5
+    with pytest.raises(socket.gaierror):
+        cache.lookup("wire.test")
+    with pytest.raises(socket.gaierror):
+        cache.lookup("zero.test")
+    assert lookup.calls == ["wire.test", "zero.test"]
+
+
+def test_failed_names_are_negatively_cached(clock):
+    lookup = ScriptedLookup({"missing.test": socket.gaierror(socket.EAI_NONAME, "Name or service not known"),
+                             "empty.test": []})
+    cache = ResolverCache(negative_ttl=30, lookup=lookup)
+
+    for name in ("missing.test", "empty.test"):
+        for _ in range(3):
+            with pytest.raises(socket.gaierror) as raised:
+                cache.lookup(name)
+            assert raised.value.errno == socket.EAI_NONAME
+    assert lookup.calls == ["missing.test", "empty.test"]
+    assert cache.stats()["negative_hits"] == 4
+
+    clock.now += 30
+    with pytest.raises(socket.gaierror):
+        cache.lookup("missing.test")
+    assert lookup.calls.count("missing.test") == 2
+
+
+@pytest.mark.parametrize("name", ["EAI_AGAIN", "EAI_SYSTEM", "EAI_MEMORY"])
+def test_transient_failures_bypass_the_cache(clock, name):
+    code = getattr(socket, name, None)
+    if code is None:
+        pytest.skip(f"{name} is not defined on this platform")
+    lookup = ScriptedLookup({"flaky.test": socket.gaierror(code, "temporary failure")})
+    cache = ResolverCache(lookup=lookup)
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror) as raised:
+            cache.lookup("flaky.test")
+        assert raised.value.errno == code
+    assert lookup.calls == ["flaky.test", "flaky.test"]
+    assert cache.stats()["entries"] == 0
+
+    lookup.answers["flaky.test"] = ["192.0.2.9"]
+    assert cache.resolve("flaky.test") == ["192.0.2.9"]
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    lookup = ScriptedLookup({name: [f"192.0.2.{index}"] for index, name in enumerate("abcd", 1)})
+    cache = ResolverCache(max_entries=3, lookup=lookup)
+    for name in "abc":
+        cache.lookup(name)
+    # Touching "a" makes "b" the oldest
+    assert cache.lookup("a").from_cache
+    cache.lookup("d")
+
+    assert cache.stats()["entries"] == 3 and cache.stats()["evictions"] == 1
+    assert cache.lookup("a").from_cache and cache.lookup("c").from_cache and cache.lookup("d").from_cache
+    assert not cache.lookup("b").from_cache
+    assert lookup.calls == ["a", "b", "c", "d", "b"]
+
+
+def test_literals_skip_the_lookup():
+    lookup = ScriptedLookup()
+    cache = ResolverCache(lookup=lookup)
+    assert cache.resolve_one("192.0.2.1") == "192.0.2.1"
+    assert cache.resolve_one("[2001:db8::1]", socket.AF_INET6) == "2001:db8::1"
+    assert lookup.calls == []
+
+
+def test_concurrent_lookups_of_one_name_share_a_single_query():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_lookup(host, family):
+        calls.append(host)
+        started.set()
+        release.wait(5)
+        return ["192.0.2.50"]
+
+    cache = ResolverCache(lookup=slow_lookup)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.lookup("busy.test"))) for _ in range(8)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Every other caller has registered as waiting before the answer arrives
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < len(threads) - 1:
+        assert time.monotonic() < deadline, "callers never started waiting"
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["busy.test"]
+    assert [result.addresses for result in results] == [["192.0.2.50"]] * len(threads)
+    assert sum(not result.from_cache for result in results) == 1
+    assert cache.stats()["misses"] == 1
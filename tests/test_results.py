@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import logging
+import sqlite3
+
+import pytest
+
+import core.results as results
+from core.export import export_results
+from core.results import BATCH_SIZE, ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    instance = ResultsStore(str(tmp_path / "results.db"))
+    yield instance
+    instance.close()
+
+
+def test_rows_are_committed_in_batches(store):
+    rows = BATCH_SIZE * 2 + 500
+    for seq in range(rows):
+        store.record("ping", f"host{seq % 3}.test", ts=1_000_000_000 + seq, seq=seq, rtt_ms=seq / 10)
+    store.flush()
+
+    stats = store.stats()
+    assert stats["written"] == rows and stats["pending"] == 0 and stats["dropped"] == 0
+    # Rows were grouped, and no batch held more than BATCH_SIZE of them
+    assert 3 <= stats["batches"] < rows
+    assert len(list(store.iter_rows("ping"))) == rows
+    newest = store.query("ping", target="host0.test", limit=2)
+    assert [row["seq"] for row in newest] == [rows - 1, rows - 4]
+
+
+def test_values_are_encoded_and_missing_fields_are_null(store):
+    store.record("dns", "example.test", rtype="A", answers=["192.0.2.1", "192.0.2.2"])
+    store.flush()
+    [row] = store.query("dns")
+    assert json.loads(row["answers"]) == ["192.0.2.1", "192.0.2.2"]
+    assert row["server"] is None and row["elapsed_ms"] is None
+
+
+class FlakyConnection:
+    """Connection wrapper whose first ``failures`` inserts raise a locked-database error."""
+
+    def __init__(self, connection: sqlite3.Connection, failures: int):
+        self._connection = connection
+        self.failures = failures
+
+    def executemany(self, statement, rows):
+        if statement.startswith("INSERT") and self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self._connection.executemany(statement, rows)
+
+    def __enter__(self):
+        return self._connection.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._connection.__exit__(*exc_info)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def flaky_store(tmp_path, monkeypatch, failures: int) -> ResultsStore:
+    monkeypatch.setattr(results, "RETRY_DELAY", 0)
+    connect = ResultsStore._connect
+    monkeypatch.setattr(ResultsStore, "_connect", lambda self: FlakyConnection(connect(self), failures))
+    return ResultsStore(str(tmp_path / "results.db"))
+
+
+def test_failed_batch_is_retried(tmp_path, monkeypatch):
+    errors = results.WRITE_ERRORS.value
+    store = flaky_store(tmp_path, monkeypatch, failures=results.WRITE_ATTEMPTS - 1)
+    try:
+        store.record("ping", "host.test", seq=1, rtt_ms=1.5)
+        store.flush()
+        assert store.stats()["written"] == 1 and store.stats()["dropped"] == 0
+        assert len(store.query("ping")) == 1
+    finally:
+        store.close()
+    assert results.WRITE_ERRORS.value - errors == results.WRITE_ATTEMPTS - 1
+
+
+def test_batch_failing_every_attempt_is_counted_and_logged(tmp_path, monkeypatch, caplog):
+    dropped = results.ROWS_DROPPED.value
+    store = flaky_store(tmp_path, monkeypatch, failures=results.WRITE_ATTEMPTS)
+    try:
+        with caplog.at_level(logging.ERROR, logger="core.results"):
+            store.record("ping", "host.test", seq=1, rtt_ms=1.5)
+            store.record("ping", "host.test", seq=2, rtt_ms=1.6)
+            store.flush()
+        stats = store.stats()
+        assert stats["dropped"] == 2 and stats["written"] == 0
+        assert stats["last_error"] == "database is locked"
+        assert results.ROWS_DROPPED.value - dropped == 2
+        assert "Dropped 2 result rows" in caplog.text
+
+        # The writer carries on with later batches
+        store.record("ping", "host.test", seq=3, rtt_ms=1.7)
+        store.flush()
+        assert [row["seq"] for row in store.query("ping")] == [3]
+    finally:
+        store.close()
+
+
+def read_export(path: str, fmt: str) -> list:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            return list(csv.DictReader(handle))
+        return [json.loads(line) for line in handle]
+
+
+@pytest.mark.parametrize("name", ["scans.csv", "scans.ndjson", "scans.csv.gz", "scans.ndjson.gz"])
+def test_store_to_export_round_trip(store, tmp_path, name):
+    for port, service in ((22, "ssh"), (80, "http"), (443, "https, tls")):
+        store.record("portscan", "a.test", ts=1_000_000_000 + port, address="192.0.2.1", port=port, service=service)
+    store.record("portscan", "b.test", ts=1_000_000_000, address="192.0.2.2", port=25, service="smtp")
+    path = str(tmp_path / name)
+
+    # Export flushes the queue itself, so nothing is flushed here
+    assert export_results(store, "portscan", path, target="a.test") == 3
+
+    fmt = "csv" if ".csv" in name else "ndjson"
+    rows = read_export(path, fmt)
+    if name.endswith(".gz"):
+        with open(path, "rb") as handle:
+            assert handle.read(2) == b"\x1f\x8b"
+    assert [list(row) for row in rows] == [ResultsStore.columns("portscan")] * 3
+    assert [(row["address"], int(row["port"]), row["service"]) for row in rows] == [
+        ("192.0.2.1", 22, "ssh"), ("192.0.2.1", 80, "http"), ("192.0.2.1", 443, "https, tls"),
+    ]
+
+
+def test_empty_csv_export_still_has_a_header(store, tmp_path):
+    path = str(tmp_path / "pings.csv")
+    assert export_results(store, "ping", path) == 0
+    with open(path, encoding="utf-8") as handle:
+        assert handle.read().strip() == ",".join(ResultsStore.columns("ping"))
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from widgets.theme import THEMES, ThemeEngine, compile_stylesheet  # noqa: E402  pylint: disable=wrong-import-position
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def build_window():
+    window = QtWidgets.QWidget()
+    window.setFixedSize(480, 360)
+    layout = QtWidgets.QVBoxLayout(window)
+    title = QtWidgets.QLabel("Title")
+    title.setObjectName("TitleLabel")
+    layout.addWidget(title)
+    tabs = QtWidgets.QTabWidget()
+    tabs.setObjectName("MainTabs")
+    for name in ("One", "Two", "Three"):
+        page = QtWidgets.QWidget()
+        page_layout = QtWidgets.QVBoxLayout(page)
+        page_layout.addWidget(QtWidgets.QLineEdit(name))
+        button = QtWidgets.QPushButton(name)
+        button.setObjectName("AccentButton")
+        page_layout.addWidget(button)
+        page_layout.addWidget(QtWidgets.QPlainTextEdit(name))
+        tabs.addTab(page, name)
+    layout.addWidget(tabs)
+    return window, tabs
+
+
+def grabs(qapp, window, tabs):
+    images = []
+    for index in range(tabs.count()):
+        tabs.setCurrentIndex(index)
+        qapp.processEvents()
+        images.append(window.grab().toImage())
+    return images
+
+
+def test_toggle_matches_a_fresh_stylesheet_on_every_tab(qapp):
+    engine = ThemeEngine()
+    window, tabs = build_window()
+    assert engine.apply(window, "neon")
+    window.show()
+    qapp.processEvents()
+    stylesheet = window.styleSheet()
+
+    # Toggle while the first tab is showing; the others are restyled when shown
+    for name in ("light", "neon", "light"):
+        assert engine.apply(window, name)
+        qapp.processEvents()
+    assert not engine.apply(window, "light")
+    assert window.styleSheet() == stylesheet
+    toggled = grabs(qapp, window, tabs)
+
+    reference, reference_tabs = build_window()
+    reference.setStyleSheet(compile_stylesheet(THEMES["light"].stylesheet))
+    reference.show()
+    qapp.processEvents()
+    assert toggled == grabs(qapp, reference, reference_tabs)
+    window.close()
+    reference.close()
+
+
+def test_unknown_theme(qapp):
+    with pytest.raises(KeyError):
+        ThemeEngine().apply(QtWidgets.QWidget(), "sepia")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import core.throughput as throughput
+from core.jobs import JobManager
+from core.throughput import ThroughputServer, run_test
+
+
+@pytest.fixture
+def manager():
+    instance = JobManager(job_threads=2, io_threads=2, socket_limit=2)
+    yield instance
+    instance.shutdown()
+
+
+@pytest.fixture
+def server():
+    with ThroughputServer(host="127.0.0.1", port=0) as instance:
+        yield instance
+
+
+def test_cancelled_while_connecting_releases_every_socket(manager, server):
+    stop = threading.Event()
+    # Two of four streams connect, then the test is cancelled waiting for a third slot
+    threading.Timer(0.3, stop.set).start()
+    result = run_test("127.0.0.1", server.port, duration=1, streams=4, stop=stop, manager=manager)
+
+    assert result.bytes == 0 and not result.intervals
+    assert manager.sockets_in_use == 0
+
+
+def test_failed_stream_setup_releases_its_socket(manager, server, monkeypatch):
+    def broken_tune(sock):
+        raise OSError("setsockopt failed")
+
+    monkeypatch.setattr(throughput, "_tune", broken_tune)
+    with pytest.raises(OSError):
+        run_test("127.0.0.1", server.port, duration=1, streams=2, manager=manager)
+    assert manager.sockets_in_use == 0
+
+
+def test_download_reports_every_stream(manager, server):
+    result = run_test("127.0.0.1", server.port, duration=0.3, streams=2, direction="download", interval=0.1,
+                      manager=manager)
+
+    assert not result.errors
+    assert result.bytes > 0 and result.intervals
+    assert manager.sockets_in_use == 0
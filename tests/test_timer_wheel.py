@@ -0,0 +1,145 @@
+"""Tick-driven checks of the timing wheel and the monitor scheduler built on it.
+
+The wheels here are small (four slots, two levels) so that cascades and the
+overflow list are reached within a few dozen ticks.
+"""
+from __future__ import annotations
+
+import pytest
+
+import core.monitors as monitors
+from core.monitors import STATUS_ALERT, STATUS_FAILING, STATUS_OK, Check, CheckResult, MonitorScheduler
+from core.timer_wheel import TimerWheel
+
+
+def small_wheel() -> TimerWheel:
+    # Level 0 covers ticks 0-3, level 1 ticks 4-15; later deadlines wait in overflow
+    return TimerWheel(tick=1.0, slots=4, levels=2, start=0.0)
+
+
+def fire_times(wheel: TimerWheel, ticks: int) -> dict:
+    fired = {}
+    for tick in range(1, ticks + 1):
+        for item in wheel.advance(tick):
+            fired[item] = tick
+    return fired
+
+
+def test_timers_fire_on_their_tick_across_levels_and_overflow():
+    wheel = small_wheel()
+    delays = [1, 3, 4, 6, 13, 15, 16, 21, 40]
+    for delay in reversed(delays):
+        wheel.schedule(delay, delay)
+    assert len(wheel) == len(delays)
+
+    assert fire_times(wheel, 45) == {delay: delay for delay in delays}
+    assert len(wheel) == 0
+
+
+def test_items_due_on_one_advance_come_back_in_deadline_order():
+    wheel = small_wheel()
+    for delay in (9, 2, 17, 5):
+        wheel.schedule(delay, delay)
+    assert wheel.advance(20) == [2, 5, 9, 17]
+
+
+def test_delays_round_up_to_a_whole_tick():
+    wheel = small_wheel()
+    wheel.schedule(0, "now")
+    wheel.schedule(2.2, "later")
+    assert fire_times(wheel, 4) == {"now": 1, "later": 3}
+
+
+@pytest.mark.parametrize("cancel_at", [0, 2, 5, 9])
+def test_cancel_before_or_after_a_cascade(cancel_at):
+    # Scheduled for tick 10 on level 1; it cascades to level 0 at tick 8
+    wheel = small_wheel()
+    handle = wheel.schedule(10, "cancelled")
+    wheel.schedule(11, "kept")
+    wheel.advance(cancel_at)
+
+    assert wheel.cancel(handle)
+    assert not wheel.cancel(handle)
+    assert len(wheel) == 1
+    assert fire_times(wheel, 12)["kept"] == 11
+    assert "cancelled" not in fire_times(wheel, 12)
+
+
+def test_cancel_while_in_overflow():
+    wheel = small_wheel()
+    handle = wheel.schedule(30, "cancelled")
+    wheel.schedule(31, "kept")
+    wheel.advance(17)
+    wheel.cancel(handle)
+    assert fire_times(wheel, 35) == {"kept": 31}
+
+
+def test_time_until_next_tick():
+    wheel = small_wheel()
+    assert wheel.time_until_next_tick(0.25) == 0.75
+    wheel.advance(3.5)
+    assert wheel.time_until_next_tick(3.5) == 0.5
+    assert wheel.time_until_next_tick(9.0) == 0.0
+
+
+class ScriptedRunner:
+    """Check runner returning queued results instead of probing anything."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, check: Check) -> CheckResult:
+        self.calls += 1
+        ok, value = self.results.pop(0)
+        return CheckResult(check.id, ok, value, "scripted", float(self.calls))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # No start offset and no jitter, so every deadline is a known tick
+    monkeypatch.setattr(monitors.random, "uniform", lambda low, high: 0.0)
+    runner = ScriptedRunner((True, 5.0), (False, None), (False, None), (True, 4.0))
+    instance = MonitorScheduler(tick=0.5, jitter=0.0, runner=runner)
+    instance.alerts = []
+    instance.on_alert = instance.alerts.append
+    return instance
+
+
+def due_at(scheduler: MonitorScheduler, tick: int) -> list:
+    wheel = scheduler.wheel
+    return wheel.advance(wheel.origin + (tick + 0.5) * wheel.tick)
+
+
+def test_recurring_check_is_rescheduled_an_interval_after_it_runs(scheduler):
+    check = scheduler.add(Check("tcp", "192.0.2.1", interval=2.0, port=443, fail_after=2))
+    # Added with no offset: due on the first tick
+    assert due_at(scheduler, 1) == [check.id]
+
+    for run, expected in enumerate([STATUS_OK, STATUS_FAILING, STATUS_ALERT, STATUS_OK]):
+        scheduler._execute(check)
+        assert check.status == expected
+        assert len(scheduler.wheel) == 1
+        # Interval 2.0 s at 0.5 s ticks: four ticks after the run
+        start = scheduler.wheel.current
+        assert due_at(scheduler, start + 3) == []
+        assert due_at(scheduler, start + 4) == [check.id], run
+
+    assert [alert.raised for alert in scheduler.alerts] == [True, False]
+
+
+def test_removed_check_is_not_rescheduled(scheduler):
+    check = scheduler.add(Check("tcp", "192.0.2.1", interval=2.0, port=443))
+    assert due_at(scheduler, 1) == [check.id]
+    scheduler.remove(check.id)
+    scheduler._execute(check)
+    assert len(scheduler.wheel) == 0
+    assert due_at(scheduler, 20) == []
+
+
+def test_removing_a_waiting_check_cancels_its_timer(scheduler):
+    kept = scheduler.add(Check("tcp", "192.0.2.1", interval=2.0, port=443))
+    removed = scheduler.add(Check("tcp", "192.0.2.2", interval=2.0, port=443))
+    scheduler.remove(removed.id)
+    assert len(scheduler.wheel) == 1
+    assert due_at(scheduler, 1) == [kept.id]
@@ -0,0 +1,87 @@
+"""Traceroute runs against a stand-in ``traceroute`` script placed first on PATH.
+
+The script prints canned hops with a pause between them, which is enough to
+check streaming, hop parsing, completion and cancellation without depending
+on the network or on the system command being installed.
+"""
+from __future__ import annotations
+
+import os
+import stat
+import subprocess
+import threading
+import time
+
+import pytest
+
+from core.traceroute import Traceroute, TracerouteError, build_command
+
+SCRIPT = """#!/bin/sh
+for target; do :; done
+echo "traceroute to $target ($target), $2 hops max, 60 byte packets"
+echo " 1  192.0.2.1  0.412 ms  0.388 ms  0.371 ms"
+sleep 0.1
+echo " 2  * * *"
+sleep 0.1
+echo " 3  $target  1.904 ms  1.872 ms  1.850 ms"
+exec sleep {tail}
+"""
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shell script as traceroute")
+
+
+def install(directory, monkeypatch, tail: float = 0):
+    path = directory / "traceroute"
+    path.write_text(SCRIPT.format(tail=tail))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{directory}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+def test_build_command_passes_limits(tmp_path, monkeypatch):
+    install(tmp_path, monkeypatch)
+    assert build_command("192.0.2.9", max_hops=5, per_hop_timeout=2) == [
+        "traceroute", "-m", "5", "-n", "-4", "-w", "2", "192.0.2.9"
+    ]
+
+
+def test_missing_command_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(TracerouteError):
+        Traceroute("192.0.2.9").run(lambda line: None)
+
+
+def test_streams_hops_and_completes(tmp_path, monkeypatch):
+    install(tmp_path, monkeypatch)
+    lines = []
+    assert Traceroute("192.0.2.9", max_hops=5).run(lines.append) is True
+    assert [line.hop for line in lines] == [None, 1, 2, 3]
+    assert lines[2].text.strip() == "2  * * *"
+    assert "192.0.2.9" in lines[3].text
+
+
+def test_stop_ends_a_running_trace(tmp_path, monkeypatch):
+    install(tmp_path, monkeypatch, tail=30)
+    trace = Traceroute("192.0.2.9")
+    lines = []
+    threading.Timer(0.5, trace.stop).start()
+    started = time.monotonic()
+    assert trace.run(lines.append) is False
+    assert time.monotonic() - started < 5
+    assert [line.hop for line in lines] == [None, 1, 2, 3]
+
+
+def test_stop_from_another_thread_reaps_the_child(tmp_path, monkeypatch):
+    install(tmp_path, monkeypatch, tail=30)
+    started = []
+
+    class RecordingPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            started.append(self)
+
+    monkeypatch.setattr(subprocess, "Popen", RecordingPopen)
+    trace = Traceroute("192.0.2.9")
+    threading.Timer(0.5, trace.stop).start()
+    assert trace.run(lambda line: None) is False
+    # run() waited on the terminated child, so it is not left a zombie
+    assert started[0].returncode is not None
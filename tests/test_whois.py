@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import datetime
+import json
+import time
+
+import pytest
+
+from core.whois_cache import WhoisCache
+from core.whois_client import ReferralCache, WhoisClient, WhoisQueryError, parse_record, parse_whois
+
+
+def make_client(stub, tmp_path, index=None) -> WhoisClient:
+    referrals = ReferralCache(str(tmp_path / "referrals.json"), iana_server=stub.server,
+                              index={} if index is None else index)
+    return WhoisClient(timeout=5, referrals=referrals)
+
+
+def test_lookup_parses_registry_record(whois_stub, tmp_path):
+    record = make_client(whois_stub, tmp_path, {"test": whois_stub.server}).lookup("Example.TEST.")
+
+    assert record["domain_name"] == "EXAMPLE.TEST"
+    assert record["registrar"] == "Example Registrar, Inc."
+    assert record["creation_date"] == datetime.datetime(1995, 8, 14, 4, 0)
+    assert isinstance(record["expiration_date"], datetime.datetime)
+    assert record["name_servers"] == ["ns1.example.test", "ns2.example.test"]
+    assert whois_stub.queries == 1
+
+
+def test_unknown_tld_is_referred_once_by_iana(whois_stub, tmp_path):
+    client = make_client(whois_stub, tmp_path)
+    for name in ("one.example", "two.example"):
+        assert client.lookup(name)["domain_name"] == name.upper()
+    # One IANA query for the TLD, then one registry query per domain
+    assert whois_stub.queries == 3
+    assert (tmp_path / "referrals.json").exists()
+
+
+def test_not_found_answer_raises():
+    with pytest.raises(WhoisQueryError):
+        parse_record("nothing.test", "No match for \"NOTHING.TEST\".\n")
+
+
+def test_parse_nominet_style_blocks():
+    text = "    Domain name:\n        example.co.uk\n\n    Registrar:\n        Example Ltd\n\n    Expiry date:  13-Aug-2030\n"
+    record = parse_whois(text)
+    assert record["domain_name"] == "example.co.uk"
+    assert record["registrar"] == "Example Ltd"
+    assert record["expiration_date"] == datetime.datetime(2030, 8, 13)
+
+
+def test_cache_coalesces_writes(tmp_path):
+    path = tmp_path / "whois_cache.json"
+    cache = WhoisCache(str(path), save_delay=60)
+    for index in range(500):
+        cache.put(f"domain{index}.test", {"domain_name": f"DOMAIN{index}.TEST"})
+    assert cache.saves == 0 and not path.exists()
+    assert cache.get("domain7.test")[0] == {"domain_name": "DOMAIN7.TEST"}
+
+    cache.flush()
+    cache.flush()
+    assert cache.saves == 1
+    reloaded = WhoisCache(str(path))
+    assert len(json.loads(path.read_text())) == 500
+    assert reloaded.get("domain499.test")[0]["domain_name"] == "DOMAIN499.TEST"
+
+
+def test_cache_saves_after_the_delay(tmp_path):
+    path = tmp_path / "whois_cache.json"
+    cache = WhoisCache(str(path), save_delay=0.1)
+    cache.put("one.test", {"domain_name": "ONE.TEST"})
+    cache.put("two.test", {"domain_name": "TWO.TEST"})
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert set(json.loads(path.read_text())) == {"one.test", "two.test"}
+    assert cache.saves == 1
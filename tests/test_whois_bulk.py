@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import contextlib
+import time
+
+from benchmarks.stub_whois import StubWhoisServer
+from core.whois_bulk import BulkWhoisRunner, RegistryLimiter
+from core.whois_cache import WhoisCache
+from core.whois_client import ReferralCache
+
+
+def make_runner(tmp_path, iana: str, limiter: RegistryLimiter, index=None, cache=None) -> BulkWhoisRunner:
+    referrals = ReferralCache(str(tmp_path / "referrals.json"), iana_server=iana, index={} if index is None else index)
+    return BulkWhoisRunner(referrals, limiter, cache=cache, timeout=5)
+
+
+def test_peak_concurrency_stays_within_the_registry_limit(tmp_path):
+    with StubWhoisServer(delay=0.05) as stub:
+        runner = make_runner(tmp_path, stub.server, RegistryLimiter(concurrency=3, rate=1000))
+        domains = [f"domain{index}.{tld}" for index in range(20) for tld in ("com", "net")]
+        results = []
+        runner.run(domains, results.append)
+
+    assert sorted(result.domain for result in results) == sorted(domains)
+    assert [result.error for result in results if result.error] == []
+    assert all(result.record["expiration_date"] for result in results)
+    # The referral for each TLD is asked of IANA once, not once per domain
+    assert stub.queries == len(domains) + 2
+    assert stub.peak_active <= 3
+
+
+def test_each_registry_has_its_own_limit(tmp_path):
+    with contextlib.ExitStack() as stack:
+        first = stack.enter_context(StubWhoisServer(delay=0.1))
+        second = stack.enter_context(StubWhoisServer(delay=0.1))
+        runner = make_runner(tmp_path, first.server, RegistryLimiter(concurrency=2, rate=1000),
+                             index={"aa": first.server, "bb": second.server})
+        results = []
+        started = time.monotonic()
+        runner.run([f"d{index}.{tld}" for index in range(6) for tld in ("aa", "bb")], results.append)
+        elapsed = time.monotonic() - started
+
+    assert len(results) == 12 and not any(result.error for result in results)
+    assert {result.server for result in results} == {first.server, second.server}
+    assert first.peak_active <= 2 and second.peak_active <= 2
+    # Six queries per registry, two at a time, with both registries in parallel
+    assert elapsed < 0.1 * 6
+
+
+def test_rate_limit_spaces_queries(tmp_path):
+    with StubWhoisServer() as stub:
+        runner = make_runner(tmp_path, stub.server, RegistryLimiter(concurrency=4, rate=20), index={"test": stub.server})
+        started = time.monotonic()
+        runner.run([f"r{index}.test" for index in range(10)], lambda result: None)
+        elapsed = time.monotonic() - started
+    assert elapsed >= 9 / 20 * 0.9
+
+
+def test_cached_domains_skip_the_registry(tmp_path):
+    cache = WhoisCache(str(tmp_path / "whois_cache.json"))
+    with StubWhoisServer() as stub:
+        runner = make_runner(tmp_path, stub.server, RegistryLimiter(rate=1000), index={"test": stub.server}, cache=cache)
+        runner.run(["a.test", "b.test"], lambda result: None)
+        assert (tmp_path / "whois_cache.json").exists()
+        queries = stub.queries
+
+        again = []
+        runner.run(["a.test", "B.test."], again.append)
+        assert stub.queries == queries
+        assert all(result.cached for result in again)
+
+        runner.run(["a.test"], again.append, refresh=True)
+        assert stub.queries == queries + 1
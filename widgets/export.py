@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QFileDialog, QPushButton
+
+from core.export import FILE_FILTERS, export_results
+from core.jobs import PRIORITY_BULK
+from core.results import get_results_store
+from widgets.job_worker import JobWorker
+
+
+class ExportWorker(JobWorker):
+    """Streams one tool's stored results to a file as a bulk job."""
+
+    progress = Signal(int)
+    finished = Signal(int, str)
+
+    tool = "Export"
+    priority = PRIORITY_BULK
+
+    def __init__(self, table: str, path: str, target: str | None = None):
+        super().__init__()
+        self.table = table
+        self.path = path
+        self.target = target
+
+    def describe(self) -> str:
+        return f"Export {self.table} results to {self.path}"
+
+    def run(self):
+        try:
+            rows = export_results(
+                get_results_store(),
+                self.table,
+                self.path,
+                target=self.target,
+                on_progress=self.on_progress,
+                stop=self.token,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.finished.emit(-1, str(exc))
+            return
+        self.finished.emit(rows, self.path)
+
+    def skipped(self):
+        self.finished.emit(-1, "Cancelled before it started.")
+
+    def on_progress(self, rows: int):
+        self.report(rows)
+        self.progress.emit(rows)
+
+
+class ExportButton(QPushButton):
+    """Saves a tool's results history to a file without blocking the window.
+
+    ``target`` returns the target to export, or an empty value to export
+    every stored row for the tool. Outcomes are reported through ``message``
+    so the owning tab can print them to its log.
+    """
+
+    message = Signal(str)
+
+    def __init__(self, table: str, target: Callable[[], str | None] | None = None, parent=None):
+        super().__init__("Export…", parent)
+        self.table = table
+        self.target = target
+        self.worker: ExportWorker | None = None
+        self.clicked.connect(self.toggle)
+
+    def toggle(self):
+        if self.worker:
+            self.worker.stop()
+            return
+        target = (self.target() or "").strip() if self.target else ""
+        scope = f" for {target}" if target else ""
+        path, _ = QFileDialog.getSaveFileName(
+            self, f"Export {self.table} results{scope}", f"{self.table}.csv", FILE_FILTERS
+        )
+        if not path:
+            return
+        self.worker = ExportWorker(self.table, path, target or None)
+        self.worker.progress.connect(self.show_progress)
+        self.worker.finished.connect(self.export_finished)
+        self.setText("Cancel Export")
+        self.message.emit(f"Exporting {self.table} results{scope} to {path}...")
+        self.worker.start()
+
+    def show_progress(self, rows: int):
+        if self.sender() is self.worker:
+            self.setToolTip(f"{rows:,} rows written")
+
+    def export_finished(self, rows: int, detail: str):
+        if self.sender() is not self.worker:
+            return
+        self.worker = None
+        self.setText("Export…")
+        self.setToolTip("")
+        if rows < 0:
+            self.message.emit(f"Export failed: {detail}")
+        else:
+            self.message.emit(f"Exported {rows:,} rows to {detail}")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject
+
+from core.jobs import PRIORITY_NORMAL, CancelToken, Job, get_job_manager
+
+
+class JobWorker(QObject):
+    """Base for tab workers that run as jobs on the shared JobManager.
+
+    Subclasses keep the familiar ``run``/``start``/``stop`` shape of a
+    QThread worker. ``run`` executes on a job thread; signals emitted there
+    are queued to the GUI thread because the worker object lives there.
+    """
+
+    tool = ""
+    priority = PRIORITY_NORMAL
+
+    def __init__(self):
+        super().__init__()
+        self.token = CancelToken()
+        self.job: Job | None = None
+
+    def describe(self) -> str:
+        return self.tool
+
+    def start(self):
+        self.job = get_job_manager().submit(
+            self.describe(),
+            self._execute,
+            priority=self.priority,
+            tool=self.tool,
+            token=self.token,
+            on_skipped=self._skipped,
+        )
+
+    def _execute(self, job: Job):
+        self.job = job
+        self.run()
+
+    def _skipped(self, job: Job):
+        self.job = job
+        self.skipped()
+
+    def run(self):
+        raise NotImplementedError
+
+    def skipped(self):
+        """Called instead of ``run`` when the worker is stopped before its job starts.
+
+        Emit whatever the tab expects after a stop; the default suits a
+        ``finished`` signal without arguments.
+        """
+        self.finished.emit()
+
+    def stop(self):
+        self.token.cancel()
+
+    def report(self, done: int, total: int = 0, message: str | None = None):
+        if self.job is not None:
+            self.job.report(done, total, message)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import importlib
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+@dataclass(frozen=True)
+class TabSpec:
+    """Where to find a tab class; the module is imported on first use."""
+
+    title: str
+    module: str
+    class_name: str
+
+
+class LazyTabWidget(QTabWidget):
+    """Tab widget that builds each tab the first time it is shown.
+
+    Every page starts as an empty host widget. On activation the tab's module
+    is imported, the tab is constructed and placed inside the host, so tab
+    indexes and titles never change.
+    """
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._specs: List[TabSpec] = []
+        self._hosts: List[QWidget] = []
+        self._loaded: Dict[int, QWidget] = {}
+        self.load_times: Dict[str, float] = {}
+        self.currentChanged.connect(self.ensure_loaded)
+
+    def add_lazy_tab(self, spec: TabSpec) -> int:
+        host = QWidget()
+        layout = QVBoxLayout(host)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self._specs.append(spec)
+        self._hosts.append(host)
+        index = self.addTab(host, spec.title)
+        if index == self.currentIndex():
+            self.ensure_loaded(index)
+        return index
+
+    def ensure_loaded(self, index: int) -> QWidget | None:
+        if index < 0 or index >= len(self._specs):
+            return None
+        if index in self._loaded:
+            return self._loaded[index]
+        spec = self._specs[index]
+        started = time.perf_counter()
+        tab_class = getattr(importlib.import_module(spec.module), spec.class_name)
+        tab = tab_class()
+        self._hosts[index].layout().addWidget(tab)
+        self._loaded[index] = tab
+        self.load_times[spec.title] = time.perf_counter() - started
+        return tab
+
+    def tab_for(self, title: str) -> QWidget | None:
+        """Return the tab with ``title``, constructing it if needed."""
+        for index, spec in enumerate(self._specs):
+            if spec.title == title:
+                return self.ensure_loaded(index)
+        return None
+
+    def loaded_tabs(self) -> List[QWidget]:
+        return list(self._loaded.values())
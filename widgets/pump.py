@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from core.channel import ResultChannel
+from core.metrics import get_metrics
+
+DRAIN_INTERVAL_MS = 16
+
+_metrics = get_metrics()
+QUEUE_DEPTH = _metrics.gauge("gatchfier_gui_queue_depth", "Results waiting in a channel at the last GUI drain")
+DELIVERED = _metrics.counter("gatchfier_gui_results_total", "Results delivered to the GUI in batches")
+FLUSH_SECONDS = _metrics.histogram("gatchfier_gui_flush_seconds", "GUI thread time spent handling one batch")
+
+
+class ChannelPump(QObject):
+    """Drains a :class:`ResultChannel` on the GUI thread at a fixed rate.
+
+    One ``batch`` signal per tick replaces one queued event per result, so the
+    event loop cost no longer scales with the engine's result rate.
+    """
+
+    batch = Signal(list)
+
+    def __init__(self, channel: ResultChannel, interval_ms: int = DRAIN_INTERVAL_MS, parent: QObject | None = None):
+        super().__init__(parent)
+        self.channel = channel
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.pump)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        """Stop the timer after delivering everything still queued."""
+        self.timer.stop()
+        self.channel.close()
+        while self.channel.depth():
+            self.pump()
+
+    def pump(self):
+        QUEUE_DEPTH.set(self.channel.depth())
+        items = self.channel.drain()
+        if items:
+            started = time.perf_counter()
+            self.batch.emit(items)
+            FLUSH_SECONDS.observe(time.perf_counter() - started)
+            DELIVERED.inc(len(items))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QPlainTextEdit
+
+from core.log_buffer import DEFAULT_MAX_LINES, LogBuffer
+
+FLUSH_INTERVAL_MS = 16
+
+
+class TerminalLog(QWidget):
+    """Read-only output pane shared by the tabs.
+
+    ``append`` only queues text; queued lines are written to the document in
+    one batch per frame. The document keeps at most ``max_lines`` blocks and
+    the filter box works against the ring buffer behind it.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.buffer = LogBuffer(max_lines)
+        self.filter_text = ""
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        filter_row = QHBoxLayout()
+        filter_row.setSpacing(8)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter output")
+        self.filter_input.setClearButtonEnabled(True)
+        filter_row.addWidget(self.filter_input, 1)
+
+        self.count_label = QLabel("")
+        self.count_label.setObjectName("MetricLabel")
+        filter_row.addWidget(self.count_label)
+
+        layout.addLayout(filter_row)
+
+        self.view = QPlainTextEdit()
+        self.view.setObjectName("TerminalOutput")
+        self.view.setReadOnly(True)
+        self.view.setUndoRedoEnabled(False)
+        self.view.setMaximumBlockCount(max_lines)
+        layout.addWidget(self.view, 1)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.filter_input.textChanged.connect(self.set_filter)
+
+    def append(self, text: str):
+        self.buffer.append(text)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def clear(self):
+        self.flush_timer.stop()
+        self.buffer.clear()
+        self.view.clear()
+        self._update_count()
+
+    def toPlainText(self) -> str:  # pylint: disable=invalid-name
+        return self.buffer.text()
+
+    def flush(self):
+        lines = self.buffer.take_pending()
+        if self.filter_text:
+            needle = self.filter_text.casefold()
+            lines = [line for line in lines if needle in line.casefold()]
+        if lines:
+            scrollbar = self.view.verticalScrollBar()
+            follow = scrollbar.value() >= scrollbar.maximum() - 4
+            self.view.appendPlainText("\n".join(lines))
+            if follow:
+                scrollbar.setValue(scrollbar.maximum())
+        self._update_count()
+
+    def set_filter(self, text: str):
+        self.filter_text = text.strip()
+        # Anything still queued is already in the ring, so rebuild from there
+        self.buffer.take_pending()
+        self.flush_timer.stop()
+        self.view.setPlainText("\n".join(self.buffer.set_filter(self.filter_text)))
+        scrollbar = self.view.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+        self._update_count()
+
+    def _update_count(self):
+        if self.filter_text:
+            self.count_label.setText(f"{self.buffer.matched:,} of {len(self.buffer):,} lines")
+        elif self.buffer.dropped:
+            self.count_label.setText(f"Last {len(self.buffer):,} lines")
+        else:
+            self.count_label.setText("")
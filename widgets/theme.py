@@ -0,0 +1,555 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from PySide6.QtCore import QEvent, QObject, Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QApplication, QWidget
+
+from core.paths import resource_path
+
+# Dynamic property on the top-level window naming its active theme
+THEME_PROPERTY = "theme"
+
+
+@dataclass(frozen=True)
+class Theme:
+    name: str
+    stylesheet: str
+    toggle_text: str
+    logo: str
+    splash: str
+
+
+NEON_STYLESHEET = """
+QWidget {
+    background-color: #040910;
+    color: #E4FFF9;
+    font-family: 'Segoe UI';
+    font-size: 14px;
+}
+QLabel {
+    background-color: transparent;
+}
+QLabel#TitleLabel {
+    font-size: 24px;
+    font-weight: 600;
+    color: #3CFFDD;
+}
+QLabel#SubtitleLabel {
+    font-size: 13px;
+    color: #84FFE8;
+}
+QLabel#TabHeading {
+    font-size: 18px;
+    font-weight: 600;
+    color: #3CFFDD;
+}
+QLabel#TabSubheading {
+    font-size: 12px;
+    color: #9AFEF1;
+}
+QLabel#FieldLabel {
+    font-size: 13px;
+    font-weight: 600;
+    color: #9AFEF1;
+}
+QLabel#MetricLabel {
+    font-size: 12px;
+    color: #73F5D6;
+}
+QLabel#StatusStrip {
+    background-color: rgba(12, 24, 40, 0.85);
+    border: 1px solid rgba(60, 255, 221, 0.35);
+    border-radius: 16px;
+    padding: 14px;
+    color: #88FFF0;
+}
+QFrame#HeaderCard {
+    background-color: rgba(8, 18, 34, 0.9);
+    border: 1px solid rgba(60, 255, 221, 0.45);
+    border-radius: 28px;
+}
+QFrame#ContentCard {
+    background-color: rgba(6, 14, 26, 0.95);
+    border: 1px solid rgba(60, 255, 221, 0.3);
+    border-radius: 28px;
+}
+QTabWidget#MainTabs::pane {
+    border: 1px solid rgba(60, 255, 221, 0.28);
+    border-radius: 18px;
+    padding: 16px;
+    background-color: rgba(8, 18, 34, 0.88);
+    margin-top: 10px;
+}
+QTabWidget#MainTabs > QWidget {
+    background-color: transparent;
+}
+QScrollArea {
+    background-color: transparent;
+    border: none;
+}
+QScrollArea > QWidget > QWidget {
+    background-color: transparent;
+}
+QTabBar::tab {
+    background-color: rgba(9, 22, 38, 0.9);
+    border: 1px solid rgba(60, 255, 221, 0.35);
+    padding: 8px 22px;
+    border-radius: 16px;
+    margin-right: 8px;
+    color: #8EFFF0;
+}
+QTabBar::tab:selected {
+    background-color: rgba(14, 32, 52, 0.95);
+    color: #3CFFDD;
+    border: 1px solid rgba(60, 255, 221, 0.6);
+}
+QTabBar::tab:hover {
+    color: #3CFFDD;
+}
+QPushButton {
+    background-color: rgba(10, 24, 40, 0.9);
+    border: 1px solid rgba(60, 255, 221, 0.35);
+    border-radius: 12px;
+    padding: 8px 18px;
+    color: #E4FFF9;
+}
+QPushButton:hover {
+    background-color: rgba(14, 32, 52, 0.95);
+}
+QPushButton:pressed {
+    background-color: rgba(6, 14, 24, 0.9);
+}
+QPushButton:disabled {
+    color: rgba(150, 210, 210, 0.4);
+    border: 1px solid rgba(60, 100, 100, 0.25);
+}
+QPushButton#AccentButton {
+    background-color: #3CFFDD;
+    color: #002A24;
+    font-weight: 600;
+    border-radius: 18px;
+    padding: 10px 26px;
+}
+QPushButton#AccentButton:hover {
+    background-color: #67FFE6;
+}
+QPushButton#AccentButton:pressed {
+    background-color: #2CE2C5;
+}
+QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox {
+    background-color: rgba(12, 28, 50, 0.92);
+    border: 1px solid rgba(60, 255, 221, 0.45);
+    border-radius: 8px;
+    padding: 8px 10px;
+    selection-background-color: #3CFFDD;
+    selection-color: #001824;
+    color: #E4FFF9;
+}
+QLineEdit::placeholder {
+    color: rgba(150, 255, 240, 0.55);
+}
+QPlainTextEdit#TerminalOutput {
+    font-family: 'Cascadia Code', 'Consolas', monospace;
+    font-size: 13px;
+}
+QTableWidget, QTableView {
+    background-color: rgba(12, 28, 50, 0.92);
+    border: 1px solid rgba(60, 255, 221, 0.45);
+    border-radius: 8px;
+    gridline-color: rgba(60, 255, 221, 0.18);
+    selection-background-color: #3CFFDD;
+    selection-color: #001824;
+}
+QProgressBar {
+    background-color: rgba(12, 28, 50, 0.92);
+    border: 1px solid rgba(60, 255, 221, 0.45);
+    border-radius: 6px;
+    min-height: 12px;
+    max-height: 12px;
+    color: transparent;
+}
+QProgressBar::chunk {
+    background-color: #3CFFDD;
+    border-radius: 5px;
+}
+QHeaderView::section {
+    background-color: rgba(9, 22, 38, 0.95);
+    color: #9AFEF1;
+    border: none;
+    border-bottom: 1px solid rgba(60, 255, 221, 0.35);
+    padding: 6px 8px;
+    font-weight: 600;
+}
+QComboBox::drop-down {
+    border-left: 1px solid rgba(60, 255, 221, 0.35);
+    width: 26px;
+    background-color: transparent;
+}
+QComboBox QAbstractItemView {
+    background-color: rgba(6, 14, 24, 0.98);
+    border: 1px solid rgba(60, 255, 221, 0.35);
+    selection-background-color: #3CFFDD;
+    selection-color: #002A24;
+}
+QScrollBar:vertical, QScrollBar:horizontal {
+    background-color: rgba(5, 12, 24, 0.95);
+    border: 1px solid rgba(60, 255, 221, 0.25);
+    margin: 6px;
+    border-radius: 6px;
+}
+QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+    background-color: rgba(60, 255, 221, 0.35);
+    border-radius: 6px;
+    min-height: 32px;
+}
+QScrollBar::handle:hover {
+    background-color: rgba(60, 255, 221, 0.55);
+}
+QScrollBar::add-line, QScrollBar::sub-line {
+    background: transparent;
+    border: none;
+    height: 0px;
+    width: 0px;
+}
+QScrollBar::add-page, QScrollBar::sub-page {
+    background: transparent;
+}
+"""
+
+LIGHT_STYLESHEET = """
+QWidget {
+    background-color: #f4f6fb;
+    color: #1a1d25;
+    font-family: 'Segoe UI';
+    font-size: 14px;
+}
+QLabel {
+    background-color: transparent;
+}
+QLabel#TitleLabel {
+    font-size: 24px;
+    font-weight: 600;
+    color: #113f73;
+}
+QLabel#SubtitleLabel {
+    font-size: 13px;
+    color: #3d4d63;
+}
+QLabel#TabHeading {
+    font-size: 18px;
+    font-weight: 600;
+    color: #113f73;
+}
+QLabel#TabSubheading {
+    font-size: 12px;
+    color: #4a5c78;
+}
+QLabel#FieldLabel {
+    font-size: 13px;
+    font-weight: 600;
+    color: #3d4d63;
+}
+QLabel#MetricLabel {
+    font-size: 12px;
+    color: #4a5c78;
+}
+QLabel#StatusStrip {
+    background-color: #ffffff;
+    border: 1px solid #d0d6e2;
+    border-radius: 16px;
+    padding: 14px;
+    color: #3d4d63;
+}
+QFrame#HeaderCard {
+    background-color: #ffffff;
+    border: 1px solid #d0d6e2;
+    border-radius: 28px;
+}
+QFrame#ContentCard {
+    background-color: #ffffff;
+    border: 1px solid #d0d6e2;
+    border-radius: 28px;
+}
+QTabWidget#MainTabs::pane {
+    border: 1px solid #d8deea;
+    border-radius: 18px;
+    padding: 16px;
+    background-color: #ffffff;
+    margin-top: 10px;
+}
+QTabWidget#MainTabs > QWidget {
+    background-color: transparent;
+}
+QScrollArea {
+    background-color: transparent;
+    border: none;
+}
+QScrollArea > QWidget > QWidget {
+    background-color: transparent;
+}
+QTabBar::tab {
+    background: #eef1f7;
+    border: 1px solid #ccd4e2;
+    padding: 8px 22px;
+    border-radius: 16px;
+    margin-right: 8px;
+    color: #46556f;
+}
+QTabBar::tab:selected {
+    background: #ffffff;
+    color: #0f4c81;
+    border: 1px solid #0f4c81;
+}
+QPushButton {
+    background-color: #eef1f7;
+    border: 1px solid #ccd4e2;
+    border-radius: 12px;
+    padding: 8px 18px;
+    color: #1a1d25;
+}
+QPushButton:hover {
+    background-color: #e2e7f1;
+}
+QPushButton:pressed {
+    background-color: #d4dae6;
+}
+QPushButton#AccentButton {
+    background-color: #0f4c81;
+    color: #ffffff;
+    font-weight: 600;
+    border-radius: 18px;
+    padding: 10px 26px;
+}
+QPushButton#AccentButton:hover {
+    background-color: #145f9b;
+}
+QPushButton#AccentButton:pressed {
+    background-color: #0c3c66;
+}
+QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox {
+    background-color: #ffffff;
+    border: 1px solid #c7cfde;
+    border-radius: 8px;
+    padding: 8px 10px;
+    selection-background-color: #0f4c81;
+    selection-color: #ffffff;
+}
+QPlainTextEdit#TerminalOutput {
+    font-family: 'Cascadia Code', 'Consolas', monospace;
+    font-size: 13px;
+}
+QTableWidget, QTableView {
+    background-color: #ffffff;
+    border: 1px solid #c7cfde;
+    border-radius: 8px;
+    gridline-color: #e2e7f1;
+    selection-background-color: #0f4c81;
+    selection-color: #ffffff;
+}
+QProgressBar {
+    background-color: #ffffff;
+    border: 1px solid #c7cfde;
+    border-radius: 6px;
+    min-height: 12px;
+    max-height: 12px;
+    color: transparent;
+}
+QProgressBar::chunk {
+    background-color: #0f4c81;
+    border-radius: 5px;
+}
+QHeaderView::section {
+    background-color: #eef1f7;
+    color: #3d4d63;
+    border: none;
+    border-bottom: 1px solid #ccd4e2;
+    padding: 6px 8px;
+    font-weight: 600;
+}
+QComboBox::drop-down {
+    border-left: 1px solid #c7cfde;
+    width: 26px;
+    background-color: transparent;
+}
+QComboBox QAbstractItemView {
+    background-color: #ffffff;
+    border: 1px solid #c7cfde;
+    selection-background-color: #0f4c81;
+    selection-color: #ffffff;
+}
+QScrollBar:vertical, QScrollBar:horizontal {
+    background-color: #f1f4fb;
+    border: 1px solid #d8deea;
+    margin: 6px;
+    border-radius: 6px;
+}
+QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+    background-color: #c7cfde;
+    border-radius: 6px;
+    min-height: 32px;
+}
+QScrollBar::handle:hover {
+    background-color: #a8b4c9;
+}
+QScrollBar::add-line, QScrollBar::sub-line {
+    background: transparent;
+    border: none;
+    height: 0px;
+    width: 0px;
+}
+QScrollBar::add-page, QScrollBar::sub-page {
+    background: transparent;
+}
+"""
+
+
+THEMES = {
+    "neon": Theme(
+        name="neon",
+        stylesheet=NEON_STYLESHEET,
+        toggle_text="Switch to Light Theme",
+        logo="icons/gatchfier_logo.png",
+        splash="icons/splash_dark.png",
+    ),
+    "light": Theme(
+        name="light",
+        stylesheet=LIGHT_STYLESHEET,
+        toggle_text="Switch to Neon Theme",
+        logo="icons/gatchfier_logo_dark.png",
+        splash="icons/splash.png",
+    ),
+}
+
+LOGO_SIZE = (120, 90)
+SPLASH_SIZE = (300, 200)
+
+
+def compile_stylesheet(source: str) -> str:
+    """Drop indentation and blank lines so Qt parses the smallest possible text."""
+    return "\n".join(line.strip() for line in source.splitlines() if line.strip())
+
+
+def scope_stylesheet(source: str, name: str) -> str:
+    """Limit every rule in ``source`` to a window whose theme property is ``name``.
+
+    Each selector is emitted twice: once for the window itself and once for
+    anything inside it.
+    """
+    rules = []
+    for match in re.finditer(r"([^{}]+)\{([^{}]*)\}", source):
+        selectors = []
+        for selector in match.group(1).split(","):
+            selector = selector.strip()
+            head = re.match(r"[\w#*-]+", selector).end()
+            selectors.append(f'{selector[:head]}[{THEME_PROPERTY}="{name}"]{selector[head:]}')
+            selectors.append(f'[{THEME_PROPERTY}="{name}"] {selector}')
+        rules.append(f"{','.join(selectors)} {{{match.group(2)}}}")
+    return "\n".join(rules)
+
+
+class _DeferredRestyle(QObject):
+    """Restyles a widget that was hidden during a theme switch when it is next shown."""
+
+    def __init__(self, engine: ThemeEngine):
+        super().__init__()
+        self.engine = engine
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # pylint: disable=invalid-name
+        if event.type() == QEvent.Show:
+            watched.removeEventFilter(self)
+            self.engine.restyle(watched)
+        return False
+
+
+class ThemeEngine:
+    """One stylesheet for every theme, switched by a window property.
+
+    Every theme's rules are compiled into a single stylesheet that is set on
+    the window once. A switch changes the window's ``theme`` property and
+    re-polishes only the widgets on screen; hidden ones (other tabs, popups)
+    are re-polished the first time they are shown again. Pixmaps are scaled
+    once per file, size and device pixel ratio. Applying the theme a window
+    already has does nothing.
+    """
+
+    def __init__(self):
+        self._stylesheet: str | None = None
+        self._pixmaps: Dict[Tuple[str, int, int, float], QPixmap] = {}
+        self._deferred = _DeferredRestyle(self)
+
+    def stylesheet(self) -> str:
+        if self._stylesheet is None:
+            self._stylesheet = "\n".join(
+                scope_stylesheet(compile_stylesheet(theme.stylesheet), name) for name, theme in THEMES.items()
+            )
+        return self._stylesheet
+
+    def pixmap(self, relative_path: str, size: Tuple[int, int], ratio: float = 1.0) -> QPixmap:
+        key = (relative_path, size[0], size[1], ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            # Scale to device pixels so the image stays sharp on high-DPI screens
+            pixmap = QPixmap(resource_path(relative_path)).scaled(
+                round(size[0] * ratio), round(size[1] * ratio), Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(ratio)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def logo(self, name: str, ratio: float = 1.0) -> QPixmap:
+        return self.pixmap(THEMES[name].logo, LOGO_SIZE, ratio)
+
+    def splash(self, name: str, ratio: float = 1.0) -> QPixmap:
+        return self.pixmap(THEMES[name].splash, SPLASH_SIZE, ratio)
+
+    def prepare(self, ratio: float = 1.0):
+        """Scale every theme's logo ahead of the first toggle."""
+        for name in THEMES:
+            self.logo(name, ratio)
+
+    def apply(self, window: QWidget, name: str) -> bool:
+        """Switch ``window`` to theme ``name``; returns False when it already has it."""
+        if name not in THEMES:
+            raise KeyError(name)
+        if window.property(THEME_PROPERTY) == name:
+            return False
+        window.setProperty(THEME_PROPERTY, name)
+        stylesheet = self.stylesheet()
+        if window.styleSheet() != stylesheet:
+            window.setStyleSheet(stylesheet)
+            return True
+        # Hold repaints so the restyle lands as a single frame
+        window.setUpdatesEnabled(False)
+        try:
+            self.restyle(window)
+        finally:
+            window.setUpdatesEnabled(True)
+        return True
+
+    def restyle(self, root: QWidget):
+        """Re-evaluate the stylesheet for ``root`` and the visible widgets inside it."""
+        pending = [root]
+        while pending:
+            widget = pending.pop()
+            if widget is not root and not widget.isVisible():
+                widget.installEventFilter(self._deferred)
+                continue
+            # A Polish event makes the stylesheet style drop its cached rules for the widget
+            QApplication.sendEvent(widget, QEvent(QEvent.Polish))
+            QApplication.sendEvent(widget, QEvent(QEvent.StyleChange))
+            widget.update()
+            pending.extend(child for child in widget.children() if isinstance(child, QWidget))
+
+
+_engine: ThemeEngine | None = None
+
+
+def get_theme_engine() -> ThemeEngine:
+    global _engine
+    if _engine is None:
+        _engine = ThemeEngine()
+    return _engine